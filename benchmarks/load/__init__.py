@@ -0,0 +1,5 @@
+"""
+End-to-end load benchmarks for TaskBoard.
+
+Run with `python -m benchmarks.load --help`.
+"""
@@ -0,0 +1,89 @@
+# Import standard libraries for the command line, JSON output and exit codes
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Import the HTTP client and the benchmark modules
+import httpx
+
+from benchmarks.load.environment import external_app, in_process_app
+from benchmarks.load.report import build_report, compare_to_baseline, format_table, load_json
+from benchmarks.load.scenarios import SCENARIOS, ScenarioConfig
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Drive the TaskBoard app with concurrent virtual users and report latency percentiles.",
+    )
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--users", type=int, default=ScenarioConfig.users, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=ScenarioConfig.iterations, help="Operations per virtual user")
+    parser.add_argument("--tasks-per-user", type=int, default=ScenarioConfig.tasks_per_user)
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file (default: stdout)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    config = ScenarioConfig(users=args.users, iterations=args.iterations, tasks_per_user=args.tasks_per_user)
+    names = args.scenario or list(SCENARIOS)
+
+    environment = external_app() if args.base_url else in_process_app()
+    base_url = args.base_url or "http://taskboard.bench"
+
+    results = []
+    async with environment as transport:
+        def make_client() -> httpx.AsyncClient:
+            return httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60)
+
+        for name in names:
+            print(f"Running {name} ({config.users} users x {config.iterations} iterations)...", file=sys.stderr)
+            result = await SCENARIOS[name](make_client, config)
+            for sample in result.error_samples:
+                print(f"  error: {sample}", file=sys.stderr)
+            results.append(result)
+
+    return build_report(results, {
+        "mode": "external" if args.base_url else "in-process",
+        "users": config.users,
+        "iterations": config.iterations,
+        "tasks_per_user": config.tasks_per_user,
+    })
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    report = asyncio.run(run(args))
+
+    print(format_table(report), file=sys.stderr)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    baseline = load_json(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.", file=sys.stderr)
+        return 0
+
+    regressions = compare_to_baseline(report, baseline, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# Import standard libraries for temporary storage and environment setup
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+# Import the HTTP client used to talk to the app
+import httpx
+
+# ---------------------------- Hermetic In-Process App ----------------------------
+#
+# The app reads DATABASE_URL and REDIS_URL when `src.app` is first imported, so
+# everything here imports the application lazily, after the environment is set.
+
+@asynccontextmanager
+async def in_process_app() -> AsyncIterator[httpx.AsyncBaseTransport]:
+    """
+    Start the real ASGI app in this process against local stand-ins:
+    a throwaway SQLite database (aiosqlite) and an in-memory Redis (fakeredis).
+    Yields an httpx transport that sends requests straight to the app.
+    """
+    try:
+        import aiosqlite  # noqa: F401
+        import fakeredis
+    except ImportError as e:
+        raise SystemExit(f"In-process benchmarks need `pip install aiosqlite fakeredis` ({e}).")
+
+    workdir = tempfile.mkdtemp(prefix="taskboard-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+    os.environ["REDIS_URL"] = "redis://localhost:6379/15"  # Never connected; replaced below
+    os.environ.setdefault("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 4))
+    # Keep uploaded profile images out of the source tree
+    os.environ["PROFILE_IMAGE_DIR"] = os.path.join(workdir, "profile_images")
+
+    # Install the in-memory server as this process' Redis client; init_redis() keeps it
+    import src.app.core.cache as cache
+    fake_redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    cache.redis = fake_redis
+
+    import src.app.main as main
+
+    # Create the schema, roles and admin user exactly like a fresh deployment
+    from init_db import init_db
+    await init_db()
+
+    app = main.create_app()
+    try:
+        # The lifespan opens the pools (keeping the fake Redis client) and closes them afterwards
+        async with app.router.lifespan_context(app):
+            yield httpx.ASGITransport(app=app)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@asynccontextmanager
+async def external_app() -> AsyncIterator[httpx.AsyncBaseTransport]:
+    """
+    Use a server that is already running (e.g. `uvicorn src.app.main:app` on localhost
+    against a throwaway Postgres and a local redis-server).
+    """
+    transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=None))
+    try:
+        yield transport
+    finally:
+        await transport.aclose()
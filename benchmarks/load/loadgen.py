@@ -0,0 +1,77 @@
+# Import standard libraries for concurrency and timing
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+# Import the HTTP client used by every virtual user
+import httpx
+
+# ---------------------------- Results ----------------------------
+
+@dataclass
+class ScenarioResult:
+    """
+    Raw measurements of one scenario run.
+    """
+
+    name: str
+    latencies: list[float] = field(default_factory=list)   # Seconds per successful operation
+    errors: int = 0                                         # Operations that failed or got an unexpected status
+    elapsed: float = 0.0                                    # Wall-clock seconds of the measured phase
+    error_samples: list[str] = field(default_factory=list)  # First few error messages, for debugging
+
+
+class UnexpectedResponse(Exception):
+    """
+    Raised by an operation when the app answered with an unexpected status code.
+    """
+
+
+def expect(response: httpx.Response, *status_codes: int) -> httpx.Response:
+    """
+    Raise UnexpectedResponse unless the response has one of the given status codes.
+    """
+    if response.status_code not in status_codes:
+        raise UnexpectedResponse(f"{response.request.method} {response.request.url.path} -> {response.status_code}")
+    return response
+
+# ---------------------------- Load Generator ----------------------------
+
+# An operation receives the virtual user's client, its index and the iteration number
+Operation = Callable[[httpx.AsyncClient, int, int], Awaitable[None]]
+
+MAX_ERROR_SAMPLES = 5
+
+
+async def run_closed_loop(
+    name: str,
+    clients: list[httpx.AsyncClient],
+    operation: Operation,
+    iterations: int,
+) -> ScenarioResult:
+    """
+    Run `operation` `iterations` times on every client concurrently.
+    Each client is one virtual user that waits for its previous operation
+    before starting the next one (closed loop), so the offered load adapts
+    to the app's throughput instead of piling up unbounded queues.
+    """
+    result = ScenarioResult(name=name)
+
+    async def virtual_user(index: int, client: httpx.AsyncClient) -> None:
+        for iteration in range(iterations):
+            started_at = time.perf_counter()
+            try:
+                await operation(client, index, iteration)
+            except (UnexpectedResponse, httpx.HTTPError) as e:
+                result.errors += 1
+                if len(result.error_samples) < MAX_ERROR_SAMPLES:
+                    result.error_samples.append(str(e))
+                continue
+            result.latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(virtual_user(index, client) for index, client in enumerate(clients)))
+    result.elapsed = time.perf_counter() - started_at
+
+    return result
@@ -0,0 +1,100 @@
+# Import standard libraries for math and JSON output
+import json
+import math
+import platform
+from pathlib import Path
+from typing import Any
+
+from benchmarks.load.loadgen import ScenarioResult
+
+# ---------------------------- Statistics ----------------------------
+
+def percentile(samples: list[float], pct: float) -> float:
+    """
+    Return the nearest-rank percentile of the samples (0 if there are none).
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(result: ScenarioResult) -> dict[str, Any]:
+    """
+    Reduce a scenario's raw measurements to the numbers we track.
+    """
+    completed = len(result.latencies)
+    return {
+        "requests": completed + result.errors,
+        "errors": result.errors,
+        "rps": round(completed / result.elapsed, 2) if result.elapsed else 0.0,
+        "p50_ms": round(percentile(result.latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(result.latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(result.latencies, 99) * 1000, 2),
+        "max_ms": round(max(result.latencies, default=0.0) * 1000, 2),
+    }
+
+
+def build_report(results: list[ScenarioResult], meta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Build the JSON report of a benchmark run.
+    """
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), **meta},
+        "scenarios": {result.name: summarize(result) for result in results},
+    }
+
+# ---------------------------- Baseline Comparison ----------------------------
+
+def compare_to_baseline(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """
+    Compare a report with a stored baseline.
+
+    A scenario regresses when it has errors, when its p95 latency grows by more
+    than `tolerance` (e.g. 0.25 = 25 %), or when its throughput drops by more
+    than `tolerance`. Scenarios missing from either side are ignored.
+
+    :return: One message per regression (empty if there is none).
+    """
+    regressions = []
+
+    for name, current in report["scenarios"].items():
+        if current["errors"]:
+            regressions.append(f"{name}: {current['errors']} failed requests")
+
+        expected = baseline.get("scenarios", {}).get(name)
+        if expected is None:
+            continue
+
+        if expected["p95_ms"] and current["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f} ms > baseline {expected['p95_ms']:.1f} ms (+{tolerance:.0%})"
+            )
+
+        if expected["rps"] and current["rps"] < expected["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['rps']:.1f} req/s < baseline {expected['rps']:.1f} req/s (-{tolerance:.0%})"
+            )
+
+    return regressions
+
+
+def load_json(path: Path) -> dict[str, Any] | None:
+    """
+    Read a JSON file, or return None if it does not exist.
+    """
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def format_table(report: dict[str, Any]) -> str:
+    """
+    Render a report as a fixed-width table for the terminal.
+    """
+    lines = [f"{'scenario':<16}{'reqs':>7}{'errs':>6}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}"]
+    for name, stats in report["scenarios"].items():
+        lines.append(
+            f"{name:<16}{stats['requests']:>7}{stats['errors']:>6}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
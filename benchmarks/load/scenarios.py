@@ -0,0 +1,228 @@
+# Import standard libraries for unique names, test payloads and page parsing
+import itertools
+import json
+import re
+import struct
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+# Import the HTTP client and the load generator helpers
+import httpx
+
+from benchmarks.load.loadgen import ScenarioResult, expect, run_closed_loop
+
+# Password of every benchmark user
+PASSWORD = "bench-password"
+
+# Columns of the kanban board, in drag order
+STATUSES = ("not_started", "in_progress", "completed", "blocked")
+
+# Board state embedded in the main page (see mainboard.html)
+BOARD_STATE_RE = re.compile(r'<script id="board-state" type="application/json">(.*?)</script>', re.S)
+
+# Side of the uploaded profile pictures, in pixels
+IMAGE_SIDE = 512
+
+# ---------------------------- Virtual Users ----------------------------
+
+@dataclass
+class VirtualUser:
+    """
+    A signed-up benchmark user with its own client (and so its own session cookie).
+    """
+
+    client: httpx.AsyncClient
+    email: str
+    task_ids: list[int]
+
+
+async def sign_up(client: httpx.AsyncClient, prefix: str) -> str:
+    """
+    Create a user through the public API and return its email.
+    """
+    name = f"{prefix}-{uuid.uuid4().hex[:12]}"
+    email = f"{name}@bench.example.com"
+    expect(await client.post("/api/v1/users", json={"username": name, "email": email, "password": PASSWORD}), 201)
+    return email
+
+
+async def log_in(client: httpx.AsyncClient, email: str) -> None:
+    """
+    Log in; the session cookie is kept by the client.
+    """
+    expect(await client.post("/api/v1/login", json={"email": email, "password": PASSWORD}), 200)
+
+
+async def create_tasks(client: httpx.AsyncClient, count: int) -> list[int]:
+    """
+    Create `count` tasks spread over every column and return their IDs.
+    """
+    task_ids = []
+    for index in range(count):
+        response = expect(await client.post("/api/v1/tasks", json={
+            "title": f"Task {index}",
+            "description": "Benchmark task",
+            "priority": index % 3 + 1,
+            "status": STATUSES[index % len(STATUSES)],
+            "due_date": "2030-01-01",
+            "subject": "bench",
+        }), 201)
+        task_ids.append(response.json()["data"]["id"])
+    return task_ids
+
+
+async def prepare_users(
+    make_client: Callable[[], httpx.AsyncClient],
+    count: int,
+    tasks_per_user: int,
+    logged_in: bool = True,
+) -> list[VirtualUser]:
+    """
+    Sign up `count` users (unmeasured) and optionally log them in and give them tasks.
+    """
+    users = []
+    for _ in range(count):
+        client = make_client()
+        email = await sign_up(client, "bench")
+        task_ids = []
+        if logged_in:
+            await log_in(client, email)
+            task_ids = await create_tasks(client, tasks_per_user)
+        users.append(VirtualUser(client=client, email=email, task_ids=task_ids))
+    return users
+
+# ---------------------------- Scenarios ----------------------------
+
+@dataclass
+class ScenarioConfig:
+    """
+    Size of a benchmark run.
+    """
+
+    users: int = 8               # Concurrent virtual users
+    iterations: int = 10         # Operations per virtual user
+    tasks_per_user: int = 40     # Tasks on each user's board
+    image_bytes: int = 256 * 1024
+
+
+Scenario = Callable[[Callable[[], httpx.AsyncClient], ScenarioConfig], Awaitable[ScenarioResult]]
+
+
+async def login_storm(make_client, config: ScenarioConfig) -> ScenarioResult:
+    """
+    Every user logs in over and over (bcrypt verification + session write).
+    """
+    users = await prepare_users(make_client, config.users, 0, logged_in=False)
+
+    async def operation(client, index, iteration):
+        await log_in(client, users[index].email)
+
+    return await _run("login_storm", users, operation, config)
+
+
+async def board_load(make_client, config: ScenarioConfig) -> ScenarioResult:
+    """
+    Every user opens the main board like a browser does: the HTML page, which
+    already holds the first tasks of every column, then the missing tasks of the
+    columns with more tasks than the page rendered (the whole list without board state).
+    """
+    users = await prepare_users(make_client, config.users, config.tasks_per_user)
+
+    async def operation(client, index, iteration):
+        page = expect(await client.get("/main"), 200)
+
+        match = BOARD_STATE_RE.search(page.text)
+        state = json.loads(match.group(1)) if match else None
+        if state is None:
+            expect(await client.get("/api/v1/tasks"), 200)
+            return
+
+        for status, column in state.items():
+            after = column["after"] if column["loaded"] < column["total"] else None
+            while after is not None:
+                response = expect(await client.get(f"/api/v1/tasks/columns/{status}", params={"after": after}), 200)
+                after = response.json()["data"]["next_after"]
+
+    return await _run("board_load", users, operation, config)
+
+
+async def drag_storm(make_client, config: ScenarioConfig) -> ScenarioResult:
+    """
+    Every user drags its cards from column to column as fast as possible.
+    """
+    users = await prepare_users(make_client, config.users, config.tasks_per_user)
+    statuses = itertools.cycle(STATUSES)
+
+    async def operation(client, index, iteration):
+        task_ids = users[index].task_ids
+        task_id = task_ids[iteration % len(task_ids)]
+        expect(await client.patch(f"/api/v1/tasks/{task_id}", json={"status": next(statuses)}), 200)
+
+    return await _run("drag_storm", users, operation, config)
+
+
+async def signups(make_client, config: ScenarioConfig) -> ScenarioResult:
+    """
+    New users sign up concurrently (duplicate checks + bcrypt hashing + insert).
+    """
+    users = [VirtualUser(client=make_client(), email="", task_ids=[]) for _ in range(config.users)]
+
+    async def operation(client, index, iteration):
+        await sign_up(client, f"signup{index}")
+
+    return await _run("signups", users, operation, config)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def make_png(side: int, size_bytes: int) -> bytes:
+    """
+    Build a valid side x side RGB PNG (a gradient) of exactly size_bytes bytes, padded with
+    a private ancillary chunk that decoders skip. The upload endpoint decodes and resizes it.
+    """
+    header = _png_chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0))
+    rows = b"".join(b"\0" + bytes((x + y) % 256 for x in range(side) for _ in range(3)) for y in range(side))
+    image_data = _png_chunk(b"IDAT", zlib.compress(rows, 6))
+    end = _png_chunk(b"IEND", b"")
+
+    # Signature, three chunks, and the 12 bytes of length, type and CRC of the padding chunk
+    padding = size_bytes - 8 - len(header) - len(image_data) - len(end) - 12
+    if padding < 0:
+        raise ValueError(f"A {side}x{side} PNG does not fit in {size_bytes} bytes.")
+    return b"\x89PNG\r\n\x1a\n" + header + _png_chunk(b"bnPd", b"\0" * padding) + image_data + end
+
+
+async def profile_uploads(make_client, config: ScenarioConfig) -> ScenarioResult:
+    """
+    Every user uploads a profile picture of `image_bytes` bytes.
+    """
+    users = await prepare_users(make_client, config.users, 0)
+    image = make_png(IMAGE_SIDE, config.image_bytes)
+
+    async def operation(client, index, iteration):
+        files = {"file": ("user.png", image, "image/png")}
+        expect(await client.post("/api/v1/user_settings/profile_image", files=files), 201)
+
+    return await _run("profile_uploads", users, operation, config)
+
+
+async def _run(name, users: list[VirtualUser], operation, config: ScenarioConfig) -> ScenarioResult:
+    try:
+        return await run_closed_loop(name, [user.client for user in users], operation, config.iterations)
+    finally:
+        for user in users:
+            await user.client.aclose()
+
+
+# Every scenario, in the order they run
+SCENARIOS: dict[str, Scenario] = {
+    "login_storm": login_storm,
+    "board_load": board_load,
+    "drag_storm": drag_storm,
+    "signups": signups,
+    "profile_uploads": profile_uploads,
+}
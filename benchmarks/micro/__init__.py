@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks of per-request hot paths.
+
+Run with `python -m benchmarks.micro --help`.
+"""
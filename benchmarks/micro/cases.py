@@ -0,0 +1,154 @@
+# Import standard libraries for building fixtures
+import datetime
+import json
+
+# Import the application code under measurement (every model, so the mappers can be configured)
+import src.app.models.role  # noqa: F401
+import src.app.models.user  # noqa: F401
+from src.app.dtos.user_detail import UserDetail
+from src.app.models.task import Task
+from src.app.repositories.cache_repository import CacheRepositoryImpl, MemoryCacheRepository
+from src.app.repositories.task_repository import task_to_task_out
+from src.app.schemas.base_response import BaseResponse
+from src.app.schemas.task import BoardColumn, TaskOut, TaskStatusEnum
+from src.app.services.cache_service import CacheService
+from src.app.core.templating import get_templates
+
+from benchmarks.micro.harness import case
+
+# Number of tasks in the "large" payloads, about a busy board
+LARGE_BOARD_TASKS = 200
+
+# ---------------------------- Fixtures ----------------------------
+
+def make_task(task_id: int = 1) -> Task:
+    """
+    Build a detached Task model like the ones loaded by the repository.
+    """
+    return Task(
+        id=task_id,
+        title=f"Task {task_id}",
+        description="Write the report for the physics lab",
+        owner_id=7,
+        is_completed=False,
+        priority=2,
+        due_date=datetime.datetime(2030, 1, 1),
+        created_at=datetime.datetime(2025, 1, 1),
+        status="in_progress",
+        subject="Physics",
+    )
+
+
+def make_user_detail() -> UserDetail:
+    return UserDetail(id=7, username="student", email="student@example.com", is_admin=False, role_id=2, permissions=7)
+
+
+class DictRedis:
+    """
+    Minimal in-memory stand-in for the Redis client, so the cache benchmarks
+    measure our (de)serialization rather than a network round-trip.
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def get(self, key):
+        return self.data.get(key)
+
+# ---------------------------- Serialization ----------------------------
+
+@case("task_to_task_out")
+def bench_task_to_task_out():
+    task = make_task()
+    return lambda: task_to_task_out(task)
+
+
+@case("task_out_model_validate")
+def bench_task_out_model_validate():
+    payload = task_to_task_out(make_task()).model_dump()
+    return lambda: TaskOut.model_validate(payload)
+
+
+@case("base_response_large_data")
+def bench_base_response_large_data():
+    data = {"tasks": [task_to_task_out(make_task(i)).model_dump() for i in range(LARGE_BOARD_TASKS)]}
+    return lambda: BaseResponse(success=True, message="Tasks retrieved successfully", http_status_code=200, data=data)
+
+
+@case("base_response_large_data_json")
+def bench_base_response_large_data_json():
+    # What FastAPI ends up doing with the response: build it and dump it to JSON
+    data = {"tasks": [task_to_task_out(make_task(i)).model_dump() for i in range(LARGE_BOARD_TASKS)]}
+    return lambda: BaseResponse(
+        success=True, message="Tasks retrieved successfully", http_status_code=200, data=data
+    ).model_dump_json()
+
+# ---------------------------- Sessions ----------------------------
+
+@case("session_json_loads")
+def bench_session_json_loads():
+    # The payload add_session_middleware decodes on every authenticated request
+    raw = json.dumps(make_user_detail().__dict__)
+    return lambda: json.loads(raw)
+
+
+@case("cache_service_user_detail_roundtrip")
+def bench_cache_service_user_detail_roundtrip():
+    service = CacheService(cache_repository=CacheRepositoryImpl(redis_client=DictRedis()))
+    user_detail = make_user_detail()
+
+    async def roundtrip():
+        await service.set_user_session_data("bench-session", user_detail)
+        await service.get_user_session_data("bench-session")
+
+    return roundtrip
+
+@case("cache_service_user_detail_roundtrip_memory")
+def bench_cache_service_user_detail_roundtrip_memory():
+    service = CacheService(cache_repository=MemoryCacheRepository(max_entries=1000, max_bytes=1 << 20))
+    user_detail = make_user_detail()
+
+    async def roundtrip():
+        await service.set_user_session_data("bench-session", user_detail)
+        await service.get_user_session_data("bench-session")
+
+    return roundtrip
+
+# ---------------------------- Templates ----------------------------
+
+def make_board_context(tasks_per_column: int) -> dict:
+    """
+    Build the context web/main_board.py passes to mainboard.html.
+    """
+    columns = {
+        status.value: BoardColumn(
+            status=status,
+            total=tasks_per_column,
+            tasks=[
+                task_to_task_out(make_task(i)).model_copy(update={"status": status})
+                for i in range(tasks_per_column)
+            ],
+        )
+        for status in TaskStatusEnum
+    }
+    board_state = {name: {"total": column.total, "loaded": len(column.tasks)} for name, column in columns.items()}
+    return {"request": None, **make_user_detail().__dict__, "columns": columns, "board_state": board_state}
+
+
+@case("render_mainboard_html")
+def bench_render_mainboard_html():
+    # The page shell with an empty board
+    template = get_templates().get_template("mainboard/mainboard.html")
+    context = make_board_context(0)
+    return lambda: template.render(context)
+
+
+@case("render_mainboard_html_large_board")
+def bench_render_mainboard_html_large_board():
+    # A busy board rendered on the server: LARGE_BOARD_TASKS cards over the four columns
+    template = get_templates().get_template("mainboard/mainboard.html")
+    context = make_board_context(LARGE_BOARD_TASKS // len(TaskStatusEnum))
+    return lambda: template.render(context)
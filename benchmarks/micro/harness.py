@@ -0,0 +1,149 @@
+# Import standard libraries for timing, memory tracing and async support
+import asyncio
+import gc
+import inspect
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# ---------------------------- Registry ----------------------------
+
+# A case factory does its setup and returns the zero-argument callable to measure
+CaseFactory = Callable[[], Callable[[], Any]]
+
+CASES: dict[str, CaseFactory] = {}
+
+
+def case(name: str) -> Callable[[CaseFactory], CaseFactory]:
+    """
+    Register a micro-benchmark.
+
+    Usage:
+        @case("session_json_loads")
+        def session_json_loads():
+            raw = ...                       # setup, not measured
+            return lambda: json.loads(raw)  # measured
+    """
+
+    def decorator(factory: CaseFactory) -> CaseFactory:
+        CASES[name] = factory
+        return factory
+
+    return decorator
+
+# ---------------------------- Measurement ----------------------------
+
+@dataclass
+class Measurement:
+    """
+    Result of one micro-benchmark.
+    """
+
+    name: str
+    ns_per_op: float                  # Best (lowest) mean time per call over the repeats
+    alloc_peak_bytes_per_op: float    # Extra memory at the peak of a single call (tracemalloc)
+    retained_blocks_per_op: float     # Memory blocks still alive after each call (should be ~0)
+    loops: int                        # Calls per repeat
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "ns_per_op": round(self.ns_per_op, 1),
+            "alloc_peak_bytes_per_op": round(self.alloc_peak_bytes_per_op, 1),
+            "retained_blocks_per_op": round(self.retained_blocks_per_op, 2),
+            "loops": self.loops,
+        }
+
+
+def _as_sync(function: Callable[[], Any]) -> Callable[[int], None]:
+    """
+    Return a function running `function` n times; coroutine functions are
+    awaited in a loop inside a single event loop iteration, so loop overhead
+    is paid once per batch rather than per call.
+    """
+    if inspect.iscoroutinefunction(function):
+        loop = asyncio.new_event_loop()
+
+        async def batch(n: int) -> None:
+            for _ in range(n):
+                await function()
+
+        return lambda n: loop.run_until_complete(batch(n))
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            function()
+
+    return run
+
+
+def _autorange(run: Callable[[int], None], min_seconds: float) -> int:
+    # Same idea as timeit.Timer.autorange: grow the batch until it is long enough to time reliably
+    loops = 1
+    while True:
+        started_at = time.perf_counter()
+        run(loops)
+        if time.perf_counter() - started_at >= min_seconds:
+            return loops
+        loops *= 2
+
+
+def _trace_allocations(run: Callable[[int], None], loops: int) -> tuple[float, float]:
+    # tracemalloc only sees live memory, so two numbers are reported:
+    # - the peak of extra memory while a single call runs (its transient allocations)
+    # - the blocks still alive after a batch, per call (leaks or unbounded caches)
+    tracemalloc.start(1)
+    try:
+        run(1)  # Warm caches so one-off allocations are not charged to every call
+
+        peak_total = 0
+        for _ in range(min(loops, 100)):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            run(1)
+            _, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - current
+        peak_per_op = peak_total / min(loops, 100)
+
+        before = tracemalloc.take_snapshot()
+        run(loops)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    retained_blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno"))
+    return peak_per_op, max(retained_blocks, 0) / loops
+
+
+def measure(name: str, factory: CaseFactory, repeats: int = 5, min_seconds: float = 0.2) -> Measurement:
+    """
+    Time one case and count its allocations.
+
+    ns/op is the best mean over `repeats` batches, which filters out noise from
+    other processes. Allocations are measured in a separate traced run because
+    tracemalloc slows every allocation down.
+    """
+    run = _as_sync(factory())
+    loops = _autorange(run, min_seconds)
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = []
+        for _ in range(repeats):
+            started_at = time.perf_counter_ns()
+            run(loops)
+            timings.append((time.perf_counter_ns() - started_at) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak_bytes, retained_blocks = _trace_allocations(run, min(loops, 1000))
+
+    return Measurement(
+        name=name,
+        ns_per_op=min(timings),
+        alloc_peak_bytes_per_op=peak_bytes,
+        retained_blocks_per_op=retained_blocks,
+        loops=loops,
+    )
@@ -4,8 +4,8 @@ import os
 import bcrypt
 from sqlalchemy import select, func
 
-from src.app.core.database import engine, SessionLocal
-from src.app.core.database import Base
+from src.app.core.database import SessionLocal, dispose_engine, get_engine
+from src.app.migrations.runner import migrate
 
 # 🔴 IMPORTA TODOS LOS MODELOS ANTES DE USARLOS (registro en el mapper)
 import src.app.models.role   # noqa: F401
@@ -13,13 +13,13 @@ import src.app.models.user   # noqa: F401
 import src.app.models.task   # noqa: F401
 
 from src.app.models.role import Role
+from src.app.core.permissions import DEFAULT_ROLE_PERMISSIONS, ADMIN_ROLE_ID, STUDENT_ROLE_ID
 from src.app.models.user import User
 
 
 async def init_db():
-    # Crea TODAS las tablas conocidas por el Base (requiere que los modelos estén importados)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Aplica las migraciones pendientes (una sola vez aunque arranquen varios procesos)
+    await migrate(get_engine())
 
     async with SessionLocal() as session:
         # ¿Ya hay roles? (si hay, asumimos que ya se hizo el seeding)
@@ -32,8 +32,18 @@ async def init_db():
             return
 
         # Crea roles
-        admin_role = Role(id=1, name="admin", description="System administrator")
-        student_role = Role(id=2, name="student", description="Student")
+        admin_role = Role(
+            id=ADMIN_ROLE_ID,
+            name="admin",
+            description="System administrator",
+            permissions=DEFAULT_ROLE_PERMISSIONS[ADMIN_ROLE_ID],
+        )
+        student_role = Role(
+            id=STUDENT_ROLE_ID,
+            name="student",
+            description="Student",
+            permissions=DEFAULT_ROLE_PERMISSIONS[STUDENT_ROLE_ID],
+        )
         session.add_all([admin_role, student_role])
         await session.commit()
         print("✅ Roles created.")
@@ -65,5 +75,13 @@ async def init_db():
         else:
             print("🔹 Admin user already exists, skipping.")
 
+
+async def main():
+    try:
+        await init_db()
+    finally:
+        await dispose_engine()
+
+
 if __name__ == "__main__":
-    asyncio.run(init_db())
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
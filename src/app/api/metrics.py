@@ -0,0 +1,31 @@
+# Import anyio to collect the metrics from a worker thread
+import anyio.to_thread
+
+# Import FastAPI modules for routing and plain text responses
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+# Import the scrape token check and the metrics registry
+from src.app.core.metrics import check_metrics_access, render_metrics
+
+# Router for the Prometheus scrape endpoint (mounted at /metrics, outside the versioned API)
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("", include_in_schema=False)
+async def metrics(request: Request):
+    """
+    Expose the application metrics in Prometheus text format.
+    If METRICS_TOKEN is configured, the scraper must send it as a bearer token.
+    Outside ENVIRONMENT=dev the endpoint is not served without a token.
+    """
+    refusal = check_metrics_access(request.headers.get("authorization"))
+    if refusal:
+        raise HTTPException(status_code=refusal[0], detail=refusal[1])
+
+    # With METRICS_MULTIPROC_DIR this reads every worker's file and may wait for a file lock
+    body = await anyio.to_thread.run_sync(render_metrics)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
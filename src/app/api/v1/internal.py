@@ -0,0 +1,136 @@
+# Import FastAPI modules for routing, dependency injection and file responses
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+
+# Import infrastructure helpers, permission checks and the standard response schema
+from src.app.core.database import get_pool_status
+from src.app.core.permissions import Permission, require_permission
+from src.app.core.profiling import create_profile_token, profile_store
+from src.app.core.query_stats import get_query_stats
+from src.app.schemas.base_response import BaseResponse
+from src.app.services.user_service import UserService, get_user_service
+
+# Every endpoint in this router is restricted to users allowed to see operational data
+router = APIRouter(dependencies=[Depends(require_permission(Permission.VIEW_METRICS))])
+
+# ---------------------------- Database Pool Status ----------------------------
+@router.get("/db_pool", response_model=BaseResponse, status_code=200)
+async def db_pool_status():
+    """
+    Return the connection pool usage of this worker:
+    checked-out connections, overflow in use and time spent waiting for a connection.
+    """
+    return BaseResponse(
+        success=True,
+        message="Database pool status retrieved successfully",
+        http_status_code=200,
+        data=get_pool_status()
+    )
+
+
+# ---------------------------- Query Statistics ----------------------------
+@router.get("/query_stats", response_model=BaseResponse, status_code=200)
+async def query_stats():
+    """
+    Return the latency histogram of every normalized SQL statement run by this worker,
+    slowest total time first.
+    """
+    return BaseResponse(
+        success=True,
+        message="Query statistics retrieved successfully",
+        http_status_code=200,
+        data={"statements": get_query_stats()}
+    )
+
+
+# ---------------------------- Account Deletions ----------------------------
+@router.get(
+    "/account_deletions/{user_id}",
+    response_model=BaseResponse,
+    status_code=200,
+    dependencies=[Depends(require_permission(Permission.MANAGE_USERS))]
+)
+async def account_deletion_progress(user_id: int, user_service: UserService = Depends(get_user_service)):
+    """
+    Return the progress of a background account deletion: "pending", "running",
+    "completed" or "failed", and the number of tasks deleted so far.
+    Progress is kept for a day after the last change.
+    """
+    progress = await user_service.get_deletion_progress(user_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="No account deletion in progress for this user")
+
+    return BaseResponse(
+        success=True,
+        message="Account deletion progress retrieved successfully",
+        http_status_code=200,
+        data={"user_id": user_id, **progress}
+    )
+
+
+# ---------------------------- Request Profiling ----------------------------
+@router.post(
+    "/profiles/token",
+    response_model=BaseResponse,
+    status_code=201,
+    dependencies=[Depends(require_permission(Permission.PROFILE_REQUESTS))]
+)
+async def create_profiling_token():
+    """
+    Issue a short-lived signed token. Requests sent with the header
+    `X-Profile-Token: <token>` are run under cProfile (subject to PROFILING_SAMPLE_RATE)
+    and their response carries `X-Profile-ID`.
+    """
+    try:
+        token, expires_at = create_profile_token()
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return BaseResponse(
+        success=True,
+        message="Profiling token created successfully",
+        http_status_code=201,
+        data={"header": "X-Profile-Token", "token": token, "expires_at": expires_at}
+    )
+
+
+@router.get(
+    "/profiles",
+    response_model=BaseResponse,
+    status_code=200,
+    dependencies=[Depends(require_permission(Permission.PROFILE_REQUESTS))]
+)
+async def list_profiles():
+    """
+    Return the metadata of the profiles stored by this host, newest first.
+    """
+    return BaseResponse(
+        success=True,
+        message="Profiles retrieved successfully",
+        http_status_code=200,
+        data={"profiles": profile_store.list()}
+    )
+
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(require_permission(Permission.PROFILE_REQUESTS))])
+async def download_profile(profile_id: str):
+    """
+    Download a profile as a .pstats file (open it with `python -m pstats` or snakeviz).
+    """
+    path = profile_store.pstats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.pstats")
+
+
+@router.get("/profiles/{profile_id}/summary", dependencies=[Depends(require_permission(Permission.PROFILE_REQUESTS))])
+async def profile_summary(profile_id: str, limit: int = 40):
+    """
+    Return the top functions of a profile by cumulative time, as plain text.
+    """
+    summary = profile_store.summary(profile_id, limit=limit)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return PlainTextResponse(summary)
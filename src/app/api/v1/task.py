@@ -3,11 +3,17 @@ import json
 import uuid
 
 # Import FastAPI modules for API routing and handling HTTP requests
-from fastapi import APIRouter, Depends, Request, HTTPException, Path
+from fastapi import APIRouter, Depends, Request, HTTPException, Path, Query, Response
+from fastapi.responses import StreamingResponse
+
+# Import the ETag helper of the compression middleware, the board event stream and settings
+from src.app.core.board_events import board_event_stream
+from src.app.core.compression import content_etag
+from src.app.core.config import settings
 
 # Import application-specific schemas and services
 from src.app.schemas.base_response import BaseResponse
-from src.app.schemas.task import TaskCreate, TaskChangeStatus, TaskUpdate
+from src.app.schemas.task import TaskCreate, TaskChangeStatus, TaskStatusEnum, TaskUpdate
 from src.app.services.task_service import TaskService, get_task_service
 
 # Initialize an API router for task-related operations
@@ -50,6 +56,106 @@ async def get_tasks(request: Request, task_service: TaskService = Depends(get_ta
         http_status_code=200,
         data=tasks_data
     )
+
+    # Serialized here to tag it with an ETag: clients revalidate with If-None-Match,
+    # and the compression middleware reuses the compressed body of an unchanged list
+    body = data_response.model_dump_json().encode()
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": content_etag(body), "Cache-Control": "private, no-cache"},
+    )
+
+
+# Endpoint streaming the changes of the authenticated user's board (declared before /{task_id})
+@router.get("/events")
+async def stream_board_events(request: Request):
+    """
+    This endpoint keeps a Server-Sent Events stream open and sends every change
+    made to the user's tasks (from any tab, device or worker) as a JSON event:
+    {"type": "task.created" | "task.updated" | "task.deleted" | "resync", ...}.
+    """
+
+    # Get user session from the request
+    user_data_session = request.state.session
+
+    # Check if the user is authenticated
+    if not user_data_session or not user_data_session["id"] or not isinstance(user_data_session["id"], int):
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    stream = board_event_stream(
+        int(user_data_session["id"]),
+        settings.BOARD_EVENTS_HEARTBEAT_SECONDS,
+        settings.BOARD_EVENTS_MAX_SECONDS,
+    )
+    # No buffering by proxies (X-Accel-Buffering for nginx), no caching
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+# Endpoint returning the changes of the authenticated user's board since a cursor (declared before /{task_id})
+@router.get("/changes", response_model=BaseResponse, status_code=200)
+async def get_task_changes(
+    request: Request,
+    task_service: TaskService = Depends(get_task_service),
+    since: int = Query(0, ge=0, description="Cursor of a previous response, or of the rendered board (0: everything)"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum number of changes returned"),
+):
+    """
+    This endpoint returns the tasks created, updated or deleted since a cursor, and the cursor
+    to send next time. Clients that already have the board only download what changed.
+    """
+
+    # Get user session from the request
+    user_data_session = request.state.session
+
+    # Check if the user is authenticated
+    if not user_data_session or not user_data_session["id"] or not isinstance(user_data_session["id"], int):
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    changes = await task_service.get_changes(int(user_data_session["id"]), since, limit)
+
+    data_response = BaseResponse(
+        success=True,
+        message="Task changes retrieved successfully",
+        http_status_code=200,
+        data=changes.model_dump(mode="json")
+    )
+    return data_response
+
+
+# Endpoint returning the rest of a board column (declared before /{task_id})
+@router.get("/columns/{status}", response_model=BaseResponse, status_code=200)
+async def get_column_page(
+    request: Request,
+    status: TaskStatusEnum,
+    task_service: TaskService = Depends(get_task_service),
+    after: int = Query(0, ge=0, description="ID of the last task the client has in the column (0: from the start)"),
+    limit: int = Query(200, ge=1, le=500, description="Maximum number of tasks returned"),
+):
+    """
+    This endpoint returns the tasks of one board column after a given task, in board order.
+    The board renders the first page of every column; main.js completes longer columns with it.
+    """
+
+    # Get user session from the request
+    user_data_session = request.state.session
+
+    # Check if the user is authenticated
+    if not user_data_session or not user_data_session["id"] or not isinstance(user_data_session["id"], int):
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    page = await task_service.get_column_page(int(user_data_session["id"]), status, after, limit)
+
+    data_response = BaseResponse(
+        success=True,
+        message="Column tasks retrieved successfully",
+        http_status_code=200,
+        data=page.model_dump(mode="json")
+    )
     return data_response
 
 
@@ -87,12 +193,18 @@ async def create_task(request: Request, task_data: TaskCreate, task_service: Tas
 @router.patch("/{task_id}", response_model=BaseResponse, status_code=200)
 async def update_task_status(
     request: Request,
+    response: Response,
     task_status: TaskChangeStatus,
     task_service: TaskService = Depends(get_task_service),
     task_id: int = Path(..., description="task ID")
 ):
     """
     This endpoint updates the status of a given task for the authenticated user.
+
+    With a `Prefer: respond-async` header (and TASK_STATUS_COALESCE_SECONDS above 0) the change
+    is only queued: the answer is 202 with an ordering token, and changes of the same task
+    within the window are written once, with the newest status. Boards get the written
+    status as a "task.updated" event.
     """
 
     # Get user session from the request
@@ -104,6 +216,22 @@ async def update_task_status(
 
     user_id = int(user_data_session["id"])
 
+    # Coalesced change, acknowledged before it is written
+    if "respond-async" in request.headers.get("prefer", "") and settings.TASK_STATUS_COALESCE_SECONDS > 0:
+        try:
+            token = await task_service.queue_task_status(task_id, task_status.status, user_id)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Task not found")
+
+        response.status_code = 202
+        response.headers["Preference-Applied"] = "respond-async"
+        return BaseResponse(
+            success=True,
+            message="Task status change accepted",
+            http_status_code=202,
+            data={"id": task_id, "status": task_status.status.value, "token": token}
+        )
+
     # Call the service to update the task status
     updated_task = await task_service.update_task_status(task_id, task_status.status, user_id)
 
@@ -157,6 +285,37 @@ async def get_task_by_id(
     return data_response
 
 
+# Endpoint returning the recorded changes of a task, newest first
+@router.get("/{task_id}/history", response_model=BaseResponse, status_code=200)
+async def get_task_history(
+    request: Request,
+    task_service: TaskService = Depends(get_task_service),
+    task_id: int = Path(..., description="task ID"),
+    before: int | None = Query(None, ge=1, description="`next_before` of the previous page (omit for the newest events)"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of events returned"),
+):
+    """
+    This endpoint returns who changed which field of a task and when, one page at a time.
+    Changes are written behind the request, so the newest may take about a second to appear.
+    """
+
+    user_data_session = request.state.session
+
+    # Check authentication
+    if not user_data_session or not user_data_session["id"] or not isinstance(user_data_session["id"], int):
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    history = await task_service.get_task_history(task_id, int(user_data_session["id"]), before, limit)
+
+    data_response = BaseResponse(
+        success=True,
+        message="Task history retrieved successfully",
+        http_status_code=200,
+        data=history.model_dump(mode="json")
+    )
+    return data_response
+
+
 # Endpoint to update an existing task's content (not only status)
 @router.post("/{task_id}", response_model=BaseResponse, status_code=200)
 async def update_task(
@@ -1,27 +1,65 @@
-# Import required modules from the Python standard library
-import os
-
 # Import FastAPI components for building API endpoints
-from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, Request, Depends
 
 # Import internal modules for user-related operations and response models
+from src.app.core.avatars import avatar_url
+from src.app.core.config import settings
+from src.app.core.images import PROFILE_IMAGE_VARIANTS, InvalidImageError
+from src.app.core.uploads import UploadError, receive_file
 from src.app.dtos.user_detail import UserDetail
 from src.app.schemas.base_response import BaseResponse
 from src.app.schemas.user import UserUpdate, UserPasswordUpdate
 from src.app.services.cache_service import CacheService, get_cache_service
+from src.app.services.profile_image_service import ProfileImageService, get_profile_image_service
 from src.app.services.user_service import UserService, get_user_service
 
-# Define the path where profile images will be stored
-UPLOAD_PROFILE_IMAGE_DIR = "src/app/static/img/profile_images/"
-
 # Create a router instance for user-related endpoints
 router = APIRouter()
 
 # ------------------------------ Upload Profile Image ------------------------------
-@router.post("/profile_image", response_model=BaseResponse, status_code=201)
-async def upload_profile_image(request: Request, file: UploadFile = File(...)):
+
+# The body is read by the endpoint itself (see receive_file), so document it for OpenAPI
+PROFILE_IMAGE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+def check_profile_image_part(filename: str, content_type: str) -> None:
+    """
+    Refuse anything but a PNG image, before its data is received.
+    """
+    # Check that the uploaded file is an image
+    if not content_type.startswith("image/"):
+        raise UploadError("Invalid file type. Only image files are allowed.")
+
+    # Only PNG format is allowed for profile images
+    if not filename.endswith('.png'):
+        raise UploadError("Invalid file type. Only PNG is allowed.")
+
+
+@router.post("/profile_image", response_model=BaseResponse, status_code=201, openapi_extra=PROFILE_IMAGE_REQUEST_BODY)
+async def upload_profile_image(
+    request: Request,
+    profile_image_service: ProfileImageService = Depends(get_profile_image_service),
+    user_service: UserService = Depends(get_user_service),
+    cache_service: CacheService = Depends(get_cache_service)
+):
     """
     Upload a new profile image for the authenticated user.
+    The file is streamed to disk (refused as soon as it passes the size limit),
+    then resized into the variants the pages use. Their URLs contain the new
+    content hash, returned in the response.
     """
 
     # Get session data from the request
@@ -31,39 +69,39 @@ async def upload_profile_image(request: Request, file: UploadFile = File(...)):
     if not user_data_session or not user_data_session["id"] or not isinstance(user_data_session["id"], int):
         raise HTTPException(status_code=401, detail="User not authenticated")
 
-    # Check that the uploaded file is an image
-    if not file.content_type.startswith("image/"):
-        raise HTTPException(status_code=400, detail="Invalid file type. Only image files are allowed.")
-
-    # Only PNG format is allowed for profile images
-    if not file.filename.endswith('.png'):
-        raise HTTPException(status_code=400, detail="Invalid file type. Only PNG is allowed.")
-
-    # Check that the file size is less than 5 MB
-    if file.size > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File size exceeds the limit of 5 MB.")
-
     # Get the user ID from the session
     user_id = int(user_data_session["id"])
 
-    # Create the directory path to save the profile image
-    user_profile_image_path = f"{UPLOAD_PROFILE_IMAGE_DIR}/{user_id}/"
+    try:
+        async with profile_image_service.staging_directory() as staging:
+            # Stream the file to the staging directory, checking its type and size as it arrives
+            upload = await receive_file(
+                request, "file", staging, settings.PROFILE_IMAGE_MAX_BYTES, check_part=check_profile_image_part
+            )
 
-    # Create the directory if it doesn't exist
-    os.makedirs(user_profile_image_path, exist_ok=True)
+            # Resize it into every variant, stored under their content hash
+            avatar_hash = await profile_image_service.save_profile_image(user_id, upload)
+    except UploadError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=str(exc))
+    except InvalidImageError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-    # Define the path and file name for the profile image
-    file_path = os.path.join(user_profile_image_path, "user.png")
+    # Point the user's avatar URLs at the new version, in the database and in the session
+    await user_service.update_avatar_hash(user_id, avatar_hash)
+    user_data_session["avatar_hash"] = avatar_hash
+    await cache_service.set_user_session_data(request.cookies.get("session_id"), UserDetail(**user_data_session))
 
-    # Save the uploaded image to the specified location
-    with open(file_path, "wb") as buffer:
-        buffer.write(await file.read())
+    # Only now that nothing points at them, delete the previous versions (in a background job)
+    await profile_image_service.schedule_removal_of_other_versions(user_id, keep=avatar_hash)
 
     return BaseResponse(
         success=True,
         message="Profile image uploaded successfully",
         http_status_code=201,
-        data=None
+        data={
+            "avatar_hash": avatar_hash,
+            "urls": {name: avatar_url(user_id, avatar_hash, name) for name in PROFILE_IMAGE_VARIANTS},
+        }
     )
 
 # ------------------------------ Update User Details ------------------------------
@@ -119,6 +157,9 @@ async def update_user_details(
         username=user_detail.username,
         email=user_detail.email.__str__(),
         is_admin=user_data_session.get("is_admin", False),
+        role_id=user_data_session.get("role_id"),
+        permissions=user_data_session.get("permissions", 0),
+        avatar_hash=user_data_session.get("avatar_hash"),
     )
 
     # Update session in cache
@@ -179,6 +220,7 @@ async def delete_user(
 ):
     """
     Delete the user account of the authenticated user.
+    The account is deactivated immediately; its tasks are removed by a background job.
     """
 
     user_data_session = request.state.session
@@ -190,7 +232,7 @@ async def delete_user(
     # Get the user ID
     user_id = int(user_data_session["id"])
 
-    # Delete the user from the database
+    # Deactivate the user now; the service enqueues the purge of their data
     await user_service.delete_user(user_id)
 
     # Remove session data from cache
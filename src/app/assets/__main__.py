@@ -0,0 +1,89 @@
+# Import standard libraries for the command line and exit codes
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Import application settings, the asset builder and the icon font subsetter
+from src.app.core.config import settings
+from src.app.assets.builder import brotli, build_assets
+from src.app.assets.icons import IconSubsetError, build_icon_subset, check_icon_subset
+from src.app.services.profile_image_service import ProfileImageService, backfill_profile_versions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.app.assets", description="Build the static assets.")
+    parser.add_argument("--source", default=settings.STATIC_DIR, help="Static directory (default: STATIC_DIR)")
+    parser.add_argument("--templates", default=settings.TEMPLATE_DIR, help="Template directory (default: TEMPLATE_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Write fingerprinted and precompressed assets and their manifest")
+    build.add_argument("--output", default=settings.STATIC_BUILD_DIR, help="Build directory (default: STATIC_BUILD_DIR)")
+    icons = commands.add_parser("icons", help="Regenerate the Font Awesome subset from the icons the templates use")
+    icons.add_argument("--check", action="store_true", help="Only check that every used icon is in the subset")
+    avatars = commands.add_parser("avatars", help="Move profile images saved before avatar URLs were versioned")
+    avatars.add_argument("--directory", default=settings.PROFILE_IMAGE_DIR, help="Profile images (default: PROFILE_IMAGE_DIR)")
+    return parser.parse_args(argv)
+
+
+async def record_avatar_hashes(versions: dict[int, str]) -> int:
+    """
+    Store the version of each converted profile image on its user.
+
+    :return: The number of users updated (images of deleted users are ignored).
+    """
+    # Imported here: the other commands do not need a database
+    import src.app.models.role  # noqa: F401
+    import src.app.models.task  # noqa: F401
+    import src.app.models.user  # noqa: F401
+    from src.app.core.database import SessionLocal, dispose_engine, init_engine
+    from src.app.repositories.user_repository import UserRepositoryImpl
+
+    init_engine()
+    try:
+        async with SessionLocal() as session:
+            repository = UserRepositoryImpl(session)
+            return sum([await repository.set_avatar_hash(user_id, version) for user_id, version in versions.items()])
+    finally:
+        await dispose_engine()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.command == "avatars":
+        versions = backfill_profile_versions(args.directory)
+        updated = asyncio.run(record_avatar_hashes(versions))
+        # The users point at the new versions: the files without a version can go
+        for user_id, version in versions.items():
+            ProfileImageService._remove_other_versions(Path(args.directory) / str(user_id), version)
+        print(f"Versioned the profile images of {len(versions)} users ({updated} updated in the database)")
+        print("Sessions opened before this keep showing the default avatar until the next login")
+        return 0
+
+    try:
+        if args.command == "icons" and not args.check:
+            for path, size in build_icon_subset(args.templates, args.source).items():
+                print(f"Wrote {path} ({size / 1024:.1f} KB)")
+            return 0
+
+        # Every build checks the subset, so a template using a new icon fails it
+        check_icon_subset(args.templates, args.source)
+    except IconSubsetError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+
+    if args.command == "build":
+        _, report = build_assets(args.source, args.output)
+        print(f"Built {report.files} files ({report.original_bytes / 1024:.0f} KB) into {args.output}")
+        print(f"gzip variants: {report.gzip_bytes / 1024:.0f} KB")
+        if brotli is None:
+            print("brotli is not installed: no .br variants written")
+        else:
+            print(f"brotli variants: {report.brotli_bytes / 1024:.0f} KB")
+    else:
+        print("Every icon used is in the subset.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# Import standard libraries for hashing, compression and file handling
+import gzip
+import hashlib
+import posixpath
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+
+# Import the manifest format shared with the static file handler
+from src.app.core.assets import ENCODING_SUFFIXES, MANIFEST_NAME, AssetManifest
+
+# brotli is optional: without it only gzip variants are written
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Length of the content hash put in file names (hex characters)
+HASH_LENGTH = 12
+
+# Directories that are not build inputs: profile images are uploaded at runtime
+EXCLUDED_DIRS = ("img/profile_images",)
+
+# Text formats worth compressing; images, woff and woff2 are compressed already
+COMPRESSIBLE_SUFFIXES = {".css", ".js", ".json", ".map", ".svg", ".txt", ".html", ".ttf", ".eot", ".otf", ".ico"}
+
+# A variant is kept only when it saves at least this fraction of the original size
+MIN_COMPRESSION_SAVING = 0.05
+
+# url(...) references inside stylesheets
+CSS_URL_RE = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+@dataclass
+class BuildReport:
+    """
+    Totals of one build, printed by the command line.
+    """
+
+    files: int = 0
+    original_bytes: int = 0
+    gzip_bytes: int = 0
+    brotli_bytes: int = 0
+
+
+def fingerprinted_name(relative_path: str, content: bytes) -> str:
+    """
+    Put a hash of the content before the extension: "css/style.css" -> "css/style.1a2b3c4d5e6f.css".
+    """
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    directory, name = posixpath.split(relative_path)
+    stem, dot, suffix = name.rpartition(".")
+    fingerprinted = f"{stem}.{digest}.{suffix}" if dot else f"{name}.{digest}"
+    return posixpath.join(directory, fingerprinted)
+
+
+def rewrite_css_urls(css: str, css_path: str, assets: dict[str, str]) -> str:
+    """
+    Point the relative url(...) references of a stylesheet to the fingerprinted files,
+    keeping any query string or fragment (e.g. font URLs like "x.eot?#iefix").
+    """
+    base = posixpath.dirname(css_path)
+
+    def replace(match: re.Match) -> str:
+        quote, url = match.group(1), match.group(2).strip()
+        if url.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+
+        path, suffix = re.match(r"([^?#]*)(.*)", url).groups()
+        target = assets.get(posixpath.normpath(posixpath.join(base, path)))
+        if target is None:
+            return match.group(0)
+
+        return f"url({quote}{posixpath.relpath(target, base)}{suffix}{quote})"
+
+    return CSS_URL_RE.sub(replace, css)
+
+
+def build_assets(source_dir: str | Path, output_dir: str | Path) -> tuple[AssetManifest, BuildReport]:
+    """
+    Copy every static file to output_dir under a content-hashed name, write gzip
+    (and brotli, when installed) variants of the text files, and write the manifest.
+
+    The build is written to a temporary directory first and then swapped in,
+    so a running server never sees a half-written build.
+
+    :param source_dir: The static directory (STATIC_DIR).
+    :param output_dir: Where the build goes (STATIC_BUILD_DIR).
+    :return: The manifest and the build totals.
+    """
+    source_dir, output_dir = Path(source_dir), Path(output_dir)
+    staging_dir = output_dir.with_name(output_dir.name + ".tmp")
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    staging_dir.mkdir(parents=True)
+
+    sources = sorted(
+        path.relative_to(source_dir).as_posix()
+        for path in source_dir.rglob("*")
+        if path.is_file() and not path.relative_to(source_dir).as_posix().startswith(EXCLUDED_DIRS)
+    )
+
+    # Stylesheets last, so the files they reference already have their final names
+    sources.sort(key=lambda name: name.endswith(".css"))
+
+    assets: dict[str, str] = {}
+    encodings: dict[str, tuple[str, ...]] = {}
+    report = BuildReport()
+
+    for relative_path in sources:
+        content = (source_dir / relative_path).read_bytes()
+        if relative_path.endswith(".css"):
+            content = rewrite_css_urls(content.decode("utf-8"), relative_path, assets).encode("utf-8")
+
+        target = fingerprinted_name(relative_path, content)
+        assets[relative_path] = target
+
+        target_path = staging_dir / target
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_bytes(content)
+
+        report.files += 1
+        report.original_bytes += len(content)
+
+        if Path(relative_path).suffix.lower() in COMPRESSIBLE_SUFFIXES:
+            written = _write_variants(target_path, content, report)
+            if written:
+                encodings[target] = written
+
+    manifest = AssetManifest(assets=assets, encodings=encodings)
+    (staging_dir / MANIFEST_NAME).write_text(manifest.to_json())
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    staging_dir.rename(output_dir)
+    return manifest, report
+
+
+def _write_variants(target_path: Path, content: bytes, report: BuildReport) -> tuple[str, ...]:
+    """
+    Write the precompressed siblings of a file; return the encodings written.
+    """
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+
+    written = []
+    for encoding, compressed in variants.items():
+        if len(compressed) > len(content) * (1 - MIN_COMPRESSION_SAVING):
+            continue
+
+        target_path.with_name(target_path.name + ENCODING_SUFFIXES[encoding]).write_bytes(compressed)
+        written.append(encoding)
+        if encoding == "gzip":
+            report.gzip_bytes += len(compressed)
+        else:
+            report.brotli_bytes += len(compressed)
+
+    # Same order as ENCODING_SUFFIXES (preference order)
+    return tuple(encoding for encoding in ENCODING_SUFFIXES if encoding in written)
@@ -0,0 +1,260 @@
+# Import standard libraries for scanning sources and writing the subset
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# fontTools is only needed to regenerate the subset (`python -m src.app.assets icons`), not to check it
+try:
+    from fontTools import subset as font_subset
+except ImportError:  # pragma: no cover - depends on the environment
+    font_subset = None
+
+# Font Awesome files, relative to the static directory
+FONT_AWESOME_DIR = "vendor/fontawesome-free"
+FULL_CSS = f"{FONT_AWESOME_DIR}/css/all.min.css"
+SUBSET_CSS = f"{FONT_AWESOME_DIR}/css/icons.min.css"
+
+# Fonts of each family, and the name of their subset (the brands font is only kept when `fab` is used)
+FONT_FILES = {
+    "fa-solid-900": "Font Awesome 5 Free",
+    "fa-regular-400": "Font Awesome 5 Free",
+    "fa-brands-400": "Font Awesome 5 Brands",
+}
+SUBSET_SUFFIX = ".subset.woff2"
+
+# Sources scanned for icon classes: templates, and the app's own scripts (not vendor/)
+SCANNED_PATTERNS = ("**/*.html",)
+SCANNED_SCRIPTS = ("js/**/*.js",)
+
+# fa-* class names in HTML/JS, and the brands style class
+ICON_CLASS_RE = re.compile(r"(?<![\w-])fa-([a-z0-9][a-z0-9-]*)")
+BRANDS_CLASS_RE = re.compile(r"(?<![\w-])fab(?![\w-])")
+
+# Icon rules of all.min.css: .fa-user:before{content:"\f007"}
+ICON_SELECTOR_RE = re.compile(r"^\.fa-([a-z0-9-]+):before$")
+CONTENT_RE = re.compile(r"""content:\s*['"]\\([0-9a-fA-F]{4,5})['"]""")
+
+# Glyphs other stylesheets draw with the icon font (e.g. sb-admin-2's collapse arrows)
+EXTRA_GLYPHS_RE = re.compile(r"Extra glyphs: ([0-9a-f ]*)\*/")
+
+
+class IconSubsetError(Exception):
+    """
+    Raised when the sources use an icon that is not in the subset (or not in Font Awesome).
+    """
+
+
+@dataclass
+class IconUsage:
+    """
+    Icons found in the sources, with where each one is used.
+    """
+
+    icons: dict[str, list[str]] = field(default_factory=dict)  # icon name -> ["templates/x.html:12", ...]
+    brands: bool = False                                        # Whether any element uses the `fab` style
+
+# ---------------------------- Parsing ----------------------------
+
+def split_css_blocks(css: str) -> list[tuple[str, str]]:
+    """
+    Split a stylesheet into its top-level (prelude, body) blocks.
+    Nested blocks such as @keyframes keep their whole body.
+    """
+    blocks, depth, start, prelude = [], 0, 0, ""
+    for index, char in enumerate(css):
+        if char == "{":
+            if depth == 0:
+                prelude, start = css[start:index].strip(), index + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:index]))
+                start = index + 1
+    return blocks
+
+
+def icon_codepoints(css: str) -> dict[str, int]:
+    """
+    Return every icon defined by a Font Awesome stylesheet, with its codepoint.
+    """
+    icons = {}
+    for prelude, body in split_css_blocks(css):
+        content = CONTENT_RE.search(body)
+        if content is None:
+            continue
+        for selector in prelude.split(","):
+            match = ICON_SELECTOR_RE.match(selector.strip())
+            if match:
+                icons[match.group(1)] = int(content.group(1), 16)
+    return icons
+
+
+def css_class_names(css: str) -> set[str]:
+    """
+    Return the fa-* classes a stylesheet styles in any way (icons, sizes, animations...).
+    """
+    return set(re.findall(r"\.fa-([a-z0-9-]+)", css))
+
+
+def font_face_families(css: str) -> set[str]:
+    """
+    Return the font families a stylesheet declares with @font-face.
+    """
+    return {
+        re.search(r'font-family:\s*"([^"]+)"', body).group(1)
+        for prelude, body in split_css_blocks(css)
+        if prelude == "@font-face"
+    }
+
+
+def extra_glyphs(static_dir: Path) -> set[int]:
+    """
+    Return the codepoints that the app's own stylesheets draw with the Font Awesome font.
+    """
+    codepoints = set()
+    for path in sorted((static_dir / "css").glob("*.css")):
+        for _, body in split_css_blocks(path.read_text(encoding="utf-8")):
+            if "Font Awesome" in body:
+                codepoints.update(int(value, 16) for value in CONTENT_RE.findall(body))
+    return codepoints
+
+
+def scan_sources(template_dir: Path, static_dir: Path) -> IconUsage:
+    """
+    Find the fa-* classes (and the `fab` style) used by the templates and the app's scripts.
+    Classes built at runtime (e.g. "fa-" + name in JavaScript) cannot be found: write them out in full.
+    """
+    paths = [path for pattern in SCANNED_PATTERNS for path in template_dir.glob(pattern)]
+    paths += [path for pattern in SCANNED_SCRIPTS for path in static_dir.glob(pattern)]
+
+    usage = IconUsage()
+    for path in sorted(paths):
+        for line_number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+            for name in ICON_CLASS_RE.findall(line):
+                usage.icons.setdefault(name, []).append(f"{path}:{line_number}")
+            if BRANDS_CLASS_RE.search(line):
+                usage.brands = True
+    return usage
+
+# ---------------------------- Check ----------------------------
+
+def check_icon_subset(template_dir: str | Path, static_dir: str | Path) -> None:
+    """
+    Fail when the sources use a fa-* class the subset stylesheet does not style, or
+    when the app's stylesheets need a glyph the subset was not built with.
+
+    :raises IconSubsetError: With every missing icon and where it is used.
+    """
+    template_dir, static_dir = Path(template_dir), Path(static_dir)
+    subset_css = (static_dir / SUBSET_CSS).read_text(encoding="utf-8")
+
+    styled = css_class_names(subset_css)
+    usage = scan_sources(template_dir, static_dir)
+    problems = [
+        f"fa-{name} (used in {', '.join(places)})"
+        for name, places in sorted(usage.icons.items())
+        if name not in styled
+    ]
+
+    match = EXTRA_GLYPHS_RE.search(subset_css)
+    built_glyphs = {int(value, 16) for value in match.group(1).split()} if match else set()
+    built_glyphs |= set(icon_codepoints(subset_css).values())
+    problems += [f"glyph \\{codepoint:x} (drawn by a stylesheet in css/)" for codepoint in sorted(extra_glyphs(static_dir) - built_glyphs)]
+
+    if usage.brands and "Font Awesome 5 Brands" not in font_face_families(subset_css):
+        problems.append("the `fab` style (brands font not in the subset)")
+
+    if problems:
+        raise IconSubsetError(
+            "Icons missing from the Font Awesome subset; run `python -m src.app.assets icons`:\n  - "
+            + "\n  - ".join(problems)
+        )
+
+# ---------------------------- Build ----------------------------
+
+def build_icon_subset(template_dir: str | Path, static_dir: str | Path) -> dict[str, int]:
+    """
+    Write the subset stylesheet (SUBSET_CSS) and one subset woff2 per Font Awesome font,
+    holding only the icons used by the sources.
+
+    :return: The size in bytes of every written file, by path relative to static_dir.
+    :raises IconSubsetError: When the sources use an fa-* class Font Awesome does not have.
+    """
+    if font_subset is None:
+        raise RuntimeError("fontTools is required to build the icon subset: pip install fonttools brotli")
+
+    template_dir, static_dir = Path(template_dir), Path(static_dir)
+    full_css = (static_dir / FULL_CSS).read_text(encoding="utf-8")
+
+    icons = icon_codepoints(full_css)
+    known_classes = css_class_names(full_css)
+    usage = scan_sources(template_dir, static_dir)
+
+    unknown = {name: places for name, places in usage.icons.items() if name not in known_classes}
+    if unknown:
+        raise IconSubsetError(
+            "Unknown Font Awesome classes:\n  - "
+            + "\n  - ".join(f"fa-{name} (used in {', '.join(places)})" for name, places in sorted(unknown.items()))
+        )
+
+    used_icons = {name for name in usage.icons if name in icons}
+    extra = extra_glyphs(static_dir) - {icons[name] for name in used_icons}
+    codepoints = {icons[name] for name in used_icons} | extra
+    families = {family for font, family in FONT_FILES.items() if usage.brands or "Brands" not in family}
+
+    written = {}
+    for font, family in FONT_FILES.items():
+        if family not in families:
+            continue
+        relative_path = f"{FONT_AWESOME_DIR}/webfonts/{font}{SUBSET_SUFFIX}"
+        _subset_font(static_dir / FONT_AWESOME_DIR / "webfonts" / f"{font}.ttf", static_dir / relative_path, codepoints)
+        written[relative_path] = (static_dir / relative_path).stat().st_size
+
+    css = _subset_stylesheet(full_css, used_icons, families)
+    header = (
+        "/* Font Awesome subset, generated by `python -m src.app.assets icons` (do not edit).\n"
+        f" * Extra glyphs: {' '.join(f'{codepoint:x}' for codepoint in sorted(extra))} */\n"
+    )
+    (static_dir / SUBSET_CSS).write_text(header + css, encoding="utf-8")
+    written[SUBSET_CSS] = (static_dir / SUBSET_CSS).stat().st_size
+    return written
+
+
+def _subset_font(source: Path, target: Path, codepoints: set[int]) -> None:
+    options = font_subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.drop_tables += ["FFTM"]  # FontForge timestamps, not needed by browsers
+
+    font = font_subset.load_font(str(source), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font_subset.save_font(font, str(target), options)
+
+
+def _subset_stylesheet(full_css: str, used_icons: set[str], families: set[str]) -> str:
+    """
+    Keep every rule of all.min.css except the icons that are not used, and point
+    each kept @font-face to its subset woff2 (supported by every current browser).
+    """
+    rules = []
+    for prelude, body in split_css_blocks(full_css):
+        if prelude == "@font-face":
+            if not font_face_families(f"@font-face{{{body}}}") & families:
+                continue
+            font = re.search(r"webfonts/([\w-]+)\.woff2", body).group(1)
+            descriptors = re.sub(r";?src:[^;}]*", "", body).strip(";")
+            rules.append(f'@font-face{{{descriptors};src:url(../webfonts/{font}{SUBSET_SUFFIX}) format("woff2")}}')
+            continue
+
+        selectors = [selector.strip() for selector in prelude.split(",")]
+        icon_names = [ICON_SELECTOR_RE.match(selector) for selector in selectors]
+        if CONTENT_RE.search(body) and all(icon_names):
+            selectors = [selector for selector, match in zip(selectors, icon_names) if match.group(1) in used_icons]
+            if not selectors:
+                continue
+
+        rules.append(f"{','.join(selectors)}{{{body}}}")
+    return "".join(rules)
@@ -0,0 +1,181 @@
+# Import standard libraries for file lookups, JSON and type hints
+import json
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Import Starlette's static file handling and response helpers
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Import application settings
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Name of the manifest written by `python -m src.app.assets build`
+MANIFEST_NAME = "manifest.json"
+
+# URL prefix the static files are mounted on (see create_app)
+STATIC_URL_PREFIX = "/static/"
+
+# Fingerprinted files never change: browsers may keep them for a year without asking again
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Other files (uploaded profile images, assets when no build was made) are revalidated with their ETag
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Precompressed variants, in order of preference, with their file suffix
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# ---------------------------- Manifest ----------------------------
+
+@dataclass(frozen=True)
+class AssetManifest:
+    """
+    Result of the asset build: the fingerprinted name of every source file,
+    and the precompressed variants written next to each fingerprinted file.
+    """
+
+    assets: dict[str, str] = field(default_factory=dict)               # "css/style.css" -> "css/style.1a2b3c4d5e6f.css"
+    encodings: dict[str, tuple[str, ...]] = field(default_factory=dict)  # fingerprinted path -> ("br", "gzip")
+
+    @classmethod
+    def load(cls, directory: str | Path) -> "AssetManifest":
+        """
+        Read the manifest of a build directory; an empty manifest when there was no build.
+        """
+        path = Path(directory) / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return cls()
+
+        return cls(
+            assets=data.get("assets", {}),
+            encodings={name: tuple(values) for name, values in data.get("encodings", {}).items()},
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({"assets": self.assets, "encodings": self.encodings}, indent=2, sort_keys=True)
+
+
+# Manifest of this process, read on first use
+_manifest: AssetManifest | None = None
+
+
+def get_manifest() -> AssetManifest:
+    """
+    Return the manifest of STATIC_BUILD_DIR, read once per process.
+    """
+    global _manifest
+    if _manifest is None:
+        _manifest = AssetManifest.load(settings.STATIC_BUILD_DIR)
+        if not _manifest.assets:
+            logger.info("No asset manifest in %s, serving static files unversioned", settings.STATIC_BUILD_DIR)
+    return _manifest
+
+
+def static_url(path: str) -> str:
+    """
+    Return the URL of a static file, e.g. static_url("css/style.css").
+    It points to the fingerprinted copy when the assets were built, and to the
+    file itself otherwise (development, or files created at runtime).
+    """
+    return STATIC_URL_PREFIX + get_manifest().assets.get(path, path)
+
+# ---------------------------- Content Negotiation ----------------------------
+
+def accepted_encodings(header: str | None) -> set[str]:
+    """
+    Return the content codings a client accepts, from its Accept-Encoding header.
+    Codings with q=0 are refused; "*" accepts every coding we can send.
+    """
+    accepted, refused = set(), set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        quality = params.strip()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            refused.add(coding)
+        else:
+            accepted.add(coding)
+
+    if "*" in accepted:
+        accepted |= set(ENCODING_SUFFIXES)
+    return accepted - refused
+
+# ---------------------------- Static File Handler ----------------------------
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the asset build first, then the source directory.
+
+    - Fingerprinted files get `Cache-Control: immutable`. When the client accepts it,
+      their brotli or gzip variant is sent as it was written by the build, so
+      nothing is compressed per request.
+    - Fingerprinted files are looked up from the manifest and a per-process stat cache,
+      without the thread pool hop StaticFiles makes for every request.
+    - Everything else is served as before, with `Cache-Control: no-cache` so
+      browsers revalidate it with its ETag.
+
+    Files are sent with FileResponse, which uses the server's zero-copy
+    `http.response.pathsend` extension when the server supports it.
+    """
+
+    def __init__(self, directory: str, build_directory: str | None = None, manifest: AssetManifest | None = None):
+        super().__init__(directory=directory)
+
+        self.build_directory = build_directory if build_directory and os.path.isdir(build_directory) else None
+        self.manifest = manifest if manifest is not None else (get_manifest() if self.build_directory else AssetManifest())
+        if self.build_directory:
+            self.all_directories.insert(0, self.build_directory)
+
+        # Fingerprinted path -> encodings available for it
+        self._fingerprinted = {name: self.manifest.encodings.get(name, ()) for name in self.manifest.assets.values()}
+
+        # Fingerprinted file (or variant) -> its stat; these files never change while the process runs
+        self._stat_cache: dict[str, os.stat_result] = {}
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        encodings = self._fingerprinted.get(path)
+        if encodings is None or self.build_directory is None or scope["method"] not in ("GET", "HEAD"):
+            response = await super().get_response(path, scope)
+            response.headers.setdefault("Cache-Control", REVALIDATE_CACHE_CONTROL)
+            return response
+
+        request_headers = Headers(scope=scope)
+        full_path = os.path.join(self.build_directory, path)
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL}
+
+        if encodings:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = accepted_encodings(request_headers.get("accept-encoding"))
+            for encoding in ENCODING_SUFFIXES:
+                if encoding in encodings and encoding in accepted:
+                    headers["Content-Encoding"] = encoding
+                    return self._fingerprinted_response(
+                        full_path + ENCODING_SUFFIXES[encoding], full_path, headers, request_headers
+                    )
+
+        return self._fingerprinted_response(full_path, full_path, headers, request_headers)
+
+    def _fingerprinted_response(self, file_path: str, original_path: str, headers: dict, request_headers: Headers) -> Response:
+        stat_result = self._stat_cache.get(file_path)
+        if stat_result is None:
+            stat_result = self._stat_cache[file_path] = os.stat(file_path)
+
+        # The media type is the one of the original file, not of its .br/.gz variant
+        media_type = mimetypes.guess_type(original_path)[0] or "application/octet-stream"
+        response = FileResponse(file_path, stat_result=stat_result, media_type=media_type, headers=headers)
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,288 @@
+# Import standard libraries for the queue, timestamps and logging
+import asyncio
+import dataclasses
+import datetime
+import logging
+import os
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Iterable
+
+# Import SQLAlchemy's insert and raw statements
+from sqlalchemy import insert, text
+
+# Import application settings, the engine, the audit table and metrics
+from src.app.core.config import settings
+from src.app.core.database import get_engine
+from src.app.core.metrics import (
+    AUDIT_EVENTS_DROPPED_TOTAL,
+    AUDIT_EVENTS_WRITTEN_TOTAL,
+    AUDIT_FLUSH_DURATION_SECONDS,
+    AUDIT_QUEUE_DEPTH,
+)
+from src.app.models.task import TaskEvent
+from src.app.schemas.task import TaskOut
+
+logger = logging.getLogger(__name__)
+
+# Delay before retrying a failed write, doubled after every attempt
+WRITE_RETRY_SECONDS = 0.5
+
+# Fields of TaskOut whose changes are recorded
+AUDITED_FIELDS = ("title", "description", "completed", "priority", "status", "due_date", "subject")
+
+# ---------------------------- Change Records ----------------------------
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TaskChangeRecord:
+    """
+    One row of task_events, waiting in the queue.
+    """
+
+    task_id: int
+    owner_id: int
+    actor_id: int | None
+    action: str
+    field: str | None = None
+    old_value: str | None = None
+    new_value: str | None = None
+    occurred_at: datetime.datetime = dataclasses.field(default_factory=datetime.datetime.utcnow)
+
+
+def _as_text(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def task_change_records(before: TaskOut | None, after: TaskOut | None, actor_id: int | None) -> list[TaskChangeRecord]:
+    """
+    Describe a committed change to a task as audit records.
+
+    :param before: The task before the change (None when it was created).
+    :param after: The task after the change (None when it was deleted).
+    :param actor_id: User who made the change.
+    :return: One record for a creation or a deletion, one per changed field for an update.
+    """
+    task = after or before
+    if before is None:
+        return [TaskChangeRecord(task.id, task.owner_id, actor_id, "created", new_value=task.title)]
+    if after is None:
+        return [TaskChangeRecord(task.id, task.owner_id, actor_id, "deleted", old_value=task.title)]
+
+    now = datetime.datetime.utcnow()
+    records = []
+    for name in AUDITED_FIELDS:
+        old_value, new_value = _as_text(getattr(before, name)), _as_text(getattr(after, name))
+        if old_value != new_value:
+            records.append(TaskChangeRecord(
+                task.id, task.owner_id, actor_id, "updated", name, old_value, new_value, occurred_at=now
+            ))
+    return records
+
+# ---------------------------- Writing ----------------------------
+
+# Monthly partitions this process knows exist (PostgreSQL)
+_known_partitions: set[str] = set()
+
+
+def month_partition(month: datetime.date) -> tuple[str, str]:
+    """
+    Name and CREATE statement of the task_events partition holding a month
+    (used by migration 0006 too).
+
+    :param month: Any day of the month.
+    """
+    month = month.replace(day=1)
+    next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+    name = f"task_events_{month:%Y_%m}"
+    return name, (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF task_events "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+    )
+
+
+async def insert_task_events(records: list[TaskChangeRecord]) -> None:
+    """
+    Write a batch of records in one transaction. SQLAlchemy sends the rows as
+    multi-row INSERT statements; on PostgreSQL the monthly partitions the batch
+    needs are created first.
+    """
+    partitions = {}
+    async with get_engine().begin() as conn:
+        if conn.dialect.name == "postgresql":
+            partitions = dict(month_partition(record.occurred_at.date()) for record in records)
+            for name, ddl in partitions.items():
+                if name not in _known_partitions:
+                    await conn.execute(text(ddl))
+
+        await conn.execute(insert(TaskEvent.__table__), [dataclasses.asdict(record) for record in records])
+
+    # Only once committed: a failed INSERT rolls the CREATE TABLE back, and the retry must run it again
+    _known_partitions.update(partitions)
+
+# ---------------------------- Audit Log ----------------------------
+
+class TaskAuditLog:
+    """
+    Write-behind log of task changes.
+
+    Repositories hand their records to record() after committing; a background task
+    (run) inserts them in batches of up to AUDIT_BATCH_SIZE, at most AUDIT_FLUSH_SECONDS
+    after the first record of the batch arrived. The request never waits for the INSERT.
+
+    - Backpressure: the queue holds AUDIT_QUEUE_SIZE records. When it is full (the
+      database is slow or down), record() waits up to AUDIT_ENQUEUE_TIMEOUT_SECONDS
+      for room, then drops the record and counts it.
+    - Failed writes are retried AUDIT_WRITE_ATTEMPTS times, then the batch is dropped and counted.
+    - Crash loss: records are only in memory until written. A worker that dies loses
+      at most AUDIT_QUEUE_SIZE + AUDIT_BATCH_SIZE records, normally the last
+      AUDIT_FLUSH_SECONDS of changes. A normal shutdown writes everything first (drain).
+    """
+
+    def __init__(
+        self,
+        queue_size: int,
+        batch_size: int,
+        flush_seconds: float,
+        enqueue_timeout: float,
+        writer: Callable[[list[TaskChangeRecord]], Awaitable[None]] = insert_task_events,
+    ):
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.enqueue_timeout = enqueue_timeout
+        self.writer = writer
+        # Records taken from the queue and not written yet
+        self._pending = 0
+        self._queue: asyncio.Queue[TaskChangeRecord] | None = None
+        self._queue_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def queue(self) -> asyncio.Queue[TaskChangeRecord]:
+        # One queue per event loop: a worker runs a single loop, tests and scripts may start several
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._queue_loop is not loop:
+            self._queue, self._queue_loop = asyncio.Queue(maxsize=self.queue_size), loop
+        return self._queue
+
+    async def record(self, records: Iterable[TaskChangeRecord]) -> int:
+        """
+        Queue records for writing. A call waits at most enqueue_timeout in total:
+        once it timed out, the rest of its records are dropped without waiting.
+
+        :return: The number of records dropped because the queue stayed full.
+        """
+        dropped = 0
+        for record in records:
+            try:
+                self.queue.put_nowait(record)
+                continue
+            except asyncio.QueueFull:
+                if dropped:
+                    dropped += 1
+                    continue
+
+            # Full: slow this request down rather than grow without bound
+            try:
+                await asyncio.wait_for(self.queue.put(record), self.enqueue_timeout)
+            except TimeoutError:
+                dropped += 1
+
+        if dropped:
+            AUDIT_EVENTS_DROPPED_TOTAL.inc(dropped, reason="queue_full")
+            logger.warning("Audit queue full, dropped %d task change records", dropped)
+        return dropped
+
+    async def next_batch(self) -> list[TaskChangeRecord]:
+        """
+        Wait for a record, then collect more until the batch is full or flush_seconds have passed.
+        """
+        batch = [await self.queue.get()]
+        self._pending = 1
+        deadline = time.monotonic() + self.flush_seconds
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except TimeoutError:
+                    break
+            self._pending = len(batch)
+
+        AUDIT_QUEUE_DEPTH.set(self.queue.qsize(), worker=os.getpid())
+        return batch
+
+    async def write(self, batch: list[TaskChangeRecord]) -> bool:
+        """
+        Write a batch, retrying with a short backoff; drop it after the last attempt.
+
+        :return: Whether the batch was written.
+        """
+        try:
+            for attempt in range(1, settings.AUDIT_WRITE_ATTEMPTS + 1):
+                started_at = time.perf_counter()
+                try:
+                    await self.writer(batch)
+                except Exception as exc:
+                    if attempt == settings.AUDIT_WRITE_ATTEMPTS:
+                        logger.error("Dropping %d task change records: %s", len(batch), exc)
+                        AUDIT_EVENTS_DROPPED_TOTAL.inc(len(batch), reason="write_failed")
+                        return False
+                    logger.warning("Could not write %d task change records, retrying: %s", len(batch), exc)
+                    await asyncio.sleep(WRITE_RETRY_SECONDS * 2 ** (attempt - 1))
+                    continue
+
+                AUDIT_FLUSH_DURATION_SECONDS.observe(time.perf_counter() - started_at)
+                AUDIT_EVENTS_WRITTEN_TOTAL.inc(len(batch))
+                return True
+        finally:
+            self._pending = 0
+
+    async def run(self) -> None:
+        """
+        Write queued records until cancelled (started by the app lifespan in every worker).
+        """
+        while True:
+            batch = await self.next_batch()
+            await self.write(batch)
+
+    async def drain(self, timeout_seconds: float) -> int:
+        """
+        Wait until every queued record is written, or until the timeout expires.
+        Called at shutdown, before the writer task is cancelled.
+
+        :return: The number of records still not written.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        while (self.queue.qsize() or self._pending) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+        left = self.queue.qsize() + self._pending
+        if left:
+            logger.warning("Shutting down with %d task change records not written", left)
+        return left
+
+
+# Audit log of this process
+audit_log = TaskAuditLog(
+    queue_size=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_seconds=settings.AUDIT_FLUSH_SECONDS,
+    enqueue_timeout=settings.AUDIT_ENQUEUE_TIMEOUT_SECONDS,
+)
+
+
+def get_audit_log() -> TaskAuditLog:
+    return audit_log
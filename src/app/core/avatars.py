@@ -0,0 +1,139 @@
+# Import standard libraries for hashing, file lookups and the admission window
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+# Import anyio to touch the disk off the event loop, and Starlette's responses
+import anyio.to_thread
+from starlette.responses import FileResponse, Response
+
+# Import application settings, static URLs, the variant list, metrics and the in-process cache
+from src.app.core.assets import IMMUTABLE_CACHE_CONTROL, static_url
+from src.app.core.config import settings
+from src.app.core.images import PROFILE_IMAGE_VARIANTS
+from src.app.core.metrics import AVATAR_REQUESTS_TOTAL
+from src.app.repositories.cache_repository import MemoryCacheRepository
+
+# URL prefix of the avatar route (see web/avatars.py)
+AVATAR_URL_PREFIX = "/avatars/"
+
+# Default avatar, in the static files (fingerprinted and cached like any other asset)
+DEFAULT_AVATAR_DIR = "img/avatar"
+
+# Versions are the first hex characters of a blake2b hash of the variants
+VERSION_LENGTH = 16
+VERSION_RE = re.compile(rf"^[0-9a-f]{{{VERSION_LENGTH}}}$")
+
+# Content type of each variant, by extension
+MEDIA_TYPES = {".png": "image/png", ".webp": "image/webp"}
+
+# Bound on the number of avatar files kept in memory (AVATAR_CACHE_MAX_BYTES bounds their size)
+CACHE_MAX_ENTRIES = 20_000
+
+# Files requested once in this window are not kept in memory yet; a second request admits them
+ADMISSION_WINDOW_ENTRIES = 20_000
+
+# ---------------------------- URLs and Versions ----------------------------
+
+def avatar_url(user_id: int, avatar_hash: str | None, variant: str = "thumb.webp") -> str:
+    """
+    Return the URL of a variant of a user's profile image, e.g.
+    /avatars/7/3f2a9c0d1b4e5f60/thumb.webp. The hash changes with every new upload,
+    so the URL can be cached forever; users without an image get the default avatar.
+    """
+    if not avatar_hash:
+        return static_url(f"{DEFAULT_AVATAR_DIR}/{variant}")
+    return f"{AVATAR_URL_PREFIX}{user_id}/{avatar_hash}/{variant}"
+
+
+def content_version(directory: Path) -> str:
+    """
+    Return the version of a set of variants: a hash of every PROFILE_IMAGE_VARIANTS file of the directory.
+    """
+    digest = hashlib.blake2b(digest_size=VERSION_LENGTH // 2)
+    for name in PROFILE_IMAGE_VARIANTS:
+        digest.update((directory / name).read_bytes())
+    return digest.hexdigest()
+
+
+def is_avatar_path(version: str, variant: str) -> bool:
+    """
+    Check the parts of an avatar URL before they are used as a path.
+    """
+    return bool(VERSION_RE.match(version)) and variant in PROFILE_IMAGE_VARIANTS
+
+# ---------------------------- Avatar Store ----------------------------
+
+class AvatarStore:
+    """
+    Serves the files of <directory>/<user_id>/<version>/<variant>.
+
+    A path never changes content (a new upload gets a new version), so responses
+    are immutable and a copy in memory never needs invalidating. Hot files are
+    answered from a bounded LRU without touching the disk. A file enters it on
+    its second request within the admission window, so one-off requests do not
+    push hot avatars out. Other files are sent with FileResponse, which uses
+    sendfile / http.response.pathsend where the server supports it.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.cache = MemoryCacheRepository(CACHE_MAX_ENTRIES, max_bytes)
+        # Files requested once, oldest first
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    async def response(self, user_id: int, version: str, variant: str) -> Response | None:
+        """
+        Return the response for an avatar file, or None if it does not exist.
+        The caller must check the path with is_avatar_path first.
+        """
+        key = f"{user_id}/{version}/{variant}"
+        headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": f'"{version}-{variant}"'}
+        media_type = MEDIA_TYPES[Path(variant).suffix]
+
+        body = self.cache.get_raw(key)
+        if body is not None:
+            AVATAR_REQUESTS_TOTAL.inc(source="memory")
+            return Response(body, media_type=media_type, headers=headers)
+
+        path = self.directory / key
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, path)
+        except FileNotFoundError:
+            AVATAR_REQUESTS_TOTAL.inc(source="missing")
+            return None
+
+        if self._admit(key):
+            body = await anyio.to_thread.run_sync(path.read_bytes)
+            self.cache.set_raw(key, body, None)
+            AVATAR_REQUESTS_TOTAL.inc(source="memory")
+            return Response(body, media_type=media_type, headers=headers)
+
+        AVATAR_REQUESTS_TOTAL.inc(source="file")
+        return FileResponse(path, stat_result=stat_result, media_type=media_type, headers=headers)
+
+    def _admit(self, key: str) -> bool:
+        if key in self._seen:
+            del self._seen[key]
+            return True
+
+        self._seen[key] = None
+        if len(self._seen) > ADMISSION_WINDOW_ENTRIES:
+            self._seen.popitem(last=False)
+        return False
+
+
+# Store of this process, created on first use
+_store: AvatarStore | None = None
+
+
+def get_avatar_store() -> AvatarStore:
+    """
+    Return the avatar store of this process.
+    """
+    global _store
+    if _store is None:
+        _store = AvatarStore(settings.PROFILE_IMAGE_DIR, settings.AVATAR_CACHE_MAX_BYTES)
+    return _store
@@ -0,0 +1,196 @@
+# Import standard libraries for queues, JSON, logging and timestamps
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator
+
+# Import the Redis client type used for pub/sub
+from redis.asyncio import Redis
+
+# Import application settings, and metrics for open streams, delivery latency and dropped events
+from src.app.core.config import settings
+from src.app.core.metrics import (
+    BOARD_EVENT_CONNECTIONS,
+    BOARD_EVENT_FANOUT_SECONDS,
+    BOARD_EVENTS_DROPPED_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Board events of a user are published on "board:<owner id>"; workers subscribe to the pattern
+BOARD_CHANNEL_PREFIX = "board:"
+BOARD_CHANNEL_PATTERN = f"{BOARD_CHANNEL_PREFIX}*"
+
+# Seconds to wait before re-subscribing after the Redis connection drops
+LISTENER_RETRY_SECONDS = 5
+
+# Sent to a stream whose client fell behind: it reloads the board instead of applying events
+RESYNC_EVENT = json.dumps({"type": "resync"})
+
+# ---------------------------- Events ----------------------------
+
+def board_channel(owner_id: int) -> str:
+    return f"{BOARD_CHANNEL_PREFIX}{owner_id}"
+
+
+def encode_board_event(event_type: str, task: dict[str, Any] | None = None, task_id: int | None = None) -> str:
+    """
+    Serialize a board event once; the same string is sent to every stream of the board.
+
+    :param event_type: "task.created", "task.updated" or "task.deleted".
+    :param task: The task as JSON-compatible data (created and updated tasks).
+    :param task_id: ID of the task (deleted tasks).
+    :return: The JSON message, stamped with its publication time to measure fan-out latency.
+    """
+    return json.dumps({
+        "type": event_type,
+        "task_id": task_id if task_id is not None else task["id"],
+        "task": task,
+        "published_at": time.time(),
+    })
+
+# ---------------------------- Hub ----------------------------
+
+class BoardEventHub:
+    """
+    Delivers board events to the streams open in this worker.
+
+    Each stream gets a bounded queue. Events are published to Redis, and every worker
+    receives them through a single pattern subscription (listen_for_board_events),
+    so a change made through any worker reaches the streams of every worker.
+    Without Redis (CACHE_BACKEND=memory, one worker) publishing delivers locally.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        # Open streams by board owner
+        self._queues: dict[int, set[asyncio.Queue]] = {}
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._queues.values())
+
+    def subscribe(self, owner_id: int) -> asyncio.Queue:
+        """
+        Register a stream for a board and return the queue its events are put in.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._queues.setdefault(owner_id, set()).add(queue)
+        BOARD_EVENT_CONNECTIONS.set(self.connection_count, worker=os.getpid())
+        return queue
+
+    def unsubscribe(self, owner_id: int, queue: asyncio.Queue) -> None:
+        queues = self._queues.get(owner_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[owner_id]
+        BOARD_EVENT_CONNECTIONS.set(self.connection_count, worker=os.getpid())
+
+    def deliver(self, owner_id: int, message: str) -> None:
+        """
+        Put an event in the queue of every stream of a board open in this worker.
+        """
+        queues = self._queues.get(owner_id)
+        if not queues:
+            return
+
+        published_at = json.loads(message).get("published_at", time.time())
+        for queue in queues:
+            try:
+                queue.put_nowait((published_at, message))
+            except asyncio.QueueFull:
+                # The client is not reading: drop what it has not received and make it reload
+                BOARD_EVENTS_DROPPED_TOTAL.inc(queue.qsize())
+                _clear(queue)
+                queue.put_nowait((published_at, RESYNC_EVENT))
+
+
+def _clear(queue: asyncio.Queue) -> None:
+    while not queue.empty():
+        queue.get_nowait()
+
+
+# Hub of this process
+hub = BoardEventHub(settings.BOARD_EVENTS_QUEUE_SIZE)
+
+# ---------------------------- Publishing ----------------------------
+
+async def publish_board_event(redis_client: Redis | None, owner_id: int, message: str) -> None:
+    """
+    Send an event to every open stream of a board, in every worker.
+    A failed notification is logged: the change itself is already committed,
+    and clients catch up when their stream reconnects.
+
+    :param redis_client: Redis client, or None to deliver in this worker only.
+    :param owner_id: Owner of the board that changed.
+    :param message: Event built with encode_board_event.
+    """
+    if redis_client is None:
+        hub.deliver(owner_id, message)
+        return
+
+    try:
+        await redis_client.publish(board_channel(owner_id), message)
+    except Exception:
+        logger.exception("Could not publish a board event for user %s", owner_id)
+
+
+async def listen_for_board_events(redis_client: Redis) -> None:
+    """
+    Subscribe to the board events of every user and hand them to this worker's hub.
+    Events of boards without a stream in this worker are dropped on the channel name,
+    without being parsed. Runs until cancelled; reconnects if the Redis connection drops.
+
+    :param redis_client: Redis client used for the subscription.
+    """
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.psubscribe(BOARD_CHANNEL_PATTERN)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "pmessage":
+                        continue
+
+                    owner_id = message["channel"].removeprefix(BOARD_CHANNEL_PREFIX)
+                    if owner_id.isdigit():
+                        hub.deliver(int(owner_id), message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Board event listener failed, retrying in %ds", LISTENER_RETRY_SECONDS)
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+# ---------------------------- Server-Sent Events ----------------------------
+
+async def board_event_stream(owner_id: int, heartbeat_seconds: float, max_seconds: float) -> AsyncIterator[str]:
+    """
+    Yield the text/event-stream body of one client: its board's events, as they happen.
+
+    A comment is sent when nothing happened for heartbeat_seconds, so proxies keep
+    the connection open. The stream ends after max_seconds: the browser reconnects,
+    which checks the session again and spreads streams over the workers.
+
+    :param owner_id: Owner of the board the client shows.
+    """
+    queue = hub.subscribe(owner_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    try:
+        # Reconnect quickly after the stream ends
+        yield "retry: 2000\n\n"
+
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                published_at, message = await asyncio.wait_for(queue.get(), min(heartbeat_seconds, remaining))
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            BOARD_EVENT_FANOUT_SECONDS.observe(time.time() - published_at)
+            yield f"data: {message}\n\n"
+    finally:
+        hub.unsubscribe(owner_id, queue)
@@ -4,11 +4,41 @@ from redis.asyncio import Redis
 # Import application settings containing the Redis connection URL
 from src.app.core.config import settings
 
-# ---------------------------- Redis Client Initialization ----------------------------
+# ---------------------------- Redis Client Lifecycle ----------------------------
+#
+# Like the database engine, the client (and its connection pool) is created per
+# process by the app lifespan or on first use, never at import time, so forked
+# workers do not share sockets.
 
-# Initialize a global Redis client using the connection URL from settings.
-# The parameter decode_responses=True ensures that Redis responses are returned as strings instead of bytes.
-redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Redis client of this process, or None until init_redis() is called
+redis: Redis | None = None
+
+
+def init_redis() -> Redis:
+    """
+    Create this process' Redis client if needed.
+    The parameter decode_responses=True ensures that Redis responses are returned as strings instead of bytes.
+    """
+    global redis
+    if redis is None:
+        redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return redis
+
+
+async def close_redis() -> None:
+    """
+    Close this process' Redis connection pool and forget the client.
+    """
+    global redis
+    if redis is not None:
+        await redis.aclose()
+        redis = None
+
+def redis_enabled() -> bool:
+    """
+    Whether this deployment uses Redis: every cache backend except "memory" does.
+    """
+    return settings.CACHE_BACKEND != "memory"
 
 # ---------------------------- Dependency Injection ----------------------------
 
@@ -17,4 +47,4 @@ async def get_redis() -> Redis:
     This function is used as a dependency to provide the Redis instance.
     It allows FastAPI to inject the Redis connection wherever it is needed.
     """
-    return redis
\ No newline at end of file
+    return redis if redis is not None else init_redis()
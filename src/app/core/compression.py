@@ -0,0 +1,365 @@
+# Import standard libraries for hashing, compression and type hints
+import hashlib
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Import anyio to compress large bodies off the event loop, and Starlette's header helpers
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+# Import application settings, content negotiation, metrics and the in-process cache
+from src.app.core.assets import accepted_encodings
+from src.app.core.config import settings
+from src.app.core.metrics import HTTP_COMPRESSED_RESPONSES_TOTAL, HTTP_COMPRESSION_SAVED_BYTES_TOTAL
+from src.app.repositories.cache_repository import MemoryCacheRepository
+
+# brotli and zstandard are optional: without them, responses are gzip-compressed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Content types worth compressing (images, fonts and archives are compressed already)
+COMPRESSIBLE_TYPES = frozenset({
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+})
+
+# Levels tuned for responses compressed on every request: close to the best ratio at a fraction of the CPU
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# Bodies are buffered up to this size to be compressed in one go; longer ones are compressed as they stream
+BUFFER_MAX_BYTES = 1024 * 1024
+
+# Bound on the number of compressed bodies kept per worker (COMPRESSION_CACHE_MAX_BYTES bounds their size)
+CACHE_MAX_ENTRIES = 2000
+
+# ---------------------------- ETags ----------------------------
+
+def content_etag(body: bytes) -> str:
+    """
+    Return a strong ETag derived from the body, e.g. for JSON responses.
+    Identical bodies get the same ETag, so their compressed copy is cached once.
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """
+    Return the ETag of a compressed representation: "abc" -> "abc-gzip".
+    Each representation needs its own ETag; a cache must not mix them up.
+    """
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+def _opaque_tag(tag: str) -> str:
+    # Compare tags without the weak prefix, the quotes, or our encoding suffix
+    tag = tag.strip().removeprefix("W/").strip('"')
+    for encoding in ENCODERS:
+        suffix = f"-{encoding}"
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Return True when an If-None-Match header names the ETag (in any of its encodings).
+    """
+    if if_none_match.strip() == "*":
+        return True
+    target = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == target for tag in if_none_match.split(","))
+
+# ---------------------------- Encoders ----------------------------
+
+@dataclass(frozen=True)
+class Encoder:
+    """
+    A content coding: one-shot compression for buffered bodies, and a streaming
+    compressor (an object with compress(chunk) and flush()) for long ones.
+    """
+
+    name: str
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], Any]
+
+
+class _BrotliStream:
+    # Gives brotli's Compressor the compress/flush interface of zlib and zstandard
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self._compressor.process(chunk)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _gzip_stream():
+    # wbits=31: gzip container (header and CRC) around deflate
+    return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+
+def _gzip_compress(body: bytes) -> bytes:
+    compressor = _gzip_stream()
+    return compressor.compress(body) + compressor.flush()
+
+
+def _available_encoders() -> dict[str, Encoder]:
+    # In order of preference: zstd and brotli beat gzip on ratio and speed at these levels
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = Encoder(
+            name="zstd",
+            compress=zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress,
+            stream=lambda: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj(),
+        )
+    if brotli is not None:
+        encoders["br"] = Encoder(
+            name="br",
+            compress=lambda body: brotli.compress(body, quality=BROTLI_QUALITY),
+            stream=_BrotliStream,
+        )
+    encoders["gzip"] = Encoder(name="gzip", compress=_gzip_compress, stream=_gzip_stream)
+    return encoders
+
+
+ENCODERS = _available_encoders()
+
+
+def choose_encoder(accept_encoding: str | None) -> Encoder | None:
+    """
+    Return the preferred encoder among those the client accepts, or None.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for name, encoder in ENCODERS.items():
+        if name in accepted:
+            return encoder
+    return None
+
+# ---------------------------- ASGI Middleware ----------------------------
+
+class CompressionMiddleware:
+    """
+    Compresses text responses (HTML, JSON, CSS, JS) with zstd, brotli or gzip,
+    whichever the client accepts first in that order.
+
+    - Responses under COMPRESSION_MIN_BYTES, or that are already encoded (the
+      precompressed static files), marked no-transform, or streamed as
+      server-sent events are sent as they are.
+    - Bodies over COMPRESSION_THREAD_MIN_BYTES are compressed in a worker thread,
+      so a large board page does not block the other requests of the worker.
+    - Responses with an ETag (the task list, pre-rendered pages, static files)
+      keep their compressed body in memory: a repeat hit skips compression.
+      A GET whose If-None-Match matches the ETag gets a 304 without a body.
+
+    It sits right around the routes, so the middleware functions outside it
+    move the smaller, compressed body.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int | None = None,
+        thread_minimum_size: int | None = None,
+        cache: MemoryCacheRepository | None = None,
+    ):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+        self.thread_minimum_size = (
+            settings.COMPRESSION_THREAD_MIN_BYTES if thread_minimum_size is None else thread_minimum_size
+        )
+        self.cache = cache or MemoryCacheRepository(CACHE_MAX_ENTRIES, settings.COMPRESSION_CACHE_MAX_BYTES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        # HEAD responses have no body to compress, only a Content-Length to keep
+        encoder = choose_encoder(headers.get("accept-encoding")) if scope["method"] == "GET" else None
+        if_none_match = headers.get("if-none-match") if scope["method"] in ("GET", "HEAD") else None
+
+        # Nothing to do for this request: no overhead beyond the header lookups
+        if encoder is None and if_none_match is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, scope, send, encoder, if_none_match)
+        await self.app(scope, receive, responder.send)
+
+    async def compress(self, encoder: Encoder, body: bytes) -> bytes:
+        """
+        Compress a whole body, in a worker thread when it is large.
+        """
+        if len(body) >= self.thread_minimum_size:
+            return await anyio.to_thread.run_sync(encoder.compress, body)
+        return encoder.compress(body)
+
+
+class _CompressingResponder:
+    """
+    Intercepts the messages of one response: passes them through, answers 304,
+    or buffers the body and sends it compressed.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoder: Encoder | None, if_none_match: str | None):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = send
+        self.encoder = encoder
+        self.if_none_match = if_none_match
+
+        self.start_message: dict | None = None
+        self.mode = "undecided"          # "passthrough", "buffer", "stream" or "done"
+        self.buffer = bytearray()
+        self.stream = None               # Streaming compressor, once the body outgrew the buffer
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            await self._start(message)
+        elif message["type"] == "http.response.body" and self.mode == "buffer":
+            await self._buffer(message)
+        elif message["type"] == "http.response.body" and self.mode == "stream":
+            await self._stream(message)
+        elif self.mode != "done":
+            await self.downstream(message)
+
+    # ---------------------------- Response Start ----------------------------
+
+    async def _start(self, message) -> None:
+        headers = MutableHeaders(raw=message["headers"])
+        etag = headers.get("etag")
+
+        # Conditional GET: the client has this representation already
+        if self.if_none_match and etag and message["status"] == 200 and etag_matches(self.if_none_match, etag):
+            await self._not_modified(headers, etag)
+            return
+
+        if self.encoder is None or not self._compressible(message["status"], headers):
+            self.mode = "passthrough"
+            await self.downstream(message)
+            return
+
+        self.start_message = message
+        self.mode = "buffer"
+
+    def _compressible(self, status: int, headers: MutableHeaders) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+            return False
+        content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return content_type in COMPRESSIBLE_TYPES
+
+    async def _not_modified(self, headers: MutableHeaders, etag: str) -> None:
+        # Same headers without the body ones; the ETag names the representation this client would get
+        if self.encoder is not None and self._compressible(200, headers):
+            headers["etag"] = encoded_etag(etag, self.encoder.name)
+            headers.add_vary_header("Accept-Encoding")
+        for name in ("content-length", "content-type", "content-encoding"):
+            del headers[name]
+
+        self.mode = "done"
+        await self.downstream({"type": "http.response.start", "status": 304, "headers": headers.raw})
+        await self.downstream({"type": "http.response.body", "body": b"", "more_body": False})
+
+    # ---------------------------- Buffered Bodies ----------------------------
+
+    async def _buffer(self, message) -> None:
+        self.buffer += message.get("body", b"")
+        if not message.get("more_body", False):
+            await self._send_whole_body(bytes(self.buffer))
+        elif len(self.buffer) > BUFFER_MAX_BYTES:
+            await self._start_stream()
+
+    async def _send_whole_body(self, body: bytes) -> None:
+        self.mode = "done"
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        if len(body) < self.middleware.minimum_size:
+            await self._send_uncompressed(body)
+            return
+
+        encoder = self.encoder
+        etag = headers.get("etag")
+        cache_key = f"compressed:{encoder.name}:{self.scope['path']}:{etag}" if etag else None
+
+        compressed = self.middleware.cache.get_raw(cache_key) if cache_key else None
+        cache_result = "hit" if compressed is not None else ("miss" if cache_key else "uncached")
+        if compressed is None:
+            compressed = await self.middleware.compress(encoder, body)
+            if cache_key:
+                self.middleware.cache.set_raw(cache_key, compressed, None)
+
+        # Incompressible after all (e.g. already minified and tiny): keep the original
+        if len(compressed) >= len(body):
+            await self._send_uncompressed(body)
+            return
+
+        HTTP_COMPRESSED_RESPONSES_TOTAL.inc(encoding=encoder.name, cache=cache_result)
+        HTTP_COMPRESSION_SAVED_BYTES_TOTAL.inc(len(body) - len(compressed), encoding=encoder.name)
+
+        self._set_encoding_headers(headers)
+        headers["content-length"] = str(len(compressed))
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
+
+    async def _send_uncompressed(self, body: bytes) -> None:
+        await self.downstream(self.start_message)
+        await self.downstream({"type": "http.response.body", "body": body, "more_body": False})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["etag"] = encoded_etag(headers["etag"], self.encoder.name)
+
+    # ---------------------------- Streamed Bodies ----------------------------
+
+    async def _start_stream(self) -> None:
+        # The length of the compressed body is not known in advance: send it chunked
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        self._set_encoding_headers(headers)
+        del headers["content-length"]
+
+        self.mode = "stream"
+        self.stream = self.encoder.stream()
+        HTTP_COMPRESSED_RESPONSES_TOTAL.inc(encoding=self.encoder.name, cache="streamed")
+        await self.downstream(self.start_message)
+
+        pending, self.buffer = bytes(self.buffer), bytearray()
+        await self._stream({"type": "http.response.body", "body": pending, "more_body": True})
+
+    async def _stream(self, message) -> None:
+        chunk = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if len(chunk) >= self.middleware.thread_minimum_size:
+            compressed = await anyio.to_thread.run_sync(self.stream.compress, chunk)
+        else:
+            compressed = self.stream.compress(chunk)
+        if not more_body:
+            compressed += self.stream.flush()
+            self.mode = "done"
+
+        if compressed or not more_body:
+            await self.downstream({"type": "http.response.body", "body": compressed, "more_body": more_body})
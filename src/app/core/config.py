@@ -18,16 +18,118 @@ class Settings(BaseSettings):
     DATABASE_URL: str                  # URL for connecting to the database
     REDIS_URL: str                     # URL for connecting to the Redis cache
     CACHE_EXPIRATION_TIME: int = 3600 # Default cache expiration time in seconds (1 hour)
+    CACHE_BACKEND: str = "redis"      # "redis", "memory" (single process, no Redis needed) or "tiered"
+    CACHE_MEMORY_MAX_ENTRIES: int = 10_000          # LRU bound of the in-process cache
+    CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024  # Approximate memory bound of the in-process cache
+    CACHE_LOCAL_TTL_SECONDS: float = 5.0            # "tiered": how long a worker keeps its local copy of a Redis value
     TEMPLATE_DIR: str = str(BASE_DIR / "templates")  # Path to HTML template directory
+    TEMPLATE_AUTO_RELOAD: bool | None = None         # Re-check template files on every render (default: only in dev)
+    TEMPLATE_BYTECODE_CACHE_DIR: str | None = None   # Compiled template cache (default: a directory under the system temp dir)
     STATIC_DIR: str = "src/app/static"               # Path to static files (CSS, JS, images)
+    STATIC_BUILD_DIR: str = "src/app/static_build"   # Fingerprinted, precompressed assets (python -m src.app.assets build)
     ENVIRONMENT: str = "dev"                         # Environment name (e.g., dev, prod)
     PROJECT_NAME: str = "FastAPI Project"            # Name of the project
+    ACCOUNT_DELETION_BATCH_SIZE: int = 500           # Tasks deleted per transaction when removing an account
+    BOARD_COLUMN_PAGE_SIZE: int = 50                 # Tasks rendered server-side per main board column
+
+    # ---------------------------- Database Pool ----------------------------
+
+    DB_POOL_SIZE: int = 10               # Connections kept open per worker
+    DB_MAX_OVERFLOW: int = 20            # Extra connections allowed above the pool size under load
+    DB_POOL_TIMEOUT: float = 10.0        # Seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800          # Seconds after which a connection is replaced
+    DB_POOL_PRE_PING: bool = True        # Check connections are alive before handing them out
+    DB_STATEMENT_CACHE_SIZE: int = 512   # asyncpg prepared statements cached per connection
+    DB_COMMAND_TIMEOUT: float = 30.0     # asyncpg per-query timeout in seconds
+    DB_ECHO: bool = False                # Print every SQL statement (very slow, debugging only)
+    DB_SLOW_QUERY_MS: float = 200.0      # Queries slower than this are logged with their request ID
+    DB_MIGRATE_ON_STARTUP: bool = True   # Apply pending migrations at startup; when False, refuse to start instead
+
+    # ---------------------------- Read Replicas ----------------------------
+
+    DATABASE_REPLICA_URLS: str = ""             # Comma-separated replica URLs; read-only queries are spread over them
+    DB_REPLICA_CHECK_SECONDS: float = 5.0       # How often each worker checks that its replicas are reachable
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0     # Replicas further behind the primary stop receiving reads
+    READ_YOUR_WRITES_SECONDS: float = 5.0       # After a write, the user's reads go to the primary for this long
+
+    @property
+    def replica_urls(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    # ---------------------------- Response Compression ----------------------------
+
+    COMPRESSION_MIN_BYTES: int = 1024                   # Smaller responses are sent uncompressed
+    COMPRESSION_THREAD_MIN_BYTES: int = 64 * 1024       # Larger responses are compressed in a worker thread
+    COMPRESSION_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # Compressed bodies of responses with an ETag kept per worker
+
+    # ---------------------------- Profile Images ----------------------------
+
+    PROFILE_IMAGE_DIR: str = "src/app/static/img/profile_images"  # One directory of resized images per user ID
+    PROFILE_IMAGE_MAX_BYTES: int = 5 * 1024 * 1024  # Largest accepted upload
+    IMAGE_PROCESS_WORKERS: int = 2                  # Processes resizing uploads per worker (0: a thread instead)
+    AVATAR_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Hot avatar files kept in memory per worker
+
+    # ---------------------------- Board Events ----------------------------
+
+    BOARD_EVENTS_HEARTBEAT_SECONDS: float = 15.0    # Keep-alive comment sent on idle event streams
+    BOARD_EVENTS_MAX_SECONDS: float = 1800.0        # Streams end after this; browsers reconnect and re-check the session
+    BOARD_EVENTS_QUEUE_SIZE: int = 100              # Events waiting per stream before a slow client is told to reload
+
+    # ---------------------------- Task Status Coalescing ----------------------------
+
+    TASK_STATUS_COALESCE_SECONDS: float = 1.0   # Status changes of a task within this window are written once (0: off)
+
+    # ---------------------------- Task Audit Log ----------------------------
+
+    AUDIT_QUEUE_SIZE: int = 10_000              # Task change records waiting to be written, per worker
+    AUDIT_BATCH_SIZE: int = 500                 # Records written per INSERT transaction
+    AUDIT_FLUSH_SECONDS: float = 1.0            # Longest time a record waits for its batch to fill
+    AUDIT_ENQUEUE_TIMEOUT_SECONDS: float = 0.5  # How long a request waits for room in a full queue before dropping
+    AUDIT_WRITE_ATTEMPTS: int = 3               # Attempts to write a batch before it is dropped
+    AUDIT_SHUTDOWN_SECONDS: float = 10.0        # How long shutdown waits for queued records to be written
+
+    # ---------------------------- Background Jobs ----------------------------
+
+    JOB_CONCURRENCY: int = 10                   # Jobs each worker (python -m src.app.worker) runs at once
+    JOB_PROCESS_WORKERS: int = 2                # Processes running CPU-bound jobs per worker (0: a thread instead)
+    JOB_MAX_ATTEMPTS: int = 5                   # Attempts before a failing job is moved to the dead-letter stream
+    JOB_RETRY_BASE_SECONDS: float = 2.0         # Delay before the first retry; doubled after every failure
+    JOB_RETRY_MAX_SECONDS: float = 300.0        # Longest delay between two attempts
+    JOB_TIMEOUT_SECONDS: float = 300.0          # An attempt running longer fails
+    JOB_CLAIM_IDLE_SECONDS: float = 600.0       # Jobs of a worker that stopped are taken over after this (above the timeout)
+    JOB_SHUTDOWN_SECONDS: float = 30.0          # How long a stopping worker waits for its running jobs
+    JOB_DEAD_LETTER_MAX_LENGTH: int = 10_000    # Dead-lettered jobs kept for inspection
+    WORKER_METRICS_HOST: str = "0.0.0.0"        # Address the job worker serves its /metrics on
+    WORKER_METRICS_PORT: int = 9100             # Port of the job worker's /metrics (0: not served)
+
+    # ---------------------------- Metrics & Security ----------------------------
+
+    METRICS_TOKEN: str | None = None            # If set, /metrics requires "Authorization: Bearer <token>"
+    METRICS_MULTIPROC_DIR: str | None = None    # Shared directory used to aggregate metrics across workers
+    METRICS_FLUSH_SECONDS: float = 5.0          # How often each worker writes its metrics snapshot
+    PASSWORD_HASH_WORKERS: int = 4              # Threads running bcrypt off the event loop
+
+    # ---------------------------- Server ----------------------------
+
+    WEB_HOST: str = "0.0.0.0"                   # Address the runner binds to
+    WEB_PORT: int = 8000                        # Port the runner binds to
+    WEB_WORKERS: int | None = None              # Worker processes (default: one per available CPU)
+    SHUTDOWN_DRAIN_SECONDS: float = 20.0        # How long shutdown waits for in-flight requests
+
+    # ---------------------------- Profiling ----------------------------
+
+    PROFILING_SECRET: str | None = None         # Enables on-demand profiling; signs X-Profile-Token headers
+    PROFILING_SAMPLE_RATE: float = 1.0          # Share of requests with a valid token that are profiled
+    PROFILING_TOKEN_TTL_SECONDS: int = 900      # Lifetime of a profiling token
+    PROFILE_DIR: str | None = None              # Where .pstats files and their metadata are stored (default: a directory under the system temp dir)
+    PROFILES_MAX_KEPT: int = 50                 # Older profiles are deleted beyond this count
 
     # ---------------------------- Configuration Metadata ----------------------------
 
     model_config = SettingsConfigDict(
         env_file=".env",             # Path to the environment file
         case_sensitive=False,        # Environment variables are case-insensitive
+        env_ignore_empty=True,       # "NAME=" (as in .env_example) keeps the default instead of failing to parse
         extra="ignore"               # Ignore any extra variables not defined in this class
     )
 
@@ -1,7 +1,17 @@
-# Import type hints for asynchronous generators
+# Import standard libraries for timing, logging and type hints
+import asyncio
+import logging
+import time
 from typing import Any, AsyncGenerator
 
+# Import FastAPI's request type (the dependencies read the logged-in user from it)
+from fastapi import Depends, Request
+
+# Import the Redis errors raised while storing the read-your-writes marker
+from redis.exceptions import RedisError
+
 # Import SQLAlchemy components for async database operations
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     create_async_engine,
@@ -9,9 +19,21 @@ from sqlalchemy.ext.asyncio import (
     AsyncSession
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 # Import application configuration for database URL and environment
+from src.app.core import cache
 from src.app.core.config import settings
+from src.app.core.metrics import (
+    DB_POOL_CHECKOUTS_TOTAL,
+    DB_POOL_TIMEOUTS_TOTAL,
+    DB_POOL_WAIT_SECONDS,
+    DB_READS_ROUTED_TOTAL,
+    registry,
+)
+from src.app.core.query_stats import install_query_instrumentation
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------- Base Class for ORM Models ----------------------------
 
@@ -22,33 +44,383 @@ class Base(DeclarativeBase):
     """
     pass
 
-# ---------------------------- Database Engine Initialization ----------------------------
+# ---------------------------- Pool Instrumentation ----------------------------
+
+class PoolStats:
+    """
+    Counters describing how the connection pool is used.
+    They are updated by InstrumentedQueuePool every time a connection is requested.
+    """
+
+    def __init__(self):
+        self.checkouts = 0            # Connections handed out since startup
+        self.timeouts = 0             # Requests that gave up waiting for a connection
+        self.wait_seconds_total = 0.0 # Total time spent waiting for connections
+        self.wait_seconds_max = 0.0   # Longest single wait
+
+    def record_wait(self, seconds: float) -> None:
+        """
+        Record the time it took to obtain a connection from the pool.
+        """
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+
+        DB_POOL_CHECKOUTS_TOTAL.inc()
+        DB_POOL_WAIT_SECONDS.observe(seconds)
+
+
+# Global pool statistics of this process
+pool_stats = PoolStats()
+
 
-# Create an asynchronous database engine using the URL from settings
-# The echo option prints SQL queries to the console in development mode
-engine: AsyncEngine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENVIRONMENT == "dev",
-    future=True,  # Use SQLAlchemy 2.0-style behavior
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that measures how long callers wait for a connection.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            DB_POOL_TIMEOUTS_TOTAL.inc()
+            raise
+        finally:
+            pool_stats.record_wait(time.perf_counter() - start)
+
+
+def build_engine_options(database_url: str) -> dict[str, Any]:
+    """
+    Build the keyword arguments for create_async_engine from the settings.
+    Pool sizing only applies to server databases, and the prepared-statement
+    cache and command timeout only to the asyncpg driver.
+    """
+    options: dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "future": True,  # Use SQLAlchemy 2.0-style behavior
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    if not database_url.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+
+    if "+asyncpg" in database_url:
+        options["connect_args"] = {
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "command_timeout": settings.DB_COMMAND_TIMEOUT,
+        }
+
+    return options
+
+# ---------------------------- Read Replicas ----------------------------
+
+class ReplicaSet:
+    """
+    Engines of the read replicas of this process. Reads are spread over the
+    healthy ones round-robin; a replica that fails a health check (or a query
+    with a connection error) is skipped until a later check succeeds.
+    """
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.engines = engines
+        self.healthy = [True] * len(engines)
+        self._next = 0
+
+    def choose(self) -> AsyncEngine | None:
+        """
+        Return the next healthy replica, or None if none is healthy.
+        """
+        for _ in range(len(self.engines)):
+            index = self._next
+            self._next = (index + 1) % len(self.engines)
+            if self.healthy[index]:
+                return self.engines[index]
+        return None
+
+    def mark_unhealthy(self, engine: AsyncEngine) -> None:
+        """
+        Stop sending reads to a replica until the next successful health check.
+        """
+        index = self.engines.index(engine)
+        if self.healthy[index]:
+            logger.warning("Replica %s marked unhealthy", engine.url.render_as_string(hide_password=True))
+        self.healthy[index] = False
+
+    async def check(self) -> None:
+        """
+        Check every replica: it must answer and not lag more than DB_REPLICA_MAX_LAG_SECONDS.
+        """
+        for index, engine in enumerate(self.engines):
+            try:
+                lag = await asyncio.wait_for(replication_lag_seconds(engine), settings.DB_REPLICA_CHECK_SECONDS)
+                healthy = lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+            except (exc.DBAPIError, OSError, asyncio.TimeoutError):
+                healthy = False
+
+            if healthy != self.healthy[index]:
+                logger.warning("Replica %s is now %s", engine.url.render_as_string(hide_password=True),
+                               "healthy" if healthy else "unhealthy")
+            self.healthy[index] = healthy
+
+
+async def replication_lag_seconds(engine: AsyncEngine) -> float:
+    """
+    Return how far a replica is behind its primary (0 when it has replayed everything it received).
+    Only Postgres reports lag; other databases are checked for reachability only.
+    """
+    async with engine.connect() as conn:
+        if engine.dialect.name != "postgresql":
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+
+        lag = (await conn.execute(text(
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        ))).scalar()
+        return float(lag or 0)
+
+
+async def monitor_replicas() -> None:
+    """
+    Background task: re-check the replicas every DB_REPLICA_CHECK_SECONDS.
+    """
+    while True:
+        await asyncio.sleep(settings.DB_REPLICA_CHECK_SECONDS)
+        if replicas is not None:
+            await replicas.check()
+
+
+# Replicas of this process, or None when DATABASE_REPLICA_URLS is empty
+replicas: ReplicaSet | None = None
+
+registry.gauge(
+    "taskboard_db_replicas_healthy", "Read replicas currently receiving reads in this worker.",
+    callback=lambda: {(): sum(replicas.healthy) if replicas else 0}
 )
 
-# ---------------------------- Async Session Factory ----------------------------
+# ---------------------------- Read-Your-Writes ----------------------------
+#
+# Replicas apply the primary's changes with a small delay. After a user writes,
+# a short-lived Redis key sends that user's reads to the primary, so a board
+# loaded right after an edit shows the edit. The key is shared by all workers.
+
+RECENT_WRITE_KEY = "recent_write:{user_id}"
 
-# Create a session factory that will generate AsyncSession instances
+
+async def mark_recent_write(user_id: int) -> None:
+    """
+    Send this user's reads to the primary for READ_YOUR_WRITES_SECONDS.
+    """
+    try:
+        await (cache.redis or cache.init_redis()).set(
+            RECENT_WRITE_KEY.format(user_id=user_id), 1, px=int(settings.READ_YOUR_WRITES_SECONDS * 1000)
+        )
+    except RedisError:
+        # The write itself succeeded; at worst the user briefly reads a stale replica
+        logger.warning("Could not store the recent write marker of user %s", user_id)
+
+
+async def has_recent_write(user_id: int) -> bool:
+    """
+    Check whether the user wrote within the last READ_YOUR_WRITES_SECONDS.
+    """
+    try:
+        return bool(await (cache.redis or cache.init_redis()).exists(RECENT_WRITE_KEY.format(user_id=user_id)))
+    except RedisError:
+        # Cannot tell: the primary is always correct
+        return True
+
+
+class ReadYourWritesSession(AsyncSession):
+    """
+    Session that marks its user as a recent writer after every commit.
+    The user is set by get_write_db; sessions without one behave like AsyncSession.
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+
+        user_id = self.info.get("writer_user_id")
+        if user_id is not None and replicas is not None:
+            await mark_recent_write(user_id)
+
+# ---------------------------- Database Engine Lifecycle ----------------------------
+#
+# The engine (and its connection pool) is created per process, on first use or by
+# the app lifespan, never at import time. With a preloading pre-fork server the
+# module is imported once in the parent; creating the pool there would share its
+# sockets between every forked worker.
+
+# Engine of this process, or None until init_engine() is called
+engine: AsyncEngine | None = None
+
+# Session factory; it is bound to the primary by init_engine() (read sessions pass a replica as bind)
 SessionLocal = async_sessionmaker(
-    bind=engine,
-    autoflush=False,            # Prevent automatic flushing to the database
-    expire_on_commit=False,     # Keep data in session after commit
-    class_=AsyncSession         # Use async-compatible sessions
+    autoflush=False,                # Prevent automatic flushing to the database
+    expire_on_commit=False,         # Keep data in session after commit
+    class_=ReadYourWritesSession    # Async sessions that record writes for replica routing
 )
 
-# ---------------------------- Dependency for DB Session ----------------------------
 
-async def get_db() -> AsyncGenerator[AsyncSession | Any, Any]:
+def _create_engine(database_url: str) -> AsyncEngine:
+    new_engine = create_async_engine(database_url, **build_engine_options(database_url))
+
+    # Time every statement: latency histograms, slow query log and per-request totals
+    install_query_instrumentation(new_engine.sync_engine)
+    return new_engine
+
+
+def init_engine() -> AsyncEngine:
+    """
+    Create this process' engines (primary and replicas) if needed and bind the session factory.
+
+    :return: The primary engine.
+    """
+    global engine, replicas
+    if engine is None:
+        engine = _create_engine(settings.DATABASE_URL)
+        SessionLocal.configure(bind=engine)
+
+        if settings.replica_urls:
+            replicas = ReplicaSet([_create_engine(url) for url in settings.replica_urls])
+    return engine
+
+
+def get_engine() -> AsyncEngine:
+    """
+    Return this process' engine, creating it on first use (scripts, background jobs).
+    """
+    return engine if engine is not None else init_engine()
+
+
+async def dispose_engine() -> None:
+    """
+    Close every pooled connection of this process and forget the engines.
+    """
+    global engine, replicas
+    if replicas is not None:
+        for replica in replicas.engines:
+            await replica.dispose()
+        replicas = None
+
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+
+# ---------------------------- Dependencies for DB Sessions ----------------------------
+
+def _session_user_id(request: Request) -> int | None:
+    # Set by the session middleware for logged-in users
+    session = getattr(request.state, "session", None)
+    return session.get("id") if isinstance(session, dict) else None
+
+
+async def get_write_db(request: Request) -> AsyncGenerator[AsyncSession | Any, Any]:
     """
-    Dependency to provide a database session.
-    This session is used inside route handlers or services.
-    It ensures the session is opened and closed properly.
+    Dependency providing a session on the primary database.
+    Commits made through it mark the logged-in user as a recent writer.
     """
+    # Bind the session factory if this process has not created its engine yet
+    get_engine()
     async with SessionLocal() as session:
-        yield session
\ No newline at end of file
+        user_id = _session_user_id(request)
+        if user_id is not None:
+            session.info["writer_user_id"] = user_id
+        yield session
+
+
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_write_db)
+) -> AsyncGenerator[AsyncSession | Any, Any]:
+    """
+    Dependency providing a session for read-only queries.
+
+    It uses a healthy replica, round-robin, unless there is none or the user
+    wrote recently; then it is the request's primary session itself, so no
+    extra connection is used. A replica that refuses the connection is marked
+    unhealthy and the primary session is used instead.
+    """
+    if replicas is None:
+        yield db
+        return
+
+    user_id = _session_user_id(request)
+    if user_id is not None and await has_recent_write(user_id):
+        DB_READS_ROUTED_TOTAL.inc(target="primary", reason="recent_write")
+        yield db
+        return
+
+    replica = replicas.choose()
+    if replica is None:
+        DB_READS_ROUTED_TOTAL.inc(target="primary", reason="no_healthy_replica")
+        yield db
+        return
+
+    async with SessionLocal(bind=replica) as session:
+        # Check out the connection now, so a replica refusing connections is skipped
+        # for this request instead of failing it on its first query
+        try:
+            await session.connection()
+        except (exc.DBAPIError, OSError):
+            replicas.mark_unhealthy(replica)
+            DB_READS_ROUTED_TOTAL.inc(target="primary", reason="replica_unavailable")
+            yield db
+            return
+
+        DB_READS_ROUTED_TOTAL.inc(target="replica", reason="read")
+        try:
+            yield session
+        except (exc.OperationalError, exc.InterfaceError):
+            # Connection-level failure: stop using this replica until it passes a check
+            replicas.mark_unhealthy(replica)
+            raise
+
+
+# ---------------------------- Pool Status ----------------------------
+
+def get_pool_status() -> dict[str, Any]:
+    """
+    Return a snapshot of the connection pool: current usage plus wait statistics.
+    """
+    pool = get_engine().sync_engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+
+    # Queue pools expose their current usage; other pools (e.g. SQLite) may not
+    if hasattr(pool, "checkedout"):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=getattr(pool, "_max_overflow", None),
+        )
+
+    status.update(
+        checkouts=pool_stats.checkouts,
+        timeouts=pool_stats.timeouts,
+        wait_seconds_total=round(pool_stats.wait_seconds_total, 6),
+        wait_seconds_max=round(pool_stats.wait_seconds_max, 6),
+        wait_seconds_avg=round(pool_stats.wait_seconds_total / pool_stats.checkouts, 6)
+        if pool_stats.checkouts else 0.0,
+    )
+    return status
+
+
+# Pool usage gauges, computed when /metrics is scraped
+registry.gauge(
+    "taskboard_db_pool_checked_out", "Connections currently checked out of the pool.",
+    callback=lambda: {(): get_pool_status().get("checked_out", 0)}
+)
+registry.gauge(
+    "taskboard_db_pool_overflow", "Overflow connections currently open above the pool size.",
+    callback=lambda: {(): get_pool_status().get("overflow", 0)}
+)
@@ -0,0 +1,119 @@
+# Import standard libraries for the image process pool and timing
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+# Import application settings and metrics
+from src.app.core.config import settings
+from src.app.core.metrics import IMAGE_PROCESSING_DURATION_SECONDS
+
+# Files written for every profile image: name -> (square size in pixels, Pillow format).
+# thumb is the topbar avatar (2rem, sharp on 2x screens); user and user@2x the settings page avatar.
+PROFILE_IMAGE_VARIANTS = {
+    "thumb.png": (64, "PNG"),
+    "thumb.webp": (64, "WEBP"),
+    "user.png": (160, "PNG"),
+    "user.webp": (160, "WEBP"),
+    "user@2x.png": (320, "PNG"),
+    "user@2x.webp": (320, "WEBP"),
+}
+
+# Larger images are refused before being decoded (a small PNG can declare a huge canvas)
+MAX_IMAGE_PIXELS = 40_000_000
+
+# Encoder options: lossless PNG, and WebP at a quality that is hard to tell apart at avatar sizes
+SAVE_OPTIONS = {
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 82, "method": 4},
+}
+
+
+class InvalidImageError(ValueError):
+    """
+    Raised when an uploaded file is not an image we accept.
+    """
+
+# ---------------------------- Resizing ----------------------------
+
+def render_profile_variants(source: str, output_dir: str) -> dict[str, int]:
+    """
+    Write every PROFILE_IMAGE_VARIANTS file of a profile image into output_dir:
+    the image is cropped to a centered square and resized with Lanczos.
+    Runs in the image process pool (see run_in_image_pool), so the arguments are plain paths.
+
+    :param source: Path of the uploaded PNG.
+    :param output_dir: Existing directory the variants are written to.
+    :return: The size in bytes of every written file, by name.
+    :raises InvalidImageError: When the file is not a PNG, or is too large to decode.
+    """
+    # Pillow is imported on first use, in the pool processes: web workers never load it
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(source, formats=["PNG"]) as image:
+            # Only the header has been read so far
+            width, height = image.size
+            if width * height > MAX_IMAGE_PIXELS:
+                raise InvalidImageError(f"The image is too large ({width}x{height}).")
+            image = ImageOps.exif_transpose(image).convert("RGBA")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as exc:
+        raise InvalidImageError("The file is not a valid PNG image.") from exc
+
+    written = {}
+    for name, (size, image_format) in PROFILE_IMAGE_VARIANTS.items():
+        variant = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+        path = Path(output_dir) / name
+        variant.save(path, format=image_format, **SAVE_OPTIONS[image_format])
+        written[name] = path.stat().st_size
+    return written
+
+# ---------------------------- Process Pool ----------------------------
+
+# Decoding, resizing and encoding take tens of milliseconds of CPU per upload:
+# they run in separate processes, created on first use in each worker.
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # "spawn": forking a process that runs an event loop and threads is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+async def run_in_image_pool(operation: str, func, *args):
+    """
+    Run an image function in the process pool and record how long it took.
+    With IMAGE_PROCESS_WORKERS=0 it runs in a thread instead (tests, small deployments).
+
+    :param operation: Label of the duration histogram.
+    """
+    global _executor
+    started_at = time.perf_counter()
+    try:
+        if settings.IMAGE_PROCESS_WORKERS == 0:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+    except BrokenProcessPool:
+        # A pool process died (e.g. killed for memory): start a new pool on the next call
+        _executor = None
+        raise
+    finally:
+        IMAGE_PROCESSING_DURATION_SECONDS.observe(time.perf_counter() - started_at, operation=operation)
+
+
+def shutdown_image_pool() -> None:
+    """
+    Stop the pool processes of this worker, if any were started.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
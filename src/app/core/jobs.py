@@ -0,0 +1,437 @@
+# Import standard libraries for the worker loop, the process pool, JSON payloads and timing
+import asyncio
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Import FastAPI's dependency injection and the Redis client types
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError, WatchError
+
+# Import application settings, the Redis dependency and the job metrics
+from src.app.core.cache import get_redis, redis_enabled
+from src.app.core.config import settings
+from src.app.core.metrics import (
+    JOB_DURATION_SECONDS,
+    JOB_QUEUE_DEPTH,
+    JOB_WAIT_SECONDS,
+    JOBS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Jobs waiting to run; entries are deleted once acknowledged, so the stream length is the backlog
+JOB_STREAM = "jobs"
+# Consumer group shared by every worker: each job is delivered to one of them
+JOB_GROUP = "workers"
+# Failed jobs waiting for their retry, scored by the time they are due
+JOB_RETRY_KEY = "jobs:retry"
+# Jobs that failed JOB_MAX_ATTEMPTS times, with their last error
+JOB_DEAD_LETTER_STREAM = "jobs:dead"
+
+# Retries moved back to the stream per loop iteration
+RETRY_BATCH_SIZE = 100
+
+# How often a worker looks for jobs left pending by a stopped worker
+CLAIM_CHECK_SECONDS = 5.0
+
+# ---------------------------- Registry ----------------------------
+
+@dataclass(frozen=True)
+class JobType:
+    """
+    A function that can run as a background job.
+    CPU-bound jobs are plain functions run in the worker's process pool;
+    the others are coroutines run on the worker's event loop.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    cpu_bound: bool = False
+    max_attempts: int | None = None
+
+    @property
+    def attempts(self) -> int:
+        return self.max_attempts or settings.JOB_MAX_ATTEMPTS
+
+
+# Every job type, by name; filled by the @job decorator when a module is imported
+JOB_TYPES: dict[str, JobType] = {}
+
+
+def job(name: str, cpu_bound: bool = False, max_attempts: int | None = None):
+    """
+    Register a function as a job type. Its arguments are the JSON payload given to
+    enqueue(), so they must be JSON-compatible; jobs may run more than once, so
+    they must be safe to repeat.
+
+    :param name: Name the job is enqueued with, e.g. "accounts.purge".
+    :param cpu_bound: Run a plain function in the process pool instead of awaiting a coroutine.
+    :param max_attempts: Attempts before the job is dead-lettered (default: JOB_MAX_ATTEMPTS).
+    """
+    def register(func):
+        if name in JOB_TYPES and JOB_TYPES[name].func is not func:
+            raise ValueError(f"Job {name!r} is already registered")
+        JOB_TYPES[name] = JobType(name, func, cpu_bound, max_attempts)
+        return func
+
+    return register
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Seconds to wait before running a job again after its attempt-th failure (exponential backoff).
+    """
+    return min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1), settings.JOB_RETRY_MAX_SECONDS)
+
+# ---------------------------- Running Jobs ----------------------------
+
+# CPU-bound jobs run in separate processes, created on first use by the worker
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # "spawn", like the image pool: forking a process that runs an event loop is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.JOB_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_job_pool() -> None:
+    """
+    Stop the processes running CPU-bound jobs, if any were started.
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_job(job_type: JobType, payload: dict[str, Any]) -> None:
+    """
+    Run one attempt of a job, failing it after JOB_TIMEOUT_SECONDS.
+    With JOB_PROCESS_WORKERS=0, CPU-bound jobs run in a thread instead (tests, small deployments).
+    """
+    global _executor
+    if not job_type.cpu_bound:
+        await asyncio.wait_for(job_type.func(**payload), settings.JOB_TIMEOUT_SECONDS)
+        return
+
+    call = functools.partial(job_type.func, **payload)
+    try:
+        if settings.JOB_PROCESS_WORKERS == 0:
+            await asyncio.wait_for(asyncio.to_thread(call), settings.JOB_TIMEOUT_SECONDS)
+        else:
+            future = asyncio.get_running_loop().run_in_executor(_get_executor(), call)
+            await asyncio.wait_for(future, settings.JOB_TIMEOUT_SECONDS)
+    except BrokenProcessPool:
+        # A pool process died (e.g. killed for memory): start a new pool for the next job
+        _executor = None
+        raise
+
+# ---------------------------- Queue ----------------------------
+
+# Jobs started in this process because there is no Redis (kept so they are not garbage collected)
+_local_jobs: set[asyncio.Task] = set()
+
+
+class JobQueue:
+    """
+    Enqueues background jobs. Services use it to move slow work out of the request:
+    the job is added to the JOB_STREAM Redis stream, and one of the
+    `python -m src.app.worker` processes runs it.
+
+    Without Redis (CACHE_BACKEND=memory) there is no worker: jobs run in this
+    process after enqueue() returns, once, without retries.
+    """
+
+    def __init__(self, redis_client: Redis | None):
+        self.redis = redis_client
+
+    async def enqueue(self, name: str, **payload: Any) -> str:
+        """
+        Add a job to the queue.
+
+        :param name: Name of a registered job type.
+        :param payload: Keyword arguments of the job function (JSON-compatible).
+        :return: ID of the job, kept across its retries (it appears in the worker's logs).
+        :raises ValueError: When no job type has that name.
+        """
+        job_type = JOB_TYPES.get(name)
+        if job_type is None:
+            raise ValueError(f"Unknown job: {name}")
+
+        job_id = uuid.uuid4().hex
+        fields = {
+            "id": job_id,
+            "job": name,
+            "payload": json.dumps(payload),
+            "attempt": "1",
+            "enqueued_at": repr(time.time()),
+        }
+
+        if self.redis is None:
+            task = asyncio.create_task(_run_locally(job_type, fields))
+            _local_jobs.add(task)
+            task.add_done_callback(_local_jobs.discard)
+            return job_id
+
+        await self.redis.xadd(JOB_STREAM, fields)
+        return job_id
+
+
+async def _run_locally(job_type: JobType, fields: dict[str, str]) -> None:
+    started_at = time.perf_counter()
+    try:
+        await run_job(job_type, json.loads(fields["payload"]))
+        result = "succeeded"
+    except Exception:
+        logger.exception("Job %s (%s) failed", fields["id"], job_type.name)
+        result = "failed"
+    JOBS_TOTAL.inc(job=job_type.name, result=result)
+    JOB_DURATION_SECONDS.observe(time.perf_counter() - started_at, job=job_type.name)
+
+
+async def wait_for_local_jobs(timeout_seconds: float) -> None:
+    """
+    Give the jobs running in this process (no Redis) time to finish before shutdown.
+    """
+    if _local_jobs:
+        await asyncio.wait(set(_local_jobs), timeout=timeout_seconds)
+
+# ---------------------------- Worker ----------------------------
+
+class JobWorker:
+    """
+    Runs the jobs of the JOB_STREAM stream as one consumer of the JOB_GROUP group.
+
+    - At most `concurrency` jobs run at once; the worker only reads as many jobs as it has free slots.
+    - A finished job is acknowledged and deleted from the stream.
+    - A failed job is retried after an exponential backoff: it waits in JOB_RETRY_KEY,
+      then goes back to the stream. After its last attempt it goes to JOB_DEAD_LETTER_STREAM.
+    - Jobs read by a worker that stopped (crashed, killed) are taken over by another
+      worker once they have been pending for JOB_CLAIM_IDLE_SECONDS.
+    """
+
+    def __init__(self, redis_client: Redis, consumer: str | None = None, concurrency: int | None = None):
+        self.redis = redis_client
+        # Unique across hosts and containers (where every worker may be pid 1)
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.concurrency = concurrency or settings.JOB_CONCURRENCY
+        self._running: set[asyncio.Task] = set()
+        self._last_claim = 0.0
+
+    async def ensure_group(self) -> None:
+        """
+        Create the stream and its consumer group, if another worker has not already.
+        """
+        try:
+            await self.redis.xgroup_create(JOB_STREAM, JOB_GROUP, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    async def run(self, stop: asyncio.Event, block_ms: int = 1000) -> None:
+        """
+        Run jobs until `stop` is set, then wait (up to JOB_SHUTDOWN_SECONDS) for the running ones.
+
+        :param stop: Set to stop reading new jobs.
+        :param block_ms: How long each read waits for a new job.
+        """
+        await self.ensure_group()
+        logger.info("Worker %s running up to %d jobs at once", self.consumer, self.concurrency)
+
+        while not stop.is_set():
+            try:
+                await self.release_due_retries()
+                await self.claim_stalled_jobs()
+                await self.read_jobs(block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job worker loop failed, retrying in 1s")
+                await asyncio.sleep(1)
+
+        if self._running:
+            logger.info("Waiting for %d running jobs", len(self._running))
+            await asyncio.wait(set(self._running), timeout=settings.JOB_SHUTDOWN_SECONDS)
+
+    async def read_jobs(self, block_ms: int) -> None:
+        """
+        Start as many new jobs as there are free slots; with none free, wait for a job to finish.
+        """
+        free = self.concurrency - len(self._running)
+        if free <= 0:
+            await asyncio.wait(set(self._running), timeout=block_ms / 1000, return_when=asyncio.FIRST_COMPLETED)
+            return
+
+        response = await self.redis.xreadgroup(JOB_GROUP, self.consumer, {JOB_STREAM: ">"}, count=free, block=block_ms)
+        for _, messages in response or []:
+            for message_id, fields in messages:
+                self._start(message_id, fields)
+
+    def _start(self, message_id: str, fields: dict[str, str]) -> None:
+        task = asyncio.create_task(self.handle(message_id, fields))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def handle(self, message_id: str, fields: dict[str, str]) -> str:
+        """
+        Run one job read from the stream and settle it: acknowledged, retried or dead-lettered.
+
+        :return: "succeeded", "retried" or "dead".
+        """
+        name = fields.get("job", "")
+        job_type = JOB_TYPES.get(name)
+        # Unknown names (e.g. enqueued by a newer version) are kept as "unknown" to bound the labels
+        label = name if job_type is not None else "unknown"
+
+        enqueued_at = float(fields.get("enqueued_at") or time.time())
+        JOB_WAIT_SECONDS.observe(max(time.time() - enqueued_at, 0.0), job=label)
+
+        started_at = time.perf_counter()
+        try:
+            if job_type is None:
+                raise LookupError(f"Unknown job: {name}")
+            await run_job(job_type, json.loads(fields["payload"]))
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed on attempt %s", fields.get("id"), name, fields.get("attempt"))
+            result = await self.fail(message_id, fields, job_type, exc)
+        else:
+            await self.complete(message_id)
+            result = "succeeded"
+        finally:
+            JOB_DURATION_SECONDS.observe(time.perf_counter() - started_at, job=label)
+
+        JOBS_TOTAL.inc(job=label, result=result)
+        return result
+
+    async def complete(self, message_id: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(JOB_STREAM, JOB_GROUP, message_id)
+            pipe.xdel(JOB_STREAM, message_id)
+            await pipe.execute()
+
+    async def fail(self, message_id: str, fields: dict[str, str], job_type: JobType | None, error: BaseException) -> str:
+        """
+        Schedule the retry of a failed job, or dead-letter it after its last attempt.
+        Both happen in the transaction that acknowledges it, so a job is never lost or doubled here.
+        """
+        attempt = int(fields.get("attempt") or 1)
+        dead = job_type is None or attempt >= job_type.attempts
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if dead:
+                pipe.xadd(
+                    JOB_DEAD_LETTER_STREAM,
+                    {**fields, "error": f"{type(error).__name__}: {error}"[:1000], "failed_at": repr(time.time())},
+                    maxlen=settings.JOB_DEAD_LETTER_MAX_LENGTH,
+                    approximate=True,
+                )
+            else:
+                retry = {**fields, "attempt": str(attempt + 1)}
+                pipe.zadd(JOB_RETRY_KEY, {json.dumps(retry): time.time() + retry_delay(attempt)})
+            pipe.xack(JOB_STREAM, JOB_GROUP, message_id)
+            pipe.xdel(JOB_STREAM, message_id)
+            await pipe.execute()
+
+        return "dead" if dead else "retried"
+
+    async def release_due_retries(self) -> int:
+        """
+        Move the retries that are due back to the stream.
+        The set is watched, so when two workers release the same retries only one succeeds.
+
+        :return: The number of jobs moved.
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(JOB_RETRY_KEY)
+                due = await pipe.zrangebyscore(JOB_RETRY_KEY, "-inf", time.time(), start=0, num=RETRY_BATCH_SIZE)
+                if not due:
+                    return 0
+
+                pipe.multi()
+                pipe.zrem(JOB_RETRY_KEY, *due)
+                for member in due:
+                    # The wait of a retry is measured from the moment it is due
+                    pipe.xadd(JOB_STREAM, {**json.loads(member), "enqueued_at": repr(time.time())})
+                await pipe.execute()
+            except WatchError:
+                return 0
+
+        return len(due)
+
+    async def claim_stalled_jobs(self) -> int:
+        """
+        Take over the jobs another consumer read but did not settle within JOB_CLAIM_IDLE_SECONDS
+        (its process died). Checked every few seconds; jobs already delivered too many times are
+        dead-lettered instead of run, so a job that kills its worker cannot stop them all.
+
+        :return: The number of jobs taken over.
+        """
+        now = time.monotonic()
+        free = self.concurrency - len(self._running)
+        if free <= 0 or now - self._last_claim < CLAIM_CHECK_SECONDS:
+            return 0
+        self._last_claim = now
+
+        idle_ms = int(settings.JOB_CLAIM_IDLE_SECONDS * 1000)
+        stalled = await self.redis.xpending_range(JOB_STREAM, JOB_GROUP, min="-", max="+", count=free, idle=idle_ms)
+        if not stalled:
+            return 0
+
+        deliveries = {entry["message_id"]: entry["times_delivered"] for entry in stalled}
+        claimed = await self.redis.xclaim(JOB_STREAM, JOB_GROUP, self.consumer, idle_ms, list(deliveries))
+        for message_id, fields in claimed:
+            if not fields:
+                continue
+            job_type = JOB_TYPES.get(fields.get("job", ""))
+            if job_type is not None and deliveries[message_id] >= job_type.attempts:
+                logger.error("Job %s (%s) stalled %d times", fields.get("id"), job_type.name, deliveries[message_id])
+                await self.fail(message_id, {**fields, "attempt": str(job_type.attempts)}, job_type,
+                                RuntimeError("The worker running the job stopped"))
+                JOBS_TOTAL.inc(job=job_type.name, result="dead")
+                continue
+
+            logger.warning("Taking over job %s (%s) from a stalled worker", fields.get("id"), fields.get("job"))
+            self._start(message_id, fields)
+
+        return len(claimed)
+
+    async def report_queue_depth(self) -> dict[str, int]:
+        """
+        Record the number of jobs waiting or running, waiting for a retry, and dead-lettered.
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(JOB_STREAM)
+            pipe.zcard(JOB_RETRY_KEY)
+            pipe.xlen(JOB_DEAD_LETTER_STREAM)
+            ready, retry, dead = await pipe.execute()
+
+        depth = {"ready": ready, "retry": retry, "dead": dead}
+        for queue, value in depth.items():
+            JOB_QUEUE_DEPTH.set(value, queue=queue, worker=self.consumer)
+        return depth
+
+# ---------------------------- Dependency Injection ----------------------------
+
+async def get_job_queue(redis_client: Redis = Depends(get_redis)) -> JobQueue:
+    """
+    Provide the job queue: jobs go to Redis unless this deployment runs without it.
+    """
+    return JobQueue(redis_client if redis_enabled() else None)
@@ -0,0 +1,568 @@
+# Import standard libraries for timing, file handling and serialization
+import asyncio
+import fcntl
+import hmac
+import json
+import logging
+import os
+import socket
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+# Import anyio to read and write snapshots from a worker thread
+import anyio.to_thread
+
+# Import application settings for the multi-worker metrics directory
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------- Metric Types ----------------------------
+#
+# Metrics are only updated from the event loop thread (middleware, services,
+# SQLAlchemy listeners running in the loop's greenlets), so updates are plain
+# dictionary operations and need no locks.
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """
+    Base class of all metrics: a name, a help text and a fixed set of label names.
+    Values are stored per tuple of label values.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> dict[tuple[str, ...], Any]:
+        """
+        Return the current values keyed by label values.
+        """
+        return dict(self._values)
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing value (requests served, cache hits, ...).
+    """
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down. It can either be set directly or computed
+    at scrape time by a callback returning {label values tuple: value}.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 callback: Callable[[], dict[tuple[str, ...], float]] | None = None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> dict[tuple[str, ...], Any]:
+        if self.callback is not None:
+            try:
+                return dict(self.callback())
+            except Exception:
+                logger.exception("Gauge callback %s failed", self.name)
+                return {}
+        return dict(self._values)
+
+
+class Histogram(Metric):
+    """
+    Fixed-bucket histogram. Each label set stores its bucket counts
+    (non-cumulative), followed by the sum and the count of observations.
+    """
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        data = self._values.get(key)
+        if data is None:
+            # One slot per bucket plus +Inf, then sum and count
+            data = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        data[bisect_left(self.buckets, value)] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def samples(self) -> dict[tuple[str, ...], Any]:
+        return {key: list(value) for key, value in self._values.items()}
+
+# ---------------------------- Registry ----------------------------
+
+class MetricsRegistry:
+    """
+    Holds every metric of the process and renders them in Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Iterable[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, help_text, labelnames, callback=callback))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labelnames, buckets=buckets))
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """
+        Return a JSON-serializable copy of every metric.
+        """
+        result = []
+        for metric in self._metrics.values():
+            entry = {
+                "name": metric.name,
+                "type": metric.type_name,
+                "help": metric.help_text,
+                "labelnames": list(metric.labelnames),
+                "samples": [[list(key), value] for key, value in metric.samples().items()],
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            result.append(entry)
+        return result
+
+    def render(self) -> str:
+        """
+        Render this process' metrics in Prometheus text format.
+        """
+        return render_prometheus(self.snapshot())
+
+
+# Global registry of this process
+registry = MetricsRegistry()
+
+# ---------------------------- Prometheus Text Format ----------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: list[str], values: list[str], extra: dict[str, str] | None = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs += [f'{name}="{value}"' for name, value in extra.items()]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(snapshot: list[dict[str, Any]]) -> str:
+    """
+    Render a registry snapshot (possibly merged from several workers) as Prometheus text.
+    """
+    lines = []
+    for metric in snapshot:
+        name = metric["name"]
+        labelnames = metric["labelnames"]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+
+        for values, value in metric["samples"]:
+            if metric["type"] == "histogram":
+                cumulative = 0
+                for upper_bound, bucket_count in zip([*metric["buckets"], float("inf")], value[:-2]):
+                    cumulative += bucket_count
+                    le = _format_value(upper_bound)
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, values, {'le': le})} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, values)} {value[-1]}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(value)}")
+
+    return "\n".join(lines) + "\n"
+
+# ---------------------------- Multi-Worker Aggregation ----------------------------
+#
+# With several worker processes, each one writes its snapshot to
+# METRICS_MULTIPROC_DIR/metrics-<hostname>-<pid>.json and the worker answering the
+# scrape merges every file. When a worker exits, its counters and histograms are
+# added to metrics-exited.json and its file is removed, so totals never go backwards
+# and no file outlives its process; gauges of exited workers are dropped.
+#
+# The hostname keeps processes of different containers (each with its own pids,
+# often the same ones) apart. Whether a process of this host is alive is asked to
+# the kernel; a process of another host is considered gone once its file has not
+# been written for SNAPSHOT_STALE_FLUSHES flush intervals.
+
+# Counters and histograms of every exited worker
+EXITED_SNAPSHOT = "metrics-exited.json"
+
+# Missed flushes after which the snapshot of another host's process is retired
+SNAPSHOT_STALE_FLUSHES = 3
+
+# Process whose snapshot file this module owns (a fork starts with its parent's)
+_snapshot_pid: int | None = None
+
+
+def _snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f"metrics-{socket.gethostname()}-{pid}.json"
+
+
+def _write_json(path: Path, data: Any) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(directory: str) -> None:
+    """
+    Atomically write this process' snapshot into the shared directory.
+    """
+    global _snapshot_pid
+    path = _snapshot_path(directory, os.getpid())
+
+    # A file with this pid is left by an exited process whose pid was reused: keep its totals
+    if _snapshot_pid != os.getpid():
+        if path.exists():
+            retire_snapshots(directory, [path])
+        _snapshot_pid = os.getpid()
+
+    _write_json(path, registry.snapshot())
+
+
+def retire_snapshots(directory: str, paths: list[Path]) -> None:
+    """
+    Add the counters and histograms of exited workers to the exited snapshot, then
+    remove their files. Runs under a file lock, so each file is counted once.
+    """
+    with open(Path(directory) / "metrics.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        exited_path = Path(directory) / EXITED_SNAPSHOT
+        snapshots = []
+        for path in [exited_path, *paths]:
+            try:
+                snapshots.append((False, json.loads(path.read_text())))
+            except (ValueError, OSError):
+                # Missing (retired already) or half-written: nothing to keep
+                continue
+
+        _write_json(exited_path, merge_snapshots(snapshots))
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+def retire_own_snapshot(directory: str) -> None:
+    """
+    Called by a worker shutting down: fold its final values into the exited snapshot.
+    """
+    write_snapshot(directory)
+    retire_snapshots(directory, [_snapshot_path(directory, os.getpid())])
+
+
+def _snapshot_alive(path: Path) -> bool | None:
+    """
+    Tell whether the process that writes a snapshot file is still running
+    (None: not a snapshot file).
+    """
+    host, _, pid = path.stem.removeprefix("metrics-").rpartition("-")
+    if not host or not pid.isdigit():
+        return None
+    if host == socket.gethostname():
+        return _pid_alive(int(pid))
+    try:
+        age = time.time() - path.stat().st_mtime
+    except OSError:
+        return False
+    return age < SNAPSHOT_STALE_FLUSHES * settings.METRICS_FLUSH_SECONDS
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def merge_snapshots(snapshots: list[tuple[bool, list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+    """
+    Merge the snapshots of several workers by summing samples with the same labels.
+    Each item is (worker_alive, snapshot).
+    """
+    merged: dict[str, dict[str, Any]] = {}
+
+    for alive, snapshot in snapshots:
+        for metric in snapshot:
+            if metric["type"] == "gauge" and not alive:
+                continue
+
+            target = merged.setdefault(metric["name"], {**metric, "samples": {}})
+            for values, value in metric["samples"]:
+                key = tuple(values)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    target["samples"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][key] = current + value
+
+    for metric in merged.values():
+        metric["samples"] = [[list(key), value] for key, value in metric["samples"].items()]
+    return list(merged.values())
+
+
+def collect_all_workers(directory: str) -> list[dict[str, Any]]:
+    """
+    Write this worker's snapshot, then merge the snapshots of every live worker
+    with the totals of exited ones. Files of workers that died without retiring
+    their snapshot (crash, SIGKILL) are retired here.
+    """
+    write_snapshot(directory)
+
+    snapshots, dead = [], []
+    for path in Path(directory).glob("metrics-*.json"):
+        alive = None if path.name == EXITED_SNAPSHOT else _snapshot_alive(path)
+        if alive is None:
+            # The exited snapshot, or a foreign file
+            continue
+        if not alive:
+            dead.append(path)
+            continue
+        try:
+            snapshots.append((True, json.loads(path.read_text())))
+        except (ValueError, OSError):
+            # Half-written; skip it
+            continue
+
+    if dead:
+        retire_snapshots(directory, dead)
+    try:
+        snapshots.append((False, json.loads((Path(directory) / EXITED_SNAPSHOT).read_text())))
+    except (ValueError, OSError):
+        pass
+
+    return merge_snapshots(snapshots)
+
+
+def render_metrics() -> str:
+    """
+    Render the metrics answered by /metrics: this worker only, or every worker
+    when METRICS_MULTIPROC_DIR is configured.
+    """
+    if settings.METRICS_MULTIPROC_DIR:
+        return render_prometheus(collect_all_workers(settings.METRICS_MULTIPROC_DIR))
+    return registry.render()
+
+
+def check_metrics_access(authorization: str | None) -> tuple[int, str] | None:
+    """
+    Check the Authorization header of a scrape against METRICS_TOKEN.
+    Outside ENVIRONMENT=dev, metrics are not served without a token.
+
+    :return: The status code and reason of a refusal, or None when the scrape is allowed.
+    """
+    if not settings.METRICS_TOKEN:
+        if settings.ENVIRONMENT != "dev":
+            return 403, "Set METRICS_TOKEN to enable /metrics"
+        return None
+
+    # Constant-time comparison, so the token cannot be guessed from response times
+    if not hmac.compare_digest((authorization or "").encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        return 401, "Invalid metrics token"
+    return None
+
+
+async def flush_snapshots_periodically() -> None:
+    """
+    Background task that keeps this worker's snapshot fresh in the shared directory,
+    so scrapes answered by another worker see recent values.
+    """
+    if not settings.METRICS_MULTIPROC_DIR:
+        return
+
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    while True:
+        try:
+            # File I/O, and a file lock when a snapshot is retired: kept off the event loop
+            await anyio.to_thread.run_sync(write_snapshot, settings.METRICS_MULTIPROC_DIR)
+        except OSError:
+            logger.exception("Could not write metrics snapshot")
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+
+# ---------------------------- Process Start Time ----------------------------
+
+# Fallback when the real start time is unknown: the moment metrics were first imported
+_IMPORTED_AT = time.time()
+
+
+def process_start_time() -> float:
+    """
+    Return the Unix time at which this process started.
+    On Linux it is read from /proc, so interpreter and import time are included.
+    """
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # The command name may contain spaces; fields after it are space-separated
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        start_ticks = int(fields[19])
+
+        with open("/proc/stat") as proc_stat:
+            boot_time = next(int(line.split()[1]) for line in proc_stat if line.startswith("btime"))
+
+        return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return _IMPORTED_AT
+
+# ---------------------------- Timing Helper ----------------------------
+
+class timed:
+    """
+    Context manager that observes the elapsed time into a histogram.
+
+        with timed(TEMPLATE_RENDER_SECONDS, template="login/login.html"):
+            ...
+    """
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, **labels: Any):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+# ---------------------------- Application Metrics ----------------------------
+
+HTTP_REQUESTS_TOTAL = registry.counter(
+    "taskboard_http_requests_total", "HTTP requests served.", ("method", "route", "status"))
+HTTP_REQUEST_DURATION_SECONDS = registry.histogram(
+    "taskboard_http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+
+SESSION_REDIS_DURATION_SECONDS = registry.histogram(
+    "taskboard_session_redis_duration_seconds", "Time spent loading the session from the cache backend in the session middleware.")
+
+CACHE_REQUESTS_TOTAL = registry.counter(
+    "taskboard_cache_requests_total", "CacheService lookups by result.", ("operation", "result"))
+CACHE_MEMORY_EVICTIONS_TOTAL = registry.counter(
+    "taskboard_cache_memory_evictions_total", "Entries evicted from the in-process cache to respect its bounds.")
+
+DB_POOL_CHECKOUTS_TOTAL = registry.counter(
+    "taskboard_db_pool_checkouts_total", "Connections handed out by the pool.")
+DB_POOL_TIMEOUTS_TOTAL = registry.counter(
+    "taskboard_db_pool_timeouts_total", "Requests that timed out waiting for a pool connection.")
+DB_POOL_WAIT_SECONDS = registry.histogram(
+    "taskboard_db_pool_wait_seconds", "Time spent waiting for a pool connection.")
+DB_QUERY_DURATION_SECONDS = registry.histogram(
+    "taskboard_db_query_duration_seconds", "SQL statement latency by statement type.", ("verb",))
+DB_READS_ROUTED_TOTAL = registry.counter(
+    "taskboard_db_reads_routed_total", "Read-only sessions by target database and reason.", ("target", "reason"))
+
+PASSWORD_HASH_QUEUE_WAIT_SECONDS = registry.histogram(
+    "taskboard_password_hash_queue_wait_seconds", "Time bcrypt jobs wait for a hashing thread.", ("operation",))
+PASSWORD_HASH_DURATION_SECONDS = registry.histogram(
+    "taskboard_password_hash_duration_seconds", "Time spent running bcrypt.", ("operation",))
+
+HTTP_COMPRESSED_RESPONSES_TOTAL = registry.counter(
+    "taskboard_http_compressed_responses_total", "Responses compressed by the compression middleware.", ("encoding", "cache"))
+HTTP_COMPRESSION_SAVED_BYTES_TOTAL = registry.counter(
+    "taskboard_http_compression_saved_bytes_total", "Bytes saved by response compression.", ("encoding",))
+
+AVATAR_REQUESTS_TOTAL = registry.counter(
+    "taskboard_avatar_requests_total", "Avatar requests by where the file came from.", ("source",))
+IMAGE_PROCESSING_DURATION_SECONDS = registry.histogram(
+    "taskboard_image_processing_duration_seconds", "Time spent resizing images in the image process pool.", ("operation",))
+
+BOARD_EVENT_CONNECTIONS = registry.gauge(
+    "taskboard_board_event_connections", "Board event streams open in each worker.", ("worker",))
+BOARD_EVENT_FANOUT_SECONDS = registry.histogram(
+    "taskboard_board_event_fanout_seconds", "Time from publishing a board event to writing it to a stream.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+BOARD_EVENTS_DROPPED_TOTAL = registry.counter(
+    "taskboard_board_events_dropped_total", "Board events dropped because a stream's client was not reading.")
+
+# written: one UPDATE; coalesced: replaced by a newer change of the task; discarded: task deleted; failed: given up
+TASK_STATUS_CHANGES_TOTAL = registry.counter(
+    "taskboard_task_status_changes_total", "Coalesced task status changes by outcome.", ("result",))
+
+AUDIT_EVENTS_WRITTEN_TOTAL = registry.counter(
+    "taskboard_audit_events_written_total", "Task change records written to task_events.")
+AUDIT_EVENTS_DROPPED_TOTAL = registry.counter(
+    "taskboard_audit_events_dropped_total", "Task change records dropped, by reason.", ("reason",))
+AUDIT_FLUSH_DURATION_SECONDS = registry.histogram(
+    "taskboard_audit_flush_duration_seconds", "Time spent writing a batch of task change records.")
+AUDIT_QUEUE_DEPTH = registry.gauge(
+    "taskboard_audit_queue_depth", "Task change records waiting to be written in each worker.", ("worker",))
+
+JOBS_TOTAL = registry.counter(
+    "taskboard_jobs_total", "Background job attempts by result.", ("job", "result"))
+JOB_WAIT_SECONDS = registry.histogram(
+    "taskboard_job_wait_seconds", "Time background jobs wait in the queue before they start.", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0))
+JOB_DURATION_SECONDS = registry.histogram(
+    "taskboard_job_duration_seconds", "Time spent running background jobs.", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0))
+# Every worker reports the same queues: aggregate with max(), not sum()
+JOB_QUEUE_DEPTH = registry.gauge(
+    "taskboard_job_queue_depth", "Jobs in each queue, as seen by each job worker.", ("queue", "worker"))
+
+TEMPLATE_RENDER_DURATION_SECONDS = registry.histogram(
+    "taskboard_template_render_duration_seconds", "Jinja template render time.", ("template",))
+
+# One observation per worker and phase (imports done, startup done, first request served);
+# a histogram rather than a gauge so values from several workers aggregate sensibly
+STARTUP_DURATION_SECONDS = registry.histogram(
+    "taskboard_startup_duration_seconds", "Seconds from process start to each startup phase.", ("phase",),
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0))
@@ -0,0 +1,149 @@
+# Import standard libraries for flag enums and read-only mappings
+from enum import IntFlag
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping
+
+# Import FastAPI tools for dependency injection and error handling
+from fastapi import HTTPException, Request
+
+# ---------------------------- Permission Flags ----------------------------
+
+class Permission(IntFlag):
+    """
+    Bitset of everything a role is allowed to do.
+    Each flag is a single bit, so a role's permissions fit in one integer
+    and a check is a single AND operation.
+    """
+
+    NONE = 0
+    VIEW_TASKS = 1 << 0        # Read own tasks and the main board
+    MANAGE_TASKS = 1 << 1      # Create, update and delete own tasks
+    EDIT_PROFILE = 1 << 2      # Change own username, email, password and image
+    LIST_USERS = 1 << 3        # See the list of all users
+    MANAGE_USERS = 1 << 4      # Create, edit or delete other users
+    MANAGE_ROLES = 1 << 5      # Change roles and their permissions
+    VIEW_METRICS = 1 << 6      # Read internal operational endpoints (pool status, metrics)
+    PROFILE_REQUESTS = 1 << 7  # Issue profiling tokens and read stored profiles
+    ADMINISTRATOR = 1 << 30    # Grants every permission, including future ones
+
+    @classmethod
+    def all(cls) -> "Permission":
+        """
+        Return a bitset with every known permission set.
+        """
+        value = cls.NONE
+        for flag in cls:
+            value |= flag
+        return value
+
+
+# Permissions of the built-in roles seeded by init_db.py (admin=1, student=2).
+# They are also used as a fallback until the table has been loaded from the database.
+ADMIN_ROLE_ID = 1
+STUDENT_ROLE_ID = 2
+
+DEFAULT_ROLE_PERMISSIONS: dict[int, int] = {
+    ADMIN_ROLE_ID: int(Permission.ADMINISTRATOR),
+    STUDENT_ROLE_ID: int(
+        Permission.VIEW_TASKS | Permission.MANAGE_TASKS | Permission.EDIT_PROFILE
+    ),
+}
+
+# ---------------------------- Role Permission Table ----------------------------
+
+class RolePermissionTable:
+    """
+    Immutable, in-process table that maps a role ID to its permission bitset.
+    It is built once (at startup or after a role change) and then only read,
+    so lookups need no locking and no I/O.
+    """
+
+    __slots__ = ("_permissions", "version")
+
+    def __init__(self, role_permissions: Mapping[int, int], version: int = 0):
+        # Expand the ADMINISTRATOR bit once here so checks stay a single AND
+        expanded = {}
+        for role_id, bits in role_permissions.items():
+            bits = int(bits or 0)
+            if bits & Permission.ADMINISTRATOR:
+                bits = int(Permission.all())
+            expanded[int(role_id)] = bits
+
+        self._permissions = MappingProxyType(expanded)
+        self.version = version
+
+    @classmethod
+    def from_roles(cls, roles: Iterable, version: int = 0) -> "RolePermissionTable":
+        """
+        Build a table from Role model instances (anything with `id` and `permissions`).
+        """
+        return cls({role.id: role.permissions for role in roles}, version=version)
+
+    def permissions_for(self, role_id: int | None, default: int = 0) -> int:
+        """
+        Return the permission bitset of a role, or `default` if the role is unknown.
+        """
+        if role_id is None:
+            return default
+        return self._permissions.get(role_id, default)
+
+    def has_permission(self, role_id: int | None, permission: Permission) -> bool:
+        """
+        Check if a role has every bit of the given permission.
+        """
+        return self.permissions_for(role_id) & permission == permission
+
+    def __len__(self) -> int:
+        return len(self._permissions)
+
+
+# ---------------------------- Global Table Instance ----------------------------
+
+# The table is swapped atomically as a whole; readers always see a complete snapshot.
+_role_table = RolePermissionTable(DEFAULT_ROLE_PERMISSIONS)
+
+
+def get_role_table() -> RolePermissionTable:
+    """
+    Return the role table currently in use by this process.
+    """
+    return _role_table
+
+
+def set_role_table(table: RolePermissionTable) -> None:
+    """
+    Replace the role table used by this process.
+    """
+    global _role_table
+    _role_table = table
+
+
+def has_permission(permissions: int, permission: Permission) -> bool:
+    """
+    Check a raw permission bitset (e.g. the one stored in a session).
+    """
+    return int(permissions) & permission == permission
+
+
+# ---------------------------- Dependency Injection ----------------------------
+
+def require_permission(permission: Permission) -> Callable[[Request], None]:
+    """
+    Build a FastAPI dependency that rejects the request with 403 unless the
+    session's permission bits contain `permission`.
+
+    Usage:
+        @router.get("", dependencies=[Depends(require_permission(Permission.LIST_USERS))])
+    """
+
+    async def dependency(request: Request) -> None:
+        # The session middleware resolves the bits once per request
+        permissions = getattr(request.state, "permissions", None)
+
+        if permissions is None:
+            raise HTTPException(status_code=401, detail="User not authenticated")
+
+        if permissions & permission != permission:
+            raise HTTPException(status_code=403, detail="Permission denied")
+
+    return dependency
@@ -0,0 +1,210 @@
+# Import standard libraries for signing, storage and sampling
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Import anyio to write profiles from a worker thread
+import anyio.to_thread
+
+# Import application settings
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Header carrying the signed profiling token
+PROFILE_HEADER = "x-profile-token"
+
+# ---------------------------- Signed Tokens ----------------------------
+#
+# A token is "<expires_at>.<hex hmac>", signed with PROFILING_SECRET. Admins get one
+# from the internal API and send it in the X-Profile-Token header. Verifying it needs
+# no session or database lookup, so the profiler can wrap the whole middleware stack.
+
+def _sign(expires_at: int) -> str:
+    return hmac.new(settings.PROFILING_SECRET.encode(), str(expires_at).encode(), hashlib.sha256).hexdigest()
+
+
+def create_profile_token(ttl_seconds: int | None = None) -> tuple[str, int]:
+    """
+    Create a signed profiling token.
+
+    :param ttl_seconds: Lifetime of the token (defaults to PROFILING_TOKEN_TTL_SECONDS).
+    :return: The token and its expiry as a Unix timestamp.
+    """
+    if not settings.PROFILING_SECRET:
+        raise ValueError("Profiling is disabled (PROFILING_SECRET is not set).")
+
+    expires_at = int(time.time()) + (ttl_seconds or settings.PROFILING_TOKEN_TTL_SECONDS)
+    return f"{expires_at}.{_sign(expires_at)}", expires_at
+
+
+def verify_profile_token(token: str) -> bool:
+    """
+    Check the signature and expiry of a profiling token.
+    """
+    if not settings.PROFILING_SECRET:
+        return False
+
+    expires_part, _, signature = token.partition(".")
+    if not expires_part.isdigit() or int(expires_part) < time.time():
+        return False
+
+    return hmac.compare_digest(signature, _sign(int(expires_part)))
+
+# ---------------------------- Profile Storage ----------------------------
+
+class ProfileStore:
+    """
+    Stores profiles on disk as <id>.pstats (loadable with pstats / snakeviz)
+    plus <id>.json with request metadata. Only the newest PROFILES_MAX_KEPT are kept.
+    """
+
+    def __init__(self, directory: str, max_kept: int):
+        self.directory = Path(directory)
+        self.max_kept = max_kept
+
+    def save(self, profiler, metadata: dict[str, Any]) -> str:
+        """
+        Write a finished cProfile profiler and its metadata; return the profile ID.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = metadata["id"]
+
+        profiler.dump_stats(str(self.directory / f"{profile_id}.pstats"))
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(metadata))
+
+        self._prune()
+        return profile_id
+
+    def list(self) -> list[dict[str, Any]]:
+        """
+        Return the metadata of every stored profile, newest first.
+        """
+        profiles = []
+        for path in self.directory.glob("*.json"):
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda item: item["created_at"], reverse=True)
+
+    def pstats_path(self, profile_id: str) -> Path | None:
+        """
+        Return the path of a stored .pstats file, or None if it does not exist.
+        """
+        # IDs are generated hex strings; anything else could escape the directory
+        if not profile_id.isalnum():
+            return None
+        path = self.directory / f"{profile_id}.pstats"
+        return path if path.exists() else None
+
+    def summary(self, profile_id: str, limit: int = 40) -> str | None:
+        """
+        Return the top functions of a profile by cumulative time, as text.
+        """
+        import io
+        import pstats
+
+        path = self.pstats_path(profile_id)
+        if path is None:
+            return None
+
+        output = io.StringIO()
+        stats = pstats.Stats(str(path), stream=output)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def _prune(self) -> None:
+        for metadata in self.list()[self.max_kept:]:
+            for suffix in (".pstats", ".json"):
+                (self.directory / f"{metadata['id']}{suffix}").unlink(missing_ok=True)
+
+
+# Keep profiles out of the working directory unless PROFILE_DIR says otherwise
+profile_store = ProfileStore(settings.PROFILE_DIR or os.path.join(tempfile.gettempdir(), "taskboard-profiles"),
+                             settings.PROFILES_MAX_KEPT)
+
+# ---------------------------- ASGI Middleware ----------------------------
+
+class ProfilingMiddleware:
+    """
+    Runs a request under cProfile when it carries a valid X-Profile-Token header
+    and is picked by PROFILING_SAMPLE_RATE.
+
+    It is only installed when PROFILING_SECRET is set, so there is no overhead
+    at all when profiling is disabled, and a single header lookup otherwise.
+    cProfile sees the whole thread, so work of concurrent requests can appear in
+    the profile; only one request is profiled at a time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        import cProfile
+
+        profile_id = uuid.uuid4().hex
+        status_code = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", []).append((b"x-profile-id", profile_id.encode()))
+            await send(message)
+
+        self._busy = True
+        profiler = cProfile.Profile()
+        started_at = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.disable()
+            self._busy = False
+            await self._store(profiler, profile_id, scope, status_code, time.perf_counter() - started_at)
+
+    def _should_profile(self, scope) -> bool:
+        if self._busy:
+            return False
+
+        token = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                token = value.decode("latin-1")
+                break
+
+        if token is None or not verify_profile_token(token):
+            return False
+
+        return random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def _store(self, profiler, profile_id, scope, status_code, seconds) -> None:
+        # Dumping and pruning touch the disk: done in a worker thread, off the event loop
+        metadata = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 3),
+            "request_id": scope.get("state", {}).get("request_id"),
+            "created_at": time.time(),
+            "pid": os.getpid(),
+        }
+        try:
+            await anyio.to_thread.run_sync(profile_store.save, profiler, metadata)
+        except OSError:
+            logger.exception("Could not store profile %s", profile_id)
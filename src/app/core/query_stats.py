@@ -0,0 +1,206 @@
+# Import standard libraries for timing, logging, regex and per-request context
+import logging
+import re
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+# Import SQLAlchemy event system and engine type
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Import application settings for the slow query threshold and the metrics registry
+from src.app.core.config import settings
+from src.app.core.metrics import DB_QUERY_DURATION_SECONDS
+
+logger = logging.getLogger("src.app.sql")
+
+# ---------------------------- Per-Request Context ----------------------------
+
+# ID of the request being served (set by the request context middleware)
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+class RequestQueryStats:
+    """
+    Number of queries and total database time of a single request.
+    An instance is attached to request.state.query_stats by the middleware.
+    """
+
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_seconds * 1000
+
+
+# Stats object of the request being served, if any
+request_query_stats_var: ContextVar[RequestQueryStats | None] = ContextVar("request_query_stats", default=None)
+
+# ---------------------------- Latency Histograms ----------------------------
+
+# Upper bounds (in seconds) of the latency buckets; the last bucket is +Inf
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Maximum number of distinct statements tracked, to bound memory with ad-hoc SQL
+MAX_TRACKED_STATEMENTS = 500
+OTHER_STATEMENTS_KEY = "<other>"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram for one normalized statement.
+    """
+
+    __slots__ = ("bucket_counts", "count", "total_seconds", "max_seconds")
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """
+        Add one measurement to the histogram.
+        """
+        self.bucket_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Return the histogram as a JSON-serializable dictionary.
+        """
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "avg_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "buckets": dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], self.bucket_counts)),
+        }
+
+
+# Histograms of this process, keyed by normalized SQL
+query_histograms: dict[str, LatencyHistogram] = {}
+
+# ---------------------------- SQL Normalization ----------------------------
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+# asyncpg parameters carry casts ("$1::INTEGER"), removed before parameters are replaced
+_CAST_RE = re.compile(r"::\w+(?:\(\s*\d+(?:\s*,\s*\d+)?\s*\))?(?:\[\])?")
+_PARAM_RE = re.compile(r"%\(\w+\)s|\$\d+|(?<!:):\w+|\?")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape so that executions with different
+    values (or IN lists of different lengths) share one histogram.
+    """
+    sql = _WHITESPACE_RE.sub(" ", statement).strip()
+    sql = _STRING_RE.sub("?", sql)
+    sql = _CAST_RE.sub("", sql)
+    sql = _PARAM_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return sql
+
+
+def describe_parameters(parameters: Any) -> Any:
+    """
+    Describe bind parameters by type only, so slow query logs never contain user data.
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+
+    if isinstance(parameters, (list, tuple)):
+        # executemany: a list of parameter sets
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {describe_parameters(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+
+    return type(parameters).__name__
+
+# ---------------------------- Recording ----------------------------
+
+def record_query(statement: str, parameters: Any, seconds: float) -> None:
+    """
+    Record one executed statement: update its histogram, the current request's
+    totals, and log it if it is slower than the configured threshold.
+    """
+    key = normalize_sql(statement)
+
+    histogram = query_histograms.get(key)
+    if histogram is None:
+        if len(query_histograms) >= MAX_TRACKED_STATEMENTS:
+            key = OTHER_STATEMENTS_KEY
+            histogram = query_histograms.setdefault(key, LatencyHistogram())
+        else:
+            histogram = query_histograms[key] = LatencyHistogram()
+    histogram.observe(seconds)
+    DB_QUERY_DURATION_SECONDS.observe(seconds, verb=key.split(" ", 1)[0].upper())
+
+    request_stats = request_query_stats_var.get()
+    if request_stats is not None:
+        request_stats.count += 1
+        request_stats.total_seconds += seconds
+
+    if seconds * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query %.1f ms [request_id=%s] %s params=%s",
+            seconds * 1000,
+            request_id_var.get(),
+            key,
+            describe_parameters(parameters),
+        )
+
+
+def get_query_stats() -> dict[str, dict[str, Any]]:
+    """
+    Return every statement histogram, slowest total time first.
+    """
+    ordered = sorted(query_histograms.items(), key=lambda item: item[1].total_seconds, reverse=True)
+    return {sql: histogram.to_dict() for sql, histogram in ordered}
+
+# ---------------------------- Engine Listeners ----------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # A stack supports nested executions on the same connection
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    record_query(statement, parameters, time.perf_counter() - start_times.pop())
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute; drop their start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_times"):
+        conn.info["query_start_times"].pop()
+
+
+def install_query_instrumentation(engine: Engine) -> None:
+    """
+    Attach the timing listeners to a (sync) engine.
+    For an AsyncEngine pass `engine.sync_engine`.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,67 @@
+# Import standard libraries for the hashing thread pool and timing
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Import application settings and metrics
+from src.app.core.config import settings
+from src.app.core.metrics import PASSWORD_HASH_DURATION_SECONDS, PASSWORD_HASH_QUEUE_WAIT_SECONDS
+
+# ---------------------------- Hashing Thread Pool ----------------------------
+
+# bcrypt is deliberately slow (~100+ ms); running it on the event loop would block
+# every other request, so it runs in a small dedicated thread pool instead.
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+
+async def _run_in_pool(operation: str, func, *args):
+    """
+    Run a bcrypt call in the hashing pool and record how long it waited for a thread
+    and how long it ran.
+    """
+    submitted_at = time.perf_counter()
+    started_at = None
+
+    def job():
+        nonlocal started_at
+        started_at = time.perf_counter()
+        return func(*args)
+
+    result = await asyncio.get_running_loop().run_in_executor(_executor, job)
+    finished_at = time.perf_counter()
+
+    # Metrics are updated back on the event loop thread
+    PASSWORD_HASH_QUEUE_WAIT_SECONDS.observe(started_at - submitted_at, operation=operation)
+    PASSWORD_HASH_DURATION_SECONDS.observe(finished_at - started_at, operation=operation)
+    return result
+
+# ---------------------------- Public API ----------------------------
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a plain text password with a new salt.
+
+    :param password: The plain text password.
+    :return: The bcrypt hash as a string.
+    """
+    # bcrypt is imported on first use: workers that never see a login don't load it
+    import bcrypt
+
+    hashed = await _run_in_pool("hash", bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
+    return hashed.decode()
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    """
+    Check a plain text password against a bcrypt hash.
+
+    :param password: The plain text password.
+    :param hashed_password: The stored bcrypt hash.
+    :return: True if they match.
+    """
+    import bcrypt
+
+    return await _run_in_pool("verify", bcrypt.checkpw, password.encode(), hashed_password.encode())
@@ -0,0 +1,343 @@
+# Import standard libraries for timers, ordering tokens and logging
+import asyncio
+import itertools
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable
+
+# Import the Redis client type holding the changes shared by every worker
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+# Import the metric of coalesced changes and the task statuses
+from src.app.core.metrics import TASK_STATUS_CHANGES_TOTAL
+from src.app.schemas.task import TaskStatusEnum
+
+logger = logging.getLogger(__name__)
+
+# Keys of a task, all expiring STATUS_KEY_TTL_SECONDS after its last change:
+# - "task_status:<id>": hash with the token counter ("seq"), the verified owner and the last token written
+# - "task_status:<id>:pending": sorted set of the changes not written yet, scored by token
+# - "task_status:<id>:flush": exists while a flush of the task is scheduled
+# - "task_status:<id>:lock": random value of the holder, while a flush or a direct write writes the task
+STATUS_KEY_PREFIX = "task_status:"
+STATUS_KEY_TTL_SECONDS = 3600
+
+# Longest time a flush holds a task's lock (a worker dying while writing blocks the task this long)
+FLUSH_LOCK_SECONDS = 30
+# Delay between two attempts to take a lock held by another flush
+LOCK_RETRY_SECONDS = 0.05
+
+# Attempts to write a status, and the delay before a retry (doubled after every attempt)
+WRITE_ATTEMPTS = 3
+WRITE_RETRY_SECONDS = 0.5
+
+# Writes the newest status of a window: (Redis client, task ID, owner ID, status) -> whether the task still exists
+StatusWriter = Callable[[Redis | None, int, int, TaskStatusEnum], Awaitable[bool]]
+
+
+def status_key(task_id: int) -> str:
+    return f"{STATUS_KEY_PREFIX}{task_id}"
+
+# ---------------------------- Coalescer ----------------------------
+
+class TaskStatusCoalescer:
+    """
+    Collapses rapid status changes of a task into one write.
+
+    submit() records a change and returns at once with its ordering token. The first change
+    of a window schedules a flush window_seconds later, which writes only the newest change:
+    a card dragged back and forth N times costs one UPDATE instead of N.
+
+    Ordering, per task: tokens come from one Redis counter, so they follow the order in which
+    the changes reached Redis, whichever worker received them. A flush holds the task's lock,
+    writes the change with the highest token, and skips it when a newer one was written
+    already, so an older status never overwrites a newer one.
+    Without Redis (CACHE_BACKEND=memory, one worker) the same happens in this process.
+
+    Writes that do not go through the coalescer (a synchronous PATCH, a full task update)
+    run inside direct_write(): they take a token and the task's lock too, and the pending
+    changes older than them are dropped, so a later flush never writes over them.
+
+    A change is acknowledged before it is written. A worker that dies during a window loses
+    it, unless a later change of the task schedules a new flush (the pending changes stay
+    in Redis); a normal shutdown writes everything first (drain).
+    """
+
+    def __init__(self, window_seconds: float, writer: StatusWriter):
+        self.window_seconds = window_seconds
+        self.writer = writer
+        # Flushes waiting for the end of their window, with what they flush, and flushes writing
+        self._timers: dict[asyncio.Task, tuple[Redis | None, int]] = {}
+        self._flushing: set[asyncio.Task] = set()
+        # Without Redis: changes not written yet and verified owners, by task ID
+        self._tokens = itertools.count(1)
+        self._pending: dict[int, list[tuple[int, TaskStatusEnum]]] = {}
+        self._owners: dict[int, int] = {}
+        self._local_lock: asyncio.Lock | None = None
+        self._local_lock_loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(
+        self,
+        redis: Redis | None,
+        task_id: int,
+        owner_id: int,
+        status: TaskStatusEnum,
+        verify: Callable[[], Awaitable[bool]],
+    ) -> int | None:
+        """
+        Record a status change, to be written with the other changes of its window.
+
+        :param redis: Redis client shared by the workers (None: changes stay in this process).
+        :param task_id: ID of the task.
+        :param owner_id: ID of the user changing it.
+        :param status: New status.
+        :param verify: Checks in the database that the task belongs to owner_id. The verified
+            owner is remembered, so later changes of the task skip the query.
+        :return: The ordering token of the change, or None when the task is not the user's.
+        """
+        if redis is None:
+            return await self._submit_locally(task_id, owner_id, status, verify)
+
+        key = status_key(task_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hget(key, "owner_id")
+            pipe.hincrby(key, "seq", 1)
+            pipe.expire(key, STATUS_KEY_TTL_SECONDS)
+            owner, token, _ = await pipe.execute()
+
+        if owner != str(owner_id) and not await verify():
+            return None
+
+        # Added and scheduled atomically: a change is either taken by a flush already
+        # scheduled, or schedules one itself
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "owner_id", owner_id)
+            pipe.zadd(f"{key}:pending", {f"{token}:{status.value}": token})
+            pipe.expire(f"{key}:pending", STATUS_KEY_TTL_SECONDS)
+            # Expires if the worker that scheduled the flush dies, so the next change schedules another
+            pipe.set(f"{key}:flush", 1, nx=True, px=int((self.window_seconds + FLUSH_LOCK_SECONDS) * 1000))
+            *_, scheduled = await pipe.execute()
+
+        if scheduled:
+            self._schedule(redis, task_id, self.window_seconds)
+        return token
+
+    async def _submit_locally(
+        self, task_id: int, owner_id: int, status: TaskStatusEnum, verify: Callable[[], Awaitable[bool]]
+    ) -> int | None:
+        if self._owners.get(task_id) != owner_id:
+            if not await verify():
+                return None
+            self._owners[task_id] = owner_id
+
+        token = next(self._tokens)
+        scheduled = task_id not in self._pending
+        self._pending.setdefault(task_id, []).append((token, status))
+        if scheduled:
+            self._schedule(None, task_id, self.window_seconds)
+        return token
+
+    @asynccontextmanager
+    async def direct_write(self, redis: Redis | None, task_id: int) -> AsyncIterator[None]:
+        """
+        Hold the task's lock while its status is written outside of the coalescer.
+        The write takes a token like a queued change: once it succeeds, the pending changes
+        received before it are dropped and a flush skips them, even if they reach Redis late.
+
+        :param redis: Redis client shared by the workers (None: changes stay in this process).
+        :param task_id: ID of the task written.
+        """
+        async with self._lock(redis, task_id):
+            if redis is None:
+                token = next(self._tokens)
+                yield
+                changes = [change for change in self._pending.get(task_id, []) if change[0] > token]
+                if task_id in self._pending:
+                    dropped = len(self._pending[task_id]) - len(changes)
+                    if dropped:
+                        TASK_STATUS_CHANGES_TOTAL.inc(dropped, result="coalesced")
+                    # The scheduled flush finds the list empty and writes nothing
+                    self._pending[task_id] = changes
+                return
+
+            key = status_key(task_id)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hincrby(key, "seq", 1)
+                pipe.expire(key, STATUS_KEY_TTL_SECONDS)
+                token, _ = await pipe.execute()
+
+            yield
+
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(f"{key}:pending", "-inf", token)
+                pipe.hset(key, "written", token)
+                dropped, _ = await pipe.execute()
+            if dropped:
+                TASK_STATUS_CHANGES_TOTAL.inc(dropped, result="coalesced")
+
+    # ---------------------------- Flushing ----------------------------
+
+    def _schedule(self, redis: Redis | None, task_id: int, delay: float) -> asyncio.Task:
+        timer = asyncio.create_task(self._flush_later(redis, task_id, delay))
+        self._timers[timer] = (redis, task_id)
+        return timer
+
+    async def _flush_later(self, redis: Redis | None, task_id: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        # From here on drain() waits for this flush instead of cancelling it
+        current = asyncio.current_task()
+        self._timers.pop(current, None)
+        self._flushing.add(current)
+        try:
+            await self.flush(redis, task_id)
+        except Exception:
+            logger.exception("Could not flush the status changes of task %d", task_id)
+        finally:
+            self._flushing.discard(current)
+
+    async def flush(self, redis: Redis | None, task_id: int) -> None:
+        """
+        Write the newest pending status of a task, unless a newer one was written already.
+        """
+        async with self._lock(redis, task_id):
+            taken = await self._take(redis, task_id)
+            if taken is None:
+                return
+            count, token, owner_id, status, written = taken
+
+            # The changes replaced by the newest one are never written
+            if count > 1:
+                TASK_STATUS_CHANGES_TOTAL.inc(count - 1, result="coalesced")
+            if written is not None and token <= written:
+                TASK_STATUS_CHANGES_TOTAL.inc(result="coalesced")
+                return
+
+            if await self._write(redis, task_id, token, owner_id, status) and redis is not None:
+                await redis.hset(status_key(task_id), "written", token)
+
+    @asynccontextmanager
+    async def _lock(self, redis: Redis | None, task_id: int) -> AsyncIterator[None]:
+        if redis is None:
+            async with self._get_local_lock():
+                yield
+            return
+
+        # The random value identifies this holder: a lock that expired and was taken by
+        # another worker is not released by this one
+        lock_key, holder = f"{status_key(task_id)}:lock", uuid.uuid4().hex
+        while not await redis.set(lock_key, holder, nx=True, ex=FLUSH_LOCK_SECONDS):
+            await asyncio.sleep(LOCK_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            await self._release(redis, lock_key, holder)
+
+    @staticmethod
+    async def _release(redis: Redis, lock_key: str, holder: str) -> None:
+        # Compare and delete: the DELETE only runs if the key still holds our value when it commits
+        async with redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(lock_key)
+                if await pipe.get(lock_key) != holder:
+                    logger.warning("The lock %s expired before it was released", lock_key)
+                    return
+                pipe.multi()
+                pipe.delete(lock_key)
+                await pipe.execute()
+            except WatchError:
+                # Changed since it was read: it expired and another worker holds it now
+                logger.warning("The lock %s expired before it was released", lock_key)
+
+    def _get_local_lock(self) -> asyncio.Lock:
+        # One lock per event loop: a worker runs a single loop, tests may start several
+        loop = asyncio.get_running_loop()
+        if self._local_lock is None or self._local_lock_loop is not loop:
+            self._local_lock, self._local_lock_loop = asyncio.Lock(), loop
+        return self._local_lock
+
+    async def _take(
+        self, redis: Redis | None, task_id: int
+    ) -> tuple[int, int, int, TaskStatusEnum, int | None] | None:
+        """
+        Remove the pending changes of a task.
+
+        :return: How many there were, then the token and owner of the newest, its status,
+            and the token last written (None if unknown); None when nothing is pending.
+        """
+        if redis is None:
+            changes = self._pending.pop(task_id, [])
+            if not changes:
+                return None
+            # Local tokens are taken in order, so a newer change was never written before
+            token, status = changes[-1]
+            return len(changes), token, self._owners.pop(task_id), status, None
+
+        key = status_key(task_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zrange(f"{key}:pending", -1, -1, withscores=True)
+            pipe.zcard(f"{key}:pending")
+            # A change arriving from now on schedules a new flush
+            pipe.delete(f"{key}:pending", f"{key}:flush")
+            pipe.hmget(key, "owner_id", "written")
+            newest, count, _, (owner, written) = await pipe.execute()
+
+        if not newest or owner is None:
+            return None
+        member, token = newest[0]
+        status = TaskStatusEnum(member.split(":", 1)[1])
+        return count, int(token), int(owner), status, int(written) if written is not None else None
+
+    async def _write(
+        self, redis: Redis | None, task_id: int, token: int, owner_id: int, status: TaskStatusEnum
+    ) -> bool:
+        """
+        Write a status, retrying with a short backoff; give it up after the last attempt,
+        or as soon as a status newer than `token` was written.
+
+        :return: Whether the status was written.
+        """
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            # Checked again right before every attempt: if the lock expired during a slow write,
+            # a direct write or another flush may have written a newer status meanwhile
+            if redis is not None and int(await redis.hget(status_key(task_id), "written") or 0) >= token:
+                TASK_STATUS_CHANGES_TOTAL.inc(result="coalesced")
+                return False
+
+            try:
+                exists = await self.writer(redis, task_id, owner_id, status)
+            except Exception as exc:
+                if attempt == WRITE_ATTEMPTS:
+                    logger.error("Giving up the status change of task %d: %s", task_id, exc)
+                    TASK_STATUS_CHANGES_TOTAL.inc(result="failed")
+                    return False
+                logger.warning("Could not write the status of task %d, retrying: %s", task_id, exc)
+                await asyncio.sleep(WRITE_RETRY_SECONDS * 2 ** (attempt - 1))
+                continue
+
+            # A task deleted during the window has nothing to write
+            TASK_STATUS_CHANGES_TOTAL.inc(result="written" if exists else "discarded")
+            return True
+
+    async def drain(self, timeout_seconds: float) -> int:
+        """
+        Write every pending change now instead of at the end of its window, and wait for
+        the flushes already writing. Called at shutdown.
+
+        :return: The number of flushes not finished within the timeout.
+        """
+        waiting = list(self._timers.items())
+        self._timers.clear()
+        for timer, _ in waiting:
+            timer.cancel()
+
+        flushes = {self._schedule(redis, task_id, 0) for _, (redis, task_id) in waiting} | self._flushing
+        if not flushes:
+            return 0
+
+        _, left = await asyncio.wait(flushes, timeout=timeout_seconds)
+        if left:
+            logger.warning("Shutting down with %d task status changes not written", len(left))
+        return len(left)
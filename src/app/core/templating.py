@@ -0,0 +1,180 @@
+# Import standard libraries for timing and logging
+import logging
+import time
+
+# Import Jinja2 (environment, bytecode cache and the extension API) and FastAPI's integration
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+# Import application settings, the asset URL and ETag helpers, the template render time histogram and the in-process cache
+from src.app.core.assets import static_url
+from src.app.core.avatars import avatar_url
+from src.app.core.compression import content_etag
+from src.app.core.config import settings
+from src.app.core.metrics import TEMPLATE_RENDER_DURATION_SECONDS, timed
+from src.app.repositories.cache_repository import MemoryCacheRepository
+
+logger = logging.getLogger(__name__)
+
+# Pages without any per-user data: rendered once per worker, then served as stored bytes
+STATIC_PAGES = ("login/login.html", "sign_up/sign_up.html")
+
+# Bounds of the rendered fragment cache of each worker
+FRAGMENT_CACHE_MAX_ENTRIES = 1000
+FRAGMENT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# ---------------------------- Fragment Caching ----------------------------
+
+class FragmentCacheExtension(Extension):
+    """
+    Adds `{% cache key[, ttl_seconds] %} ... {% endcache %}`: the body is rendered
+    once per worker and then served from memory until the TTL expires (never, without one).
+
+    Only wrap markup that is the same for every user, or put everything it
+    depends on in the key. Caching is skipped while templates auto-reload, so
+    edits show up during development.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment: Environment):
+        super().__init__(environment)
+        environment.extend(
+            fragment_cache=MemoryCacheRepository(FRAGMENT_CACHE_MAX_ENTRIES, FRAGMENT_CACHE_MAX_BYTES)
+        )
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_render_cached", args), [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, key: str, ttl_seconds: float | None, caller) -> Markup:
+        if self.environment.auto_reload:
+            return Markup(caller())
+
+        fragment_cache: MemoryCacheRepository = self.environment.fragment_cache
+        fragment = fragment_cache.get_raw(f"fragment:{key}")
+        if fragment is None:
+            fragment = caller()
+            fragment_cache.set_raw(f"fragment:{key}", fragment, ttl_seconds)
+
+        # Already escaped when it was rendered
+        return Markup(fragment)
+
+# ---------------------------- Instrumented Templates ----------------------------
+
+class TimedJinja2Templates(Jinja2Templates):
+    """
+    Jinja2Templates that records how long each template takes to render.
+    TemplateResponse renders the whole template when it is created, so timing
+    the call measures the render.
+    """
+
+    def TemplateResponse(self, *args, **kwargs):
+        # Supports both the (name, context) and the (request, name, context) signatures
+        if args and isinstance(args[0], str):
+            name = args[0]
+        elif len(args) > 1:
+            name = args[1]
+        else:
+            name = kwargs.get("name", "unknown")
+
+        with timed(TEMPLATE_RENDER_DURATION_SECONDS, template=name):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+def build_environment() -> Environment:
+    """
+    Create the Jinja environment shared by every web route.
+
+    Outside development templates are not checked for changes on every render,
+    and compiled templates are kept in a bytecode cache on disk, so workers and
+    restarts skip the parsing step.
+    """
+    auto_reload = settings.TEMPLATE_AUTO_RELOAD
+    if auto_reload is None:
+        auto_reload = settings.ENVIRONMENT == "dev"
+
+    env = Environment(
+        loader=FileSystemLoader(settings.TEMPLATE_DIR),
+        autoescape=True,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(settings.TEMPLATE_BYTECODE_CACHE_DIR),
+        extensions=[FragmentCacheExtension],
+    )
+
+    # {{ static_url("css/style.css") }} -> the fingerprinted URL of a static file
+    env.globals["static_url"] = static_url
+    # {{ avatar_url(id, avatar_hash, "thumb.webp") }} -> the versioned URL of a profile image
+    env.globals["avatar_url"] = avatar_url
+    return env
+
+# ---------------------------- Shared Instance ----------------------------
+
+# One Jinja environment (and template cache) for every web route, created on first use
+_templates: TimedJinja2Templates | None = None
+
+# Rendered STATIC_PAGES and their ETag, by template name
+_static_pages: dict[str, tuple[bytes, str]] = {}
+
+
+def get_templates() -> TimedJinja2Templates:
+    """
+    Return the templates shared by every web route.
+    They are created on the first render (or by compile_templates at startup)
+    instead of at import time, so importing the app stays cheap.
+    """
+    global _templates
+    if _templates is None:
+        _templates = TimedJinja2Templates(env=build_environment())
+    return _templates
+
+
+def compile_templates() -> int:
+    """
+    Load every template now, and pre-render the static pages, so the first
+    request of a worker does not pay for it.
+
+    :return: The number of templates compiled.
+    """
+    started_at = time.perf_counter()
+    env = get_templates().env
+
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+
+    for name in STATIC_PAGES:
+        render_static_page(name)
+
+    logger.info("Compiled %d templates in %.0f ms", len(names), (time.perf_counter() - started_at) * 1000)
+    return len(names)
+
+
+def render_static_page(name: str) -> HTMLResponse:
+    """
+    Return a page that has no per-user data. It is rendered once per worker;
+    while templates auto-reload it is rendered on every call. Its ETag lets
+    browsers revalidate it, and the compression middleware reuse its compressed copy.
+    """
+    page = _static_pages.get(name)
+    if page is None:
+        templates = get_templates()
+        with timed(TEMPLATE_RENDER_DURATION_SECONDS, template=name):
+            body = templates.get_template(name).render().encode()
+        page = (body, content_etag(body))
+        if not templates.env.auto_reload:
+            _static_pages[name] = page
+
+    body, etag = page
+    return HTMLResponse(content=body, headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -0,0 +1,189 @@
+# Import standard libraries for temporary files and type hints
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+# Import anyio to write to disk off the event loop, and the multipart parser Starlette uses
+import anyio.to_thread
+import python_multipart as multipart
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.requests import Request
+
+# Extra bytes a multipart body may carry around the file (boundaries, part headers, small fields)
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadError(ValueError):
+    """
+    Raised when an upload is refused; `status_code` is the HTTP status to answer with.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class ReceivedFile:
+    """
+    A file written to disk by receive_file. The caller moves or deletes it.
+    """
+
+    path: Path          # Temporary file, in the directory given to receive_file
+    filename: str       # File name sent by the client
+    content_type: str   # Content type sent by the client
+    size: int           # Bytes received
+
+# ---------------------------- Streaming Receiver ----------------------------
+
+class _FilePartReceiver:
+    """
+    Callbacks of the multipart parser: collect the headers of each part, and the
+    data of the file field. The data is only collected here; it is written to disk
+    by receive_file, in a thread, after each chunk of the request body.
+    """
+
+    def __init__(self, field_name: str, check_part: Callable[[str, str], None] | None):
+        self.field_name = field_name
+        self.check_part = check_part
+        self.headers: list[tuple[bytes, bytes]] = []
+        self.header_field = b""
+        self.header_value = b""
+        self.in_file_part = False
+        self.file_found = False
+        self.filename = ""
+        self.content_type = ""
+        self.pending: list[bytes] = []
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self.headers, self.in_file_part = [], False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers.append((self.header_field.lower(), self.header_value))
+        self.header_field, self.header_value = b"", b""
+
+    def on_headers_finished(self) -> None:
+        headers = dict(self.headers)
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("latin-1") != self.field_name or b"filename" not in options:
+            return
+        if self.file_found:
+            raise UploadError(f"Only one file can be sent in '{self.field_name}'.")
+
+        self.filename = options[b"filename"].decode("utf-8", "replace")
+        self.content_type = headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+        # Refuse a wrong file type before receiving its data
+        if self.check_part is not None:
+            self.check_part(self.filename, self.content_type)
+        self.in_file_part = self.file_found = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.in_file_part:
+            self.pending.append(data[start:end])
+
+
+async def receive_file(
+    request: Request,
+    field_name: str,
+    directory: str | Path,
+    max_bytes: int,
+    check_part: Callable[[str, str], None] | None = None,
+) -> ReceivedFile:
+    """
+    Stream the file field of a multipart request to a temporary file.
+
+    Unlike UploadFile, the body is never held in memory, and an upload past the
+    limit is refused as soon as it goes over, without reading the rest.
+    Disk writes run in a worker thread.
+
+    :param request: The multipart/form-data request.
+    :param field_name: Name of the file field; other fields are ignored.
+    :param directory: Where the temporary file is created (the same file system as
+        its final location, so it can be moved there atomically with os.replace).
+    :param max_bytes: Largest accepted file.
+    :param check_part: Called with the file name and content type before any data
+        is received; raises UploadError to refuse the file.
+    :raises UploadError: 400 for a malformed or refused upload, 413 when it is too large.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in options:
+        raise UploadError("Expected a multipart/form-data body.")
+
+    # Refuse a body that announces it is too large before reading any of it
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD_BYTES:
+        raise UploadError(_too_large_message(max_bytes), status_code=413)
+
+    receiver = _FilePartReceiver(field_name, check_part)
+    parser = multipart.MultipartParser(options[b"boundary"], receiver.callbacks())
+    output: BinaryIO | None = None
+    size = 0
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            if not receiver.pending:
+                continue
+
+            data = b"".join(receiver.pending)
+            receiver.pending.clear()
+            size += len(data)
+            if size > max_bytes:
+                raise UploadError(_too_large_message(max_bytes), status_code=413)
+
+            if output is None:
+                output = await anyio.to_thread.run_sync(_create_temporary_file, Path(directory))
+            await anyio.to_thread.run_sync(output.write, data)
+
+        parser.finalize()
+        if not receiver.file_found:
+            raise UploadError(f"No file was sent in '{field_name}'.")
+        if output is None:
+            raise UploadError("The file is empty.")
+
+        await anyio.to_thread.run_sync(output.close)
+        return ReceivedFile(Path(output.name), receiver.filename, receiver.content_type, size)
+    except BaseException as exc:
+        # Refused, malformed or disconnected: do not leave a partial file behind.
+        # Called directly (close + unlink is quick): a cancelled request could not await a thread.
+        if output is not None:
+            _discard(output)
+        if isinstance(exc, MultipartParseError):
+            raise UploadError("Malformed multipart body.") from exc
+        raise
+
+
+def _create_temporary_file(directory: Path) -> BinaryIO:
+    directory.mkdir(parents=True, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False)
+
+
+def _discard(output: BinaryIO) -> None:
+    output.close()
+    try:
+        os.unlink(output.name)
+    except FileNotFoundError:
+        pass
+
+
+def _too_large_message(max_bytes: int) -> str:
+    return f"File size exceeds the limit of {max_bytes // (1024 * 1024)} MB."
@@ -13,4 +13,7 @@ class UserDetail:
     id: int              # Unique identifier for the user
     username: str        # Username chosen by the user
     email: str           # User's email address
-    is_admin: bool = False  # Whether the user has administrative privileges (default: False)
\ No newline at end of file
+    is_admin: bool = False  # Whether the user has administrative privileges (default: False)
+    role_id: int | None = None  # Role assigned to the user
+    permissions: int = 0    # Permission bitset of the role (see core/permissions.py)
+    avatar_hash: str | None = None  # Content hash of the profile image (see core/avatars.py)
\ No newline at end of file
@@ -1,7 +1,12 @@
 # Import standard and third-party libraries
+import asyncio
 import json
+import logging
+import os
+import time
+import uuid
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 
 # Import API route modules
@@ -10,25 +15,57 @@ from src.app.api.v1 import login as api_login
 from src.app.api.v1 import task as api_task
 from src.app.api.v1 import user_settings as api_user_settings
 from src.app.api.v1 import logout as api_logout
+from src.app.api.v1 import internal as api_internal
+
+# Import the Prometheus scrape endpoint
+from src.app.api import metrics as api_metrics
 
 # Import Web route modules
 from src.app.web import login as web_login
 from src.app.web import main_board as web_main_board
 from src.app.web import user_settings as web_user_settings
 from src.app.web import sign_up as web_sign_up
+from src.app.web import avatars as web_avatars
 
 # Import configuration and infrastructure modules
+from src.app.core import cache, database
+from src.app.core.audit import audit_log
+from src.app.core.board_events import listen_for_board_events
+from src.app.core.assets import PrecompressedStaticFiles
+from src.app.core.compression import CompressionMiddleware
 from src.app.core.config import settings
-from src.app.core.database import engine, Base
-from src.app.core.cache import redis
+from src.app.core.database import dispose_engine, init_engine, monitor_replicas
+from src.app.core.images import shutdown_image_pool
+from src.app.core.jobs import shutdown_job_pool, wait_for_local_jobs
+from src.app.core.metrics import (
+    HTTP_REQUESTS_TOTAL,
+    HTTP_REQUEST_DURATION_SECONDS,
+    SESSION_REDIS_DURATION_SECONDS,
+    STARTUP_DURATION_SECONDS,
+    flush_snapshots_periodically,
+    process_start_time,
+    retire_own_snapshot,
+)
+from src.app.core.permissions import get_role_table
+from src.app.core.profiling import ProfilingMiddleware
+from src.app.core.query_stats import RequestQueryStats, request_id_var, request_query_stats_var
+from src.app.core.templating import compile_templates
+from src.app.migrations.runner import ensure_schema_current
+from src.app.repositories.cache_repository import build_cache_repository
+from src.app.services.role_service import listen_for_role_changes, reload_role_table
+from src.app.services.task_service import status_coalescer
+
+logger = logging.getLogger(__name__)
 
-# Initialize the FastAPI app with the project name from settings
-app = FastAPI(title=settings.PROJECT_NAME)
+# Set once this worker has sent its first response
+first_request_served = False
+
+# Requests this worker is serving right now
+in_flight_requests = 0
 
 # -------------------------------
 # Middleware for session handling
 # -------------------------------
-@app.middleware("http")
 async def add_session_middleware(request: Request, call_next):
     """
     Custom middleware that handles session validation using Redis.
@@ -49,10 +86,11 @@ async def add_session_middleware(request: Request, call_next):
         "/api/v1/login",
         "/api/v1/users",
         "/sign_up",
+        "/metrics",
     ]
 
-    # Allow access to static resources without authentication
-    if request.url.path.startswith("/static/"):
+    # Allow access to static resources and avatars (content-addressed URLs) without authentication
+    if request.url.path.startswith(("/static/", "/avatars/")):
         return await call_next(request)
 
     # Allow access to explicitly whitelisted paths
@@ -64,63 +102,237 @@ async def add_session_middleware(request: Request, call_next):
     if not session_id:
         return RedirectResponse(url="/login")
 
-    # Compose the Redis session key
-    session_key = f"session:{session_id}"
-
-    # Retrieve session data from Redis cache
-    session_data = await redis.get(session_key)
+    # Retrieve and decode the session from the configured cache backend
+    redis_started_at = time.perf_counter()
+    try:
+        session_data = await build_cache_repository().get_user_session_data(session_id)
+    except json.JSONDecodeError:
+        session_data = None
+    SESSION_REDIS_DURATION_SECONDS.observe(time.perf_counter() - redis_started_at)
 
     if not session_data:
         return RedirectResponse(url="/login")
 
-    # Attempt to decode the session JSON string into a dictionary
-    try:
-        request.state.session = json.loads(session_data)
-    except json.JSONDecodeError:
-        return RedirectResponse(url="/login")
+    request.state.session = session_data
+
+    # Resolve the permission bitset from the in-process role table (no database access).
+    # Sessions without a known role fall back to the bits stored at login.
+    request.state.permissions = get_role_table().permissions_for(
+        request.state.session.get("role_id"),
+        default=request.state.session.get("permissions", 0),
+    )
 
     # Continue with the request
     response = await call_next(request)
     return response
 
 # -------------------------------
-# Web Routes (HTML views)
+# Middleware for request context
 # -------------------------------
-app.include_router(web_main_board.router, prefix="/main", tags=["Web - Login"])
-app.include_router(web_login.router, prefix="/login", tags=["Web - Login"])
-app.include_router(web_user_settings.router, prefix="/settings", tags=["Web - User Settings"])
-app.include_router(web_sign_up.router, prefix="/sign_up", tags=["Web - Sign Up"])
-# Note: web_users route is commented out
+async def add_request_context_middleware(request: Request, call_next):
+    """
+    Outermost middleware: assigns a request ID, collects the number of
+    SQL queries and the database time spent by the request, and records
+    per-route latency and status metrics.
+    """
+    started_at = time.perf_counter()
 
-# -------------------------------
-# API Routes (JSON endpoints)
-# -------------------------------
-app.include_router(api_login.router, prefix="/api/v1/login", tags=["API - Login"])
-app.include_router(api_users.router, prefix="/api/v1/users", tags=["API - Users"])
-app.include_router(api_task.router, prefix="/api/v1/tasks", tags=["API - Tasks"])
-app.include_router(api_user_settings.router, prefix="/api/v1/user_settings", tags=["API - User Settings"])
-app.include_router(api_logout.router, prefix="/api/v1/logout", tags=["API - Logout"])
+    # Reuse the ID sent by the load balancer, or generate one
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    query_stats = RequestQueryStats()
+
+    request.state.request_id = request_id
+    request.state.query_stats = query_stats
+
+    request_id_token = request_id_var.set(request_id)
+    query_stats_token = request_query_stats_var.set(query_stats)
+    status_code = 500
+
+    # Counted so shutdown can wait for requests that are still running
+    global in_flight_requests
+    in_flight_requests += 1
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        in_flight_requests -= 1
+        request_id_var.reset(request_id_token)
+        request_query_stats_var.reset(query_stats_token)
+
+        # Label by route template (e.g. /api/v1/tasks/{task_id}) to keep cardinality bounded
+        route = request.scope.get("route")
+        if route is not None:
+            route_label = route.path
+        elif request.url.path.startswith("/static/"):
+            route_label = "/static"
+        else:
+            route_label = "unmatched"
+
+        HTTP_REQUESTS_TOTAL.inc(method=request.method, route=route_label, status=status_code)
+        HTTP_REQUEST_DURATION_SECONDS.observe(
+            time.perf_counter() - started_at, method=request.method, route=route_label
+        )
+
+    response.headers["X-Request-ID"] = request_id
+    response.headers["Server-Timing"] = f'db;dur={query_stats.total_ms:.1f};desc="{query_stats.count} queries"'
+
+    # Cold start: time from process start until this worker answered its first request
+    global first_request_served
+    if not first_request_served:
+        first_request_served = True
+        STARTUP_DURATION_SECONDS.observe(time.time() - process_start_time(), phase="first_request")
+
+    return response
 
 # -------------------------------
-# Static Files Configuration
+# Lifespan: per-worker resources
 # -------------------------------
-app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Runs once in every worker process, after any fork.
+    Startup opens this worker's database and Redis pools, checks the schema,
+    loads the roles and starts the background tasks. Shutdown lets in-flight
+    requests finish, stops the background tasks and closes the pools.
+    """
+    # ---- Startup ----
+    engine = init_engine()
+    redis_client = cache.init_redis() if cache.redis_enabled() else None
+
+    # Modules and routes were loaded by this process (not inherited from a preloading parent)
+    if app.state.created_by_pid == os.getpid():
+        STARTUP_DURATION_SECONDS.observe(app.state.created_at - process_start_time(), phase="import")
+
+    # One query when the schema is current; pending migrations run under a lock
+    await ensure_schema_current(engine)
+
+    # Load roles and their permissions once; the table is then read without I/O
+    try:
+        await reload_role_table()
+    except Exception:
+        logger.exception("Could not load roles, using built-in role permissions")
+
+    # Keep the table in sync when a role changes in any worker (a single process needs no Redis for that)
+    if redis_client is not None:
+        app.state.role_listener = asyncio.create_task(listen_for_role_changes(redis_client))
+        # Board changes made through any worker reach the event streams open in this one
+        app.state.board_event_listener = asyncio.create_task(listen_for_board_events(redis_client))
+
+    # Write the task changes recorded by requests, in batches
+    app.state.audit_writer = asyncio.create_task(audit_log.run())
+
+    # Share this worker's metrics with the others (only when METRICS_MULTIPROC_DIR is set)
+    app.state.metrics_flusher = asyncio.create_task(flush_snapshots_periodically())
+
+    # Check the read replicas before serving, then keep checking in the background
+    if database.replicas is not None:
+        await database.replicas.check()
+        app.state.replica_monitor = asyncio.create_task(monitor_replicas())
+
+    # Compile every template and pre-render the static pages before the first request
+    compile_templates()
+
+    STARTUP_DURATION_SECONDS.observe(time.time() - process_start_time(), phase="startup")
+
+    yield
+
+    # ---- Shutdown ----
+    await drain_in_flight_requests(settings.SHUTDOWN_DRAIN_SECONDS)
+
+    # Without Redis, background jobs run in this process: let them finish with the pools open
+    await wait_for_local_jobs(settings.JOB_SHUTDOWN_SECONDS)
+
+    # Write the coalesced status changes now rather than at the end of their window
+    await status_coalescer.drain(settings.SHUTDOWN_DRAIN_SECONDS)
+
+    # Write the task changes still queued before the writer is stopped
+    await audit_log.drain(settings.AUDIT_SHUTDOWN_SECONDS)
+
+    for task_name in ("role_listener", "board_event_listener", "audit_writer", "metrics_flusher", "replica_monitor"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    # Keep this worker's final counters in the shared metrics
+    if settings.METRICS_MULTIPROC_DIR:
+        try:
+            retire_own_snapshot(settings.METRICS_MULTIPROC_DIR)
+        except OSError:
+            logger.exception("Could not write final metrics snapshot")
+
+    shutdown_image_pool()
+    shutdown_job_pool()
+    await cache.close_redis()
+    await dispose_engine()
+
+
+async def drain_in_flight_requests(timeout_seconds: float) -> None:
+    """
+    Wait until no request is being served, or until the timeout expires.
+    The server has stopped accepting connections at this point; this keeps the
+    pools open for the requests that are still running.
+    """
+    deadline = time.monotonic() + timeout_seconds
+    while in_flight_requests and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+
+    if in_flight_requests:
+        logger.warning("Shutting down with %d requests still running", in_flight_requests)
 
 # -------------------------------
-# Startup Event: Database Tables
+# Application factory
 # -------------------------------
-@app.on_event("startup")
-async def on_startup():
+def create_app() -> FastAPI:
     """
-    Runs when the application starts.
-    It creates the database tables if they do not exist.
-    NOTE: In production, migrations should be used instead of auto-create.
+    Build the FastAPI application: middleware, routes and static files.
+    It opens no connection; pools are created per worker by the lifespan.
     """
-    # Import models to register them with SQLAlchemy's metadata
-    import src.app.models.role
-    import src.app.models.user
-    import src.app.models.task
-
-    # Use an asynchronous connection to create the tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+    # Initialize the FastAPI app with the project name from settings
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+    app.state.created_at = time.time()
+    app.state.created_by_pid = os.getpid()
+
+    # Middleware added last runs first: request context > profiling > session > compression.
+    # Compression is innermost, so the layers above pass the smaller body along.
+    app.add_middleware(CompressionMiddleware)
+    app.middleware("http")(add_session_middleware)
+
+    # Installed only when enabled, so a disabled profiler costs nothing.
+    # It sits inside the request context middleware (to know the request ID)
+    # and outside the session middleware (so session handling is profiled too).
+    if settings.PROFILING_SECRET:
+        app.add_middleware(ProfilingMiddleware)
+
+    app.middleware("http")(add_request_context_middleware)
+
+    # Web Routes (HTML views)
+    app.include_router(web_main_board.router, prefix="/main", tags=["Web - Login"])
+    app.include_router(web_login.router, prefix="/login", tags=["Web - Login"])
+    app.include_router(web_user_settings.router, prefix="/settings", tags=["Web - User Settings"])
+    app.include_router(web_sign_up.router, prefix="/sign_up", tags=["Web - Sign Up"])
+    app.include_router(web_avatars.router, prefix="/avatars", tags=["Web - Avatars"])
+    # Note: web_users route is commented out
+
+    # API Routes (JSON endpoints)
+    app.include_router(api_login.router, prefix="/api/v1/login", tags=["API - Login"])
+    app.include_router(api_users.router, prefix="/api/v1/users", tags=["API - Users"])
+    app.include_router(api_task.router, prefix="/api/v1/tasks", tags=["API - Tasks"])
+    app.include_router(api_user_settings.router, prefix="/api/v1/user_settings", tags=["API - User Settings"])
+    app.include_router(api_logout.router, prefix="/api/v1/logout", tags=["API - Logout"])
+    app.include_router(api_internal.router, prefix="/api/v1/internal", tags=["API - Internal"])
+    app.include_router(api_metrics.router, prefix="/metrics", tags=["Metrics"])
+
+    # Static Files Configuration: the asset build (when present) first, then the source directory
+    app.mount(
+        "/static",
+        PrecompressedStaticFiles(directory=settings.STATIC_DIR, build_directory=settings.STATIC_BUILD_DIR),
+        name="static",
+    )
+
+    return app
+
+
+# Module-level app for `uvicorn src.app.main:app` and the tests;
+# `python -m src.app.runner` uses the factory instead.
+app = create_app()
@@ -0,0 +1,95 @@
+# Import standard libraries for the command line and exit codes
+import argparse
+import asyncio
+import re
+import sys
+
+# Import the engine helpers and the migration runner
+from src.app.core.database import dispose_engine, get_engine
+from src.app.migrations.runner import MIGRATIONS_DIR, MigrationError, discover_migrations, get_applied, migrate
+
+# Skeleton written by `new`
+TEMPLATE = '''"""
+{description}
+"""
+from sqlalchemy import text
+
+# Set to False for statements that cannot run inside a transaction
+# (e.g. create_index_concurrently from src.app.migrations.runner); the migration must then be idempotent.
+TRANSACTIONAL = True
+
+
+async def upgrade(conn):
+    await conn.execute(text("..."))
+'''
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.app.migrations", description="Manage the database schema.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="List migrations and whether they are applied")
+    commands.add_parser("upgrade", help="Apply every pending migration")
+    new = commands.add_parser("new", help="Create an empty migration file")
+    new.add_argument("name", help="Short description, e.g. add_task_tags")
+    return parser.parse_args(argv)
+
+
+async def status() -> int:
+    applied = await get_applied(get_engine()) if await _has_table() else {}
+    for migration in discover_migrations():
+        row = applied.get(migration.version)
+        state = f"applied {row['applied_at']:%Y-%m-%d %H:%M}" if row else "pending"
+        if row and row["checksum"] != migration.checksum:
+            state += " (MODIFIED)"
+        print(f"{migration.version:04d}_{migration.name:<40} {state}")
+    return 0
+
+
+async def _has_table() -> bool:
+    from sqlalchemy import inspect
+
+    async with get_engine().connect() as conn:
+        return await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("schema_migrations"))
+
+
+async def upgrade() -> int:
+    applied = await migrate(get_engine())
+    for migration in applied:
+        print(f"Applied {migration.version:04d}_{migration.name}")
+    if not applied:
+        print("Schema is up to date.")
+    return 0
+
+
+def new(name: str) -> int:
+    slug = re.sub(r"\W+", "_", name.lower()).strip("_")
+    migrations = discover_migrations()
+    version = migrations[-1].version + 1 if migrations else 1
+
+    path = MIGRATIONS_DIR / f"{version:04d}_{slug}.py"
+    path.write_text(TEMPLATE.format(description=name.replace("_", " ").capitalize() + "."))
+    print(path)
+    return 0
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "status":
+            return await status()
+        return await upgrade()
+    except MigrationError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        await dispose_engine()
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "new":
+        return new(args.name)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
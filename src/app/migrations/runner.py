@@ -0,0 +1,283 @@
+# Import standard libraries for discovery, checksums, timing and file locks
+import asyncio
+import datetime
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import AsyncIterator
+
+# Import SQLAlchemy components for the bookkeeping table and raw statements
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, exc, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Import application settings
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Directory holding the migration files, named NNNN_description.py
+MIGRATIONS_DIR = Path(__file__).parent / "versions"
+_FILENAME_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Key of the Postgres advisory lock taken while migrating (any constant shared by every process)
+ADVISORY_LOCK_KEY = 727_301_036
+
+
+class MigrationError(Exception):
+    """
+    Raised when migrations cannot be applied safely (edited files, unknown versions, stale schema).
+    """
+
+# ---------------------------- Bookkeeping Table ----------------------------
+
+migrations_metadata = MetaData()
+
+# One row per applied migration
+schema_migrations = Table(
+    "schema_migrations",
+    migrations_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("checksum", String(64), nullable=False),    # sha256 of the file when it was applied
+    Column("applied_at", DateTime, nullable=False),
+    Column("duration_ms", Float, nullable=False),
+)
+
+# ---------------------------- Discovery ----------------------------
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A migration file. The module defines `async def upgrade(conn)` and may set
+    `TRANSACTIONAL = False` for statements that cannot run in a transaction
+    (e.g. CREATE INDEX CONCURRENTLY); such migrations must be idempotent.
+    """
+
+    version: int
+    name: str
+    path: Path
+    checksum: str
+
+    def load(self) -> ModuleType:
+        """
+        Import the migration module from its file.
+        """
+        spec = importlib.util.spec_from_file_location(f"taskboard_migration_{self.version:04d}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+
+def discover_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """
+    Return every migration in `directory`, ordered by version.
+    """
+    migrations = []
+    for path in directory.iterdir():
+        match = _FILENAME_RE.match(path.name)
+        if not match:
+            continue
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            path=path,
+            checksum=hashlib.sha256(path.read_bytes()).hexdigest(),
+        ))
+
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration versions in {directory}")
+
+    return migrations
+
+# ---------------------------- Status ----------------------------
+
+async def get_current_version(engine: AsyncEngine) -> int | None:
+    """
+    Return the highest applied version, or None if nothing was ever applied.
+    This is the single cheap query run at application startup.
+    """
+    try:
+        async with engine.connect() as conn:
+            return (await conn.execute(select(func.max(schema_migrations.c.version)))).scalar()
+    except exc.DBAPIError:
+        # The bookkeeping table does not exist yet
+        return None
+
+
+async def is_schema_current(engine: AsyncEngine, migrations: list[Migration] | None = None) -> bool:
+    """
+    Check whether the latest migration has been applied.
+    """
+    migrations = discover_migrations() if migrations is None else migrations
+    if not migrations:
+        return True
+    return (await get_current_version(engine) or 0) >= migrations[-1].version
+
+
+async def get_applied(engine: AsyncEngine) -> dict[int, dict]:
+    """
+    Return the applied migrations keyed by version.
+    """
+    async with engine.connect() as conn:
+        rows = (await conn.execute(select(schema_migrations))).mappings().all()
+    return {row["version"]: dict(row) for row in rows}
+
+# ---------------------------- Locking ----------------------------
+
+@asynccontextmanager
+async def migration_lock(engine: AsyncEngine) -> AsyncIterator[None]:
+    """
+    Make sure only one process migrates at a time. Others wait, then find
+    the work done.
+
+    Postgres uses a session-level advisory lock held on a dedicated connection;
+    a file SQLite database uses an exclusive lock on a file next to it.
+    """
+    if engine.dialect.name == "postgresql":
+        async with engine.connect() as lock_conn:
+            await lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            try:
+                yield
+            finally:
+                await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        yield
+        return
+
+    import fcntl
+
+    with open(f"{database}.migrate.lock", "w") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+# ---------------------------- Applying ----------------------------
+
+async def _apply(engine: AsyncEngine, migration: Migration) -> None:
+    module = migration.load()
+    started_at = time.perf_counter()
+
+    record = insert(schema_migrations)
+
+    if getattr(module, "TRANSACTIONAL", True):
+        # DDL and bookkeeping commit together: a failed migration leaves no trace
+        async with engine.begin() as conn:
+            await module.upgrade(conn)
+            await conn.execute(record.values(**_record_values(migration, started_at)))
+    else:
+        async with engine.connect() as conn:
+            autocommit_conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await module.upgrade(autocommit_conn)
+        async with engine.begin() as conn:
+            await conn.execute(record.values(**_record_values(migration, started_at)))
+
+    logger.info("Applied migration %04d_%s in %.0f ms", migration.version, migration.name,
+                (time.perf_counter() - started_at) * 1000)
+
+
+def _record_values(migration: Migration, started_at: float) -> dict:
+    return {
+        "version": migration.version,
+        "name": migration.name,
+        "checksum": migration.checksum,
+        "applied_at": datetime.datetime.now(datetime.UTC).replace(tzinfo=None),
+        "duration_ms": round((time.perf_counter() - started_at) * 1000, 3),
+    }
+
+
+def verify_checksums(migrations: list[Migration], applied: dict[int, dict]) -> None:
+    """
+    Refuse to continue if an applied migration was edited or is no longer present.
+    """
+    known = {migration.version: migration for migration in migrations}
+
+    for version, row in applied.items():
+        migration = known.get(version)
+        if migration is None:
+            raise MigrationError(f"Migration {version:04d}_{row['name']} is applied but its file is missing")
+        if migration.checksum != row["checksum"]:
+            raise MigrationError(
+                f"Migration {version:04d}_{migration.name} was modified after being applied; "
+                "add a new migration instead"
+            )
+
+
+async def migrate(engine: AsyncEngine, migrations: list[Migration] | None = None) -> list[Migration]:
+    """
+    Apply every pending migration, in order, under the migration lock.
+
+    :return: The migrations applied by this call.
+    """
+    migrations = discover_migrations() if migrations is None else migrations
+
+    async with migration_lock(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(migrations_metadata.create_all)
+
+        applied = await get_applied(engine)
+        verify_checksums(migrations, applied)
+
+        pending = [migration for migration in migrations if migration.version not in applied]
+        for migration in pending:
+            await _apply(engine, migration)
+
+    return pending
+
+
+async def ensure_schema_current(engine: AsyncEngine) -> None:
+    """
+    Startup check: one query when the schema is current. Otherwise migrate
+    (if DB_MIGRATE_ON_STARTUP) or refuse to start.
+    """
+    migrations = discover_migrations()
+    if await is_schema_current(engine, migrations):
+        return
+
+    if not settings.DB_MIGRATE_ON_STARTUP:
+        raise MigrationError(
+            f"Database schema is behind version {migrations[-1].version}; "
+            "run `python -m src.app.migrations upgrade`"
+        )
+
+    applied = await migrate(engine, migrations)
+    logger.info("Startup applied %d migrations (pid %d)", len(applied), os.getpid())
+
+# ---------------------------- Helpers for Migrations ----------------------------
+
+async def create_index_concurrently(conn, name: str, table: str, columns: list[str], unique: bool = False) -> None:
+    """
+    Build an index without blocking writes to the table.
+
+    On Postgres this runs CREATE INDEX CONCURRENTLY, which must be used from a
+    migration with `TRANSACTIONAL = False`. A failed concurrent build leaves an
+    invalid index behind, so it is dropped first to keep the migration re-runnable.
+    Other databases get a plain CREATE INDEX.
+    """
+    unique_sql = "UNIQUE " if unique else ""
+    column_sql = ", ".join(columns)
+
+    if conn.dialect.name == "postgresql":
+        invalid = (await conn.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name})).first()
+        if invalid:
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        await conn.execute(text(f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column_sql})"))
+    else:
+        await conn.execute(text(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({column_sql})"))
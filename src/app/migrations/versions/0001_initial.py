@@ -0,0 +1,50 @@
+"""
+Initial schema: roles, users and tasks.
+
+The tables are declared here rather than imported from the models, so this
+migration keeps creating the same schema when the models change later.
+Existing tables (from databases created with create_all) are left untouched.
+"""
+import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table
+
+metadata = MetaData()
+
+roles = Table(
+    "roles",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(50), unique=True, index=True, nullable=False),
+    Column("description", String(255), nullable=True),
+)
+
+users = Table(
+    "users",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), unique=True, index=True, nullable=False),
+    Column("email", String(120), unique=True, index=True, nullable=False),
+    Column("password", String(255), nullable=False),
+    Column("is_active", Boolean, nullable=False, default=True),
+    Column("role_id", Integer, ForeignKey("roles.id"), nullable=False, index=True),
+)
+
+tasks = Table(
+    "tasks",
+    metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(100), nullable=False),
+    Column("description", String(255), nullable=True),
+    Column("owner_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("is_completed", Integer, nullable=False),
+    Column("priority", Integer, nullable=False),
+    Column("due_date", DateTime, nullable=False),
+    Column("created_at", DateTime, nullable=False, default=datetime.datetime.utcnow),
+    Column("status", String(50), nullable=False),
+    Column("subject", String(100), nullable=True),
+)
+
+
+async def upgrade(conn):
+    await conn.run_sync(metadata.create_all, checkfirst=True)
@@ -0,0 +1,22 @@
+"""
+Add the permission bitset to roles and grant the built-in roles their defaults.
+"""
+from sqlalchemy import inspect, text
+
+# Frozen copies of the defaults at the time of this migration
+ADMIN_ROLE_ID, ADMIN_PERMISSIONS = 1, 1 << 30       # ADMINISTRATOR
+STUDENT_ROLE_ID, STUDENT_PERMISSIONS = 2, 7          # VIEW_TASKS | MANAGE_TASKS | EDIT_PROFILE
+
+
+async def upgrade(conn):
+    columns = await conn.run_sync(lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("roles")})
+
+    # Databases created with create_all after the column was added already have it
+    if "permissions" not in columns:
+        await conn.execute(text("ALTER TABLE roles ADD COLUMN permissions BIGINT NOT NULL DEFAULT 0"))
+
+    for role_id, permissions in ((ADMIN_ROLE_ID, ADMIN_PERMISSIONS), (STUDENT_ROLE_ID, STUDENT_PERMISSIONS)):
+        await conn.execute(
+            text("UPDATE roles SET permissions = :permissions WHERE id = :id AND permissions = 0"),
+            {"permissions": permissions, "id": role_id},
+        )
@@ -0,0 +1,8 @@
+"""
+Drop the single-row schema_version table, replaced by schema_migrations.
+"""
+from sqlalchemy import text
+
+
+async def upgrade(conn):
+    await conn.execute(text("DROP TABLE IF EXISTS schema_version"))
@@ -0,0 +1,12 @@
+"""
+Add the content hash of each user's profile image, which versions its URLs.
+"""
+from sqlalchemy import inspect, text
+
+
+async def upgrade(conn):
+    columns = await conn.run_sync(lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("users")})
+
+    # Databases created with create_all after the column was added already have it
+    if "avatar_hash" not in columns:
+        await conn.execute(text("ALTER TABLE users ADD COLUMN avatar_hash VARCHAR(32)"))
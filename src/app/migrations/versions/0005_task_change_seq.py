@@ -0,0 +1,61 @@
+"""
+Track changes to tasks for delta sync: a per-user change sequence, the last
+change of every task, and tombstones for deleted tasks.
+
+Existing tasks are numbered 1..n per owner, so a client syncing from cursor 0
+receives all of them. The index on (owner_id, change_seq) is built by 0007,
+outside of a transaction.
+"""
+import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, MetaData, Table, inspect, text
+
+metadata = MetaData()
+
+# Declared here, like the tables of 0001, so later model changes do not alter this migration
+# (users is only declared for the foreign key; it exists already)
+users = Table("users", metadata, Column("id", Integer, primary_key=True))
+
+task_tombstones = Table(
+    "task_tombstones",
+    metadata,
+    Column("task_id", Integer, primary_key=True),
+    Column("owner_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    Column("change_seq", BigInteger, nullable=False),
+    Column("deleted_at", DateTime, nullable=False, default=datetime.datetime.utcnow),
+    Index("ix_task_tombstones_owner_id_change_seq", "owner_id", "change_seq"),
+)
+
+
+async def upgrade(conn):
+    def existing_columns(sync_conn):
+        inspector = inspect(sync_conn)
+        return {table: {c["name"] for c in inspector.get_columns(table)} for table in ("users", "tasks")}
+
+    columns = await conn.run_sync(existing_columns)
+
+    # Databases created with create_all after the columns were added already have them
+    if "task_change_seq" not in columns["users"]:
+        await conn.execute(text("ALTER TABLE users ADD COLUMN task_change_seq BIGINT NOT NULL DEFAULT 0"))
+
+    if "change_seq" not in columns["tasks"]:
+        await conn.execute(text("ALTER TABLE tasks ADD COLUMN change_seq BIGINT NOT NULL DEFAULT 0"))
+        await conn.execute(text("ALTER TABLE tasks ADD COLUMN updated_at TIMESTAMP"))
+        await conn.execute(text("UPDATE tasks SET updated_at = created_at"))
+        if conn.dialect.name == "postgresql":
+            await conn.execute(text("ALTER TABLE tasks ALTER COLUMN updated_at SET NOT NULL"))
+
+        # Number the existing tasks of every owner, then start each user's sequence after them
+        # (one pass over the table each, instead of a correlated count per task)
+        await conn.execute(text(
+            "UPDATE tasks SET change_seq = numbered.seq "
+            "FROM (SELECT id, ROW_NUMBER() OVER (PARTITION BY owner_id ORDER BY id) AS seq FROM tasks) AS numbered "
+            "WHERE numbered.id = tasks.id"
+        ))
+        await conn.execute(text(
+            "UPDATE users SET task_change_seq = counted.seq "
+            "FROM (SELECT owner_id, COUNT(*) AS seq FROM tasks GROUP BY owner_id) AS counted "
+            "WHERE counted.owner_id = users.id"
+        ))
+
+    await conn.run_sync(metadata.create_all, tables=[task_tombstones], checkfirst=True)
@@ -0,0 +1,66 @@
+"""
+Add the append-only task_events table of the task audit log.
+
+On PostgreSQL it is partitioned by month of occurred_at: the current and next
+month are created here, later months by the audit log before it writes to them.
+Other databases (SQLite in development and tests) get a plain table.
+"""
+import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, MetaData, String, Table, Text, inspect, text
+
+from src.app.core.audit import month_partition
+
+metadata = MetaData()
+
+# Declared here, like the tables of 0001, so later model changes do not alter this migration
+task_events = Table(
+    "task_events",
+    metadata,
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True),
+    Column("occurred_at", DateTime, nullable=False),
+    Column("task_id", Integer, nullable=False),
+    Column("owner_id", Integer, nullable=False),
+    Column("actor_id", Integer, nullable=True),
+    Column("action", String(20), nullable=False),
+    Column("field", String(50), nullable=True),
+    Column("old_value", Text, nullable=True),
+    Column("new_value", Text, nullable=True),
+    Index("ix_task_events_task_id_id", "task_id", "id"),
+)
+
+
+async def upgrade(conn):
+    exists = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("task_events"))
+
+    # Databases created with create_all after the table was added already have it
+    if exists:
+        return
+
+    if conn.dialect.name != "postgresql":
+        await conn.run_sync(metadata.create_all)
+        return
+
+    # The partition key must be part of the primary key
+    await conn.execute(text(
+        "CREATE TABLE task_events ("
+        "id BIGINT GENERATED BY DEFAULT AS IDENTITY, "
+        "occurred_at TIMESTAMP NOT NULL, "
+        "task_id INTEGER NOT NULL, "
+        "owner_id INTEGER NOT NULL, "
+        "actor_id INTEGER, "
+        "action VARCHAR(20) NOT NULL, "
+        "field VARCHAR(50), "
+        "old_value TEXT, "
+        "new_value TEXT, "
+        "PRIMARY KEY (id, occurred_at)"
+        ") PARTITION BY RANGE (occurred_at)"
+    ))
+    # Created on every partition, present and future
+    await conn.execute(text("CREATE INDEX ix_task_events_task_id_id ON task_events (task_id, id)"))
+
+    this_month = datetime.datetime.utcnow().date().replace(day=1)
+    next_month = (this_month + datetime.timedelta(days=32)).replace(day=1)
+    for month in (this_month, next_month):
+        _, ddl = month_partition(month)
+        await conn.execute(text(ddl))
@@ -0,0 +1,13 @@
+"""
+Index the change sequence of tasks, used by every delta sync query.
+
+Built concurrently on PostgreSQL, so writes to tasks are not blocked while the
+index of a large table is built.
+"""
+from src.app.migrations.runner import create_index_concurrently
+
+TRANSACTIONAL = False
+
+
+async def upgrade(conn):
+    await create_index_concurrently(conn, "ix_tasks_owner_id_change_seq", "tasks", ["owner_id", "change_seq"])
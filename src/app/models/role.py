@@ -1,5 +1,5 @@
 # Import required types from SQLAlchemy
-from sqlalchemy import String, Integer
+from sqlalchemy import String, Integer, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Import the base class for ORM models
@@ -27,6 +27,9 @@ class Role(Base):
     # Optional description of the role
     description: Mapped[str] = mapped_column(String(255), nullable=True)
 
+    # Bitset of Permission flags granted to this role (see core/permissions.py)
+    permissions: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
     # ---------------------------- Relationships ----------------------------
 
     # One-to-many relationship: A role can be assigned to many users
@@ -2,7 +2,7 @@
 import datetime
 
 # Import necessary types from SQLAlchemy
-from sqlalchemy import String, Integer, ForeignKey, DateTime
+from sqlalchemy import BigInteger, String, Integer, ForeignKey, DateTime, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Import the base class for all ORM models
@@ -18,6 +18,9 @@ class Task(Base):
 
     __tablename__ = "tasks"  # Name of the table in the database
 
+    # Changes of a user's board since a cursor: GET /api/v1/tasks/changes
+    __table_args__ = (Index("ix_tasks_owner_id_change_seq", "owner_id", "change_seq"),)
+
     # ---------------------------- Table Columns ----------------------------
 
     # Primary key: Unique ID for each task
@@ -59,6 +62,17 @@ class Task(Base):
     # Optional subject or category of the task
     subject: Mapped[str] = mapped_column(String(100), nullable=True)
 
+    # Timestamp of the last change
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.datetime.utcnow,
+        onupdate=datetime.datetime.utcnow,
+        nullable=False
+    )
+
+    # Position of the last change in the owner's sequence of task changes (users.task_change_seq)
+    change_seq: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
     # ---------------------------- Relationships ----------------------------
 
     # Relationship to the User model (a task belongs to one user)
@@ -71,4 +85,73 @@ class Task(Base):
         Return a string representation of the task.
         Useful for logging and debugging.
         """
-        return f"<Task(id={self.id}, title={self.title}, is_completed={self.is_completed})>"
\ No newline at end of file
+        return f"<Task(id={self.id}, title={self.title}, is_completed={self.is_completed})>"
+
+# ---------------------------- Tombstone ORM Model ----------------------------
+
+class TaskTombstone(Base):
+    """
+    Record of a deleted task, so clients syncing changes since a cursor learn
+    about deletions. The task row itself is gone.
+
+    PostgreSQL never reuses task IDs, but SQLite may (the tasks table has no
+    AUTOINCREMENT): a task created with the ID of a deleted one removes its
+    tombstone, and the new task replaces the old card on clients behind it.
+    Tombstones are never pruned, so the table grows by one small row per deleted
+    task for as long as the owner exists.
+    """
+
+    __tablename__ = "task_tombstones"
+
+    __table_args__ = (Index("ix_task_tombstones_owner_id_change_seq", "owner_id", "change_seq"),)
+
+    # ID the deleted task had (at most one tombstone per ID, see above)
+    task_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    # Owner of the deleted task; removed with the user
+    owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # Position of the deletion in the owner's sequence of task changes
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    # When the task was deleted
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+
+# ---------------------------- Audit Event ORM Model ----------------------------
+
+class TaskEvent(Base):
+    """
+    One change to a task, written behind the request by the audit log (core/audit.py):
+    a creation, a deletion, or the new value of one field. Rows are only ever inserted.
+
+    On PostgreSQL the table is partitioned by month of occurred_at (migration 0006),
+    with (id, occurred_at) as primary key; old months are removed by dropping their partition.
+    """
+
+    __tablename__ = "task_events"
+
+    # History of a task, newest first: GET /api/v1/tasks/{task_id}/history
+    __table_args__ = (Index("ix_task_events_task_id_id", "task_id", "id"),)
+
+    # Increasing ID, also the pagination cursor of the history (INTEGER on SQLite, so it autoincrements)
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+
+    # When the change was committed
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    # Task that changed; no foreign key, the history outlives the task
+    task_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # Owner of the task, who alone may read its history
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # User who made the change
+    actor_id: Mapped[int] = mapped_column(Integer, nullable=True)
+
+    # "created", "updated" or "deleted"
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Field that changed ("updated" only), with its values as text (NULL for no value)
+    field: Mapped[str] = mapped_column(String(50), nullable=True)
+    old_value: Mapped[str] = mapped_column(Text, nullable=True)
+    new_value: Mapped[str] = mapped_column(Text, nullable=True)
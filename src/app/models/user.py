@@ -1,11 +1,12 @@
 # Import required SQLAlchemy modules and types
-from sqlalchemy import String, Integer, ForeignKey
+from sqlalchemy import BigInteger, String, Integer, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Import base class for ORM models and data transfer object for user detail
 from src.app.core.database import Base
 from src.app.dtos.user_detail import UserDetail
 from src.app.models.role import Role
+from src.app.core.permissions import Permission, get_role_table
 
 # ---------------------------- User ORM Model ----------------------------
 
@@ -31,6 +32,12 @@ class User(Base):
     # Encrypted password for authentication
     password: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    # Content hash of the profile image, part of its URLs (None: the default avatar)
+    avatar_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
+
+    # Last change sequence number given to one of the user's tasks (see TaskRepositoryImpl.next_change_seq)
+    task_change_seq: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
     # Indicates whether the user account is active
     is_active: Mapped[bool] = mapped_column(default=True)
 
@@ -59,12 +66,19 @@ class User(Base):
         """
         return f"<User(id={self.id}, username={self.username}, email={self.email}, is_active={self.is_active})>"
 
+    def permissions(self) -> int:
+        """
+        Return the permission bitset of the user's role.
+        The value comes from the in-process role table, so no query is needed.
+        """
+        return get_role_table().permissions_for(self.role_id)
+
     def is_admin(self) -> bool:
         """
         Check if the user has administrative privileges.
-        For simplicity, this example assumes role_id == 1 is the admin role.
+        A user is an admin when their role is allowed to manage other users.
         """
-        return self.role_id == 1
+        return get_role_table().has_permission(self.role_id, Permission.MANAGE_USERS)
 
     def to_user_detail(self) -> UserDetail:
         """
@@ -76,4 +90,7 @@ class User(Base):
             username=self.username,
             email=self.email,
             is_admin=self.is_admin(),
+            role_id=self.role_id,
+            permissions=self.permissions(),
+            avatar_hash=self.avatar_hash,
         )
\ No newline at end of file
@@ -1,10 +1,15 @@
 # Import required modules
 import json
-from typing import Protocol, List
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Protocol, List
 
 # Import Redis client and related dependencies
+from src.app.core import cache
 from src.app.core.cache import Redis, get_redis
 from src.app.core.config import settings
+from src.app.core.metrics import CACHE_MEMORY_EVICTIONS_TOTAL, registry
 from fastapi import Depends
 
 # ---------------------------- Cache Repository Interface ----------------------------
@@ -92,11 +97,239 @@ class CacheRepositoryImpl:
 
         await self.redis_client.delete(key)
 
+# ---------------------------- In-Process Implementation ----------------------------
+
+class MemoryCacheRepository:
+    """
+    CacheRepository kept in this process' memory, for single-process deployments
+    and tests (no Redis needed).
+
+    Values are stored JSON-encoded, like in Redis, so callers never share mutable
+    objects with the cache. Entries expire after their TTL and the least recently
+    used ones are evicted beyond CACHE_MEMORY_MAX_ENTRIES or CACHE_MEMORY_MAX_BYTES.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # key -> (JSON value, expiry on the clock or None); oldest use first
+        self._entries: OrderedDict[str, tuple[str | bytes, float | None]] = OrderedDict()
+        self.size_bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------------------------- Storage ----------------------------
+
+    @staticmethod
+    def _entry_size(key: str, value: str | bytes) -> int:
+        # Size of the stored strings; the dict slot and tuple overhead is ignored
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get_raw(self, key: str) -> str | bytes | None:
+        """
+        Return the stored value of a key, or None (synchronous; also used for template fragments
+        and compressed responses).
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set_raw(self, key: str, value: str | bytes, ttl_seconds: float | None) -> None:
+        """
+        Store a string (or bytes) for `ttl_seconds` (forever if None), evicting old entries if needed.
+        """
+        self._remove(key)
+
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        expires_at = self.clock() + ttl_seconds if ttl_seconds else None
+        self._entries[key] = (value, expires_at)
+        self.size_bytes += size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= self._entry_size(key, entry[0])
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.max_entries and self.size_bytes <= self.max_bytes:
+            return
+
+        # Expired entries go first, then the least recently used
+        now = self.clock()
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at is not None and expires_at <= now]:
+            self._remove(key)
+
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+            CACHE_MEMORY_EVICTIONS_TOTAL.inc()
+
+    # ---------------------------- Session Methods ----------------------------
+
+    async def set_user_session_data(self, session_id: str, user_data: dict) -> None:
+        """
+        Store user session data for CACHE_EXPIRATION_TIME seconds.
+        """
+        self.set_raw(f"session:{session_id}", json.dumps(user_data), settings.CACHE_EXPIRATION_TIME)
+
+    async def get_user_session_data(self, session_id: str) -> dict | None:
+        """
+        Retrieve user session data by session ID.
+        """
+        user_data = self.get_raw(f"session:{session_id}")
+        return json.loads(user_data) if user_data else None
+
+    # ---------------------------- Generic Cache Methods ----------------------------
+
+    async def set(self, key: str, value: dict, ttl_seconds: int = 60) -> None:
+        """
+        Set a key-value pair with a time-to-live (TTL).
+        """
+        if not key or not value:
+            raise ValueError("Key and value are required.")
+
+        self.set_raw(key, json.dumps(value), ttl_seconds)
+
+    async def get(self, key: str) -> dict | None:
+        """
+        Retrieve a value by key.
+        """
+        if not key:
+            raise ValueError("Key is required.")
+
+        value = self.get_raw(key)
+        return json.loads(value) if value else None
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a key and its value.
+        """
+        if not key:
+            raise ValueError("Key is required.")
+
+        self._remove(key)
+
+# ---------------------------- Tiered Implementation ----------------------------
+
+class TieredCacheRepository:
+    """
+    Reads from a local in-process cache first and falls back to Redis; writes go
+    through to Redis, so every worker sees them.
+
+    Local copies live at most CACHE_LOCAL_TTL_SECONDS: a key changed or deleted
+    by another worker (e.g. a logout) can be served stale by this one for that long.
+    """
+
+    def __init__(self, local: MemoryCacheRepository, remote: CacheRepository, local_ttl_seconds: float):
+        self.local = local
+        self.remote = remote
+        self.local_ttl_seconds = local_ttl_seconds
+
+    def _local_ttl(self, ttl_seconds: float) -> float:
+        return min(ttl_seconds, self.local_ttl_seconds)
+
+    # ---------------------------- Session Methods ----------------------------
+
+    async def set_user_session_data(self, session_id: str, user_data: dict) -> None:
+        await self.remote.set_user_session_data(session_id, user_data)
+        self.local.set_raw(f"session:{session_id}", json.dumps(user_data),
+                            self._local_ttl(settings.CACHE_EXPIRATION_TIME))
+
+    async def get_user_session_data(self, session_id: str) -> dict | None:
+        user_data = await self.local.get_user_session_data(session_id)
+        if user_data is not None:
+            return user_data
+
+        user_data = await self.remote.get_user_session_data(session_id)
+        if user_data:
+            self.local.set_raw(f"session:{session_id}", json.dumps(user_data), self.local_ttl_seconds)
+        return user_data
+
+    # ---------------------------- Generic Cache Methods ----------------------------
+
+    async def set(self, key: str, value: dict, ttl_seconds: int = 60) -> None:
+        await self.remote.set(key, value, ttl_seconds)
+        await self.local.set(key, value, self._local_ttl(ttl_seconds))
+
+    async def get(self, key: str) -> dict | None:
+        value = await self.local.get(key)
+        if value is not None:
+            return value
+
+        value = await self.remote.get(key)
+        if value:
+            await self.local.set(key, value, self.local_ttl_seconds)
+        return value
+
+    async def delete(self, key: str) -> None:
+        await self.remote.delete(key)
+        await self.local.delete(key)
+
+# ---------------------------- Backend Selection ----------------------------
+
+# In-process cache of this worker ("memory" and "tiered" backends), created on first use
+_memory_cache: MemoryCacheRepository | None = None
+
+
+def get_memory_cache() -> MemoryCacheRepository:
+    """
+    Return this process' in-process cache.
+    """
+    global _memory_cache
+    if _memory_cache is None:
+        _memory_cache = MemoryCacheRepository(settings.CACHE_MEMORY_MAX_ENTRIES, settings.CACHE_MEMORY_MAX_BYTES)
+    return _memory_cache
+
+
+def build_cache_repository(backend: str | None = None) -> CacheRepository:
+    """
+    Return the cache repository of the configured backend (CACHE_BACKEND by default).
+    """
+    backend = backend or settings.CACHE_BACKEND
+
+    if backend == "memory":
+        return get_memory_cache()
+
+    redis_repository = CacheRepositoryImpl(redis_client=cache.redis or cache.init_redis())
+    if backend == "redis":
+        return redis_repository
+    if backend == "tiered":
+        return TieredCacheRepository(get_memory_cache(), redis_repository, settings.CACHE_LOCAL_TTL_SECONDS)
+
+    raise ValueError(f"Unknown CACHE_BACKEND {backend!r} (expected redis, memory or tiered).")
+
+
+# Size of the in-process cache, computed when /metrics is scraped
+registry.gauge(
+    "taskboard_cache_memory_bytes", "Approximate bytes held by the in-process cache.",
+    callback=lambda: {(): _memory_cache.size_bytes if _memory_cache else 0}
+)
+registry.gauge(
+    "taskboard_cache_memory_entries", "Entries held by the in-process cache.",
+    callback=lambda: {(): len(_memory_cache) if _memory_cache else 0}
+)
+
 # ---------------------------- Dependency Injection ----------------------------
 
-def get_cache_repository(redis_client: Redis = Depends(get_redis)) -> CacheRepositoryImpl:
+def get_cache_repository() -> CacheRepository:
     """
-    Dependency to get a CacheRepositoryImpl instance.
+    Dependency to get the cache repository of the configured backend.
     This allows it to be injected automatically in route handlers or services.
     """
-    return CacheRepositoryImpl(redis_client=redis_client)
\ No newline at end of file
+    return build_cache_repository()
@@ -0,0 +1,63 @@
+# Import type hints
+from typing import Protocol, Sequence
+
+# Import FastAPI and SQLAlchemy dependencies
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Import database session and Role model
+from src.app.core.database import get_write_db
+from src.app.models.role import Role
+
+# ---------------------------- Role Repository Protocol ----------------------------
+
+class RoleRepository(Protocol):
+    """
+    Protocol (interface) for role-related database operations.
+    """
+
+    async def list_all(self) -> Sequence[Role]: ...
+    async def update_permissions(self, role_id: int, permissions: int) -> Role | None: ...
+    pass
+
+# ---------------------------- Role Repository Implementation ----------------------------
+
+class RoleRepositoryImpl:
+    """
+    Implementation of the RoleRepository using SQLAlchemy and AsyncSession.
+    """
+
+    def __init__(self, db: AsyncSession):
+        # Store the database session
+        self.db = db
+
+    async def list_all(self) -> Sequence[Role]:
+        """
+        Return every role with its permission bitset.
+        """
+        result = await self.db.execute(select(Role))
+        return result.scalars().all()
+
+    async def update_permissions(self, role_id: int, permissions: int) -> Role | None:
+        """
+        Replace the permission bitset of a role.
+        """
+        result = await self.db.execute(select(Role).where(Role.id == role_id))
+        role = result.scalars().first()
+
+        if role is None:
+            return None
+
+        role.permissions = permissions
+        await self.db.commit()
+        await self.db.refresh(role)
+        return role
+
+# ---------------------------- Dependency Injection ----------------------------
+
+def get_role_repository(db: AsyncSession = Depends(get_write_db)) -> RoleRepositoryImpl:
+    """
+    Dependency function that returns a RoleRepository instance.
+    """
+    return RoleRepositoryImpl(db=db)
@@ -1,18 +1,32 @@
 # Import necessary modules
 import datetime
+from functools import cache
 from typing import Protocol, List, Any, Coroutine
 
 # Import SQLAlchemy components
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, delete, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
-
-# Import task-related models and schemas
-from src.app.models.task import Task
-from src.app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+from sqlalchemy.orm import aliased
+
+# Import task-related models and schemas, and the audit log of task changes
+from src.app.core.audit import TaskAuditLog, get_audit_log, task_change_records
+from src.app.models.task import Task, TaskEvent, TaskTombstone
+from src.app.models.user import User
+from src.app.schemas.task import (
+    BoardColumn,
+    ColumnPage,
+    TaskChanges,
+    TaskCreate,
+    TaskEventOut,
+    TaskHistory,
+    TaskOut,
+    TaskStatusEnum,
+    TaskUpdate,
+)
 
 # Import FastAPI dependency tools
 from fastapi import Depends
-from src.app.core.database import get_db
+from src.app.core.database import get_read_db, get_write_db
 
 # ---------------------------- Utility Function ----------------------------
 
@@ -31,7 +45,34 @@ def task_to_task_out(task: Task) -> TaskOut:
         due_date=task.due_date.date(),
         subject=task.subject,
         created_at=task.created_at.date(),
-        owner_id=task.owner_id
+        owner_id=task.owner_id,
+        change_seq=task.change_seq
+    )
+
+
+@cache
+def board_columns_query():
+    """
+    Build, once per process, the query behind the main board: a window function
+    ranks each user's tasks within their status, and only the first
+    `:per_column` of every status are returned, each with its column's total.
+    Building it costs more than running it, so the values are bound at execution.
+    """
+    ranked = (
+        select(
+            Task,
+            func.row_number().over(partition_by=Task.status, order_by=Task.id).label("position"),
+            func.count().over(partition_by=Task.status).label("column_total"),
+        )
+        .where(Task.owner_id == bindparam("user_id"))
+        .subquery()
+    )
+    ranked_task = aliased(Task, ranked)
+
+    return (
+        select(ranked_task, ranked.c.column_total)
+        .where(ranked.c.position <= bindparam("per_column"))
+        .order_by(ranked.c.position)
     )
 
 # ---------------------------- Task Repository Protocol ----------------------------
@@ -44,9 +85,16 @@ class TaskRepository(Protocol):
 
     async def get_all_tasks_by_user_id(self, user_id) -> List[TaskOut]: ...
     async def get_task_by_id_and_user_id(self, task_id, user_id) -> TaskOut | None: ...
+    async def get_board_columns(self, user_id: int, per_column: int) -> List[BoardColumn]: ...
+    async def get_column_page(self, user_id: int, status: TaskStatusEnum, after: int, limit: int) -> ColumnPage: ...
     async def create_task(self, task_data: TaskCreate, user_id: int) -> TaskOut: ...
     async def update_task(self, task_id: int, task_data: TaskUpdate) -> TaskOut: ...
+    async def update_task_status(self, task_id: int, user_id: int, status: TaskStatusEnum) -> TaskOut | None: ...
     async def delete_task_(self, task_id: int) -> bool: ...
+    async def delete_tasks_batch_by_owner(self, owner_id: int, batch_size: int) -> int: ...
+    async def get_change_cursor(self, user_id: int) -> int: ...
+    async def get_changes(self, user_id: int, since: int, limit: int) -> TaskChanges: ...
+    async def get_task_history(self, task_id: int, user_id: int, before: int | None, limit: int) -> TaskHistory: ...
 
 # ---------------------------- Task Repository Implementation ----------------------------
 
@@ -56,16 +104,20 @@ class TaskRepositoryImpl:
     This class handles all task-related database operations.
     """
 
-    def __init__(self, db: AsyncSession):
-        # Assign the database session
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None, audit_log: TaskAuditLog | None = None):
+        # Assign the database session (primary) and the session for read-only queries
+        # (a replica when configured, otherwise the same session)
         self.db = db
+        self.read_db = read_db if read_db is not None else db
+        # Committed changes are handed to the audit log (none: not audited)
+        self.audit_log = audit_log
 
     async def get_all_tasks_by_user_id(self, user_id) -> List[TaskOut]:
         """
         Retrieve all tasks that belong to a specific user.
         """
         query = select(Task).where(Task.owner_id == user_id)
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
 
         if result is None or result.scalars() is None:
             return []
@@ -82,7 +134,7 @@ class TaskRepositoryImpl:
         Retrieve a single task by its ID and the owner's user ID.
         """
         query = select(Task).where(Task.id == task_id, Task.owner_id == user_id)
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
         task = result.scalars().first()
 
         if task is None:
@@ -90,6 +142,40 @@ class TaskRepositoryImpl:
 
         return task_to_task_out(task)
 
+    async def get_board_columns(self, user_id: int, per_column: int) -> List[BoardColumn]:
+        """
+        Retrieve the first `per_column` tasks of every status column, plus each column's total,
+        in a single query (see board_columns_query).
+        """
+        result = await self.read_db.execute(board_columns_query(), {"user_id": user_id, "per_column": per_column})
+
+        columns = {status.value: BoardColumn(status=status, total=0, tasks=[]) for status in TaskStatusEnum}
+        for task, column_total in result.all():
+            column = columns.get(task.status)
+            if column is None:
+                continue
+            column.total = column_total
+            column.tasks.append(task_to_task_out(task))
+
+        return list(columns.values())
+
+    async def get_column_page(self, user_id: int, status: TaskStatusEnum, after: int, limit: int) -> ColumnPage:
+        """
+        Retrieve the tasks of one board column with an ID above `after`, in the order
+        of the board (by ID), to complete a column rendered with its first page only.
+        """
+        query = (
+            select(Task)
+            .where(Task.owner_id == user_id, Task.status == status.value, Task.id > after)
+            .order_by(Task.id)
+            .limit(limit + 1)
+        )
+        result = await self.read_db.execute(query)
+        tasks = [task_to_task_out(task) for task in result.scalars()]
+
+        has_more = len(tasks) > limit
+        return ColumnPage(tasks=tasks[:limit], next_after=tasks[limit - 1].id if has_more else None)
+
     async def create_task(self, task_data: TaskCreate, user_id: int) -> TaskOut:
         """
         Create a new task and assign it to a specific user.
@@ -103,15 +189,21 @@ class TaskRepositoryImpl:
             status=task_data.status,
             due_date=task_data.due_date,
             created_at=datetime.date.today(),
-            subject=task_data.subject
+            subject=task_data.subject,
+            change_seq=await self.next_change_seq(user_id)
         )
 
         # Add the new task to the session and commit
         self.db.add(task)
+        await self.db.flush()
+        # SQLite may reuse the ID of a deleted task: its tombstone would announce the new one as deleted
+        await self.db.execute(delete(TaskTombstone).where(TaskTombstone.task_id == task.id))
         await self.db.commit()
         await self.db.refresh(task)
 
-        return TaskOut.model_validate(task)
+        created = TaskOut.model_validate(task)
+        await self.audit(None, created)
+        return created
 
     async def update_task(self, task_id: int, task_data: TaskUpdate) -> TaskOut | None:
         """
@@ -124,7 +216,10 @@ class TaskRepositoryImpl:
         if task is None:
             return None
 
+        before = task_to_task_out(task)
+
         # Apply updates
+        task.change_seq = await self.next_change_seq(task.owner_id)
         task.title = task_data.title
         task.description = task_data.description
         task.is_completed = task_data.completed
@@ -140,7 +235,34 @@ class TaskRepositoryImpl:
         # Ensure that created_at is in date format
         task.created_at = task.created_at.date()
 
-        return TaskOut.model_validate(task)
+        updated = TaskOut.model_validate(task)
+        await self.audit(before, updated)
+        return updated
+
+    async def update_task_status(self, task_id: int, user_id: int, status: TaskStatusEnum) -> TaskOut | None:
+        """
+        Set the status of a user's task. Nothing is written when it already has that status
+        (a card dragged away and back within a coalescing window).
+        """
+        query = select(Task).where(Task.id == task_id, Task.owner_id == user_id)
+        result = await self.db.execute(query)
+        task = result.scalars().first()
+
+        if task is None:
+            return None
+        if task.status == status.value:
+            return task_to_task_out(task)
+
+        before = task_to_task_out(task)
+        task.change_seq = await self.next_change_seq(task.owner_id)
+        task.status = status.value
+
+        await self.db.commit()
+        await self.db.refresh(task)
+
+        updated = task_to_task_out(task)
+        await self.audit(before, updated)
+        return updated
 
     async def delete_task_(self, task_id: int) -> bool:
         """
@@ -154,16 +276,135 @@ class TaskRepositoryImpl:
         if task is None:
             return False
 
+        before = task_to_task_out(task)
+
+        # Leave a tombstone, so clients syncing changes learn about the deletion
+        # (merged: replaces one left by an earlier task with the same ID)
+        await self.db.merge(TaskTombstone(
+            task_id=task.id, owner_id=task.owner_id, change_seq=await self.next_change_seq(task.owner_id)
+        ))
         await self.db.delete(task)
         await self.db.commit()
 
+        await self.audit(before, None)
         return True
 
+    async def delete_tasks_batch_by_owner(self, owner_id: int, batch_size: int) -> int:
+        """
+        Delete at most `batch_size` tasks of a user in a single short transaction.
+        Rows are deleted with one statement, without loading them into the session.
+        Returns the number of deleted tasks (0 when none are left).
+        """
+        batch_ids = (
+            select(Task.id)
+            .where(Task.owner_id == owner_id)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(delete(Task).where(Task.id.in_(batch_ids)))
+        await self.db.commit()
+
+        return result.rowcount or 0
+
+    # ---------------------------- Change Tracking ----------------------------
+
+    async def next_change_seq(self, owner_id: int) -> int:
+        """
+        Take the next number of a user's change sequence, in the current transaction.
+        The UPDATE locks the user's row until commit, so the changes of one user commit
+        in sequence order: once a number is visible, no smaller one can appear later.
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.id == owner_id)
+            .values(task_change_seq=User.task_change_seq + 1)
+            .returning(User.task_change_seq)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one()
+
+    async def get_change_cursor(self, user_id: int) -> int:
+        """
+        Return the last change sequence number of a user: a cursor covering every committed change.
+        """
+        result = await self.read_db.execute(select(User.task_change_seq).where(User.id == user_id))
+        return result.scalar_one_or_none() or 0
+
+    async def get_changes(self, user_id: int, since: int, limit: int) -> TaskChanges:
+        """
+        Return the tasks changed and deleted after the cursor `since`, at most `limit` of them.
+        Both lookups use the (owner_id, change_seq) indexes, so the cost grows with the
+        number of changes, not with the size of the board.
+        """
+        # Every change up to the user's current number is committed; later ones are left for the next call
+        horizon = await self.get_change_cursor(user_id)
+        if horizon <= since:
+            return TaskChanges(tasks=[], deleted=[], cursor=since, has_more=False)
+
+        changed = await self.read_db.execute(
+            select(Task)
+            .where(Task.owner_id == user_id, Task.change_seq > since, Task.change_seq <= horizon)
+            .order_by(Task.change_seq)
+            .limit(limit + 1)
+        )
+        tombstones = await self.read_db.execute(
+            select(TaskTombstone.change_seq, TaskTombstone.task_id)
+            .where(TaskTombstone.owner_id == user_id, TaskTombstone.change_seq > since, TaskTombstone.change_seq <= horizon)
+            .order_by(TaskTombstone.change_seq)
+            .limit(limit + 1)
+        )
+
+        # Merge both in change order and keep the first page
+        entries = sorted(
+            [(task.change_seq, task_to_task_out(task), None) for task in changed.scalars()]
+            + [(change_seq, None, task_id) for change_seq, task_id in tombstones.all()],
+            key=lambda entry: entry[0],
+        )
+        page = entries[:limit]
+        has_more = len(entries) > limit
+
+        return TaskChanges(
+            tasks=[task for _, task, _ in page if task is not None],
+            deleted=[task_id for _, _, task_id in page if task_id is not None],
+            cursor=page[-1][0] if has_more else horizon,
+            has_more=has_more,
+        )
+
+    # ---------------------------- Audit ----------------------------
+
+    async def audit(self, before: TaskOut | None, after: TaskOut | None) -> None:
+        """
+        Hand a committed change to the audit log, which writes it in the background.
+        Only owners change their tasks, so the owner is recorded as the actor.
+        """
+        if self.audit_log is not None:
+            task = after or before
+            await self.audit_log.record(task_change_records(before, after, actor_id=task.owner_id))
+
+    async def get_task_history(self, task_id: int, user_id: int, before: int | None, limit: int) -> TaskHistory:
+        """
+        Return the recorded changes of a user's task, newest first, older than the event `before`.
+        Changes appear once the audit log has written them (within about AUDIT_FLUSH_SECONDS).
+        """
+        query = select(TaskEvent).where(TaskEvent.task_id == task_id, TaskEvent.owner_id == user_id)
+        if before is not None:
+            query = query.where(TaskEvent.id < before)
+
+        result = await self.read_db.execute(query.order_by(TaskEvent.id.desc()).limit(limit + 1))
+        events = [TaskEventOut.model_validate(event) for event in result.scalars()]
+
+        has_more = len(events) > limit
+        return TaskHistory(events=events[:limit], next_before=events[limit - 1].id if has_more else None)
+
 # ---------------------------- Dependency Provider ----------------------------
 
-def get_task_repository(db: AsyncSession = Depends(get_db)) -> TaskRepository:
+def get_task_repository(
+    db: AsyncSession = Depends(get_write_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    audit_log: TaskAuditLog = Depends(get_audit_log)
+) -> TaskRepository:
     """
     Dependency function that returns an instance of TaskRepositoryImpl.
     This allows it to be injected into services or endpoints.
     """
-    return TaskRepositoryImpl(db=db)
\ No newline at end of file
+    return TaskRepositoryImpl(db=db, read_db=read_db, audit_log=audit_log)
\ No newline at end of file
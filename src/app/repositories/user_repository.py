@@ -3,11 +3,11 @@ from typing import Protocol, Sequence
 
 # Import FastAPI and SQLAlchemy dependencies
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import database session and User model
-from src.app.core.database import get_db
+from src.app.core.database import get_read_db, get_write_db
 from src.app.models.user import User
 
 # ---------------------------- User Repository Protocol ----------------------------
@@ -25,6 +25,8 @@ class UserRepository(Protocol):
     async def get_user_by_id(self, user_id: int) -> User | None: ...
     async def update_user(self, user: User) -> User: ...
     async def delete_user(self, user_id: int) -> User | None: ...
+    async def deactivate_user(self, user_id: int) -> bool: ...
+    async def set_avatar_hash(self, user_id: int, avatar_hash: str | None) -> bool: ...
     pass
 
 # ---------------------------- User Repository Implementation ----------------------------
@@ -35,9 +37,11 @@ class UserRepositoryImpl:
     Provides full CRUD operations for the User model.
     """
 
-    def __init__(self, db: AsyncSession):
-        # Store the database session
+    def __init__(self, db: AsyncSession, read_db: AsyncSession | None = None):
+        # Store the database session (primary) and the session for read-only listings
+        # (a replica when configured, otherwise the same session)
         self.db = db
+        self.read_db = read_db if read_db is not None else db
 
     async def create(self, user: User) -> User:
         """
@@ -52,7 +56,7 @@ class UserRepositoryImpl:
         """
         Return a list of all users from the database.
         """
-        result = await self.db.execute(select(User))
+        result = await self.read_db.execute(select(User))
         return result.scalars().all()
 
     async def get_by_username(self, username: str) -> User | None:
@@ -90,15 +94,41 @@ class UserRepositoryImpl:
         """
         user = await self.get_user_by_id(user_id)
         if user:
-            await self.db.delete(user)
+            # Delete with a single statement so the tasks relationship is never loaded
+            await self.db.execute(delete(User).where(User.id == user_id))
             await self.db.commit()
         return user
 
+    async def deactivate_user(self, user_id: int) -> bool:
+        """
+        Mark a user as inactive without loading it.
+        Returns True if the user exists.
+        """
+        result = await self.db.execute(
+            update(User).where(User.id == user_id).values(is_active=False)
+        )
+        await self.db.commit()
+        return bool(result.rowcount)
+
+    async def set_avatar_hash(self, user_id: int, avatar_hash: str | None) -> bool:
+        """
+        Store the content hash of a user's profile image.
+        Returns False when the user does not exist.
+        """
+        result = await self.db.execute(
+            update(User).where(User.id == user_id).values(avatar_hash=avatar_hash)
+        )
+        await self.db.commit()
+        return bool(result.rowcount)
+
 # ---------------------------- Dependency Injection ----------------------------
 
-def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepositoryImpl:
+def get_user_repository(
+    db: AsyncSession = Depends(get_write_db), read_db: AsyncSession = Depends(get_read_db)
+) -> UserRepositoryImpl:
     """
     Dependency function that returns a UserRepository instance.
     Allows automatic injection in services and routes.
+    Lookups used by login and account changes stay on the primary; only listings may use a replica.
     """
-    return UserRepositoryImpl(db=db)
\ No newline at end of file
+    return UserRepositoryImpl(db=db, read_db=read_db)
\ No newline at end of file
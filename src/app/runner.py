@@ -0,0 +1,146 @@
+# Import standard libraries for process management and CPU detection
+import gc
+import logging
+import os
+
+# Import application settings for the bind address, port and worker count, and the cache backend check
+from src.app.core.cache import redis_enabled
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Import path of the application factory
+APP_FACTORY = "src.app.main:create_app"
+
+# ---------------------------- Tuning ----------------------------
+
+def available_cpus() -> int:
+    """
+    Return the number of CPUs this process may run on (respects container CPU sets).
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """
+    Return the number of worker processes: WEB_WORKERS, or one per available CPU.
+    Each worker runs its own event loop, so more workers than CPUs only adds contention.
+    With CACHE_BACKEND=memory sessions live in one process, so there is always a single worker.
+    """
+    if not redis_enabled():
+        if settings.WEB_WORKERS not in (None, 1):
+            logger.warning("CACHE_BACKEND=memory keeps sessions in one process: ignoring WEB_WORKERS=%d, running 1 worker",
+                           settings.WEB_WORKERS)
+        return 1
+    return settings.WEB_WORKERS or available_cpus()
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def event_loop() -> str:
+    """
+    Return the fastest event loop available: uvloop (installed by uvicorn[standard]) or asyncio.
+    """
+    return "uvloop" if _installed("uvloop") else "asyncio"
+
+
+def http_protocol() -> str:
+    """
+    Return the fastest HTTP parser available: httptools or h11.
+    """
+    return "httptools" if _installed("httptools") else "h11"
+
+# ---------------------------- Gunicorn (pre-fork) ----------------------------
+
+def run_gunicorn(workers: int) -> None:
+    """
+    Serve with gunicorn and uvicorn workers. The app is imported once in the
+    parent (preload) and forked; pools are opened per worker by the lifespan.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    def when_ready(server):
+        # The app is loaded: freeze it, then let the arbiter collect its own garbage again
+        gc.freeze()
+        gc.enable()
+
+    def pre_fork(server, worker):
+        # Move every object allocated so far (modules, routes, templates) to a
+        # permanent generation the collector never scans, so the first GC in a
+        # worker does not write to these pages and break copy-on-write sharing
+        gc.freeze()
+
+    def post_fork(server, worker):
+        gc.enable()
+
+    class TaskBoardApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{settings.WEB_HOST}:{settings.WEB_PORT}",
+                "workers": workers,
+                # UvicornWorker picks uvloop and httptools automatically when installed
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "graceful_timeout": settings.SHUTDOWN_DRAIN_SECONDS + 10,
+                "when_ready": when_ready,
+                "pre_fork": pre_fork,
+                "post_fork": post_fork,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # The app built on import of main (building another one would do the work twice)
+            from src.app.main import app
+            return app
+
+    # No collection while the parent builds the app: objects stay compact until frozen
+    gc.disable()
+    TaskBoardApplication().run()
+
+# ---------------------------- Uvicorn ----------------------------
+
+def run_uvicorn(workers: int) -> None:
+    """
+    Serve with uvicorn's own process manager. Workers are spawned, not forked,
+    so each imports the app itself and there is no memory to share.
+    """
+    import uvicorn
+
+    uvicorn.run(
+        APP_FACTORY,
+        factory=True,
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=workers,
+        loop=event_loop(),
+        http=http_protocol(),
+        timeout_graceful_shutdown=int(settings.SHUTDOWN_DRAIN_SECONDS) + 10,
+    )
+
+
+def main() -> None:
+    """
+    Start the server: gunicorn with preloading when it is installed, uvicorn otherwise.
+    """
+    workers = worker_count()
+
+    if _installed("gunicorn"):
+        logger.info("Starting gunicorn with %d workers", workers)
+        run_gunicorn(workers)
+    else:
+        logger.info("Starting uvicorn with %d workers (%s, %s)", workers, event_loop(), http_protocol())
+        run_uvicorn(workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-# Import date class for due dates and creation dates
-from datetime import date
+# Import date classes for due dates, creation dates and event timestamps
+from datetime import date, datetime
 
 # Import Enum to define fixed status values
 from enum import Enum
@@ -81,7 +81,68 @@ class TaskOut(TaskBase):
     id: int                      # Unique identifier of the task
     created_at: date            # Date when the task was created
     owner_id: int               # ID of the user who created or owns the task
+    change_seq: int = 0         # Position of the last change in the owner's change sequence
 
     class Config:
         from_attributes = True  # Enables model creation from ORM-like objects (Pydantic v2)
-        orm_mode = True         # Compatibility with SQLAlchemy ORM models
\ No newline at end of file
+        orm_mode = True         # Compatibility with SQLAlchemy ORM models
+
+# ---------------------------- BOARD SCHEMA: BoardColumn ----------------------------
+
+class BoardColumn(BaseModel):
+    """
+    One column of the main board: the first page of the user's tasks with a given status.
+    """
+
+    status: TaskStatusEnum      # Status shown by the column
+    total: int                  # Number of tasks of the user in this column
+    tasks: list[TaskOut]        # First tasks of the column, ordered by ID
+
+
+class ColumnPage(BaseModel):
+    """
+    The next tasks of a board column, after those the client has.
+    """
+
+    tasks: list[TaskOut]        # Tasks of the column, ordered by ID
+    next_after: int | None      # Send as `after` for the next page; None on the last page
+
+# ---------------------------- DELTA SYNC SCHEMA: TaskChanges ----------------------------
+
+class TaskChanges(BaseModel):
+    """
+    Changes to a user's tasks after a cursor, in change order.
+    """
+
+    tasks: list[TaskOut]        # Created or updated tasks, in their current state
+    deleted: list[int]          # IDs of deleted tasks
+    cursor: int                 # Cursor to send as `since` next time
+    has_more: bool              # True when the page was full: ask again from `cursor`
+
+# ---------------------------- AUDIT SCHEMAS: TaskEventOut, TaskHistory ----------------------------
+
+class TaskEventOut(BaseModel):
+    """
+    One recorded change to a task.
+    """
+
+    id: int                     # Increasing ID of the event
+    occurred_at: datetime       # When the change was committed (UTC)
+    task_id: int                # Task that changed
+    actor_id: int | None        # User who made the change
+    action: str                 # "created", "updated" or "deleted"
+    field: str | None           # Field that changed ("updated" only)
+    old_value: str | None       # Previous value, as text
+    new_value: str | None       # New value, as text
+
+    class Config:
+        from_attributes = True  # Enables model creation from ORM-like objects (Pydantic v2)
+
+
+class TaskHistory(BaseModel):
+    """
+    A page of a task's history, newest first.
+    """
+
+    events: list[TaskEventOut]  # Changes, newest first
+    next_before: int | None     # Send as `before` for the next (older) page; None on the last page
@@ -1,4 +1,5 @@
-# Importing the user detail data structure and the cache repository interface
+# Importing the user detail data structure, metrics and the cache repository interface
+from src.app.core.metrics import CACHE_REQUESTS_TOTAL
 from src.app.dtos.user_detail import UserDetail
 from src.app.repositories.cache_repository import CacheRepository, get_cache_repository
 
@@ -50,9 +51,11 @@ class CacheService:
         user_data = await self.cache_repository.get_user_session_data(session_id)
 
         if user_data:
+            CACHE_REQUESTS_TOTAL.inc(operation="session", result="hit")
             # Deserialize the dictionary back to a UserDetail object
             return UserDetail(**user_data)
 
+        CACHE_REQUESTS_TOTAL.inc(operation="session", result="miss")
         return None
 
     async def set(self, key: str, value: dict, ttl_seconds: int = 60) -> None:
@@ -82,7 +85,9 @@ class CacheService:
         if not key:
             raise ValueError("Key is required.")
 
-        return await self.cache_repository.get(key)
+        value = await self.cache_repository.get(key)
+        CACHE_REQUESTS_TOTAL.inc(operation="get", result="hit" if value is not None else "miss")
+        return value
 
     async def delete(self, key: str) -> None:
         """
@@ -1,10 +1,8 @@
-# Import the bcrypt library for password hashing
-import bcrypt
-
 # Import FastAPI dependency injection utility
 from fastapi import Depends
 
-# Import the User model and repository dependencies
+# Import the password helpers, the User model and repository dependencies
+from src.app.core.security import verify_password
 from src.app.models.user import User
 from src.app.repositories.user_repository import UserRepository, get_user_repository
 
@@ -39,8 +37,12 @@ class LoginService:
         if not user or not isinstance(user.password, str):
             return None
 
+        # Inactive users (e.g. accounts being deleted) cannot log in
+        if getattr(user, "is_active", True) is False:
+            return None
+
         # Check if the provided password matches the hashed password
-        password_matches = bcrypt.checkpw(password.encode(), user.password.encode())
+        password_matches = await verify_password(password, user.password)
 
         # Return user object only if passwords match
         if password_matches:
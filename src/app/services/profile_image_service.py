@@ -0,0 +1,170 @@
+# Import standard libraries for file moves and temporary directories
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+# Import FastAPI's dependency injection
+from fastapi import Depends
+
+# Import application settings, avatar versions, the image process pool and the upload type
+from src.app.core.avatars import content_version
+from src.app.core.config import settings
+from src.app.core.images import InvalidImageError, render_profile_variants, run_in_image_pool
+from src.app.core.jobs import JobQueue, get_job_queue, job
+from src.app.core.uploads import ReceivedFile
+
+logger = logging.getLogger(__name__)
+
+# Background job deleting the replaced versions of a profile image
+REMOVE_OLD_VERSIONS_JOB = "profile_images.remove_old_versions"
+
+# --------------------------- SERVICE CLASS ---------------------------
+
+class ProfileImageService:
+    """
+    This service stores profile images: every upload is resized into the
+    PROFILE_IMAGE_VARIANTS files, stored under the content hash that versions their
+    URLs (see core/avatars.py). The original is dropped, so pages never download a
+    full-size upload.
+    """
+
+    def __init__(self, directory: str | Path, job_queue: JobQueue | None = None):
+        """
+        Initialize the ProfileImageService.
+
+        :param directory: Directory holding one sub-directory of images per user ID.
+        :param job_queue: Queue of the job removing replaced versions (without one, they are removed inline).
+        """
+        self.directory = Path(directory)
+        self.job_queue = job_queue
+
+    @asynccontextmanager
+    async def staging_directory(self) -> AsyncIterator[Path]:
+        """
+        Yield a private directory to receive an upload into, removed on exit.
+        It is inside the images directory, so finished files are moved to their
+        place with an atomic rename.
+        """
+        staging = await asyncio.to_thread(self._create_staging_directory)
+        try:
+            yield staging
+        finally:
+            # A few small files: removed directly, so this also runs when the request is cancelled
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _create_staging_directory(self) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(dir=self.directory, prefix=".staging-"))
+
+    async def save_profile_image(self, user_id: int, upload: ReceivedFile) -> str:
+        """
+        Resize an upload in the image process pool, then store the variants under
+        their content hash: <directory>/<user_id>/<version>/<variant>.
+        Older versions stay until remove_other_versions is called, so pages that
+        still point at them keep working until the new version is recorded.
+
+        :param user_id: ID of the user the image belongs to.
+        :param upload: The file received into a staging directory of this service.
+        :return: The version (content hash) of the stored image.
+        :raises InvalidImageError: When the upload is not a valid PNG.
+        """
+        if not user_id or not isinstance(user_id, int):
+            raise ValueError("User ID must be a positive integer.")
+
+        variants = upload.path.parent / "variants"
+        await asyncio.to_thread(variants.mkdir)
+        await run_in_image_pool("profile_image", render_profile_variants, str(upload.path), str(variants))
+        return await asyncio.to_thread(self._publish, variants, self.directory / str(user_id))
+
+    async def remove_other_versions(self, user_id: int, keep: str | None) -> None:
+        """
+        Delete every stored image of a user except the `keep` version.
+        """
+        await asyncio.to_thread(self._remove_other_versions, self.directory / str(user_id), keep)
+
+    async def schedule_removal_of_other_versions(self, user_id: int, keep: str | None) -> None:
+        """
+        Delete every stored image of a user except the `keep` version, in a background job.
+        """
+        if self.job_queue is None:
+            await self.remove_other_versions(user_id, keep)
+            return
+        await self.job_queue.enqueue(REMOVE_OLD_VERSIONS_JOB, user_id=user_id, keep=keep)
+
+    @staticmethod
+    def _publish(variants: Path, user_directory: Path) -> str:
+        version = content_version(variants)
+        target = user_directory / version
+        user_directory.mkdir(parents=True, exist_ok=True)
+        # Renaming a directory is atomic: a version appears with all of its files.
+        # The same image uploaded again already has its directory.
+        if not target.exists():
+            os.rename(variants, target)
+        return version
+
+    @staticmethod
+    def _remove_other_versions(user_directory: Path, keep: str | None) -> None:
+        if not user_directory.is_dir():
+            return
+        for path in user_directory.iterdir():
+            if path.name == keep:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                # Files of the layout without versions
+                path.unlink(missing_ok=True)
+
+# ------------------------- EXISTING IMAGES -------------------------
+
+def backfill_profile_versions(directory: str | Path) -> dict[int, str]:
+    """
+    Store a versioned copy of the profile images saved before URLs were versioned
+    (files directly in the user's directory); used by `python -m src.app.assets avatars`,
+    which then records the versions and removes the old files.
+    Runs synchronously, one image at a time; invalid images are logged and skipped.
+
+    :param directory: Directory holding one sub-directory of images per user ID.
+    :return: The version of every converted image, by user ID.
+    """
+    directory = Path(directory)
+    versions = {}
+    for user_directory in sorted(directory.iterdir()):
+        # The largest file available is resized: user@2x.png when it was already resized
+        sources = [user_directory / name for name in ("user@2x.png", "user.png")]
+        source = next((path for path in sources if path.is_file()), None)
+        if not user_directory.name.isdigit() or source is None:
+            continue
+
+        staging = Path(tempfile.mkdtemp(dir=directory, prefix=".staging-"))
+        try:
+            render_profile_variants(str(source), str(staging))
+            versions[int(user_directory.name)] = ProfileImageService._publish(staging, user_directory)
+        except InvalidImageError as exc:
+            logger.warning("Skipping the profile image of user %s: %s", user_directory.name, exc)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return versions
+
+# ------------------------- DEPENDENCY PROVIDER -------------------------
+
+def get_profile_image_service(job_queue: JobQueue = Depends(get_job_queue)) -> ProfileImageService:
+    """
+    Dependency injection function to provide a ProfileImageService instance.
+
+    :return: ProfileImageService storing images in PROFILE_IMAGE_DIR.
+    """
+    return ProfileImageService(settings.PROFILE_IMAGE_DIR, job_queue=job_queue)
+
+
+@job(REMOVE_OLD_VERSIONS_JOB)
+async def remove_old_profile_versions(user_id: int, keep: str | None) -> None:
+    """
+    Background job deleting the versions of a profile image that were replaced.
+    """
+    await ProfileImageService(settings.PROFILE_IMAGE_DIR).remove_other_versions(user_id, keep)
@@ -0,0 +1,126 @@
+# Import standard libraries for async tasks and logging
+import asyncio
+import logging
+
+# Import FastAPI dependency injection utility and the Redis client type
+from fastapi import Depends
+from redis.asyncio import Redis
+
+# Import core modules for database sessions, Redis and the permission table
+from src.app.core.cache import get_redis, redis_enabled
+from src.app.core.database import SessionLocal, get_engine
+from src.app.core.permissions import RolePermissionTable, get_role_table, set_role_table
+from src.app.models.role import Role
+from src.app.repositories.role_repository import RoleRepository, RoleRepositoryImpl, get_role_repository
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel used to tell every worker that a role changed
+ROLE_CHANGES_CHANNEL = "roles:changed"
+
+# Seconds to wait before re-subscribing after the Redis connection drops
+LISTENER_RETRY_SECONDS = 5
+
+# ---------------------------- CLASS: RoleService ----------------------------
+
+class RoleService:
+    """
+    This service keeps the in-process role permission table in sync with the database.
+    """
+
+    def __init__(self, role_repository: RoleRepository, redis_client: Redis | None = None):
+        """
+        Initialize the service with a role repository and an optional Redis client
+        used to notify other workers about role changes.
+        """
+        self.role_repository = role_repository
+        self.redis_client = redis_client
+
+    async def load_role_table(self) -> RolePermissionTable:
+        """
+        Read every role from the database and install a new permission table.
+
+        :return: The table now in use by this process.
+        """
+        roles = await self.role_repository.list_all()
+        table = RolePermissionTable.from_roles(roles, version=get_role_table().version + 1)
+        set_role_table(table)
+
+        logger.info("Role table loaded: %d roles (version %d)", len(table), table.version)
+        return table
+
+    async def update_role_permissions(self, role_id: int, permissions: int) -> Role | None:
+        """
+        Change the permissions of a role, reload the local table and notify the other workers.
+
+        :param role_id: ID of the role to change.
+        :param permissions: New permission bitset.
+        :return: The updated role, or None if it does not exist.
+        """
+        role = await self.role_repository.update_permissions(role_id, permissions)
+        if role is None:
+            return None
+
+        await self.load_role_table()
+        await self.notify_role_changed(role_id)
+
+        return role
+
+    async def notify_role_changed(self, role_id: int) -> None:
+        """
+        Publish a role change so every worker reloads its table.
+
+        :param role_id: ID of the role that changed.
+        """
+        if self.redis_client is None:
+            return
+
+        await self.redis_client.publish(ROLE_CHANGES_CHANNEL, str(role_id))
+
+# ---------------------------- Background Helpers ----------------------------
+
+async def reload_role_table() -> RolePermissionTable:
+    """
+    Reload the role table using a dedicated database session.
+    Used at startup and by the change listener, outside of any request.
+    """
+    get_engine()
+    async with SessionLocal() as session:
+        service = RoleService(role_repository=RoleRepositoryImpl(db=session))
+        return await service.load_role_table()
+
+
+async def listen_for_role_changes(redis_client: Redis) -> None:
+    """
+    Subscribe to role change notifications and reload the table on every message.
+    Runs until cancelled; reconnects if the Redis connection drops.
+
+    :param redis_client: Redis client used for the subscription.
+    """
+    while True:
+        try:
+            async with redis_client.pubsub() as pubsub:
+                await pubsub.subscribe(ROLE_CHANGES_CHANNEL)
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+
+                    logger.info("Role %s changed, reloading role table", message.get("data"))
+                    await reload_role_table()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Role change listener failed, retrying in %ds", LISTENER_RETRY_SECONDS)
+            await asyncio.sleep(LISTENER_RETRY_SECONDS)
+
+# ------------------------ DEPENDENCY INJECTION ------------------------
+
+def get_role_service(
+    role_repository: RoleRepository = Depends(get_role_repository),
+    redis_client: Redis = Depends(get_redis)
+) -> RoleService:
+    """
+    Dependency function to provide an instance of RoleService.
+    """
+    return RoleService(role_repository=role_repository, redis_client=redis_client if redis_enabled() else None)
@@ -1,9 +1,17 @@
 # Import necessary types and modules
+from contextlib import AbstractAsyncContextManager, nullcontext
 from typing import List
 from src.app.dtos.user_detail import UserDetail
-from src.app.repositories.task_repository import TaskRepository, get_task_repository
+from src.app.repositories.task_repository import TaskRepository, TaskRepositoryImpl, get_task_repository
 from fastapi import Depends
-from src.app.schemas.task import TaskOut, TaskCreate, TaskUpdate, TaskStatusEnum
+from redis.asyncio import Redis
+from src.app.core.audit import audit_log
+from src.app.core.board_events import encode_board_event, publish_board_event
+from src.app.core.cache import get_redis, redis_enabled
+from src.app.core.config import settings
+from src.app.core.database import SessionLocal, get_engine
+from src.app.core.status_coalescer import TaskStatusCoalescer
+from src.app.schemas.task import BoardColumn, ColumnPage, TaskChanges, TaskHistory, TaskOut, TaskCreate, TaskUpdate, TaskStatusEnum
 
 # --------------------------- SERVICE CLASS ---------------------------
 
@@ -13,11 +21,20 @@ class TaskService:
     It interacts with the task repository to manage task operations for users.
     """
 
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        redis_client: Redis | None = None,
+        status_coalescer: TaskStatusCoalescer | None = None
+    ):
         """
-        Initialize the TaskService with a TaskRepository instance.
+        Initialize the TaskService with a TaskRepository instance and an optional
+        Redis client used to push board changes to every worker (see core/board_events.py).
+        The status coalescer is only needed to queue status changes (queue_task_status).
         """
         self.task_repository = task_repository
+        self.redis_client = redis_client
+        self.status_coalescer = status_coalescer
 
     async def get_tasks(self, owner_id: int) -> List[TaskOut]:
         """
@@ -37,6 +54,101 @@ class TaskService:
 
         return await self.task_repository.get_all_tasks_by_user_id(owner_id)
 
+    async def get_board(self, owner_id: int, per_column: int) -> List[BoardColumn]:
+        """
+        Retrieve the first page of tasks of every board column for a given user.
+
+        :param owner_id: ID of the user whose board is rendered.
+        :param per_column: Maximum number of tasks returned per column.
+        :return: One BoardColumn per status, in TaskStatusEnum order.
+        """
+        if not owner_id:
+            raise ValueError("User id is required.")
+
+        if not isinstance(owner_id, int):
+            raise TypeError("User ID must be an integer.")
+
+        if per_column < 1:
+            raise ValueError("At least one task per column is required.")
+
+        return await self.task_repository.get_board_columns(owner_id, per_column)
+
+    async def get_column_page(self, owner_id: int, status: TaskStatusEnum, after: int, limit: int) -> ColumnPage:
+        """
+        Retrieve the next tasks of a board column, after the last one the client has.
+
+        :param owner_id: ID of the board's owner.
+        :param status: Status of the column.
+        :param after: ID of the last task the client has in the column (0: from the start).
+        :param limit: Maximum number of tasks returned.
+        :return: ColumnPage with the ID to continue from.
+        """
+        if not owner_id:
+            raise ValueError("User id is required.")
+
+        if not isinstance(after, int) or after < 0:
+            raise ValueError("The task ID to continue from must be a non-negative integer.")
+
+        if limit < 1:
+            raise ValueError("At least one task per page is required.")
+
+        return await self.task_repository.get_column_page(owner_id, status, after, limit)
+
+    async def get_change_cursor(self, owner_id: int) -> int:
+        """
+        Retrieve the cursor of everything changed so far on a user's board.
+        Read it before the board itself: changes made in between are then sent again, never missed.
+
+        :param owner_id: ID of the board's owner.
+        :return: Cursor for get_changes.
+        """
+        if not owner_id:
+            raise ValueError("User id is required.")
+
+        return await self.task_repository.get_change_cursor(owner_id)
+
+    async def get_changes(self, owner_id: int, since: int, limit: int) -> TaskChanges:
+        """
+        Retrieve the tasks created, updated and deleted after a cursor.
+
+        :param owner_id: ID of the board's owner.
+        :param since: Cursor returned by get_change_cursor or a previous call (0: everything).
+        :param limit: Maximum number of changes returned.
+        :return: TaskChanges with the next cursor.
+        """
+        if not owner_id:
+            raise ValueError("User id is required.")
+
+        if not isinstance(since, int) or since < 0:
+            raise ValueError("The cursor must be a non-negative integer.")
+
+        if limit < 1:
+            raise ValueError("At least one change per page is required.")
+
+        return await self.task_repository.get_changes(owner_id, since, limit)
+
+    async def get_task_history(self, task_id: int, owner_id: int, before: int | None, limit: int) -> TaskHistory:
+        """
+        Retrieve the recorded changes of a task, newest first.
+        The history is kept after the task is deleted.
+
+        :param task_id: ID of the task.
+        :param owner_id: ID of the user who owns (or owned) the task.
+        :param before: ID of the oldest event of the previous page (None: newest first).
+        :param limit: Maximum number of events returned.
+        :return: TaskHistory with the cursor of the next page.
+        """
+        if not owner_id:
+            raise ValueError("User id is required.")
+
+        if not task_id:
+            raise ValueError("Task id is required.")
+
+        if limit < 1:
+            raise ValueError("At least one event per page is required.")
+
+        return await self.task_repository.get_task_history(task_id, owner_id, before, limit)
+
     async def get_task_by_id(self, task_id: int, owner_id: int) -> TaskOut | None:
         """
         Retrieve a specific task by its ID for a given user.
@@ -73,7 +185,9 @@ class TaskService:
         if not self.task_repository:
             raise ValueError("Task repository is not initialized.")
 
-        return await self.task_repository.create_task(task_data, owner_id)
+        task = await self.task_repository.create_task(task_data, owner_id)
+        await self.notify_board(task.owner_id, encode_board_event("task.created", task=task.model_dump(mode="json")))
+        return task
 
     async def update_task(self, task_data: TaskUpdate, owner_id: int) -> TaskOut:
         """
@@ -99,7 +213,12 @@ class TaskService:
         if not self.task_repository.get_task_by_id_and_user_id(task_data.id, owner_id):
             raise ValueError(f"Task with ID {task_data.id} not found for user {owner_id}.")
 
-        return await self.task_repository.update_task(task_data.id, task_data)
+        # Status changes queued before this update must not be written over it later
+        async with self.direct_write(task_data.id):
+            task = await self.task_repository.update_task(task_data.id, task_data)
+        if task:
+            await self.notify_board(task.owner_id, encode_board_event("task.updated", task=task.model_dump(mode="json")))
+        return task
 
     async def update_task_status(self, task_id: int, status: TaskStatusEnum, owner_id: int) -> TaskOut:
         """
@@ -138,6 +257,51 @@ class TaskService:
 
         return await self.update_task(task_update, owner_id)
 
+    async def queue_task_status(self, task_id: int, status: TaskStatusEnum, owner_id: int) -> int:
+        """
+        Accept a status change without writing it: changes of the same task within
+        TASK_STATUS_COALESCE_SECONDS are written once, with the newest status.
+
+        :param task_id: ID of the task to update.
+        :param status: New status for the task.
+        :param owner_id: ID of the user who owns the task.
+        :return: The ordering token of the change (higher tokens are newer).
+        """
+        if not isinstance(owner_id, int):
+            raise TypeError("Owner ID must be an integer.")
+
+        if not self.status_coalescer:
+            raise ValueError("Status coalescer is not initialized.")
+
+        async def owns_task() -> bool:
+            return await self.task_repository.get_task_by_id_and_user_id(task_id, owner_id) is not None
+
+        token = await self.status_coalescer.submit(self.redis_client, task_id, owner_id, status, verify=owns_task)
+        if token is None:
+            raise ValueError(f"Task with ID {task_id} not found for user {owner_id}.")
+        return token
+
+    def direct_write(self, task_id: int) -> AbstractAsyncContextManager[None]:
+        """
+        Context for writing a task outside of the status coalescer (see TaskStatusCoalescer.direct_write).
+        Without coalescing (TASK_STATUS_COALESCE_SECONDS = 0) no change is ever queued, and nothing is taken.
+        """
+        if not self.status_coalescer or self.status_coalescer.window_seconds <= 0:
+            return nullcontext()
+        return self.status_coalescer.direct_write(self.redis_client, task_id)
+
+    async def write_task_status(self, task_id: int, status: TaskStatusEnum, owner_id: int) -> TaskOut | None:
+        """
+        Write a status change and push it to the owner's boards.
+        Called by the status coalescer with the newest change of a window.
+
+        :return: The task, or None when it was deleted meanwhile.
+        """
+        task = await self.task_repository.update_task_status(task_id, owner_id, status)
+        if task:
+            await self.notify_board(owner_id, encode_board_event("task.updated", task=task.model_dump(mode="json")))
+        return task
+
     async def delete_task(self, task_id: int, owner_id: int) -> bool:
         """
         Delete a task by its ID.
@@ -160,15 +324,66 @@ class TaskService:
         if task.owner_id != owner_id:
             raise ValueError(f"User {owner_id} does not have permission to delete task {task_id}.")
 
-        return await self.task_repository.delete_task_(task_id)
+        deleted = await self.task_repository.delete_task_(task_id)
+        if deleted:
+            await self.notify_board(owner_id, encode_board_event("task.deleted", task_id=task_id))
+        return deleted
+
+    async def notify_board(self, owner_id: int, message: str) -> None:
+        """
+        Push a change to every open board of its owner, in every worker.
+
+        :param owner_id: Owner of the board that changed.
+        :param message: Event built with encode_board_event.
+        """
+        await publish_board_event(self.redis_client, owner_id, message)
+
+# ------------------------- STATUS COALESCING -------------------------
+
+async def write_coalesced_task_status(
+    redis_client: Redis | None, task_id: int, owner_id: int, status: TaskStatusEnum
+) -> bool:
+    """
+    Write the newest status change of a coalescing window (see core/status_coalescer.py).
+    It opens its own database session because the requests that made the changes have finished.
+
+    :return: False when the task was deleted meanwhile.
+    """
+    get_engine()
+    async with SessionLocal() as session:
+        # Like a request's session: the owner's next reads go to the primary
+        session.info["writer_user_id"] = owner_id
+        service = TaskService(
+            task_repository=TaskRepositoryImpl(db=session, audit_log=audit_log),
+            redis_client=redis_client
+        )
+        return await service.write_task_status(task_id, status, owner_id) is not None
+
+
+# Status changes received by this process and not written yet
+status_coalescer = TaskStatusCoalescer(settings.TASK_STATUS_COALESCE_SECONDS, writer=write_coalesced_task_status)
+
+
+def get_status_coalescer() -> TaskStatusCoalescer:
+    return status_coalescer
 
 # ------------------------- DEPENDENCY PROVIDER -------------------------
 
-async def get_task_service(task_repository: TaskRepository = Depends(get_task_repository)):
+async def get_task_service(
+    task_repository: TaskRepository = Depends(get_task_repository),
+    redis_client: Redis = Depends(get_redis),
+    coalescer: TaskStatusCoalescer = Depends(get_status_coalescer)
+):
     """
     Dependency injection function to provide a TaskService instance.
 
     :param task_repository: TaskRepository instance.
+    :param redis_client: Redis client board events are published with (unused by the memory backend).
+    :param coalescer: Collects the status changes queued by queue_task_status.
     :return: TaskService instance.
     """
-    return TaskService(task_repository=task_repository)
\ No newline at end of file
+    return TaskService(
+        task_repository=task_repository,
+        redis_client=redis_client if redis_enabled() else None,
+        status_coalescer=coalescer
+    )
\ No newline at end of file
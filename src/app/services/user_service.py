@@ -1,17 +1,33 @@
-# Import libraries for password hashing and dependency injection
-import bcrypt
+# Import libraries for password hashing, logging and dependency injection
+import logging
+
 from fastapi import Depends
 
 # Import repository and service dependencies
-from src.app.repositories.user_repository import UserRepository, get_user_repository
+from src.app.core.config import settings
+from src.app.core.database import SessionLocal, get_engine
+from src.app.core.jobs import JobQueue, get_job_queue, job
+from src.app.core.security import hash_password
+from src.app.repositories.cache_repository import build_cache_repository
+from src.app.repositories.task_repository import TaskRepository, TaskRepositoryImpl, get_task_repository
+from src.app.repositories.user_repository import UserRepository, UserRepositoryImpl, get_user_repository
 from src.app.services.cache_service import CacheService, get_cache_service
 from src.app.schemas.user import UserCreate, UserUpdate
 from src.app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 # Constants for cache key and time-to-live (TTL)
 CACHE_KEY_ALL_USERS = "users:all"
 CACHE_TTL_SECONDS = 60
 
+# Cache key (and TTL) holding the progress of a background account deletion
+CACHE_KEY_ACCOUNT_DELETION = "account_deletion:{user_id}"
+ACCOUNT_DELETION_PROGRESS_TTL_SECONDS = 24 * 3600
+
+# Background job purging a deleted account (see run_account_deletion)
+ACCOUNT_PURGE_JOB = "accounts.purge"
+
 
 class UserService:
     """
@@ -20,12 +36,22 @@ class UserService:
     It also manages caching behavior.
     """
 
-    def __init__(self, user_repository: UserRepository, cache_service: CacheService):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        cache_service: CacheService,
+        task_repository: TaskRepository | None = None,
+        job_queue: JobQueue | None = None
+    ):
         """
         Initialize the service with a user repository and cache service.
+        The task repository is only needed to purge the tasks of deleted accounts,
+        and the job queue to schedule that purge.
         """
         self.user_repository = user_repository
         self.cache_service = cache_service
+        self.task_repository = task_repository
+        self.job_queue = job_queue
 
     async def create_user(self, data: UserCreate):
         """
@@ -41,7 +67,7 @@ class UserService:
         user_model.is_active = True  # Activate user account
 
         # Hash the password securely
-        hashed_pw = bcrypt.hashpw(data.password.encode("utf-8"), bcrypt.gensalt()).decode()
+        hashed_pw = await hash_password(data.password)
         user_model.password = hashed_pw
 
         # Save the user to the database
@@ -135,7 +161,7 @@ class UserService:
             raise ValueError("Old password is incorrect or user not found")
 
         # Hash new password and save
-        hashed_pw = bcrypt.hashpw(new_password.encode("utf-8"), bcrypt.gensalt()).decode()
+        hashed_pw = await hash_password(new_password)
         user.password = hashed_pw
         await self.user_repository.update_user(user)
 
@@ -144,32 +170,134 @@ class UserService:
 
         return
 
+    async def update_avatar_hash(self, user_id: int, avatar_hash: str | None) -> None:
+        """
+        Point the user's avatar URLs at a new profile image.
+
+        :param user_id: ID of the user.
+        :param avatar_hash: Content hash of the stored image (None for the default avatar).
+        """
+        updated = await self.user_repository.set_avatar_hash(user_id, avatar_hash)
+        if not updated:
+            raise ValueError("User not found")
+
     async def delete_user(self, user_id: int):
         """
-        Delete a user from the system.
+        Start the deletion of a user account.
+        The user is only marked inactive here, which is a single-row update;
+        their tasks and the user row are removed later by purge_user(), in a background job.
 
         :param user_id: ID of the user to delete.
         :return: None if successful, or raises an error if user is not found.
         """
-        user = await self.user_repository.get_user_by_id(user_id)
-        if not user:
+        deactivated = await self.user_repository.deactivate_user(user_id)
+        if not deactivated:
             raise ValueError("User not found")
 
-        await self.user_repository.delete_user(user_id)
-
         # Invalidate cache
         await self.cache_service.delete(CACHE_KEY_ALL_USERS)
 
+        await self._report_deletion_progress(user_id, "pending", deleted_tasks=0)
+
+        if self.job_queue is not None:
+            await self.job_queue.enqueue(ACCOUNT_PURGE_JOB, user_id=user_id)
+
         return None
 
+    async def purge_user(
+        self, user_id: int, batch_size: int = settings.ACCOUNT_DELETION_BATCH_SIZE, deleted_before: int = 0
+    ) -> int:
+        """
+        Delete the tasks of an inactive user in bounded batches, then the user itself.
+        Every batch is its own short transaction, so locks are held only briefly.
+        A failure is reported in the deletion progress, with the tasks deleted so far, and raised.
+
+        :param user_id: ID of the user being deleted.
+        :param batch_size: Maximum number of tasks deleted per transaction.
+        :param deleted_before: Tasks deleted by earlier attempts, counted in the progress.
+        :return: Total number of deleted tasks.
+        """
+        if not self.task_repository:
+            raise ValueError("Task repository is not initialized.")
+
+        deleted_tasks = deleted_before
+
+        try:
+            while True:
+                deleted = await self.task_repository.delete_tasks_batch_by_owner(user_id, batch_size)
+                if not deleted:
+                    break
+
+                deleted_tasks += deleted
+                await self._report_deletion_progress(user_id, "running", deleted_tasks=deleted_tasks)
+
+            await self.user_repository.delete_user(user_id)
+        except Exception:
+            await self._report_deletion_progress(user_id, "failed", deleted_tasks=deleted_tasks)
+            raise
+
+        await self._report_deletion_progress(user_id, "completed", deleted_tasks=deleted_tasks)
+
+        logger.info("Account %s deleted (%d tasks)", user_id, deleted_tasks)
+        return deleted_tasks
+
+    async def get_deletion_progress(self, user_id: int) -> dict | None:
+        """
+        Return the progress of a background account deletion, if any.
+
+        :param user_id: ID of the user being deleted.
+        :return: A dictionary with "status" and "deleted_tasks", or None.
+        """
+        return await self.cache_service.get(CACHE_KEY_ACCOUNT_DELETION.format(user_id=user_id))
+
+    async def _report_deletion_progress(self, user_id: int, status: str, deleted_tasks: int) -> None:
+        """
+        Store the progress of an account deletion in the cache.
+        """
+        await self.cache_service.set(
+            CACHE_KEY_ACCOUNT_DELETION.format(user_id=user_id),
+            {"status": status, "deleted_tasks": deleted_tasks},
+            ttl_seconds=ACCOUNT_DELETION_PROGRESS_TTL_SECONDS
+        )
+
+
+@job(ACCOUNT_PURGE_JOB)
+async def run_account_deletion(user_id: int) -> None:
+    """
+    Background job that purges a user account.
+    It opens its own database session because it runs after the request has finished.
+    A failure is reported in the deletion progress and raised, so the job is retried;
+    batches already deleted are not repeated, and a retry keeps counting from the last progress.
+
+    :param user_id: ID of the user to purge.
+    """
+    get_engine()
+    async with SessionLocal() as session:
+        cache_service = CacheService(cache_repository=build_cache_repository())
+        service = UserService(
+            user_repository=UserRepositoryImpl(db=session),
+            cache_service=cache_service,
+            task_repository=TaskRepositoryImpl(db=session)
+        )
+
+        progress = await service.get_deletion_progress(user_id)
+        await service.purge_user(user_id, deleted_before=progress["deleted_tasks"] if progress else 0)
+
 
 def get_user_service(
     user_repository: UserRepository = Depends(get_user_repository),
-    cache_service: CacheService = Depends(get_cache_service)
+    cache_service: CacheService = Depends(get_cache_service),
+    task_repository: TaskRepository = Depends(get_task_repository),
+    job_queue: JobQueue = Depends(get_job_queue)
 ) -> UserService:
     """
     Dependency injector for UserService.
 
     :return: Instance of UserService with required dependencies.
     """
-    return UserService(user_repository=user_repository, cache_service=cache_service)
\ No newline at end of file
+    return UserService(
+        user_repository=user_repository,
+        cache_service=cache_service,
+        task_repository=task_repository,
+        job_queue=job_queue
+    )
\ No newline at end of file
@@ -16,6 +16,18 @@ const statusToPanelId = {
   completed: 'cancelled-panel',
 };
 
+// Delta sync: cursor of the last changes applied (from the rendered board, then from /changes)
+let changeCursor = null;
+// Late updates of deleted tasks are ignored: task ID -> change cursor the deletion was seen at.
+// Only a newer task can come back with the same ID (SQLite may reuse the IDs of deleted tasks).
+const deletedTaskIds = new Map();
+// Without EventSource, changes are polled
+const BOARD_POLL_INTERVAL_MS = 30000;
+// A dropped card is saved once it stays in a column this long (the server also coalesces changes)
+const STATUS_DEBOUNCE_MS = 400;
+// Status the user gave each card, until the board shows it saved: task ID -> { status, saved, timer }
+const statusChanges = new Map();
+
 const panelIdToStatus = {
   'queue-panel': 'not_started',
   'serving-panel': 'in_progress',
@@ -100,9 +112,10 @@ function setCardStatus(card, newStatus) {
 /* ========= Persistencia (PATCH solo status) ========= */
 async function updateTaskStatus(taskId, newStatus) {
   try {
+    // Queued by the server (202): changes of the task within its window are written once
     const resp = await fetch(`${API_URL}${taskId}`, {
       method: 'PATCH',
-      headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+      headers: { 'Content-Type': 'application/json', 'Accept': 'application/json', 'Prefer': 'respond-async' },
       credentials: 'include',
       body: JSON.stringify({ status: newStatus }),
     });
@@ -120,22 +133,44 @@ async function updateTaskStatus(taskId, newStatus) {
   }
 }
 
-async function persistCardStatus(card, newStatus, oldStatus) {
-  setCardBusy(card, true);
-  const taskId = card.dataset.id;
-  const res = await updateTaskStatus(taskId, newStatus);
-  setCardBusy(card, false);
+// Saves the card's status once it stops moving. Moving it back to its saved status sends nothing.
+function persistCardStatus(card, newStatus, oldStatus) {
+  const taskId = Number(card.dataset.id);
+  const change = statusChanges.get(taskId) || { saved: oldStatus, timer: null };
+  clearTimeout(change.timer);
+  change.status = newStatus;
+
+  if (newStatus === change.saved && !change.sending) {
+    statusChanges.delete(taskId);
+    return;
+  }
+  change.timer = setTimeout(() => sendCardStatus(taskId, change), STATUS_DEBOUNCE_MS);
+  statusChanges.set(taskId, change);
+}
+
+async function sendCardStatus(taskId, change) {
+  const status = change.status;
+  const findCard = () => document.querySelector(`.kanban-card[data-id="${taskId}"]`);
+  change.timer = null;
+  change.sending = true;
+  if (findCard()) setCardBusy(findCard(), true);
+  const res = await updateTaskStatus(taskId, status);
+  change.sending = false;
+  const card = findCard();
+  if (card) setCardBusy(card, false);
 
   if (!res.ok) {
-    const oldCol = getColumnByStatus(oldStatus);
-    if (oldCol) {
-      oldCol.appendChild(card);
-      setCardStatus(card, oldStatus);
+    statusChanges.delete(taskId);
+    const savedCol = getColumnByStatus(change.saved);
+    if (card && savedCol) {
+      savedCol.appendChild(card);
+      setCardStatus(card, change.saved);
     }
     alert(`No se pudo actualizar el estado de la tarea #${taskId}: ${res.error}`);
-    return false;
+    return;
   }
-  return true;
+  // Later moves are compared with what the server has now; one made during the request is already scheduled
+  change.saved = status;
 }
 
 /* ========= Tarjeta ========= */
@@ -149,7 +184,7 @@ function createTaskHTML(task) {
   const status = task.status || (task.completed ? 'completed' : 'not_started');
 
   return `
-  <div class="card mb-2 kanban-card" draggable="true" data-id="${id}" data-status="${status}" ondragstart="drag(event)">
+  <div class="card mb-2 kanban-card" draggable="true" data-id="${id}" data-status="${status}" data-change-seq="${Number(task.change_seq || 0)}" ondragstart="drag(event)">
     <div class="card-body">
       <div class="d-flex justify-content-between">
         <h5 class="text-muted mb-2">${title}</h5>
@@ -184,13 +219,14 @@ async function loadTasks() {
       credentials: 'include',
     });
 
-    if (!resp.ok) {
+    // 404: the user has no tasks
+    if (!resp.ok && resp.status !== 404) {
       console.error('HTTP error', resp.status);
       alert('The tasks could not be loaded.');
       return;
     }
 
-    const json = await resp.json();
+    const json = resp.ok ? await resp.json() : null;
     const tasks = json?.data?.tasks ?? [];
 
     tasks.forEach(t => {
@@ -222,7 +258,7 @@ document.addEventListener('click', async (ev) => {
   targetCol.appendChild(card);
   setCardStatus(card, newStatus);
 
-  await persistCardStatus(card, newStatus, oldStatus);
+  persistCardStatus(card, newStatus, oldStatus);
 });
 
 /* ========= Wrappers GLOBALS para handlers inline ========= */
@@ -271,7 +307,7 @@ window.drop = async function(event) {
   const newStatus = getStatusByColumnEl(event.currentTarget);
   setCardStatus(newCard, newStatus);
 
-  await persistCardStatus(newCard, newStatus, fromStatus);
+  persistCardStatus(newCard, newStatus, fromStatus);
 };
 
 /* ========= Crear tarea ========= */
@@ -336,7 +372,8 @@ async function handleCreateTaskSubmit(ev) {
 
   try {
     const payload = getTaskPayloadFromForm(form);
-    await createTask(payload);
+    const created = await createTask(payload);
+    if (created?.data) upsertTaskCard(created.data);
 
     const modalEl = document.getElementById('createTaskModal');
     bootstrap.Modal.getOrCreateInstance(modalEl).hide();
@@ -344,8 +381,6 @@ async function handleCreateTaskSubmit(ev) {
     form.classList.remove('was-validated');
 
     showToast('Task created successfully.', 'success', 1200);
-
-    setTimeout(() => { location.reload(); }, 1300);
   } catch (err) {
     showToast(`Error creating task: ${err.message}`, 'danger', 2500);
   } finally {
@@ -501,6 +536,113 @@ function redrawTaskCard(task) {
   col.insertAdjacentHTML('beforeend', createTaskHTML({ ...task, status }));
 }
 
+// Like redrawTaskCard, but a card that stays in its column keeps its position,
+// and a version older than the card shown (a late response) is ignored
+function upsertTaskCard(task) {
+  // A card moved in this tab keeps its column until the server has written that status
+  const change = statusChanges.get(Number(task.id));
+  if (change && change.status !== task.status) {
+    task = { ...task, status: change.status };
+  } else if (change && !change.timer) {
+    statusChanges.delete(Number(task.id));
+  }
+
+  const status = task.status || (task.completed ? 'completed' : 'not_started');
+  const col = getColumnByStatus(status);
+  if (!col || Number(task.change_seq || 0) <= (deletedTaskIds.get(Number(task.id)) ?? -1)) return;
+
+  const shown = document.querySelector(`.kanban-card[data-id="${Number(task.id)}"]`);
+  if (shown && Number(shown.dataset.changeSeq || 0) > Number(task.change_seq || 0)) return;
+
+  const html = createTaskHTML({ ...task, status });
+  const existing = col.querySelector(`.kanban-card[data-id="${Number(task.id)}"]`);
+  if (existing) {
+    existing.insertAdjacentHTML('afterend', html);
+    existing.remove();
+    return;
+  }
+  removeTaskCardById(task.id);
+  col.insertAdjacentHTML('beforeend', html);
+}
+
+// `seenAt`: cursor of the changes that held the deletion (unknown for events: none is newer)
+function forgetTaskCard(id, seenAt = Infinity) {
+  clearTimeout(statusChanges.get(Number(id))?.timer);
+  statusChanges.delete(Number(id));
+  deletedTaskIds.set(Number(id), seenAt);
+  removeTaskCardById(id);
+}
+
+/* ========= Sincronización incremental (GET /changes) ========= */
+// Fetches only what changed since changeCursor; without a cursor, reloads every task
+let syncInFlight = null;
+
+function syncChanges() {
+  if (changeCursor === null) return loadTasks();
+  if (!syncInFlight) {
+    syncInFlight = fetchChanges().finally(() => { syncInFlight = null; });
+  }
+  return syncInFlight;
+}
+
+async function fetchChanges() {
+  try {
+    let hasMore = true;
+    while (hasMore) {
+      const resp = await fetch(`${API_URL}changes?since=${changeCursor}`, {
+        headers: { 'Accept': 'application/json' },
+        credentials: 'include',
+      });
+      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+
+      const changes = (await resp.json()).data;
+      changes.tasks.forEach(upsertTaskCard);
+      changes.deleted.forEach(id => forgetTaskCard(id, changes.cursor));
+      changeCursor = changes.cursor;
+      hasMore = changes.has_more;
+    }
+  } catch (e) {
+    console.error('Could not sync the board', e);
+  }
+}
+
+/* ========= Cambios en tiempo real (Server-Sent Events) ========= */
+// Every change to the user's tasks (this tab, other tabs, other devices) arrives here.
+// Changes made in this tab were applied already; applying them again is harmless.
+function applyBoardEvent(event) {
+  if (event.type === 'task.created' || event.type === 'task.updated') {
+    // A created task is newer than any deleted task that had its ID
+    if (event.type === 'task.created') deletedTaskIds.delete(Number(event.task.id));
+    upsertTaskCard(event.task);
+  } else if (event.type === 'task.deleted') {
+    forgetTaskCard(event.task_id);
+  } else if (event.type === 'resync') {
+    syncChanges();
+  }
+}
+
+function connectBoardEvents() {
+  if (!window.EventSource) {
+    setInterval(syncChanges, BOARD_POLL_INTERVAL_MS);
+    return;
+  }
+
+  // The browser reconnects by itself; events sent while disconnected are caught up from the cursor
+  const source = new EventSource(`${API_URL}events`);
+  let connectedBefore = false;
+  source.addEventListener('open', () => {
+    if (connectedBefore) syncChanges();
+    connectedBefore = true;
+  });
+  source.addEventListener('message', (msg) => {
+    try {
+      applyBoardEvent(JSON.parse(msg.data));
+    } catch (e) {
+      console.error(e);
+    }
+  });
+}
+
 /* ========= Abrir modal Details ========= */
 async function openTaskDetails(taskId) {
   const modalEl = document.getElementById('taskDetailsModal');
@@ -568,7 +710,7 @@ async function executeDelete() {
     await deleteTask(taskId);
 
     // Quitar tarjeta del tablero
-    removeTaskCardById(taskId);
+    forgetTaskCard(taskId);
 
     // Cerrar ambos modales
     const confirmModalEl = document.getElementById('confirmDeleteModal');
@@ -617,9 +759,67 @@ async function handleUpdateTaskSubmit(ev) {
   }
 }
 
+/* ========= Estado inicial del servidor ========= */
+// The server renders the first page of every column and embeds, per column, the task count,
+// the number rendered and the ID of the last one rendered in #board-state, and the change
+// cursor of what it rendered in #board-cursor.
+// Returns that state, or null when it is missing (every task is then loaded from the API).
+function readBoardState() {
+  const el = document.getElementById('board-state');
+  if (!el) return null;
+
+  const cursorEl = document.getElementById('board-cursor');
+  if (cursorEl) {
+    try {
+      const cursor = JSON.parse(cursorEl.textContent);
+      if (Number.isInteger(cursor)) changeCursor = cursor;
+    } catch (e) { /* Without a cursor, changes reload every task */ }
+  }
+
+  try {
+    return JSON.parse(el.textContent);
+  } catch (e) {
+    return null;
+  }
+}
+
+// Appends the tasks of a column after the last one rendered, one page at a time;
+// the rendered cards stay as they are
+async function loadColumnRest(status, after) {
+  try {
+    while (after !== null) {
+      const resp = await fetch(`${API_URL}columns/${encodeURIComponent(status)}?after=${after}`, {
+        headers: { 'Accept': 'application/json' },
+        credentials: 'include',
+      });
+      if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+
+      const page = (await resp.json()).data;
+      page.tasks.forEach(upsertTaskCard);
+      after = page.next_after;
+    }
+  } catch (e) {
+    console.error(e);
+    showToast('Some tasks could not be loaded.', 'danger', 2500);
+  }
+}
+
+// Only the columns with more tasks than rendered call the API
+function completeBoard() {
+  const state = readBoardState();
+  if (!state) return loadTasks();
+
+  return Promise.all(
+    Object.entries(state)
+      .filter(([, col]) => col.loaded < col.total)
+      .map(([status, col]) => loadColumnRest(status, Number(col.after) || 0))
+  );
+}
+
 /* ========= Hook al cargar ========= */
 document.addEventListener('DOMContentLoaded', () => {
-  loadTasks();
+  completeBoard();
+  connectBoardEvents();
 
   const createForm = document.getElementById('newTaskForm');
   if (createForm) createForm.addEventListener('submit', handleCreateTaskSubmit);
@@ -0,0 +1,30 @@
+# Import FastAPI classes for routing and raising exceptions
+from fastapi import APIRouter, HTTPException
+
+# Import the avatar store and its path check
+from src.app.core.avatars import get_avatar_store, is_avatar_path
+
+# Create a new APIRouter instance to group related routes
+router = APIRouter()
+
+@router.get("/{user_id}/{version}/{variant}")
+async def avatar(user_id: int, version: str, variant: str):
+    """
+    Serve a variant of a profile image by its content-addressed URL (see avatar_url).
+
+    No session is needed, so board pages showing many users cost no cache lookups;
+    the URL is unguessable without the hash, and never changes content, so browsers
+    keep the response for a year without revalidating.
+
+    :param user_id: ID of the image's owner.
+    :param version: Content hash of the image.
+    :param variant: One of the PROFILE_IMAGE_VARIANTS file names.
+    :return: The image, from memory when hot and from disk otherwise.
+    """
+    if not is_avatar_path(version, variant):
+        raise HTTPException(status_code=404, detail="Avatar not found")
+
+    response = await get_avatar_store().response(user_id, version, variant)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    return response
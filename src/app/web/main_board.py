@@ -1,18 +1,14 @@
 # Import necessary FastAPI modules for routing, request handling, and error management
-from fastapi import APIRouter, Request, HTTPException
-from fastapi.templating import Jinja2Templates
-
-# Import application settings to configure the template directory
+from fastapi import APIRouter, Depends, Request, HTTPException
 from src.app.core.config import settings
+from src.app.core.templating import get_templates
+from src.app.services.task_service import TaskService, get_task_service
 
 # Create a router instance to define route endpoints under a specific path
 router = APIRouter()
 
-# Initialize the Jinja2 template engine with the template directory specified in settings
-templates = Jinja2Templates(directory=settings.TEMPLATE_DIR)
-
 @router.get("")
-async def main_board_page(request: Request):
+async def main_board_page(request: Request, task_service: TaskService = Depends(get_task_service)):
     """
     Render the main board page for authenticated users.
 
@@ -20,7 +16,11 @@ async def main_board_page(request: Request):
     It retrieves the user session data from the request state and verifies authentication.
     If authentication fails, a 401 Unauthorized error is raised.
 
+    The first BOARD_COLUMN_PAGE_SIZE tasks of every column are rendered into the page,
+    so the board is visible without waiting for main.js to call the tasks API.
+
     :param request: The HTTP request object containing session state and other metadata.
+    :param task_service: TaskService used to load the board columns.
     :return: Rendered HTML page using the 'mainboard/mainboard.html' template.
     """
 
@@ -31,8 +31,31 @@ async def main_board_page(request: Request):
     if not user_data_session:
         raise HTTPException(status_code=401, detail="User not authenticated")
 
-    # If authenticated, render the mainboard template and inject session data as context
-    return templates.TemplateResponse(
+    # Cursor first: changes made while the board is read are sent again by /changes, never missed
+    change_cursor = await task_service.get_change_cursor(int(user_data_session["id"]))
+
+    # One query for all columns
+    board = await task_service.get_board(int(user_data_session["id"]), settings.BOARD_COLUMN_PAGE_SIZE)
+
+    # Per-column counts embedded in the page: main.js only calls the API when a column is incomplete,
+    # and then only for the tasks after the last one rendered
+    board_state = {
+        column.status.value: {
+            "total": column.total,
+            "loaded": len(column.tasks),
+            "after": column.tasks[-1].id if column.tasks else 0,
+        }
+        for column in board
+    }
+
+    # If authenticated, render the mainboard template with the session data and the tasks
+    return get_templates().TemplateResponse(
         "mainboard/mainboard.html",           # Path to the Jinja2 template
-        {"request": request, **user_data_session}  # Context dictionary including request and session
-    )
\ No newline at end of file
+        {
+            "request": request,
+            **user_data_session,
+            "columns": {column.status.value: column for column in board},
+            "board_state": board_state,
+            "change_cursor": change_cursor,
+        },
+    )
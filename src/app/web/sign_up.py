@@ -1,30 +1,21 @@
 # Import FastAPI components to handle routing and incoming requests
 from fastapi import APIRouter, Request
 
-# Import the Jinja2 template engine to render HTML templates
-from fastapi.templating import Jinja2Templates
-
-# Import application configuration, including the path to the templates directory
-from src.app.core.config import settings
+# Import the helper serving pre-rendered pages
+from src.app.core.templating import render_static_page
 
 # Create a new APIRouter instance to define route handlers under a shared path prefix
 router = APIRouter()
 
-# Initialize Jinja2Templates with the path to the HTML template directory
-templates = Jinja2Templates(directory=settings.TEMPLATE_DIR)
-
 @router.get("")
 async def sign_up_page(request: Request):
     """
     Render the sign-up page.
 
     This function handles GET requests to the root of this router.
-    It returns an HTML template for the user registration form.
+    It returns the user registration form, rendered once per worker.
 
-    :param request: The HTTP request object (required by Jinja2 templates).
+    :param request: The HTTP request object.
     :return: Rendered HTML page using the sign_up/sign_up.html template.
     """
-    return templates.TemplateResponse(
-        "sign_up/sign_up.html",  # Path to the HTML file to render
-        {"request": request}     # Context dictionary passed to the template
-    )
\ No newline at end of file
+    return render_static_page("sign_up/sign_up.html")
\ No newline at end of file
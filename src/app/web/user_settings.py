@@ -2,18 +2,11 @@
 from fastapi import APIRouter, Request, HTTPException
 
 # Import Jinja2 templating engine to render HTML files dynamically
-from fastapi.templating import Jinja2Templates
-
-# Import application settings, including template directory path
-from src.app.core.config import settings
+from src.app.core.templating import get_templates
 
 # Create a new APIRouter instance to group related routes
 router = APIRouter()
 
-# Configure the Jinja2Templates engine with the directory where HTML templates are stored
-templates = Jinja2Templates(directory=settings.TEMPLATE_DIR)
-
-
 @router.get("")
 async def settings_page(request: Request):
     """
@@ -36,7 +29,7 @@ async def settings_page(request: Request):
         raise HTTPException(status_code=401, detail="User not authenticated")
 
     # Render the 'user_settings.html' page with user session data passed to the template
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "user_settings/user_settings.html",  # Path to the HTML file to be rendered
         {"request": request, **user_data_session}  # Template context: includes request + session data
     )
\ No newline at end of file
@@ -1,25 +1,19 @@
 # Import necessary modules and classes from FastAPI, SQLAlchemy, and the application
 from fastapi import APIRouter, Depends, Request
-from fastapi.templating import Jinja2Templates
+from src.app.core.templating import get_templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import the function to get the database session
-from src.app.core.database import get_db
+from src.app.core.database import get_read_db
 
 # Import the service layer that handles user-related business logic
 from src.app.services.user_service import UserService
 
-# Import application settings to access the templates directory path
-from src.app.core.config import settings
-
 # Create a new APIRouter instance to define routes related to user pages
 router = APIRouter()
 
-# Set up the Jinja2 template engine with the specified template directory
-templates = Jinja2Templates(directory=settings.TEMPLATE_DIR)
-
 @router.get("")
-async def users_page(request: Request, db: AsyncSession = Depends(get_db)):
+async def users_page(request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Render the page that displays a list of all users.
 
@@ -40,7 +34,7 @@ async def users_page(request: Request, db: AsyncSession = Depends(get_db)):
 
     # Render the 'list.html' template inside the 'users' folder
     # The context includes the request and the list of users
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         "users/list.html",
         {"request": request, "users": users}
     )
\ No newline at end of file
@@ -0,0 +1,156 @@
+# Import standard libraries for signals, module loading, the metrics listener and logging
+import asyncio
+import importlib
+import logging
+import signal
+from http import HTTPStatus
+
+# Import the Redis client lifecycle, the database engine, the job worker and the metrics snapshots
+from src.app.core import cache
+from src.app.core.config import settings
+from src.app.core.database import dispose_engine, init_engine
+from src.app.core.jobs import JOB_TYPES, JobWorker, shutdown_job_pool
+from src.app.core.metrics import check_metrics_access, registry
+
+logger = logging.getLogger(__name__)
+
+# Modules defining jobs (with @job); importing them registers the job types
+JOB_MODULES = (
+    "src.app.models.role",
+    "src.app.services.user_service",
+    "src.app.services.profile_image_service",
+)
+
+# ---------------------------- Worker Process ----------------------------
+
+def load_job_modules() -> list[str]:
+    """
+    Import every module defining jobs and return the names of the registered job types.
+    """
+    for module in JOB_MODULES:
+        importlib.import_module(module)
+    return sorted(JOB_TYPES)
+
+
+async def report_queue_depth_periodically(worker: JobWorker) -> None:
+    """
+    Background task keeping the queue depth gauges fresh.
+    """
+    while True:
+        try:
+            await worker.report_queue_depth()
+        except Exception:
+            logger.exception("Could not read the job queue depth")
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+
+
+# ---------------------------- Metrics Listener ----------------------------
+
+# Longest wait for the request line and headers of a scrape
+METRICS_REQUEST_TIMEOUT_SECONDS = 5.0
+
+
+async def handle_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """
+    Answer one HTTP request: GET /metrics returns this process' metrics in Prometheus
+    text format, with the same token check as the web /metrics.
+    """
+    try:
+        async with asyncio.timeout(METRICS_REQUEST_TIMEOUT_SECONDS):
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        refusal = check_metrics_access(headers.get("authorization"))
+        if len(request_line) < 2 or request_line[0] != "GET" or request_line[1].split("?")[0] != "/metrics":
+            status, body = HTTPStatus.NOT_FOUND, "Not found\n"
+        elif refusal:
+            status, body = HTTPStatus(refusal[0]), f"{refusal[1]}\n"
+        else:
+            status, body = HTTPStatus.OK, registry.render()
+
+        payload = body.encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + payload)
+        await writer.drain()
+    except (TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics() -> asyncio.Server | None:
+    """
+    Serve the worker's metrics (jobs, queue depth) on WORKER_METRICS_PORT.
+    A worker runs in its own container, so it cannot share snapshots with the web
+    workers; Prometheus scrapes every worker on this port instead.
+    """
+    if not settings.WORKER_METRICS_PORT:
+        return None
+    server = await asyncio.start_server(handle_metrics_request, settings.WORKER_METRICS_HOST, settings.WORKER_METRICS_PORT)
+    logger.info("Serving worker metrics on %s:%d/metrics", settings.WORKER_METRICS_HOST, settings.WORKER_METRICS_PORT)
+    return server
+
+# ---------------------------- Running ----------------------------
+
+async def run(stop: asyncio.Event) -> None:
+    """
+    Run jobs until `stop` is set, then release this process' pools.
+    Like a web worker, it opens its own database engine and Redis client.
+    """
+    logger.info("Job types: %s", ", ".join(load_job_modules()))
+
+    init_engine()
+    worker = JobWorker(cache.init_redis())
+
+    metrics_server = await serve_metrics()
+    background = [asyncio.create_task(report_queue_depth_periodically(worker))]
+    try:
+        await worker.run(stop)
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+
+        shutdown_job_pool()
+        await cache.close_redis()
+        await dispose_engine()
+
+
+async def serve() -> None:
+    stop = asyncio.Event()
+
+    # SIGTERM (docker stop) and Ctrl+C stop reading jobs; running jobs get JOB_SHUTDOWN_SECONDS to finish
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await run(stop)
+
+
+def main() -> None:
+    """
+    Start a job worker. Run as many as needed: they share the work through the consumer group.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if not cache.redis_enabled():
+        # Without Redis, the web process runs the jobs itself (see JobQueue)
+        raise SystemExit("The job worker needs Redis; with CACHE_BACKEND=memory jobs run in the web process.")
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI, status
+from httpx import ASGITransport, AsyncClient
+
+from src.app.api.v1 import internal
+from src.app.core.permissions import Permission
+from src.app.services.user_service import get_user_service
+
+
+def internal_app(permissions):
+    # Only the internal router, with the permission bits the session middleware would resolve
+    app = FastAPI()
+    app.include_router(internal.router, prefix="/api/v1/internal")
+
+    @app.middleware("http")
+    async def session(request, call_next):
+        request.state.permissions = permissions
+        return await call_next(request)
+
+    class MockUserService:
+        async def get_deletion_progress(self, user_id):
+            return {"status": "running", "deleted_tasks": 20} if user_id == 5 else None
+
+    app.dependency_overrides[get_user_service] = lambda: MockUserService()
+    return app
+
+
+async def get(app, path):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path)
+
+
+@pytest.mark.asyncio
+async def test_account_deletion_progress():
+    app = internal_app(Permission.VIEW_METRICS | Permission.MANAGE_USERS)
+
+    response = await get(app, "/api/v1/internal/account_deletions/5")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"] == {"user_id": 5, "status": "running", "deleted_tasks": 20}
+
+    response = await get(app, "/api/v1/internal/account_deletions/6")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_account_deletion_progress_requires_manage_users():
+    response = await get(internal_app(Permission.VIEW_METRICS), "/api/v1/internal/account_deletions/5")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
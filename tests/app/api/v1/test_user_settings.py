@@ -7,14 +7,15 @@ from pydantic import EmailStr
 
 @pytest.mark.anyio
 async def test_upload_profile_image(monkeypatch, tmp_path):
+    from base64 import b64decode
     from io import BytesIO
 
-    # Crear archivo simulado PNG válido
-    image_bytes = BytesIO(b"fake_image_data")
+    # Crear archivo PNG válido (1x1): la subida se decodifica y redimensiona
+    image_bytes = BytesIO(b64decode("iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR4nGP4z8DwHwAFAAH/iZk9HQAAAABJRU5ErkJggg=="))
     image_bytes.name = "image.png"
 
     # Monkeypatch para evitar escritura en disco real
-    monkeypatch.setattr("src.app.api.v1.user_settings.UPLOAD_PROFILE_IMAGE_DIR", str(tmp_path))
+    monkeypatch.setattr("src.app.core.config.settings.PROFILE_IMAGE_DIR", str(tmp_path))
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         ac.cookies.set("session_id", "abc123")
@@ -0,0 +1,88 @@
+import gzip
+import json
+
+import pytest
+
+from src.app.assets.builder import build_assets, fingerprinted_name, rewrite_css_urls
+from src.app.core.assets import MANIFEST_NAME
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "fonts").mkdir()
+    (source / "img" / "profile_images" / "3").mkdir(parents=True)
+
+    (source / "fonts" / "icons.woff2").write_bytes(b"\x00woff2" * 10)
+    (source / "css" / "site.css").write_text(
+        "@font-face{src:url(../fonts/icons.woff2) format('woff2'),url('../fonts/icons.woff2?#iefix')}"
+        ".bg{background:url(data:image/png;base64,AAAA)}" * 20
+    )
+    (source / "img" / "profile_images" / "3" / "user.png").write_bytes(b"png")
+    return source
+
+
+def test_fingerprinted_name_keeps_directory_and_extension():
+    name = fingerprinted_name("vendor/fa/all.min.css", b"body{}")
+
+    assert name.startswith("vendor/fa/all.min.")
+    assert name.endswith(".css")
+    assert name != fingerprinted_name("vendor/fa/all.min.css", b"body{color:red}")
+
+
+def test_rewrite_css_urls_points_to_fingerprinted_files():
+    assets = {"fonts/icons.woff2": "fonts/icons.abc.woff2"}
+    css = "a{src:url(../fonts/icons.woff2?#iefix)} b{src:url('/fonts/icons.woff2')} c{src:url(../fonts/other.ttf)}"
+
+    rewritten = rewrite_css_urls(css, "css/site.css", assets)
+
+    assert "url(../fonts/icons.abc.woff2?#iefix)" in rewritten
+    assert "url('/fonts/icons.woff2')" in rewritten
+    assert "url(../fonts/other.ttf)" in rewritten
+
+
+def test_build_writes_manifest_fingerprinted_files_and_variants(source_dir, tmp_path):
+    output = tmp_path / "build"
+
+    manifest, report = build_assets(source_dir, output)
+
+    # Runtime uploads are not part of the build
+    assert set(manifest.assets) == {"css/site.css", "fonts/icons.woff2"}
+    assert report.files == 2
+
+    css_name = manifest.assets["css/site.css"]
+    font_name = manifest.assets["fonts/icons.woff2"]
+    css = (output / css_name).read_text()
+    assert font_name.split("/")[-1] in css
+    assert "url(data:image/png;base64,AAAA)" in css
+
+    # Text is precompressed; woff2 is compressed already
+    assert "gzip" in manifest.encodings[css_name]
+    assert gzip.decompress((output / f"{css_name}.gz").read_bytes()).decode() == css
+    assert font_name not in manifest.encodings
+
+    assert json.loads((output / MANIFEST_NAME).read_text())["assets"] == manifest.assets
+
+
+def test_build_replaces_previous_build(source_dir, tmp_path):
+    output = tmp_path / "build"
+    first, _ = build_assets(source_dir, output)
+
+    (source_dir / "css" / "site.css").write_text("body{}")
+    second, _ = build_assets(source_dir, output)
+
+    assert first.assets["css/site.css"] != second.assets["css/site.css"]
+    assert not (output / first.assets["css/site.css"]).exists()
+    assert not (tmp_path / "build.tmp").exists()
+
+
+def test_build_writes_brotli_when_installed(source_dir, tmp_path):
+    brotli = pytest.importorskip("brotli")
+    output = tmp_path / "build"
+
+    manifest, _ = build_assets(source_dir, output)
+
+    css_name = manifest.assets["css/site.css"]
+    assert manifest.encodings[css_name] == ("br", "gzip")
+    assert brotli.decompress((output / f"{css_name}.br").read_bytes()) == (output / css_name).read_bytes()
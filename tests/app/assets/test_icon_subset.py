@@ -0,0 +1,83 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.app.assets.icons import (
+    FONT_AWESOME_DIR,
+    SUBSET_CSS,
+    IconSubsetError,
+    build_icon_subset,
+    check_icon_subset,
+    font_face_families,
+    icon_codepoints,
+    split_css_blocks,
+)
+from src.app.core.config import settings
+
+
+@pytest.fixture
+def tree(tmp_path):
+    # A copy of the real static files and a single template to scan
+    static = tmp_path / "static"
+    shutil.copytree(Path(settings.STATIC_DIR) / FONT_AWESOME_DIR, static / FONT_AWESOME_DIR)
+    (static / "css").mkdir()
+    (static / "css" / "site.css").write_text(".toggle::after{font-family:'Font Awesome 5 Free';content:'\\f105'}")
+
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "page.html").write_text('<i class="fas fa-user fa-fw"></i><span class="avatar-add-fab"></span>')
+    return templates, static
+
+
+def test_split_css_blocks_keeps_nested_blocks():
+    css = ".a{color:red}@keyframes spin{0%{top:0}to{top:1px}}.b:before{content:\"\\f007\"}"
+
+    assert split_css_blocks(css) == [
+        (".a", "color:red"),
+        ("@keyframes spin", "0%{top:0}to{top:1px}"),
+        (".b:before", 'content:"\\f007"'),
+    ]
+
+
+def test_committed_subset_covers_every_icon_in_use():
+    # Fails when a template starts using an icon: regenerate with `python -m src.app.assets icons`
+    check_icon_subset(settings.TEMPLATE_DIR, settings.STATIC_DIR)
+
+
+def test_check_fails_for_an_icon_missing_from_the_subset(tree):
+    templates, static = tree
+    (static / SUBSET_CSS).write_text('.fa-user:before{content:"\\f007"}')
+    (templates / "other.html").write_text('<i class="fas fa-rocket"></i>')
+
+    with pytest.raises(IconSubsetError) as error:
+        check_icon_subset(templates, static)
+
+    assert "fa-rocket" in str(error.value)
+    assert "other.html:1" in str(error.value)
+    assert "f105" in str(error.value)
+
+
+def test_build_writes_only_the_used_icons(tree):
+    pytest.importorskip("fontTools")
+    pytest.importorskip("brotli")
+    templates, static = tree
+
+    written = build_icon_subset(templates, static)
+
+    css = (static / SUBSET_CSS).read_text()
+    assert icon_codepoints(css) == {"user": 0xF007}
+    assert ".fa-fw{" in css
+    assert font_face_families(css) == {"Font Awesome 5 Free"}
+    assert "fa-solid-900.subset.woff2" in css and "fa-solid-900.woff2" not in css
+    assert sum(written.values()) < 20 * 1024
+    check_icon_subset(templates, static)
+
+
+def test_build_rejects_unknown_icon_classes(tree):
+    pytest.importorskip("fontTools")
+    templates, static = tree
+    (templates / "page.html").write_text('<i class="fas fa-not-an-icon"></i>')
+
+    with pytest.raises(IconSubsetError):
+        build_icon_subset(templates, static)
@@ -0,0 +1,57 @@
+import time
+import pytest
+
+from src.app import main
+from src.app.core import cache, database
+from src.app.core.config import settings
+from src.app.migrations.runner import is_schema_current
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("aiosqlite")
+
+
+def test_create_app_builds_independent_apps():
+    first, second = main.create_app(), main.create_app()
+    assert first is not second
+    assert {route.path for route in first.routes} == {route.path for route in second.routes}
+
+
+def test_create_app_opens_no_connection(monkeypatch):
+    monkeypatch.setattr(cache, "redis", None)
+    main.create_app()
+    assert cache.redis is None
+
+
+@pytest.mark.asyncio
+async def test_lifespan_opens_and_closes_worker_resources(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path}/app.db")
+    await database.dispose_engine()
+    cache.redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    app = main.create_app()
+    async with app.router.lifespan_context(app):
+        assert database.engine is not None
+        assert await is_schema_current(database.engine)
+        assert not app.state.role_listener.done()
+
+    assert app.state.role_listener.cancelled()
+    assert database.engine is None
+    assert cache.redis is None
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_in_flight_requests_until_timeout(monkeypatch):
+    monkeypatch.setattr(main, "in_flight_requests", 1)
+
+    started_at = time.monotonic()
+    await main.drain_in_flight_requests(0.1)
+    assert time.monotonic() - started_at >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_drain_returns_immediately_when_idle(monkeypatch):
+    monkeypatch.setattr(main, "in_flight_requests", 0)
+
+    started_at = time.monotonic()
+    await main.drain_in_flight_requests(5)
+    assert time.monotonic() - started_at < 0.1
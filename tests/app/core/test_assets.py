@@ -0,0 +1,91 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from src.app.assets.builder import build_assets
+from src.app.core import assets
+from src.app.core.assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    accepted_encodings,
+)
+
+
+@pytest.fixture
+def built(tmp_path):
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "img").mkdir()
+    (source / "css" / "site.css").write_text("body{color:#333}" * 200)
+    (source / "img" / "user.png").write_bytes(b"\x89PNG" * 10)
+
+    manifest, _ = build_assets(source, tmp_path / "build")
+    return source, tmp_path / "build", manifest
+
+
+def make_client(built):
+    source, build, manifest = built
+    handler = PrecompressedStaticFiles(directory=str(source), build_directory=str(build), manifest=manifest)
+    app = Starlette(routes=[Mount("/static", app=handler)])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.5") == {"gzip"}
+    assert accepted_encodings("*") >= {"br", "gzip"}
+    assert accepted_encodings(None) == set()
+
+
+def test_static_url_uses_the_manifest(monkeypatch):
+    monkeypatch.setattr(assets, "_manifest", assets.AssetManifest(assets={"css/style.css": "css/style.abc.css"}))
+
+    assert assets.static_url("css/style.css") == "/static/css/style.abc.css"
+    assert assets.static_url("img/profile_images/1/user.png") == "/static/img/profile_images/1/user.png"
+
+
+@pytest.mark.asyncio
+async def test_fingerprinted_file_is_served_precompressed_and_immutable(built):
+    _, _, manifest = built
+    url = "/static/" + manifest.assets["css/site.css"]
+
+    async with make_client(built) as client:
+        compressed = await client.get(url, headers={"accept-encoding": "gzip"})
+        plain = await client.get(url, headers={"accept-encoding": "identity"})
+
+    assert compressed.status_code == 200
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["content-type"].startswith("text/css")
+    assert compressed.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert int(compressed.headers["content-length"]) < len(plain.content)
+    # httpx decodes the gzip body
+    assert compressed.content == plain.content
+
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] != compressed.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_fingerprinted_file_answers_not_modified(built):
+    _, _, manifest = built
+    url = "/static/" + manifest.assets["css/site.css"]
+
+    async with make_client(built) as client:
+        first = await client.get(url, headers={"accept-encoding": "gzip"})
+        second = await client.get(url, headers={"accept-encoding": "gzip", "if-none-match": first.headers["etag"]})
+
+    assert second.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_unversioned_files_are_revalidated(built):
+    async with make_client(built) as client:
+        response = await client.get("/static/img/user.png")
+        missing = await client.get("/static/img/missing.png")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+    assert missing.status_code == 404
@@ -0,0 +1,144 @@
+import asyncio
+import contextlib
+import datetime
+import time
+
+import pytest
+
+from src.app.core import audit
+from src.app.core.audit import TaskAuditLog, TaskChangeRecord, task_change_records
+from src.app.core.config import settings
+from src.app.schemas.task import TaskOut, TaskStatusEnum
+
+
+def task_out(**changes):
+    fields = dict(
+        id=3, title="Essay", description=None, completed=False, priority=1, status=TaskStatusEnum.NOT_STARTED,
+        due_date=datetime.date(2030, 1, 1), subject=None, created_at=datetime.date(2025, 1, 1), owner_id=7,
+    )
+    return TaskOut(**{**fields, **changes})
+
+
+def records(count):
+    return [TaskChangeRecord(task_id=index, owner_id=7, actor_id=7, action="created") for index in range(count)]
+
+
+class Writer:
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+
+    async def __call__(self, batch):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("database unavailable")
+        self.batches.append([record.task_id for record in batch])
+
+
+def test_updates_record_one_event_per_changed_field():
+    before = task_out()
+    after = task_out(title="Final essay", status=TaskStatusEnum.IN_PROGRESS, due_date=datetime.date(2030, 2, 1))
+
+    changes = task_change_records(before, after, actor_id=7)
+
+    assert [(c.action, c.field, c.old_value, c.new_value) for c in changes] == [
+        ("updated", "title", "Essay", "Final essay"),
+        ("updated", "status", "not_started", "in_progress"),
+        ("updated", "due_date", "2030-01-01", "2030-02-01"),
+    ]
+    assert task_change_records(None, after, 7)[0].action == "created"
+    assert task_change_records(before, None, 7)[0].old_value == "Essay"
+    assert task_change_records(before, task_out(), 7) == []
+
+
+@pytest.mark.asyncio
+async def test_records_are_written_in_batches_by_size_and_time():
+    writer = Writer()
+    log = TaskAuditLog(queue_size=100, batch_size=2, flush_seconds=0.05, enqueue_timeout=1, writer=writer)
+    await log.record(records(5))
+
+    runner = asyncio.create_task(log.run())
+    try:
+        assert await log.drain(1) == 0
+    finally:
+        runner.cancel()
+
+    # Two full batches, then the last record once flush_seconds passed
+    assert writer.batches == [[0, 1], [2, 3], [4]]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_slows_writers_down_then_drops():
+    log = TaskAuditLog(queue_size=2, batch_size=10, flush_seconds=1, enqueue_timeout=0.05, writer=Writer())
+
+    started_at = time.monotonic()
+    dropped = await log.record(records(5))
+    waited = time.monotonic() - started_at
+
+    # A single wait for the whole call, however many records it drops
+    assert dropped == 3
+    assert 0.05 <= waited < 0.5
+    assert log.queue.qsize() == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_writes_are_retried_then_dropped(monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_WRITE_ATTEMPTS", 2)
+    monkeypatch.setattr(audit, "WRITE_RETRY_SECONDS", 0)
+
+    recovering = Writer(failures=1)
+    log = TaskAuditLog(queue_size=10, batch_size=10, flush_seconds=0, enqueue_timeout=1, writer=recovering)
+    assert await log.write(records(2)) is True
+    assert recovering.batches == [[0, 1]]
+
+    failing = Writer(failures=2)
+    log = TaskAuditLog(queue_size=10, batch_size=10, flush_seconds=0, enqueue_timeout=1, writer=failing)
+    assert await log.write(records(2)) is False
+    assert failing.batches == []
+
+
+@pytest.mark.asyncio
+async def test_records_not_written_at_shutdown_are_reported():
+    # Nothing writes: what a crash would lose is what is still in memory, bounded by the queue
+    log = TaskAuditLog(queue_size=3, batch_size=10, flush_seconds=1, enqueue_timeout=0.01, writer=Writer())
+    await log.record(records(5))
+
+    assert await log.drain(0.05) == 3
+
+
+class PostgresEngine:
+    # Stands in for the engine: records the statements of every transaction, the first INSERT fails
+    def __init__(self):
+        self.statements = []
+        self.insert_failures = 1
+
+    @contextlib.asynccontextmanager
+    async def begin(self):
+        yield self
+
+    class dialect:
+        name = "postgresql"
+
+    async def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+        if str(statement).startswith("INSERT") and self.insert_failures:
+            self.insert_failures -= 1
+            raise OSError("connection dropped")
+
+
+@pytest.mark.asyncio
+async def test_a_partition_created_by_a_failed_batch_is_created_again(monkeypatch):
+    engine = PostgresEngine()
+    monkeypatch.setattr(audit, "get_engine", lambda: engine)
+    monkeypatch.setattr(audit, "_known_partitions", set())
+    batch = [TaskChangeRecord(3, 7, 7, "created", occurred_at=datetime.datetime(2031, 5, 2))]
+
+    # The INSERT fails after the CREATE TABLE: both are rolled back
+    with pytest.raises(OSError):
+        await audit.insert_task_events(batch)
+    await audit.insert_task_events(batch)
+    await audit.insert_task_events(batch)
+
+    creates = [statement for statement in engine.statements if statement.startswith("CREATE TABLE")]
+    assert creates == [audit.month_partition(datetime.date(2031, 5, 1))[1]] * 2
+    assert "task_events_2031_05" in audit._known_partitions
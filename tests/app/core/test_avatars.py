@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.responses import FileResponse
+
+from src.app.core.assets import IMMUTABLE_CACHE_CONTROL, static_url
+from src.app.core.avatars import AvatarStore, avatar_url, is_avatar_path
+from src.app.web import avatars as web_avatars
+
+VERSION = "0123456789abcdef"
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "7" / VERSION).mkdir(parents=True)
+    (tmp_path / "7" / VERSION / "thumb.webp").write_bytes(b"RIFF-webp-bytes")
+    return AvatarStore(tmp_path, max_bytes=1024 * 1024)
+
+
+def make_client(store, monkeypatch):
+    monkeypatch.setattr(web_avatars, "get_avatar_store", lambda: store)
+    app = FastAPI()
+    app.include_router(web_avatars.router, prefix="/avatars")
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_avatar_url():
+    assert avatar_url(7, VERSION, "user.png") == f"/avatars/7/{VERSION}/user.png"
+    # Users without an image get the (fingerprinted) default avatar
+    assert avatar_url(7, None, "user.png") == static_url("img/avatar/user.png")
+
+
+def test_is_avatar_path():
+    assert is_avatar_path(VERSION, "thumb.webp")
+    assert not is_avatar_path("../../etc", "thumb.webp")
+    assert not is_avatar_path(VERSION, "original.png")
+
+
+@pytest.mark.asyncio
+async def test_file_is_kept_in_memory_from_its_second_request(store):
+    first = await store.response(7, VERSION, "thumb.webp")
+    assert isinstance(first, FileResponse)
+    assert len(store.cache) == 0
+
+    second = await store.response(7, VERSION, "thumb.webp")
+    assert not isinstance(second, FileResponse)
+    assert second.body == b"RIFF-webp-bytes"
+    assert len(store.cache) == 1
+
+    # Later requests do not touch the disk
+    (store.directory / "7" / VERSION / "thumb.webp").unlink()
+    third = await store.response(7, VERSION, "thumb.webp")
+    assert third.body == b"RIFF-webp-bytes"
+
+
+@pytest.mark.asyncio
+async def test_avatar_route_serves_immutable_responses(store, monkeypatch):
+    async with make_client(store, monkeypatch) as client:
+        responses = [await client.get(f"/avatars/7/{VERSION}/thumb.webp") for _ in range(2)]
+
+    for response in responses:
+        assert response.status_code == 200
+        assert response.content == b"RIFF-webp-bytes"
+        assert response.headers["content-type"] == "image/webp"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{VERSION}-thumb.webp"'
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", [
+    f"/avatars/7/{VERSION}/thumb.png",      # Not written
+    f"/avatars/8/{VERSION}/thumb.webp",     # Other user
+    "/avatars/7/not-a-version/thumb.webp",
+    f"/avatars/7/{VERSION}/secret.txt",
+])
+async def test_unknown_avatars_are_not_found(store, monkeypatch, path):
+    async with make_client(store, monkeypatch) as client:
+        response = await client.get(path)
+
+    assert response.status_code == 404
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+import pytest
+
+from src.app.core import board_events
+from src.app.core.board_events import (
+    BoardEventHub,
+    board_event_stream,
+    encode_board_event,
+    listen_for_board_events,
+    publish_board_event,
+)
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    hub = BoardEventHub(queue_size=2)
+    monkeypatch.setattr(board_events, "hub", hub)
+    return hub
+
+
+def test_events_reach_only_the_streams_of_their_board(hub):
+    mine, other = hub.subscribe(1), hub.subscribe(2)
+    message = encode_board_event("task.deleted", task_id=5)
+
+    hub.deliver(1, message)
+
+    assert mine.get_nowait()[1] == message
+    assert other.empty()
+
+    hub.unsubscribe(1, mine)
+    hub.unsubscribe(2, other)
+    assert hub.connection_count == 0
+
+
+def test_slow_stream_is_told_to_resync(hub):
+    queue = hub.subscribe(1)
+
+    for task_id in range(3):
+        hub.deliver(1, encode_board_event("task.deleted", task_id=task_id))
+
+    # Its pending events are replaced by a single resync
+    assert queue.qsize() == 1
+    assert json.loads(queue.get_nowait()[1]) == {"type": "resync"}
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_events_and_keep_alives(hub):
+    stream = board_event_stream(1, heartbeat_seconds=0.05, max_seconds=5)
+    assert await anext(stream) == "retry: 2000\n\n"
+
+    # Nothing happened: a comment keeps the connection open
+    assert await anext(stream) == ": keep-alive\n\n"
+
+    next_chunk = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    await publish_board_event(None, 1, encode_board_event("task.updated", task={"id": 3, "title": "T"}))
+    chunk = await next_chunk
+
+    assert chunk.startswith("data: ") and chunk.endswith("\n\n")
+    assert json.loads(chunk[6:])["task"] == {"id": 3, "title": "T"}
+
+    await stream.aclose()
+    assert hub.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_ends_after_its_maximum_lifetime(hub):
+    chunks = [chunk async for chunk in board_event_stream(1, heartbeat_seconds=0.02, max_seconds=0.05)]
+
+    assert chunks[0] == "retry: 2000\n\n"
+    assert set(chunks[1:]) <= {": keep-alive\n\n"}
+    assert hub.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_events_published_to_redis_reach_every_worker(hub):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    queue = hub.subscribe(7)
+
+    listener = asyncio.create_task(listen_for_board_events(redis_client))
+    try:
+        message = encode_board_event("task.created", task={"id": 1})
+        # Wait for the subscription, then publish as another worker would
+        for _ in range(100):
+            await publish_board_event(redis_client, 7, message)
+            if not queue.empty():
+                break
+            await asyncio.sleep(0.01)
+
+        assert queue.get_nowait()[1] == message
+    finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await redis_client.aclose()
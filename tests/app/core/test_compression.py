@@ -0,0 +1,195 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+from src.app.api.v1 import task as api_task
+from src.app.core import compression
+from src.app.core.compression import CompressionMiddleware, content_etag, encoded_etag, etag_matches
+from src.app.services.task_service import get_task_service
+
+BODY = json.dumps([{"id": index, "title": f"Task {index}"} for index in range(200)]).encode()
+ETAG = content_etag(BODY)
+
+
+async def tagged(request):
+    return Response(BODY, media_type="application/json", headers={"ETag": ETAG})
+
+
+async def untagged(request):
+    return Response(BODY, media_type="application/json")
+
+
+async def small(request):
+    return Response(b'{"ok": true}', media_type="application/json")
+
+
+async def image(request):
+    return Response(BODY, media_type="image/png")
+
+
+async def precompressed(request):
+    return Response(gzip.compress(BODY), media_type="text/css", headers={"Content-Encoding": "gzip"})
+
+
+async def long_stream(request):
+    async def chunks():
+        for _ in range(40):
+            yield BODY * 10
+
+    return StreamingResponse(chunks(), media_type="text/html")
+
+
+@pytest.fixture
+def middleware(monkeypatch):
+    # Only gzip, so the tests do not depend on brotli or zstandard being installed
+    monkeypatch.setattr(compression, "ENCODERS", {"gzip": compression.ENCODERS["gzip"]})
+    routes = [Route(path, endpoint) for path, endpoint in [
+        ("/tagged", tagged), ("/untagged", untagged), ("/small", small),
+        ("/image", image), ("/precompressed", precompressed), ("/stream", long_stream),
+    ]]
+    return CompressionMiddleware(Starlette(routes=routes), minimum_size=1024, thread_minimum_size=64 * 1024)
+
+
+def make_client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_etag_helpers():
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert etag_matches('"abc-gzip"', '"abc"')
+    assert etag_matches('W/"other", "abc"', '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_compresses_large_text_responses(middleware):
+    async with make_client(middleware) as client:
+        response = await client.get("/untagged", headers={"accept-encoding": "gzip"})
+        plain = await client.get("/untagged", headers={"accept-encoding": "identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    # httpx decodes the body
+    assert response.content == BODY
+
+    assert "content-encoding" not in plain.headers
+    assert plain.content == BODY
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/small", "/image", "/precompressed"])
+async def test_leaves_small_binary_and_encoded_responses_alone(middleware, path):
+    async with make_client(middleware) as client:
+        response = await client.get(path, headers={"accept-encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "vary" not in response.headers
+    if path == "/precompressed":
+        assert response.headers["content-encoding"] == "gzip"
+    else:
+        assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_tagged_response_is_compressed_once(middleware, monkeypatch):
+    calls = []
+    original = middleware.compress
+    monkeypatch.setattr(middleware, "compress", lambda encoder, body: calls.append(1) or original(encoder, body))
+
+    async with make_client(middleware) as client:
+        first = await client.get("/tagged", headers={"accept-encoding": "gzip"})
+        second = await client.get("/tagged", headers={"accept-encoding": "gzip"})
+
+    assert first.content == second.content == BODY
+    assert second.headers["etag"] == encoded_etag(ETAG, "gzip")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_matching_if_none_match_gets_not_modified(middleware):
+    async with make_client(middleware) as client:
+        first = await client.get("/tagged", headers={"accept-encoding": "gzip"})
+        second = await client.get(
+            "/tagged", headers={"accept-encoding": "gzip", "if-none-match": first.headers["etag"]}
+        )
+        changed = await client.get("/tagged", headers={"if-none-match": '"stale"'})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == first.headers["etag"]
+    assert "content-length" not in second.headers
+    assert changed.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_compressed_in_a_thread(middleware, monkeypatch):
+    threaded = []
+    run_sync = compression.anyio.to_thread.run_sync
+
+    async def recording_run_sync(function, *args):
+        threaded.append(len(args[0]))
+        return await run_sync(function, *args)
+
+    monkeypatch.setattr(compression.anyio.to_thread, "run_sync", recording_run_sync)
+    middleware.thread_minimum_size = len(BODY)
+
+    async with make_client(middleware) as client:
+        response = await client.get("/untagged", headers={"accept-encoding": "gzip"})
+
+    assert response.content == BODY
+    assert threaded == [len(BODY)]
+
+
+@pytest.mark.asyncio
+async def test_long_streams_are_compressed_as_they_go(middleware):
+    async with make_client(middleware) as client:
+        response = await client.get("/stream", headers={"accept-encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == BODY * 10 * 40
+
+
+@pytest.mark.asyncio
+async def test_prefers_brotli_when_installed(monkeypatch):
+    pytest.importorskip("brotli")
+    monkeypatch.delitem(compression.ENCODERS, "zstd", raising=False)
+    app = CompressionMiddleware(Starlette(routes=[Route("/tagged", tagged)]))
+
+    async with make_client(app) as client:
+        response = await client.get("/tagged", headers={"accept-encoding": "gzip, br"})
+
+    assert response.headers["content-encoding"] == "br"
+    assert response.content == BODY
+
+
+@pytest.mark.asyncio
+async def test_task_list_can_be_revalidated(middleware):
+    class MockTaskService:
+        async def get_tasks(self, user_id):
+            return [type("Task", (), {"model_dump": lambda self: {"id": 1, "title": "Task"}})()]
+
+    app = FastAPI()
+    app.include_router(api_task.router, prefix="/api/v1/tasks")
+    app.dependency_overrides[get_task_service] = lambda: MockTaskService()
+
+    @app.middleware("http")
+    async def add_session(request, call_next):
+        request.state.session = {"id": 1}
+        return await call_next(request)
+
+    async with make_client(CompressionMiddleware(app)) as client:
+        first = await client.get("/api/v1/tasks")
+        second = await client.get("/api/v1/tasks", headers={"if-none-match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.json()["data"]["tasks"] == [{"id": 1, "title": "Task"}]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert second.status_code == 304
@@ -0,0 +1,38 @@
+from src.app.core.config import settings
+from src.app.core.database import PoolStats, InstrumentedQueuePool, build_engine_options, get_pool_status
+
+
+def test_asyncpg_options():
+    options = build_engine_options("postgresql+asyncpg://u:p@localhost/db")
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_timeout"] == settings.DB_POOL_TIMEOUT
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+    assert options["connect_args"] == {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "command_timeout": settings.DB_COMMAND_TIMEOUT,
+    }
+
+
+def test_sqlite_options_skip_pool_sizing():
+    options = build_engine_options("sqlite+aiosqlite:///test.db")
+    assert "pool_size" not in options
+    assert "connect_args" not in options
+
+
+def test_pool_stats_record_wait():
+    stats = PoolStats()
+    stats.record_wait(0.01)
+    stats.record_wait(0.03)
+    assert stats.checkouts == 2
+    assert abs(stats.wait_seconds_total - 0.04) < 1e-9
+    assert stats.wait_seconds_max == 0.03
+
+
+def test_get_pool_status():
+    status = get_pool_status()
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert status["size"] == settings.DB_POOL_SIZE
+    assert status["checked_out"] == 0
+    assert "wait_seconds_avg" in status
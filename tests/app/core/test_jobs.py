@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pytest
+
+from src.app.core import jobs
+from src.app.core.config import settings
+from src.app.core.jobs import (
+    JOB_DEAD_LETTER_STREAM,
+    JOB_RETRY_KEY,
+    JOB_STREAM,
+    JobQueue,
+    JobWorker,
+    job,
+    retry_delay,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+# Calls received by the test jobs
+calls = []
+
+
+@job("tests.record")
+async def record(value):
+    calls.append(value)
+
+
+@job("tests.fail", max_attempts=2)
+async def always_fail():
+    raise RuntimeError("boom")
+
+
+@job("tests.slow")
+async def slow(value):
+    await asyncio.sleep(0.05)
+    calls.append(value)
+
+
+@job("tests.square", cpu_bound=True)
+def square(value):
+    calls.append(value * value)
+
+
+@pytest.fixture(autouse=True)
+def job_settings(monkeypatch):
+    calls.clear()
+    # No process pool in the tests
+    monkeypatch.setattr(settings, "JOB_PROCESS_WORKERS", 0)
+
+
+async def run_until_settled(worker):
+    # One pass of the worker loop, then wait for the jobs it started
+    await worker.release_due_retries()
+    await worker.claim_stalled_jobs()
+    await worker.read_jobs(block_ms=10)
+    if worker._running:
+        await asyncio.wait(set(worker._running))
+
+
+def test_retry_delay_backs_off_exponentially(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "JOB_RETRY_MAX_SECONDS", 10.0)
+    assert [retry_delay(attempt) for attempt in range(1, 5)] == [2.0, 4.0, 8.0, 10.0]
+
+
+@pytest.mark.asyncio
+async def test_enqueued_jobs_run_once_and_leave_the_stream():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    worker = JobWorker(redis_client, consumer="test")
+    await worker.ensure_group()
+
+    queue = JobQueue(redis_client)
+    await queue.enqueue("tests.record", value="a")
+    await queue.enqueue("tests.square", value=3)
+    await run_until_settled(worker)
+    await run_until_settled(worker)
+
+    assert sorted(map(str, calls)) == ["9", "a"]
+    assert await worker.report_queue_depth() == {"ready": 0, "retry": 0, "dead": 0}
+
+
+@pytest.mark.asyncio
+async def test_unknown_jobs_are_refused():
+    with pytest.raises(ValueError):
+        await JobQueue(fakeredis.FakeAsyncRedis(decode_responses=True)).enqueue("tests.missing")
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried_then_dead_lettered(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0)
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    worker = JobWorker(redis_client, consumer="test")
+    await worker.ensure_group()
+    job_id = await JobQueue(redis_client).enqueue("tests.fail")
+
+    # First attempt: waits for its retry
+    await run_until_settled(worker)
+    assert await worker.report_queue_depth() == {"ready": 0, "retry": 1, "dead": 0}
+    retry = json.loads((await redis_client.zrange(JOB_RETRY_KEY, 0, -1))[0])
+    assert (retry["id"], retry["attempt"]) == (job_id, "2")
+
+    # Second and last attempt: dead-lettered with its error
+    await run_until_settled(worker)
+    assert await worker.report_queue_depth() == {"ready": 0, "retry": 0, "dead": 1}
+    [(_, dead)] = await redis_client.xrange(JOB_DEAD_LETTER_STREAM)
+    assert (dead["id"], dead["job"], dead["error"]) == (job_id, "tests.fail", "RuntimeError: boom")
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_a_stopped_worker_are_taken_over(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_CLAIM_IDLE_SECONDS", 0)
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    stopped, survivor = JobWorker(redis_client, consumer="stopped"), JobWorker(redis_client, consumer="survivor")
+    await stopped.ensure_group()
+    await JobQueue(redis_client).enqueue("tests.record", value="b")
+
+    # Read by a worker that died before running it
+    await redis_client.xreadgroup(jobs.JOB_GROUP, "stopped", {JOB_STREAM: ">"}, count=1)
+    await asyncio.sleep(0.01)
+
+    await run_until_settled(survivor)
+
+    assert calls == ["b"]
+    assert await redis_client.xlen(JOB_STREAM) == 0
+
+
+@pytest.mark.asyncio
+async def test_stopped_worker_waits_for_its_running_jobs():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    worker = JobWorker(redis_client, consumer="test")
+    await worker.ensure_group()
+    await JobQueue(redis_client).enqueue("tests.slow", value="c")
+    await worker.read_jobs(block_ms=10)
+
+    # Stopped while the job runs: no new job is read, the running one finishes
+    stop = asyncio.Event()
+    stop.set()
+    await asyncio.wait_for(worker.run(stop), 1)
+
+    assert calls == ["c"]
+    assert await redis_client.xlen(JOB_STREAM) == 0
+
+
+@pytest.mark.asyncio
+async def test_without_redis_jobs_run_in_process():
+    await JobQueue(None).enqueue("tests.record", value="d")
+    await jobs.wait_for_local_jobs(1)
+
+    assert calls == ["d"]
+
+
+@pytest.mark.asyncio
+async def test_the_worker_serves_its_metrics(monkeypatch):
+    from src.app import worker
+
+    monkeypatch.setattr(settings, "WORKER_METRICS_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "WORKER_METRICS_PORT", 0)
+    assert await worker.serve_metrics() is None
+
+    server = await asyncio.start_server(worker.handle_metrics_request, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path, token=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        authorization = f"Authorization: Bearer {token}\r\n" if token else ""
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: worker\r\n{authorization}\r\n".encode())
+        response = (await reader.read()).decode()
+        writer.close()
+        return response
+
+    try:
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+        assert (await get("/metrics")).startswith("HTTP/1.1 401")
+        assert (await get("/other", "s3cret")).startswith("HTTP/1.1 404")
+
+        response = await get("/metrics", "s3cret")
+        assert response.startswith("HTTP/1.1 200")
+        assert "taskboard_job_queue_depth" in response
+    finally:
+        server.close()
+        await server.wait_closed()
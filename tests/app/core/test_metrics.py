@@ -0,0 +1,122 @@
+import json
+import os
+import socket
+import time
+
+from src.app.core.config import settings
+from src.app.core.metrics import (
+    MetricsRegistry,
+    check_metrics_access,
+    collect_all_workers,
+    merge_snapshots,
+    render_prometheus,
+    retire_own_snapshot,
+    write_snapshot,
+)
+
+
+def test_counter_and_histogram_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+
+
+def test_gauge_callback():
+    registry = MetricsRegistry()
+    registry.gauge("pool_checked_out", "Checked out.", callback=lambda: {(): 4})
+    assert "pool_checked_out 4" in registry.render()
+
+
+def test_merge_snapshots_sums_and_drops_dead_gauges():
+    def snapshot(count, gauge):
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits.").inc(count)
+        registry.gauge("connections", "Connections.").set(gauge)
+        registry.histogram("wait_seconds", "Wait.", buckets=(1.0,)).observe(0.5)
+        return registry.snapshot()
+
+    merged = merge_snapshots([(True, snapshot(2, 5)), (False, snapshot(3, 7))])
+    text = render_prometheus(merged)
+
+    assert "hits_total 5" in text
+    assert "connections 5" in text
+    assert "wait_seconds_count 2" in text
+
+
+HOST = socket.gethostname()
+
+
+def test_collect_all_workers(tmp_path):
+    (tmp_path / f"metrics-{HOST}-999999.json").write_text("not json")
+    write_snapshot(str(tmp_path))
+    assert (tmp_path / f"metrics-{HOST}-{os.getpid()}.json").exists()
+    assert isinstance(collect_all_workers(str(tmp_path)), list)
+
+
+def test_exited_workers_keep_their_totals_but_not_their_files(tmp_path):
+    from src.app.core import metrics
+
+    def worker_snapshot(count):
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs.").inc(count)
+        registry.gauge("depth", "Depth.").set(9)
+        return json.dumps(registry.snapshot())
+
+    # A worker that was killed, and the metrics of this one after it exits
+    (tmp_path / f"metrics-{HOST}-999999.json").write_text(worker_snapshot(3))
+    retire_own_snapshot(str(tmp_path))
+    assert not (tmp_path / f"metrics-{HOST}-{os.getpid()}.json").exists()
+
+    merged = {metric["name"]: metric for metric in collect_all_workers(str(tmp_path))}
+
+    assert not (tmp_path / f"metrics-{HOST}-999999.json").exists()
+    assert "depth" not in merged
+    assert merged["jobs_total"]["samples"] == [[[], 3]]
+    assert metrics.EXITED_SNAPSHOT in {path.name for path in tmp_path.iterdir()}
+
+
+def test_metrics_access_requires_the_token_outside_dev(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "prod")
+    assert check_metrics_access(None)[0] == 403
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "dev")
+    assert check_metrics_access(None) is None
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert check_metrics_access(None)[0] == 401
+    assert check_metrics_access("Bearer wrong")[0] == 401
+    assert check_metrics_access("Bearer s3cret") is None
+
+
+def test_snapshots_of_other_hosts_are_kept_until_they_go_stale(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_FLUSH_SECONDS", 5)
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs.").inc(2)
+    registry.gauge("depth", "Depth.").set(4)
+
+    # Another container, whose pid 1 means nothing here
+    fresh, stale = tmp_path / "metrics-worker-a-1.json", tmp_path / "metrics-worker-b-1.json"
+    for path in (fresh, stale):
+        path.write_text(json.dumps(registry.snapshot()))
+    os.utime(stale, (time.time() - 60, time.time() - 60))
+
+    merged = {metric["name"]: metric for metric in collect_all_workers(str(tmp_path))}
+
+    assert fresh.exists() and not stale.exists()
+    assert merged["depth"]["samples"] == [[[], 4]]
+    assert merged["jobs_total"]["samples"] == [[[], 4]]
@@ -0,0 +1,67 @@
+import pytest
+from fastapi import HTTPException
+from src.app.core.permissions import (
+    Permission,
+    RolePermissionTable,
+    DEFAULT_ROLE_PERMISSIONS,
+    require_permission,
+    has_permission,
+)
+
+
+class FakeRequest:
+    def __init__(self, permissions=None):
+        self.state = type("State", (), {})()
+        if permissions is not None:
+            self.state.permissions = permissions
+
+
+def test_table_lookup():
+    table = RolePermissionTable({2: Permission.VIEW_TASKS | Permission.MANAGE_TASKS})
+    assert table.has_permission(2, Permission.VIEW_TASKS)
+    assert table.has_permission(2, Permission.VIEW_TASKS | Permission.MANAGE_TASKS)
+    assert not table.has_permission(2, Permission.LIST_USERS)
+    assert table.permissions_for(99) == 0
+    assert table.permissions_for(None, default=5) == 5
+
+
+def test_administrator_grants_everything():
+    table = RolePermissionTable(DEFAULT_ROLE_PERMISSIONS)
+    for flag in Permission:
+        assert table.has_permission(1, flag)
+    assert not table.has_permission(2, Permission.MANAGE_USERS)
+
+
+def test_table_is_immutable():
+    table = RolePermissionTable({1: 1})
+    with pytest.raises(TypeError):
+        table._permissions[1] = 2
+
+
+def test_from_roles():
+    roles = [type("Role", (), {"id": 3, "permissions": int(Permission.LIST_USERS)})()]
+    table = RolePermissionTable.from_roles(roles, version=4)
+    assert table.version == 4
+    assert has_permission(table.permissions_for(3), Permission.LIST_USERS)
+
+
+@pytest.mark.asyncio
+async def test_require_permission_allows():
+    dependency = require_permission(Permission.VIEW_TASKS)
+    await dependency(FakeRequest(int(Permission.VIEW_TASKS | Permission.EDIT_PROFILE)))
+
+
+@pytest.mark.asyncio
+async def test_require_permission_denies():
+    dependency = require_permission(Permission.LIST_USERS)
+    with pytest.raises(HTTPException) as exc:
+        await dependency(FakeRequest(int(Permission.VIEW_TASKS)))
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_require_permission_without_session():
+    dependency = require_permission(Permission.VIEW_TASKS)
+    with pytest.raises(HTTPException) as exc:
+        await dependency(FakeRequest())
+    assert exc.value.status_code == 401
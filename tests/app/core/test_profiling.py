@@ -0,0 +1,98 @@
+import time
+import pytest
+
+from src.app.core import profiling
+from src.app.core.config import settings
+from src.app.core.profiling import (
+    ProfileStore,
+    ProfilingMiddleware,
+    create_profile_token,
+    verify_profile_token,
+)
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "PROFILING_SECRET", "test-secret")
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    store = ProfileStore(str(tmp_path), max_kept=2)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    return store
+
+
+async def ok_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(middleware, headers):
+    scope = {"type": "http", "method": "GET", "path": "/main", "headers": headers, "state": {"request_id": "abc"}}
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, None, send)
+    return messages
+
+
+def test_token_round_trip(profiling_enabled):
+    token, expires_at = create_profile_token(ttl_seconds=60)
+    assert expires_at > time.time()
+    assert verify_profile_token(token) is True
+
+
+def test_token_rejects_tampering_and_expiry(profiling_enabled):
+    token, _ = create_profile_token(ttl_seconds=60)
+    expires_at, signature = token.split(".")
+    assert verify_profile_token(f"{int(expires_at) + 1}.{signature}") is False
+
+    expired = int(time.time()) - 1
+    assert verify_profile_token(f"{expired}.{profiling._sign(expired)}") is False
+    assert verify_profile_token("garbage") is False
+
+
+def test_token_requires_secret(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_SECRET", None)
+    with pytest.raises(ValueError):
+        create_profile_token()
+    assert verify_profile_token("1.abc") is False
+
+
+@pytest.mark.asyncio
+async def test_middleware_profiles_request_with_valid_token(profiling_enabled):
+    token, _ = create_profile_token()
+    messages = await call(ProfilingMiddleware(ok_app), [(b"x-profile-token", token.encode())])
+
+    headers = dict(messages[0]["headers"])
+    profile_id = headers[b"x-profile-id"].decode()
+
+    [metadata] = profiling_enabled.list()
+    assert metadata["id"] == profile_id
+    assert metadata["status"] == 200
+    assert metadata["request_id"] == "abc"
+    assert profiling_enabled.pstats_path(profile_id) is not None
+    assert "function calls" in profiling_enabled.summary(profile_id)
+
+
+@pytest.mark.asyncio
+async def test_middleware_skips_requests_without_token(profiling_enabled):
+    messages = await call(ProfilingMiddleware(ok_app), [(b"x-profile-token", b"123.bad")])
+
+    assert b"x-profile-id" not in dict(messages[0]["headers"])
+    assert profiling_enabled.list() == []
+
+
+@pytest.mark.asyncio
+async def test_store_keeps_only_newest_profiles(profiling_enabled):
+    token, _ = create_profile_token()
+    middleware = ProfilingMiddleware(ok_app)
+    for _ in range(3):
+        await call(middleware, [(b"x-profile-token", token.encode())])
+
+    assert len(profiling_enabled.list()) == 2
+    assert len(list(profiling_enabled.directory.glob("*.pstats"))) == 2
+
+
+def test_store_rejects_path_like_ids(profiling_enabled):
+    assert profiling_enabled.pstats_path("../secret") is None
@@ -0,0 +1,75 @@
+import logging
+from sqlalchemy import create_engine, text
+from src.app.core import query_stats
+from src.app.core.query_stats import (
+    RequestQueryStats,
+    describe_parameters,
+    install_query_instrumentation,
+    normalize_sql,
+    record_query,
+    request_id_var,
+    request_query_stats_var,
+)
+
+
+def test_normalize_sql():
+    sql = "SELECT *  FROM tasks\n WHERE owner_id = %(owner_id_1)s AND id IN (1, 2, 3) AND title = 'x' LIMIT 10"
+    assert normalize_sql(sql) == "SELECT * FROM tasks WHERE owner_id = ? AND id IN (...) AND title = ? LIMIT ?"
+    assert normalize_sql("SELECT * FROM t WHERE a = $1") == normalize_sql("SELECT * FROM t WHERE a = $2")
+
+
+def test_normalize_asyncpg_sql():
+    # asyncpg casts every parameter; IN lists of any length still share one key
+    two = "SELECT * FROM tasks WHERE id IN ($1::INTEGER, $2::INTEGER) AND title = $3::VARCHAR(200)"
+    three = "SELECT * FROM tasks WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER) AND title = $4::VARCHAR(200)"
+    assert normalize_sql(two) == "SELECT * FROM tasks WHERE id IN (...) AND title = ?"
+    assert normalize_sql(three) == normalize_sql(two)
+    assert normalize_sql("SELECT * FROM t WHERE ids = ANY($1::INTEGER[])") == "SELECT * FROM t WHERE ids = ANY(?)"
+
+
+def test_describe_parameters_hides_values():
+    assert describe_parameters({"email": "a@b.com", "id": 3}) == {"email": "str", "id": "int"}
+    assert describe_parameters(("a", 1)) == ["str", "int"]
+    assert describe_parameters([{"id": 1}, {"id": 2}]) == "2 x {'id': 'int'}"
+
+
+def test_record_query_updates_request_stats():
+    stats = RequestQueryStats()
+    token = request_query_stats_var.set(stats)
+    try:
+        record_query("SELECT 1", {}, 0.002)
+        record_query("SELECT 2", {}, 0.003)
+    finally:
+        request_query_stats_var.reset(token)
+
+    assert stats.count == 2
+    assert abs(stats.total_ms - 5.0) < 1e-6
+    assert query_stats.query_histograms["SELECT ?"].count >= 2
+
+
+def test_slow_query_is_logged(caplog, monkeypatch):
+    monkeypatch.setattr(query_stats.settings, "DB_SLOW_QUERY_MS", 10)
+    token = request_id_var.set("req-42")
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.app.sql"):
+            record_query("SELECT * FROM users WHERE email = :email", {"email": "secret@example.com"}, 0.5)
+    finally:
+        request_id_var.reset(token)
+
+    assert "req-42" in caplog.text
+    assert "'email': 'str'" in caplog.text
+    assert "secret@example.com" not in caplog.text
+
+
+def test_engine_listeners():
+    engine = create_engine("sqlite://")
+    install_query_instrumentation(engine)
+    stats = RequestQueryStats()
+    token = request_query_stats_var.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT :x"), {"x": 1})
+    finally:
+        request_query_stats_var.reset(token)
+
+    assert stats.count == 1
@@ -0,0 +1,108 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.app.core import cache, database
+from src.app.core.database import ReplicaSet, SessionLocal, get_read_db, has_recent_write, mark_recent_write
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("aiosqlite")
+
+
+def sqlite_engine(path):
+    # Each test runs in its own event loop; NullPool keeps no connection across loops
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+
+
+def make_request(user_id=None):
+    session = {"id": user_id} if user_id is not None else None
+    return SimpleNamespace(state=SimpleNamespace(session=session))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    monkeypatch.setattr(cache, "redis", fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+async def drain(generator):
+    session = await generator.__anext__()
+    await generator.aclose()
+    return session
+
+
+def test_choose_round_robins_over_healthy_replicas(tmp_path):
+    engines = [sqlite_engine(tmp_path / f"r{index}.db") for index in range(3)]
+    replicas = ReplicaSet(engines)
+
+    assert [replicas.choose() for _ in range(4)] == [engines[0], engines[1], engines[2], engines[0]]
+
+    replicas.mark_unhealthy(engines[1])
+    assert [replicas.choose() for _ in range(3)] == [engines[2], engines[0], engines[2]]
+
+    replicas.mark_unhealthy(engines[0])
+    replicas.mark_unhealthy(engines[2])
+    assert replicas.choose() is None
+
+
+@pytest.mark.asyncio
+async def test_check_marks_unreachable_replica_unhealthy(tmp_path):
+    reachable = sqlite_engine(tmp_path / "replica.db")
+    unreachable = sqlite_engine(tmp_path / "missing" / "replica.db")
+    replicas = ReplicaSet([reachable, unreachable])
+
+    await replicas.check()
+
+    assert replicas.healthy == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_read_db_is_the_primary_session_without_replicas(monkeypatch):
+    monkeypatch.setattr(database, "replicas", None)
+    primary = object()
+
+    assert await drain(get_read_db(make_request(1), db=primary)) is primary
+
+
+@pytest.mark.asyncio
+async def test_read_db_uses_replica_unless_user_wrote_recently(monkeypatch, tmp_path, fake_redis):
+    replica = sqlite_engine(tmp_path / "replica.db")
+    monkeypatch.setattr(database, "replicas", ReplicaSet([replica]))
+    primary = object()
+
+    session = await drain(get_read_db(make_request(7), db=primary))
+    assert session.bind is replica
+
+    await mark_recent_write(7)
+    assert await drain(get_read_db(make_request(7), db=primary)) is primary
+    # Other users still read from the replica
+    assert (await drain(get_read_db(make_request(8), db=primary))).bind is replica
+
+
+@pytest.mark.asyncio
+async def test_read_db_falls_back_to_the_primary_when_the_replica_is_down(monkeypatch, tmp_path, fake_redis):
+    unreachable = sqlite_engine(tmp_path / "missing" / "replica.db")
+    replicas = ReplicaSet([unreachable])
+    monkeypatch.setattr(database, "replicas", replicas)
+    primary = object()
+
+    assert await drain(get_read_db(make_request(8), db=primary)) is primary
+    assert replicas.healthy == [False]
+
+
+@pytest.mark.asyncio
+async def test_commit_marks_the_writer(monkeypatch, tmp_path, fake_redis):
+    monkeypatch.setattr(database, "replicas", ReplicaSet([]))
+    engine = sqlite_engine(tmp_path / "primary.db")
+
+    async with SessionLocal(bind=engine) as session:
+        session.info["writer_user_id"] = 3
+        await session.execute(text("CREATE TABLE t (id INTEGER)"))
+        await session.commit()
+
+    async with SessionLocal(bind=engine) as session:
+        await session.commit()
+
+    assert await has_recent_write(3) is True
+    assert await has_recent_write(4) is False
@@ -0,0 +1,29 @@
+from src.app import runner
+from src.app.core.config import settings
+
+
+def test_worker_count_defaults_to_available_cpus(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "WEB_WORKERS", None)
+    assert runner.worker_count() == runner.available_cpus() >= 1
+
+
+def test_worker_count_uses_setting(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "WEB_WORKERS", 3)
+    assert runner.worker_count() == 3
+
+
+def test_memory_cache_backend_runs_a_single_worker(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "WEB_WORKERS", None)
+    assert runner.worker_count() == 1
+
+    monkeypatch.setattr(settings, "WEB_WORKERS", 4)
+    assert runner.worker_count() == 1
+    assert "ignoring WEB_WORKERS=4" in caplog.text
+
+
+def test_event_loop_and_http_protocol_choices():
+    assert runner.event_loop() in ("uvloop", "asyncio")
+    assert runner.http_protocol() in ("httptools", "h11")
@@ -0,0 +1,10 @@
+import pytest
+from src.app.core.security import hash_password, verify_password
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_password():
+    hashed = await hash_password("secret123")
+    assert hashed != "secret123"
+    assert await verify_password("secret123", hashed) is True
+    assert await verify_password("wrong", hashed) is False
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from src.app.core import status_coalescer
+from src.app.core.status_coalescer import TaskStatusCoalescer, status_key
+from src.app.schemas.task import TaskStatusEnum
+
+fakeredis = pytest.importorskip("fakeredis")
+
+NOT_STARTED, IN_PROGRESS, BLOCKED, COMPLETED = (
+    TaskStatusEnum.NOT_STARTED, TaskStatusEnum.IN_PROGRESS, TaskStatusEnum.BLOCKED, TaskStatusEnum.COMPLETED
+)
+
+
+class Writer:
+    def __init__(self):
+        self.writes = []
+
+    async def __call__(self, redis, task_id, owner_id, status):
+        self.writes.append((task_id, owner_id, status))
+        return True
+
+
+class Owner:
+    # Stands in for the database check that the task belongs to the user
+    def __init__(self, owns=True):
+        self.owns = owns
+        self.checks = 0
+
+    async def __call__(self):
+        self.checks += 1
+        return self.owns
+
+
+@pytest.mark.asyncio
+async def test_changes_within_a_window_are_written_once_without_redis():
+    writer, owner = Writer(), Owner()
+    coalescer = TaskStatusCoalescer(window_seconds=0.05, writer=writer)
+
+    tokens = [await coalescer.submit(None, 3, 7, status, owner) for status in (IN_PROGRESS, BLOCKED, COMPLETED)]
+    await asyncio.sleep(0.1)
+
+    assert tokens == sorted(tokens)
+    assert writer.writes == [(3, 7, COMPLETED)]
+    # The owner is checked once per window
+    assert owner.checks == 1
+
+
+@pytest.mark.asyncio
+async def test_changes_received_by_several_workers_are_written_once_in_order():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer, owner = Writer(), Owner()
+    workers = [TaskStatusCoalescer(window_seconds=0.05, writer=writer) for _ in range(2)]
+
+    # A card dragged back and forth, each drop reaching another worker
+    for index, status in enumerate((IN_PROGRESS, BLOCKED, IN_PROGRESS, COMPLETED)):
+        await workers[index % 2].submit(redis_client, 3, 7, status, owner)
+    await asyncio.sleep(0.15)
+
+    assert writer.writes == [(3, 7, COMPLETED)]
+    assert owner.checks == 1
+    assert await redis_client.exists(f"{status_key(3)}:pending", f"{status_key(3)}:flush") == 0
+
+    # The next drag starts a new window
+    await workers[1].submit(redis_client, 3, 7, NOT_STARTED, owner)
+    await asyncio.sleep(0.1)
+    assert writer.writes[-1] == (3, 7, NOT_STARTED)
+
+
+@pytest.mark.asyncio
+async def test_a_change_older_than_the_one_written_is_skipped():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer = Writer()
+    coalescer = TaskStatusCoalescer(window_seconds=0, writer=writer)
+
+    first = await coalescer.submit(redis_client, 3, 7, IN_PROGRESS, Owner())
+    second = await coalescer.submit(redis_client, 3, 7, BLOCKED, Owner())
+    await coalescer.drain(1)
+    assert writer.writes[-1] == (3, 7, BLOCKED)
+
+    # The first change reaching the pending set late, after the second was written
+    await redis_client.zadd(f"{status_key(3)}:pending", {f"{first}:{IN_PROGRESS.value}": first})
+    await coalescer.flush(redis_client, 3)
+
+    assert second > first
+    assert writer.writes[-1] == (3, 7, BLOCKED)
+
+
+@pytest.mark.asyncio
+async def test_changes_to_tasks_of_other_users_are_refused():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer = Writer()
+    coalescer = TaskStatusCoalescer(window_seconds=0.01, writer=writer)
+
+    assert await coalescer.submit(redis_client, 3, 8, BLOCKED, Owner(owns=False)) is None
+    assert await coalescer.submit(None, 3, 8, BLOCKED, Owner(owns=False)) is None
+    await asyncio.sleep(0.05)
+
+    assert writer.writes == []
+
+
+@pytest.mark.asyncio
+async def test_shutdown_writes_pending_changes_at_once():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer = Writer()
+    coalescer = TaskStatusCoalescer(window_seconds=60, writer=writer)
+    await coalescer.submit(redis_client, 3, 7, BLOCKED, Owner())
+    await coalescer.submit(None, 4, 7, COMPLETED, Owner())
+
+    assert await asyncio.wait_for(coalescer.drain(1), 2) == 0
+    assert sorted(writer.writes) == [(3, 7, BLOCKED), (4, 7, COMPLETED)]
+
+
+@pytest.mark.asyncio
+async def test_a_direct_write_supersedes_the_changes_queued_before_it():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    writer = Writer()
+    coalescer = TaskStatusCoalescer(window_seconds=60, writer=writer)
+
+    early = await coalescer.submit(redis_client, 3, 7, BLOCKED, Owner())
+    async with coalescer.direct_write(redis_client, 3):
+        # The flush waits for the lock of the direct write
+        flush = asyncio.create_task(coalescer.flush(redis_client, 3))
+        await asyncio.sleep(0.1)
+        assert not flush.done()
+    await flush
+
+    # A change received before the direct write, reaching Redis late, is skipped too
+    await redis_client.zadd(f"{status_key(3)}:pending", {f"{early}:{BLOCKED.value}": early})
+    await coalescer.flush(redis_client, 3)
+    assert writer.writes == []
+
+    # A change received after it is written
+    await coalescer.submit(redis_client, 3, 7, COMPLETED, Owner())
+    await coalescer.drain(1)
+    assert writer.writes == [(3, 7, COMPLETED)]
+
+
+@pytest.mark.asyncio
+async def test_an_expired_lock_is_not_released_by_its_former_holder():
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    coalescer = TaskStatusCoalescer(window_seconds=0, writer=Writer())
+    lock_key = f"{status_key(3)}:lock"
+
+    async with coalescer._lock(redis_client, 3):
+        # The lock expires and another worker takes it
+        await redis_client.set(lock_key, "other worker")
+    assert await redis_client.get(lock_key) == "other worker"
+
+    await redis_client.delete(lock_key)
+    async with coalescer._lock(redis_client, 3):
+        assert await redis_client.exists(lock_key) == 1
+    assert await redis_client.exists(lock_key) == 0
+
+
+@pytest.mark.asyncio
+async def test_a_retry_is_skipped_when_a_newer_status_was_written_meanwhile(monkeypatch):
+    monkeypatch.setattr(status_coalescer, "WRITE_RETRY_SECONDS", 0)
+    redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    attempts = []
+
+    async def failing_writer(redis, task_id, owner_id, status):
+        # The first attempt fails; meanwhile a newer status is written (the lock having expired)
+        attempts.append(status)
+        await redis.hset(status_key(task_id), "written", 100)
+        raise ConnectionError("database unavailable")
+
+    coalescer = TaskStatusCoalescer(window_seconds=0, writer=failing_writer)
+    await coalescer.submit(redis_client, 3, 7, BLOCKED, Owner())
+    await coalescer.drain(1)
+
+    assert attempts == [BLOCKED]
+    assert await redis_client.hget(status_key(3), "written") == "100"
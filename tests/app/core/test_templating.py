@@ -0,0 +1,94 @@
+from datetime import date
+
+import pytest
+
+from src.app.core import templating
+from src.app.core.config import settings
+from src.app.schemas.task import BoardColumn, TaskOut, TaskStatusEnum
+
+
+@pytest.fixture
+def prod_templates(monkeypatch, tmp_path):
+    # Fresh shared environment with production settings and a private bytecode cache
+    monkeypatch.setattr(settings, "TEMPLATE_AUTO_RELOAD", False)
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(templating, "_templates", None)
+    monkeypatch.setattr(templating, "_static_pages", {})
+    return templating.get_templates()
+
+
+def test_auto_reload_defaults_to_dev_only(monkeypatch):
+    monkeypatch.setattr(settings, "TEMPLATE_AUTO_RELOAD", None)
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "dev")
+    assert templating.build_environment().auto_reload is True
+
+    monkeypatch.setattr(settings, "ENVIRONMENT", "prod")
+    assert templating.build_environment().auto_reload is False
+
+
+def test_compile_templates_fills_bytecode_cache_and_static_pages(prod_templates, tmp_path):
+    count = templating.compile_templates()
+
+    assert count >= len(templating.STATIC_PAGES)
+    assert len(list(tmp_path.iterdir())) == count
+    assert set(templating._static_pages) == set(templating.STATIC_PAGES)
+
+
+def test_static_page_is_rendered_once(prod_templates, monkeypatch):
+    first = templating.render_static_page("login/login.html")
+
+    monkeypatch.setattr(prod_templates.env, "get_template", lambda name: pytest.fail("rendered twice"))
+    second = templating.render_static_page("login/login.html")
+
+    assert first.body == second.body
+    assert second.media_type == "text/html"
+
+
+def test_cache_tag_renders_fragment_once(prod_templates):
+    calls = []
+    env = prod_templates.env
+    env.globals["expensive"] = lambda: calls.append(1) or "<b>&</b>"
+
+    template = env.from_string('{% cache "test:fragment" %}{{ expensive() }}{% endcache %}|{{ name }}')
+
+    assert template.render(name="a") == "&lt;b&gt;&amp;&lt;/b&gt;|a"
+    assert template.render(name="b") == "&lt;b&gt;&amp;&lt;/b&gt;|b"
+    assert len(calls) == 1
+
+
+def test_cache_tag_is_bypassed_while_auto_reloading(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "TEMPLATE_AUTO_RELOAD", True)
+    monkeypatch.setattr(settings, "TEMPLATE_BYTECODE_CACHE_DIR", str(tmp_path))
+    env = templating.build_environment()
+
+    calls = []
+    env.globals["expensive"] = lambda: calls.append(1) or "x"
+    template = env.from_string('{% cache "test:dev", 60 %}{{ expensive() }}{% endcache %}')
+
+    template.render()
+    template.render()
+    assert len(calls) == 2
+
+
+def test_mainboard_renders_the_cards_of_each_column(prod_templates):
+    columns = {
+        status.value: BoardColumn(status=status, total=2, tasks=[
+            TaskOut(
+                id=index, title=f"Task {index}", description="desc", priority=1, status=status,
+                due_date=date(2030, 1, 1), subject="math", created_at=date(2025, 1, 1), owner_id=1,
+            )
+            for index in range(2)
+        ])
+        for status in TaskStatusEnum
+    }
+    context = {"request": None, "username": "student", "columns": columns, "board_state": {}}
+
+    html = prod_templates.get_template("mainboard/mainboard.html").render(context)
+
+    assert html.count('class="card mb-2 kanban-card"') == 8
+    assert 'data-status="blocked"' in html
+    assert 'data-move-to="blocked"' in html
+    assert "Move to Not Started" in html
+    assert "01/01/2030" in html
+    assert '<script id="board-state" type="application/json">' in html
@@ -0,0 +1,83 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from src.app.core.uploads import UploadError, receive_file
+
+MAX_BYTES = 256 * 1024
+
+
+def refuse_text(filename, content_type):
+    if not content_type.startswith("image/"):
+        raise UploadError("Only images")
+
+
+def make_client(directory):
+    async def upload(request):
+        try:
+            received = await receive_file(request, "file", directory, MAX_BYTES, check_part=refuse_text)
+        except UploadError as exc:
+            return JSONResponse({"detail": str(exc)}, status_code=exc.status_code)
+        return JSONResponse({
+            "name": received.filename,
+            "type": received.content_type,
+            "size": received.size,
+            "data": received.path.read_bytes().decode(),
+        })
+
+    app = Starlette(routes=[Route("/upload", upload, methods=["POST"])])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_file_is_streamed_to_the_directory(tmp_path):
+    async with make_client(tmp_path) as client:
+        response = await client.post(
+            "/upload",
+            data={"note": "ignored"},
+            files={"file": ("avatar.png", b"x" * 100_000, "image/png")},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"name": "avatar.png", "type": "image/png", "size": 100_000, "data": "x" * 100_000}
+    assert [path.name.startswith(".upload-") for path in tmp_path.iterdir()] == [True]
+
+
+@pytest.mark.asyncio
+async def test_file_over_the_limit_is_refused_without_leftovers(tmp_path):
+    async def body():
+        # No Content-Length: only the streamed size can stop it
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.png"\r\nContent-Type: image/png\r\n\r\n'
+        for _ in range(10):
+            yield b"x" * 64 * 1024
+        yield b"\r\n--b--\r\n"
+
+    async with make_client(tmp_path) as client:
+        response = await client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+
+    assert response.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_announced_size_over_the_limit_is_refused_before_reading(tmp_path):
+    async with make_client(tmp_path) as client:
+        response = await client.post("/upload", files={"file": ("a.png", b"x" * (MAX_BYTES * 2), "image/png")})
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("files, detail", [
+    ({"file": ("a.txt", b"hello", "text/plain")}, "Only images"),
+    ({"other": ("a.png", b"hello", "image/png")}, "No file was sent in 'file'."),
+])
+async def test_refused_files(tmp_path, files, detail):
+    async with make_client(tmp_path) as client:
+        response = await client.post("/upload", files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+    assert list(tmp_path.iterdir()) == []
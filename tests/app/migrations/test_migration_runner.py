@@ -0,0 +1,199 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.app.core.config import settings
+from src.app.core.database import Base
+from src.app.migrations.runner import (
+    MigrationError,
+    create_index_concurrently,
+    discover_migrations,
+    ensure_schema_current,
+    get_applied,
+    get_current_version,
+    is_schema_current,
+    migrate,
+)
+
+import src.app.models.role  # noqa: F401
+import src.app.models.task  # noqa: F401
+import src.app.models.user  # noqa: F401
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # Each test runs in its own event loop; NullPool keeps no connection across loops
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/migrations.db", poolclass=NullPool)
+
+
+def write_migration(directory, filename, body):
+    (directory / filename).write_text(body)
+
+
+async def table_columns(engine) -> dict[str, set[str]]:
+    def read(sync_conn):
+        inspector = inspect(sync_conn)
+        return {table: {column["name"] for column in inspector.get_columns(table)} for table in inspector.get_table_names()}
+
+    async with engine.connect() as conn:
+        return await conn.run_sync(read)
+
+
+@pytest.mark.asyncio
+async def test_migrate_fresh_database_matches_models(engine):
+    assert await get_current_version(engine) is None
+
+    applied = await migrate(engine)
+    assert [migration.version for migration in applied] == [migration.version for migration in discover_migrations()]
+
+    columns = await table_columns(engine)
+    for table in Base.metadata.sorted_tables:
+        assert columns[table.name] == {column.name for column in table.columns}
+    assert "schema_version" not in columns
+
+    # Second run: nothing to do
+    assert await migrate(engine) == []
+    assert await is_schema_current(engine) is True
+
+
+@pytest.mark.asyncio
+async def test_migrate_upgrades_database_created_before_role_permissions(engine):
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE roles (id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL, description VARCHAR(255))"))
+        await conn.execute(text("INSERT INTO roles (id, name) VALUES (1, 'admin'), (2, 'student')"))
+        await conn.execute(text("CREATE TABLE schema_version (version INTEGER NOT NULL)"))
+
+    await migrate(engine)
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text("SELECT id, permissions FROM roles ORDER BY id"))).all()
+    assert rows == [(1, 1 << 30), (2, 7)]
+    assert "schema_version" not in await table_columns(engine)
+
+
+@pytest.mark.asyncio
+async def test_migrate_numbers_existing_tasks_for_delta_sync(engine):
+    # Schema and data as they were before change tracking
+    migrations = discover_migrations()
+    await migrate(engine, [migration for migration in migrations if migration.version < 5])
+    async with engine.begin() as conn:
+        await conn.execute(text("INSERT INTO roles (id, name, permissions) VALUES (2, 'student', 7)"))
+        await conn.execute(text(
+            "INSERT INTO users (id, username, email, password, is_active, role_id) "
+            "VALUES (1, 'a', 'a@x', 'x', 1, 2), (2, 'b', 'b@x', 'x', 1, 2), (3, 'c', 'c@x', 'x', 1, 2)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO tasks (id, title, owner_id, is_completed, priority, due_date, created_at, status) VALUES "
+            "(1, 't', 1, 0, 1, '2030-01-01', '2025-01-01', 'blocked'), "
+            "(2, 't', 2, 0, 1, '2030-01-01', '2025-01-01', 'blocked'), "
+            "(3, 't', 1, 0, 1, '2030-01-01', '2025-01-02', 'blocked')"
+        ))
+
+    await migrate(engine, migrations)
+
+    async with engine.connect() as conn:
+        tasks = (await conn.execute(text("SELECT id, change_seq, updated_at FROM tasks ORDER BY id"))).all()
+        users = (await conn.execute(text("SELECT id, task_change_seq FROM users ORDER BY id"))).all()
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("tasks"))
+    assert [(task_id, change_seq) for task_id, change_seq, _ in tasks] == [(1, 1), (2, 1), (3, 2)]
+    assert str(tasks[2][2]).startswith("2025-01-02")
+    assert users == [(1, 2), (2, 1), (3, 0)]
+    assert "ix_tasks_owner_id_change_seq" in {index["name"] for index in indexes}
+
+
+@pytest.mark.asyncio
+async def test_migrate_refuses_modified_migration(engine, tmp_path):
+    directory = tmp_path / "versions"
+    directory.mkdir()
+    write_migration(directory, "0001_first.py", "from sqlalchemy import text\n\nasync def upgrade(conn):\n    await conn.execute(text('CREATE TABLE a (id INTEGER)'))\n")
+    await migrate(engine, discover_migrations(directory))
+
+    write_migration(directory, "0001_first.py", "async def upgrade(conn):\n    pass\n")
+    with pytest.raises(MigrationError, match="modified"):
+        await migrate(engine, discover_migrations(directory))
+
+
+@pytest.mark.asyncio
+async def test_failed_migration_is_rolled_back_and_not_recorded(engine, tmp_path):
+    directory = tmp_path / "versions"
+    directory.mkdir()
+    write_migration(directory, "0001_table.py", "from sqlalchemy import text\n\nasync def upgrade(conn):\n    await conn.execute(text('CREATE TABLE a (id INTEGER)'))\n")
+    write_migration(directory, "0002_broken.py", (
+        "from sqlalchemy import text\n\n"
+        "async def upgrade(conn):\n"
+        "    await conn.execute(text('INSERT INTO a (id) VALUES (1)'))\n"
+        "    await conn.execute(text('SELECT * FROM missing_table'))\n"
+    ))
+
+    with pytest.raises(Exception):
+        await migrate(engine, discover_migrations(directory))
+
+    assert set(await get_applied(engine)) == {1}
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM a"))).scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_non_transactional_migration_runs_in_autocommit(engine, tmp_path):
+    directory = tmp_path / "versions"
+    directory.mkdir()
+    write_migration(directory, "0001_table.py", "from sqlalchemy import text\n\nasync def upgrade(conn):\n    await conn.execute(text('CREATE TABLE a (id INTEGER, b INTEGER)'))\n")
+    write_migration(directory, "0002_index.py", (
+        "from src.app.migrations.runner import create_index_concurrently\n\n"
+        "TRANSACTIONAL = False\n\n"
+        "async def upgrade(conn):\n"
+        "    assert not conn.in_transaction() or conn.get_isolation_level() == 'AUTOCOMMIT'\n"
+        "    await create_index_concurrently(conn, 'ix_a_b', 'a', ['b'])\n"
+    ))
+
+    await migrate(engine, discover_migrations(directory))
+
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("a"))
+    assert [index["name"] for index in indexes] == ["ix_a_b"]
+    assert set(await get_applied(engine)) == {1, 2}
+
+
+class RecordingPostgresConnection:
+    # Stands in for an AUTOCOMMIT PostgreSQL connection: records statements, finds an invalid index or not
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self, invalid_index):
+        self.invalid_index = invalid_index
+        self.statements = []
+
+    async def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+        found = self.invalid_index and "pg_index" in str(statement)
+        return SimpleNamespace(first=lambda: (1,) if found else None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("invalid_index", [False, True])
+async def test_create_index_concurrently_on_postgres(invalid_index):
+    conn = RecordingPostgresConnection(invalid_index)
+
+    await create_index_concurrently(conn, "ix_tasks_owner_id_change_seq", "tasks", ["owner_id", "change_seq"])
+
+    # A build interrupted earlier left an invalid index: it is dropped and built again
+    expected = ["DROP INDEX CONCURRENTLY IF EXISTS ix_tasks_owner_id_change_seq"] if invalid_index else []
+    expected.append("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tasks_owner_id_change_seq ON tasks (owner_id, change_seq)")
+    assert conn.statements[1:] == expected
+    assert "pg_index" in conn.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_startup_refuses_stale_schema_when_auto_migration_is_disabled(engine, monkeypatch):
+    monkeypatch.setattr(settings, "DB_MIGRATE_ON_STARTUP", False)
+    with pytest.raises(MigrationError, match="upgrade"):
+        await ensure_schema_current(engine)
+
+    monkeypatch.setattr(settings, "DB_MIGRATE_ON_STARTUP", True)
+    await ensure_schema_current(engine)
+    assert await is_schema_current(engine) is True
@@ -0,0 +1,159 @@
+import asyncio
+import pytest
+
+from src.app.core import cache
+from src.app.core.config import settings
+from src.app.repositories.cache_repository import (
+    CacheRepositoryImpl,
+    MemoryCacheRepository,
+    TieredCacheRepository,
+    build_cache_repository,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def make_memory():
+    return MemoryCacheRepository(max_entries=100, max_bytes=1 << 20)
+
+
+def make_redis():
+    return CacheRepositoryImpl(redis_client=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+def make_tiered():
+    return TieredCacheRepository(make_memory(), make_redis(), local_ttl_seconds=5)
+
+
+# ---------------------------- Conformance (every backend) ----------------------------
+
+@pytest.fixture(params=["redis", "memory", "tiered"])
+def repo(request):
+    return {"redis": make_redis, "memory": make_memory, "tiered": make_tiered}[request.param]()
+
+
+@pytest.mark.asyncio
+async def test_session_roundtrip(repo):
+    await repo.set_user_session_data("s1", {"id": 1, "username": "john"})
+    assert await repo.get_user_session_data("s1") == {"id": 1, "username": "john"}
+    assert await repo.get_user_session_data("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_set_get_delete(repo):
+    await repo.set("key", {"a": [1, 2]})
+    assert await repo.get("key") == {"a": [1, 2]}
+
+    await repo.delete("key")
+    assert await repo.get("key") is None
+    # Deleting a missing key is not an error
+    await repo.delete("key")
+
+
+@pytest.mark.asyncio
+async def test_returned_values_are_copies(repo):
+    await repo.set("key", {"a": 1})
+    value = await repo.get("key")
+    value["a"] = 2
+    assert await repo.get("key") == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_values_expire_after_ttl(repo):
+    await repo.set("key", {"a": 1}, ttl_seconds=1)
+    await asyncio.sleep(1.1)
+    assert await repo.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_arguments_raise_value_error(repo):
+    with pytest.raises(ValueError):
+        await repo.set("", {"a": 1})
+    with pytest.raises(ValueError):
+        await repo.set("key", {})
+    with pytest.raises(ValueError):
+        await repo.get("")
+    with pytest.raises(ValueError):
+        await repo.delete("")
+
+# ---------------------------- Memory Backend ----------------------------
+
+@pytest.mark.asyncio
+async def test_memory_evicts_least_recently_used_entry():
+    repo = MemoryCacheRepository(max_entries=2, max_bytes=1 << 20)
+    await repo.set("a", {"v": 1})
+    await repo.set("b", {"v": 2})
+    await repo.get("a")
+    await repo.set("c", {"v": 3})
+
+    assert await repo.get("b") is None
+    assert await repo.get("a") == {"v": 1}
+    assert repo.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_accounts_bytes_and_respects_byte_bound():
+    repo = MemoryCacheRepository(max_entries=100, max_bytes=1 << 20)
+    await repo.set("k0", {"v": "x" * 100})
+    single_entry_bytes = repo.size_bytes
+    assert single_entry_bytes > 100
+
+    await repo.delete("k0")
+    assert repo.size_bytes == 0
+
+    repo = MemoryCacheRepository(max_entries=100, max_bytes=single_entry_bytes * 3)
+    for index in range(10):
+        await repo.set(f"k{index}", {"v": "x" * 100})
+    assert len(repo) == 3
+    assert repo.size_bytes <= repo.max_bytes
+
+
+@pytest.mark.asyncio
+async def test_memory_expiry_uses_clock():
+    now = [100.0]
+    repo = MemoryCacheRepository(max_entries=10, max_bytes=1 << 20, clock=lambda: now[0])
+    await repo.set("key", {"a": 1}, ttl_seconds=60)
+
+    now[0] += 59
+    assert await repo.get("key") == {"a": 1}
+    now[0] += 1
+    assert await repo.get("key") is None
+    assert repo.size_bytes == 0
+
+# ---------------------------- Tiered Backend ----------------------------
+
+@pytest.mark.asyncio
+async def test_tiered_reads_local_copy_first_and_writes_through():
+    local, remote = make_memory(), make_redis()
+    repo = TieredCacheRepository(local, remote, local_ttl_seconds=5)
+
+    await repo.set("key", {"a": 1})
+    assert await remote.get("key") == {"a": 1}
+
+    # Served from the local copy without a Redis round trip
+    await remote.redis_client.delete("key")
+    assert await repo.get("key") == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_tiered_fills_local_copy_from_redis():
+    local, remote = make_memory(), make_redis()
+    repo = TieredCacheRepository(local, remote, local_ttl_seconds=5)
+
+    await remote.set_user_session_data("s1", {"id": 1})
+    assert await repo.get_user_session_data("s1") == {"id": 1}
+    assert await local.get_user_session_data("s1") == {"id": 1}
+
+
+def test_build_cache_repository_selects_backend(monkeypatch):
+    monkeypatch.setattr(cache, "redis", fakeredis.FakeAsyncRedis(decode_responses=True))
+
+    assert isinstance(build_cache_repository("redis"), CacheRepositoryImpl)
+    assert isinstance(build_cache_repository("memory"), MemoryCacheRepository)
+    assert isinstance(build_cache_repository("tiered"), TieredCacheRepository)
+    # The in-process cache is shared by every request of the worker
+    assert build_cache_repository("memory") is build_cache_repository("memory")
+
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memcached")
+    with pytest.raises(ValueError):
+        build_cache_repository()
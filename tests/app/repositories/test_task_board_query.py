@@ -0,0 +1,100 @@
+import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import src.app.models.role  # noqa: F401
+import src.app.models.user  # noqa: F401
+from src.app.core.database import Base
+from src.app.models.task import Task
+from src.app.repositories.task_repository import TaskRepositoryImpl
+from src.app.schemas.task import TaskStatusEnum
+
+pytest.importorskip("aiosqlite")
+
+
+def make_task(task_id, status, owner_id=1):
+    return Task(
+        id=task_id, title=f"Task {task_id}", description="desc", owner_id=owner_id, is_completed=False,
+        priority=1, due_date=datetime.datetime(2030, 1, 1), created_at=datetime.datetime(2025, 1, 1),
+        status=status, subject="math",
+    )
+
+
+@pytest.fixture
+def tasks():
+    # Owner 1: 3 not started, 1 blocked; owner 2 has tasks that must never show up
+    return [
+        make_task(1, "not_started"),
+        make_task(2, "blocked"),
+        make_task(3, "not_started"),
+        make_task(4, "not_started"),
+        make_task(5, "in_progress", owner_id=2),
+    ]
+
+
+async def load_board(tmp_path, tasks, per_column):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'board.db'}", poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all(tasks)
+            await session.commit()
+            return await TaskRepositoryImpl(db=session).get_board_columns(1, per_column)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_board_columns_are_returned_in_status_order(tmp_path, tasks):
+    board = await load_board(tmp_path, tasks, per_column=10)
+
+    assert [column.status for column in board] == list(TaskStatusEnum)
+
+    columns = {column.status: column for column in board}
+    assert {status: column.total for status, column in columns.items()} == {
+        TaskStatusEnum.NOT_STARTED: 3,
+        TaskStatusEnum.IN_PROGRESS: 0,
+        TaskStatusEnum.COMPLETED: 0,
+        TaskStatusEnum.BLOCKED: 1,
+    }
+    assert [task.id for task in columns[TaskStatusEnum.NOT_STARTED].tasks] == [1, 3, 4]
+    assert [task.id for task in columns[TaskStatusEnum.BLOCKED].tasks] == [2]
+    assert columns[TaskStatusEnum.IN_PROGRESS].tasks == []
+
+
+@pytest.mark.asyncio
+async def test_board_columns_are_limited_but_keep_their_total(tmp_path, tasks):
+    board = await load_board(tmp_path, tasks, per_column=2)
+
+    columns = {column.status: column for column in board}
+    assert [task.id for task in columns[TaskStatusEnum.NOT_STARTED].tasks] == [1, 3]
+    assert columns[TaskStatusEnum.NOT_STARTED].total == 3
+    assert [task.id for task in columns[TaskStatusEnum.BLOCKED].tasks] == [2]
+
+
+@pytest.mark.asyncio
+async def test_the_rest_of_a_column_is_paged_after_the_last_task_rendered(tmp_path, tasks):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'board.db'}", poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            session.add_all(tasks)
+            await session.commit()
+            repository = TaskRepositoryImpl(db=session)
+
+            # The board rendered task 1 of "not started"
+            first = await repository.get_column_page(1, TaskStatusEnum.NOT_STARTED, after=1, limit=1)
+            second = await repository.get_column_page(1, TaskStatusEnum.NOT_STARTED, after=first.next_after, limit=1)
+            other_owner = await repository.get_column_page(1, TaskStatusEnum.IN_PROGRESS, after=0, limit=10)
+    finally:
+        await engine.dispose()
+
+    assert ([task.id for task in first.tasks], first.next_after) == ([3], 3)
+    assert ([task.id for task in second.tasks], second.next_after) == ([4], None)
+    assert (other_owner.tasks, other_owner.next_after) == ([], None)
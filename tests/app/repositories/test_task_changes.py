@@ -0,0 +1,99 @@
+import datetime
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import src.app.models.role  # noqa: F401
+from src.app.core.database import Base
+from src.app.models.role import Role
+from src.app.models.user import User
+from src.app.repositories.task_repository import TaskRepositoryImpl
+from src.app.schemas.task import TaskCreate, TaskStatusEnum, TaskUpdate
+
+pytest.importorskip("aiosqlite")
+
+
+@asynccontextmanager
+async def open_repository(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'changes.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(Role(id=2, name="student", permissions=7))
+        session.add_all([
+            User(id=1, username="one", email="one@example.com", password="x", role_id=2),
+            User(id=2, username="two", email="two@example.com", password="x", role_id=2),
+        ])
+        await session.commit()
+        yield TaskRepositoryImpl(db=session)
+
+    await engine.dispose()
+
+
+def new_task(title):
+    return TaskCreate(title=title, status=TaskStatusEnum.NOT_STARTED, due_date=datetime.date(2030, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_changes_since_a_cursor(tmp_path):
+    async with open_repository(tmp_path) as repository:
+        first = await repository.create_task(new_task("first"), 1)
+        second = await repository.create_task(new_task("second"), 1)
+        await repository.create_task(new_task("someone else's"), 2)
+        assert (first.change_seq, second.change_seq) == (1, 2)
+
+        # A client that has the board at cursor 2
+        cursor = await repository.get_change_cursor(1)
+        assert cursor == 2
+
+        await repository.update_task(first.id, TaskUpdate(
+            id=first.id, title="first, edited", status=TaskStatusEnum.BLOCKED, due_date=datetime.date(2030, 1, 1)
+        ))
+        await repository.delete_task_(second.id)
+
+        changes = await repository.get_changes(1, since=cursor, limit=100)
+        assert [(task.id, task.title, task.change_seq) for task in changes.tasks] == [(first.id, "first, edited", 3)]
+        assert changes.deleted == [second.id]
+        assert (changes.cursor, changes.has_more) == (4, False)
+
+        # Nothing new since the returned cursor
+        assert (await repository.get_changes(1, since=changes.cursor, limit=100)).model_dump() == {
+            "tasks": [], "deleted": [], "cursor": 4, "has_more": False,
+        }
+
+
+@pytest.mark.asyncio
+async def test_changes_are_paged_in_change_order(tmp_path):
+    async with open_repository(tmp_path) as repository:
+        tasks = [await repository.create_task(new_task(f"task {number}"), 1) for number in range(3)]
+        await repository.delete_task_(tasks[0].id)
+
+        page = await repository.get_changes(1, since=0, limit=2)
+        assert [task.id for task in page.tasks] == [tasks[1].id, tasks[2].id]
+        assert (page.deleted, page.cursor, page.has_more) == ([], 3, True)
+
+        rest = await repository.get_changes(1, since=page.cursor, limit=2)
+        assert (rest.tasks, rest.deleted, rest.cursor, rest.has_more) == ([], [tasks[0].id], 4, False)
+
+
+@pytest.mark.asyncio
+async def test_a_reused_task_id_is_not_reported_as_deleted(tmp_path):
+    async with open_repository(tmp_path) as repository:
+        await repository.create_task(new_task("first"), 1)
+        last = await repository.create_task(new_task("deleted"), 1)
+        await repository.delete_task_(last.id)
+
+        # SQLite hands the highest free ID out again
+        reused = await repository.create_task(new_task("reused"), 1)
+        assert reused.id == last.id
+
+        changes = await repository.get_changes(1, since=2, limit=100)
+        assert ([task.title for task in changes.tasks], changes.deleted) == (["reused"], [])
+
+        # Deleting it again leaves one tombstone
+        await repository.delete_task_(reused.id)
+        changes = await repository.get_changes(1, since=2, limit=100)
+        assert (changes.tasks, changes.deleted) == ([], [reused.id])
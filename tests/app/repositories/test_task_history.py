@@ -0,0 +1,72 @@
+import datetime
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+import src.app.models.role  # noqa: F401
+from src.app.core import audit
+from src.app.core.audit import TaskAuditLog, insert_task_events
+from src.app.core.database import Base
+from src.app.models.role import Role
+from src.app.models.user import User
+from src.app.repositories.task_repository import TaskRepositoryImpl
+from src.app.schemas.task import TaskCreate, TaskStatusEnum, TaskUpdate
+
+pytest.importorskip("aiosqlite")
+
+
+@asynccontextmanager
+async def open_audited_repository(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'history.db'}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # The audit log writes through the application engine
+    monkeypatch.setattr(audit, "get_engine", lambda: engine)
+
+    log = TaskAuditLog(queue_size=100, batch_size=100, flush_seconds=0, enqueue_timeout=1, writer=insert_task_events)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        session.add(Role(id=2, name="student", permissions=7))
+        session.add_all([
+            User(id=1, username="one", email="one@example.com", password="x", role_id=2),
+            User(id=2, username="two", email="two@example.com", password="x", role_id=2),
+        ])
+        await session.commit()
+        yield TaskRepositoryImpl(db=session, audit_log=log), log
+
+    await engine.dispose()
+
+
+async def write_queued(log):
+    while log.queue.qsize():
+        await log.write(await log.next_batch())
+
+
+@pytest.mark.asyncio
+async def test_history_of_a_task_newest_first(tmp_path, monkeypatch):
+    async with open_audited_repository(tmp_path, monkeypatch) as (repository, log):
+        task = await repository.create_task(
+            TaskCreate(title="Essay", status=TaskStatusEnum.NOT_STARTED, due_date=datetime.date(2030, 1, 1)), 1
+        )
+        await repository.update_task(task.id, TaskUpdate(
+            id=task.id, title="Final essay", status=TaskStatusEnum.IN_PROGRESS, due_date=datetime.date(2030, 1, 1)
+        ))
+        await repository.delete_task_(task.id)
+        await write_queued(log)
+
+        history = await repository.get_task_history(task.id, 1, before=None, limit=10)
+        assert [(e.action, e.field, e.old_value, e.new_value, e.actor_id) for e in history.events] == [
+            ("deleted", None, "Final essay", None, 1),
+            ("updated", "status", "not_started", "in_progress", 1),
+            ("updated", "title", "Essay", "Final essay", 1),
+            ("created", None, None, "Essay", 1),
+        ]
+        assert history.next_before is None
+
+        # Pages follow next_before; other users see nothing
+        first = await repository.get_task_history(task.id, 1, before=None, limit=3)
+        rest = await repository.get_task_history(task.id, 1, before=first.next_before, limit=3)
+        assert [e.action for e in first.events + rest.events] == [e.action for e in history.events]
+        assert rest.next_before is None
+        assert (await repository.get_task_history(task.id, 2, before=None, limit=10)).events == []
@@ -63,3 +63,11 @@ async def test_authenticate_user_invalid_password_field():
     service = LoginService(user_repository=BadRepo())
     user = await service.authenticate_user("user@example.com", "pass")
     assert user is None
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_inactive(mock_repo, mock_user):
+    mock_user.is_active = False
+    service = LoginService(user_repository=mock_repo)
+    user = await service.authenticate_user("user@example.com", "password123")
+    assert user is None
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+
+from src.app.core.config import settings
+from src.app.core.images import PROFILE_IMAGE_VARIANTS, InvalidImageError
+from src.app.core.uploads import ReceivedFile
+from src.app.core.avatars import VERSION_RE
+from src.app.services.profile_image_service import ProfileImageService, backfill_profile_versions
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(autouse=True)
+def resize_in_a_thread(monkeypatch):
+    # No process pool in the tests
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 0)
+
+
+def png_bytes(width, height, color=(200, 40, 40, 255)):
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), color).save(output, format="PNG")
+    return output.getvalue()
+
+
+def received_file(staging, data):
+    # What receive_file leaves behind: a temporary file in the staging directory
+    path = staging / ".upload-test"
+    path.write_bytes(data)
+    return ReceivedFile(path, "avatar.png", "image/png", len(data))
+
+
+@pytest.mark.asyncio
+async def test_save_writes_every_variant(tmp_path):
+    service = ProfileImageService(tmp_path)
+
+    async with service.staging_directory() as staging:
+        version = await service.save_profile_image(7, received_file(staging, png_bytes(900, 600)))
+
+    assert VERSION_RE.match(version)
+    assert {path.name for path in (tmp_path / "7" / version).iterdir()} == set(PROFILE_IMAGE_VARIANTS)
+    for name, (size, image_format) in PROFILE_IMAGE_VARIANTS.items():
+        with Image.open(tmp_path / "7" / version / name) as variant:
+            assert variant.size == (size, size)
+            assert variant.format == image_format
+
+    # Only the user's directory is left: no original, no staging directory
+    assert [path.name for path in tmp_path.iterdir()] == ["7"]
+
+
+@pytest.mark.asyncio
+async def test_save_refuses_files_that_are_not_png(tmp_path):
+    service = ProfileImageService(tmp_path)
+
+    with pytest.raises(InvalidImageError):
+        async with service.staging_directory() as staging:
+            await service.save_profile_image(7, received_file(staging, b"not an image"))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_new_upload_gets_a_new_version(tmp_path):
+    service = ProfileImageService(tmp_path)
+
+    async with service.staging_directory() as staging:
+        first = await service.save_profile_image(7, received_file(staging, png_bytes(300, 300)))
+    async with service.staging_directory() as staging:
+        second = await service.save_profile_image(7, received_file(staging, png_bytes(300, 300, color=(40, 40, 200, 255))))
+
+    assert first != second
+    # The previous version is served until the caller removes it
+    assert {path.name for path in (tmp_path / "7").iterdir()} == {first, second}
+    await service.remove_other_versions(7, keep=second)
+    assert [path.name for path in (tmp_path / "7").iterdir()] == [second]
+
+
+def test_backfill_versions_images_saved_without_a_version(tmp_path):
+    (tmp_path / "3").mkdir()
+    (tmp_path / "3" / "user.png").write_bytes(png_bytes(1200, 1200))
+    (tmp_path / "4").mkdir()
+    (tmp_path / "4" / "user.png").write_bytes(b"broken")
+
+    versions = backfill_profile_versions(tmp_path)
+
+    assert list(versions) == [3]
+    with Image.open(tmp_path / "3" / versions[3] / "user.png") as image:
+        assert image.size == (160, 160)
+    # The old files stay until the users point at the new version
+    assert (tmp_path / "3" / "user.png").is_file()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["3", "4"]
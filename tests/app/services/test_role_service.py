@@ -0,0 +1,73 @@
+import pytest
+from src.app.core.permissions import Permission, get_role_table, set_role_table, RolePermissionTable, DEFAULT_ROLE_PERMISSIONS
+from src.app.services.role_service import RoleService, ROLE_CHANGES_CHANNEL
+
+
+@pytest.fixture(autouse=True)
+def restore_role_table():
+    yield
+    set_role_table(RolePermissionTable(DEFAULT_ROLE_PERMISSIONS))
+
+
+@pytest.fixture
+def mock_repo():
+    class Role:
+        def __init__(self, id, permissions):
+            self.id = id
+            self.permissions = permissions
+
+    class MockRepo:
+        def __init__(self):
+            self.roles = {1: Role(1, int(Permission.ADMINISTRATOR)), 2: Role(2, int(Permission.VIEW_TASKS))}
+
+        async def list_all(self):
+            return list(self.roles.values())
+
+        async def update_permissions(self, role_id, permissions):
+            role = self.roles.get(role_id)
+            if role:
+                role.permissions = permissions
+            return role
+
+    return MockRepo()
+
+
+@pytest.fixture
+def mock_redis():
+    class MockRedis:
+        def __init__(self):
+            self.published = []
+
+        async def publish(self, channel, message):
+            self.published.append((channel, message))
+
+    return MockRedis()
+
+
+@pytest.mark.asyncio
+async def test_load_role_table(mock_repo):
+    service = RoleService(role_repository=mock_repo)
+    table = await service.load_role_table()
+    assert get_role_table() is table
+    assert table.has_permission(2, Permission.VIEW_TASKS)
+    assert not table.has_permission(2, Permission.MANAGE_TASKS)
+
+
+@pytest.mark.asyncio
+async def test_update_role_permissions_reloads_and_notifies(mock_repo, mock_redis):
+    service = RoleService(role_repository=mock_repo, redis_client=mock_redis)
+    await service.load_role_table()
+    version = get_role_table().version
+
+    await service.update_role_permissions(2, int(Permission.VIEW_TASKS | Permission.MANAGE_TASKS))
+
+    assert get_role_table().version == version + 1
+    assert get_role_table().has_permission(2, Permission.MANAGE_TASKS)
+    assert mock_redis.published == [(ROLE_CHANGES_CHANNEL, "2")]
+
+
+@pytest.mark.asyncio
+async def test_update_unknown_role(mock_repo, mock_redis):
+    service = RoleService(role_repository=mock_repo, redis_client=mock_redis)
+    assert await service.update_role_permissions(42, 1) is None
+    assert mock_redis.published == []
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from datetime import date
 from src.app.services.task_service import TaskService
@@ -38,6 +40,10 @@ def mock_repo():
         async def update_task(self, task_id, task_data):
             return TaskOut(**task_data.model_dump(), created_at=date.today(), owner_id=1)
 
+        async def update_task_status(self, task_id, user_id, status):
+            task = await self.get_task_by_id_and_user_id(task_id, user_id)
+            return task.model_copy(update={"status": status}) if task else None
+
         async def delete_task_(self, task_id):
             return True
 
@@ -112,3 +118,59 @@ async def test_update_task_missing_id(mock_repo):
     )
     with pytest.raises(ValueError):
         await service.update_task(task_data, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_board_invalid_page_size(mock_repo):
+    service = TaskService(task_repository=mock_repo)
+    with pytest.raises(ValueError):
+        await service.get_board(1, 0)
+
+
+@pytest.mark.asyncio
+async def test_changes_are_pushed_to_the_owner_board(mock_repo, monkeypatch):
+    from src.app.core import board_events
+
+    hub = board_events.BoardEventHub(queue_size=10)
+    monkeypatch.setattr(board_events, "hub", hub)
+    queue = hub.subscribe(1)
+
+    # Without Redis the events are delivered in this process
+    service = TaskService(task_repository=mock_repo)
+    await service.update_task_status(1, TaskStatusEnum.BLOCKED, 1)
+    await service.delete_task(1, 1)
+
+    updated, deleted = (json.loads(queue.get_nowait()[1]) for _ in range(2))
+    assert updated["type"] == "task.updated"
+    assert updated["task"]["status"] == "blocked"
+    assert deleted["type"] == "task.deleted"
+    assert deleted["task_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_status_changes_are_written_once(mock_repo):
+    from src.app.core.status_coalescer import TaskStatusCoalescer
+
+    written = []
+
+    async def write(redis_client, task_id, owner_id, status):
+        task = await TaskService(task_repository=mock_repo).write_task_status(task_id, status, owner_id)
+        written.append(task.status)
+        return task is not None
+
+    service = TaskService(task_repository=mock_repo, status_coalescer=TaskStatusCoalescer(0.01, writer=write))
+    await service.queue_task_status(1, TaskStatusEnum.BLOCKED, 1)
+    await service.queue_task_status(1, TaskStatusEnum.COMPLETED, 1)
+    await service.status_coalescer.drain(1)
+    assert written == [TaskStatusEnum.COMPLETED]
+
+    # Tasks of other users are refused before anything is queued
+    with pytest.raises(ValueError):
+        await service.queue_task_status(1, TaskStatusEnum.BLOCKED, 2)
+
+    # A direct update drops the change queued before it: no flush writes the older status over it
+    written.clear()
+    await service.queue_task_status(1, TaskStatusEnum.BLOCKED, 1)
+    updated = await service.update_task_status(1, TaskStatusEnum.IN_PROGRESS, 1)
+    await service.status_coalescer.drain(1)
+    assert (updated.status, written) == (TaskStatusEnum.IN_PROGRESS, [])
@@ -97,3 +97,124 @@ async def test_list_users(mock_repo):
     assert isinstance(result, dict)
     assert "users" in result
     assert result["users"][0]["username"] == "test"
+
+
+@pytest.fixture
+def deletion_repos():
+    class UserRepo:
+        def __init__(self):
+            self.active = {1: True}
+            self.deleted = []
+
+        async def deactivate_user(self, user_id):
+            if user_id not in self.active:
+                return False
+            self.active[user_id] = False
+            return True
+
+        async def delete_user(self, user_id):
+            self.deleted.append(user_id)
+
+    class TaskRepo:
+        def __init__(self, total):
+            self.remaining = total
+            self.batches = []
+
+        async def delete_tasks_batch_by_owner(self, owner_id, batch_size):
+            deleted = min(batch_size, self.remaining)
+            self.remaining -= deleted
+            if deleted:
+                self.batches.append(deleted)
+            return deleted
+
+    class Cache:
+        def __init__(self):
+            self.storage = {}
+
+        async def set(self, key, value, ttl_seconds=60):
+            self.storage[key] = value
+
+        async def get(self, key):
+            return self.storage.get(key)
+
+        async def delete(self, key):
+            self.storage.pop(key, None)
+
+    return UserRepo(), TaskRepo(total=25), Cache()
+
+
+@pytest.mark.asyncio
+async def test_delete_user_only_deactivates(deletion_repos):
+    user_repo, task_repo, cache = deletion_repos
+    service = UserService(user_repository=user_repo, cache_service=cache, task_repository=task_repo)
+
+    await service.delete_user(1)
+
+    assert user_repo.active[1] is False
+    assert user_repo.deleted == []
+    assert task_repo.batches == []
+    assert await service.get_deletion_progress(1) == {"status": "pending", "deleted_tasks": 0}
+
+
+@pytest.mark.asyncio
+async def test_delete_user_enqueues_the_purge(deletion_repos):
+    user_repo, task_repo, cache = deletion_repos
+
+    class Queue:
+        def __init__(self):
+            self.jobs = []
+
+        async def enqueue(self, name, **payload):
+            self.jobs.append((name, payload))
+
+    queue = Queue()
+    service = UserService(user_repository=user_repo, cache_service=cache, task_repository=task_repo, job_queue=queue)
+
+    await service.delete_user(1)
+
+    assert queue.jobs == [("accounts.purge", {"user_id": 1})]
+    assert task_repo.batches == []
+
+
+@pytest.mark.asyncio
+async def test_delete_unknown_user(deletion_repos):
+    user_repo, task_repo, cache = deletion_repos
+    service = UserService(user_repository=user_repo, cache_service=cache, task_repository=task_repo)
+
+    with pytest.raises(ValueError):
+        await service.delete_user(99)
+
+
+@pytest.mark.asyncio
+async def test_purge_user_in_batches(deletion_repos):
+    user_repo, task_repo, cache = deletion_repos
+    service = UserService(user_repository=user_repo, cache_service=cache, task_repository=task_repo)
+
+    deleted = await service.purge_user(1, batch_size=10)
+
+    assert deleted == 25
+    assert task_repo.batches == [10, 10, 5]
+    assert user_repo.deleted == [1]
+    assert await service.get_deletion_progress(1) == {"status": "completed", "deleted_tasks": 25}
+
+
+@pytest.mark.asyncio
+async def test_failed_purge_reports_the_tasks_already_deleted(deletion_repos):
+    user_repo, task_repo, cache = deletion_repos
+    service = UserService(user_repository=user_repo, cache_service=cache, task_repository=task_repo)
+
+    async def fail_after_two_batches(owner_id, batch_size):
+        if len(task_repo.batches) == 2:
+            raise ConnectionError("database unavailable")
+        return await delete_batch(owner_id, batch_size)
+
+    delete_batch = task_repo.delete_tasks_batch_by_owner
+    task_repo.delete_tasks_batch_by_owner = fail_after_two_batches
+    with pytest.raises(ConnectionError):
+        await service.purge_user(1, batch_size=10)
+    assert await service.get_deletion_progress(1) == {"status": "failed", "deleted_tasks": 20}
+
+    # A retry continues the count
+    task_repo.delete_tasks_batch_by_owner = delete_batch
+    assert await service.purge_user(1, batch_size=10, deleted_before=20) == 25
+    assert await service.get_deletion_progress(1) == {"status": "completed", "deleted_tasks": 25}
@@ -0,0 +1,41 @@
+from benchmarks.load.loadgen import ScenarioResult
+from benchmarks.load.report import build_report, compare_to_baseline, percentile, summarize
+
+
+def make_report(p95_ms, rps, errors=0):
+    return {"scenarios": {"board_load": {"requests": 100, "errors": errors, "rps": rps, "p95_ms": p95_ms}}}
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(value) for value in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile(samples, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_summarize_reports_latency_in_ms_and_rps():
+    result = ScenarioResult(name="login_storm", latencies=[0.01, 0.02, 0.03, 0.04], errors=1, elapsed=2.0)
+    stats = summarize(result)
+
+    assert stats["requests"] == 5
+    assert stats["errors"] == 1
+    assert stats["rps"] == 2.0
+    assert stats["p50_ms"] == 20.0
+    assert stats["max_ms"] == 40.0
+    assert build_report([result], {"mode": "in-process"})["scenarios"]["login_storm"] == stats
+
+
+def test_compare_accepts_changes_within_tolerance():
+    baseline = make_report(p95_ms=100.0, rps=200.0)
+    assert compare_to_baseline(make_report(p95_ms=120.0, rps=170.0), baseline, tolerance=0.25) == []
+
+
+def test_compare_flags_latency_throughput_and_errors():
+    baseline = make_report(p95_ms=100.0, rps=200.0)
+    regressions = compare_to_baseline(make_report(p95_ms=130.0, rps=140.0, errors=2), baseline, tolerance=0.25)
+
+    assert len(regressions) == 3
+    assert any("p95" in message for message in regressions)
+    assert any("req/s" in message for message in regressions)
+    assert any("failed requests" in message for message in regressions)
@@ -0,0 +1,30 @@
+from benchmarks.micro.harness import CASES, case, measure
+
+
+def test_case_registers_factory():
+    @case("test_noop")
+    def noop():
+        return lambda: None
+
+    try:
+        assert CASES["test_noop"] is noop
+    finally:
+        del CASES["test_noop"]
+
+
+def test_measure_reports_time_and_allocations():
+    measurement = measure("list_alloc", lambda: (lambda: [0] * 1000), repeats=2, min_seconds=0.01)
+
+    assert measurement.ns_per_op > 0
+    assert measurement.loops >= 1
+    # A 1000-item list is about 8 KB of pointers
+    assert measurement.alloc_peak_bytes_per_op >= 8000
+    assert measurement.retained_blocks_per_op < 1
+
+
+def test_measure_supports_coroutines():
+    async def work():
+        return [0] * 10
+
+    measurement = measure("async_work", lambda: work, repeats=1, min_seconds=0.01)
+    assert measurement.ns_per_op > 0